@@ -1,10 +1,14 @@
 # Copyright (C) 2025 Intel Corporation
 # SPDX-License-Identifier: Apache-2.0
 
+import asyncio
 import traceback
-from typing import Annotated
+from functools import partial
+from pathlib import Path
+from typing import Annotated, AsyncIterator, Optional
 
 from fastapi import APIRouter, Query, HTTPException, status, Depends
+from fastapi.responses import StreamingResponse
 from pydantic.json_schema import SkipJsonSchema
 
 from audio_analyzer.schemas.transcription import (
@@ -14,6 +18,7 @@ from audio_analyzer.schemas.transcription import (
     TranscriptionFormData
 )
 from audio_analyzer.core.audio_extractor import AudioExtractor
+from audio_analyzer.core.job_manager import JobQueueFullError, TranscriptionJob, transcription_jobs
 from audio_analyzer.core.transcriber import TranscriptionService
 from audio_analyzer.utils.file_utils import get_file_duration
 from audio_analyzer.utils.validation import RequestValidation
@@ -29,6 +34,7 @@ router = APIRouter()
     responses={
         status.HTTP_400_BAD_REQUEST: {"model": ErrorResponse},
         status.HTTP_500_INTERNAL_SERVER_ERROR: {"model": ErrorResponse},
+        status.HTTP_503_SERVICE_UNAVAILABLE: {"model": ErrorResponse},
         status.HTTP_422_UNPROCESSABLE_ENTITY: {"description": "Invalid request body or parameter provided"},
     },
     tags=["Transcription API"],
@@ -49,6 +55,9 @@ async def transcribe_video(
     Two ways to provide the video:
     - Upload a video file using form-data
     - Specify MinIO parameters (minio_bucket, video_id, video_name) to retrieve from storage
+    
+    The request is processed by the same bounded worker pool as `POST /transcriptions/jobs`
+    and the response is returned once the transcription has finished.
      
     Args:
         request: Form data containing the file or MinIO parameters and transcription settings
@@ -59,59 +68,15 @@ async def transcribe_video(
     """
     
     try:
-        # Validate the request parameters
-        RequestValidation.validate_form_data(request)
+        job = await _queue_transcription(request, language)
 
-        logger.info(f"Received transcription request for {'file upload' if request.file else 'MinIO video'}")
-        logger.debug(f"Transcription parameters: model={request.model_name}, device={request.device}, language={language}")
-    
-        # Get video path either from direct upload or MinIO
-        video_path, filename = await get_video_path(request)
-        
-        # Extract audio from video
-        audio_path = await AudioExtractor.extract_audio(video_path)
-        logger.debug(f"Audio extracted successfully to: {audio_path}")
-        
-        # Get file duration
-        duration = get_file_duration(video_path)
-        logger.debug(f"File duration: {duration} seconds")
-        
-        logger.info(f"Initializing transcription service with model: {request.model_name}, device: {request.device}")
-        transcriber = TranscriptionService(
-            model_name=request.model_name,
-            device=request.device
-        )
-        
-        # Perform transcription
-        job_id, transcript_path = await transcriber.transcribe(
-            audio_path,
-            language=language,
-            include_timestamps=request.include_timestamps,
-            video_duration=duration  # Pass the video duration to optimize processing
-        )
-        
-        # Store the transcript output using the configured backend
-        output_location = store_transcript_output(
-            transcript_path, 
-            job_id, 
-            filename,
-            minio_bucket=request.minio_bucket,
-            video_id=request.video_id
-        )
+        # Wait for a transcription worker to process the job
+        await transcription_jobs.wait(job)
+        if job.status == TranscriptionStatus.FAILED:
+            # Re-raise the original error, so that client errors (e.g. a video without audio) keep their status code
+            raise job.exception or Exception(job.error)
 
-        if not output_location:
-            raise Exception("Failed to store transcript output.")
-        
-        logger.info(f"Transcription completed using {transcriber.backend.value} on {transcriber.device_type.value}")
-        
-        return TranscriptionResponse(
-            status=TranscriptionStatus.COMPLETED,
-            message="Transcription completed successfully",
-            job_id=job_id,
-            transcript_path=output_location,
-            video_name=filename,
-            video_duration=duration
-        )
+        return _job_response(job)
     
     except HTTPException as http_exc:
         raise http_exc
@@ -127,4 +92,265 @@ async def transcribe_video(
                 error_message=f"Transcription failed!",
                 details="An error occurred during transcription. Please check logs for details."
             ).model_dump()
-        )
\ No newline at end of file
+        )
+
+
+@router.post(
+    "/transcriptions/jobs",
+    response_model=TranscriptionResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+    responses={
+        status.HTTP_400_BAD_REQUEST: {"model": ErrorResponse},
+        status.HTTP_500_INTERNAL_SERVER_ERROR: {"model": ErrorResponse},
+        status.HTTP_503_SERVICE_UNAVAILABLE: {"model": ErrorResponse},
+        status.HTTP_422_UNPROCESSABLE_ENTITY: {"description": "Invalid request body or parameter provided"},
+    },
+    tags=["Transcription API"],
+    summary="Queue an asynchronous transcription job for an uploaded video file or a video stored at Minio"
+)
+async def create_transcription_job(
+    request: Annotated[TranscriptionFormData, Depends()],
+    language: Annotated[
+        str | SkipJsonSchema[None], 
+        Query(description="_(Optional)_ Language for transcription. If not provided, auto-detection will be used.")
+    ] = None
+) -> TranscriptionResponse:
+    """
+    Queue a transcription job and return immediately.
+    
+    Accepts the same parameters as `POST /transcriptions`. The response contains the
+    job ID, which can be polled with `GET /transcriptions/jobs/{job_id}` until the
+    job is completed or failed.
+    
+    Args:
+        request: Form data containing the file or MinIO parameters and transcription settings
+        language: Optional language code for transcription
+    
+    Returns:
+        A response with the queued job's ID and status
+    """
+    
+    try:
+        job = await _queue_transcription(request, language)
+        return _job_response(job)
+    
+    except HTTPException as http_exc:
+        raise http_exc
+    
+    except Exception as e:
+        error_details = traceback.format_exc()
+        logger.error(f"Failed to queue transcription job: {str(e)}")
+        logger.debug(f"Error details: {error_details}")
+        
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=ErrorResponse(
+                error_message="Failed to queue transcription job!",
+                details="An error occurred while queueing the transcription job. Please check logs for details."
+            ).model_dump()
+        )
+
+
+@router.get(
+    "/transcriptions/jobs/{job_id}",
+    response_model=TranscriptionResponse,
+    responses={
+        status.HTTP_404_NOT_FOUND: {"model": ErrorResponse},
+    },
+    tags=["Transcription API"],
+    summary="Get the status of a transcription job"
+)
+async def get_transcription_job(job_id: str) -> TranscriptionResponse:
+    """
+    Get the status of a queued transcription job.
+    
+    Args:
+        job_id: ID returned when the job was queued
+    
+    Returns:
+        A response with the job status and, once completed, the transcript location
+    """
+    job = transcription_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=ErrorResponse(
+                error_message="Transcription job not found.",
+                details=f"No transcription job with ID '{job_id}' exists or its status has expired"
+            ).model_dump()
+        )
+    return _job_response(job)
+
+
+@router.get(
+    "/transcriptions/jobs/{job_id}/events",
+    response_class=StreamingResponse,
+    responses={
+        status.HTTP_200_OK: {
+            "content": {"text/event-stream": {}},
+            "description": "Server-sent events with the transcribed segments and the final job status",
+        },
+        status.HTTP_404_NOT_FOUND: {"model": ErrorResponse},
+    },
+    tags=["Transcription API"],
+    summary="Stream the transcribed segments of a transcription job as server-sent events"
+)
+async def stream_transcription_job(job_id: str) -> StreamingResponse:
+    """
+    Stream the segments of a transcription job while it is being transcribed.
+    
+    Long videos are transcribed chunk by chunk, and the segments of every chunk are sent
+    as soon as all earlier chunks are done, so a client can show the transcript before
+    the whole video has been processed. Segments transcribed before the client connected
+    are sent first.
+    
+    Each segment is sent as a `segment` event with a JSON `TranscriptSegment`. The stream
+    ends with a `status` event with the JSON `TranscriptionResponse` of the finished job.
+    
+    Args:
+        job_id: ID returned when the job was queued
+    
+    Returns:
+        A `text/event-stream` response
+    """
+    job = transcription_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=ErrorResponse(
+                error_message="Transcription job not found.",
+                details=f"No transcription job with ID '{job_id}' exists or its status has expired"
+            ).model_dump()
+        )
+    return StreamingResponse(
+        _job_events(job),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+async def _job_events(job: TranscriptionJob) -> AsyncIterator[str]:
+    """Yield server-sent events for the segments of a job until it has finished"""
+    sent = 0
+    while True:
+        # Capture the event before reading the state, so that no update can be missed
+        updated = job.updated
+        finished = job.is_finished
+        for segment in job.segments[sent:]:
+            yield f"event: segment\ndata: {segment.model_dump_json()}\n\n"
+        sent = len(job.segments)
+        if finished:
+            yield f"event: status\ndata: {_job_response(job).model_dump_json()}\n\n"
+            return
+        await updated.wait()
+
+
+async def _queue_transcription(request: TranscriptionFormData, language: Optional[str]) -> TranscriptionJob:
+    """
+    Validate a transcription request, fetch its video and queue it for a transcription worker.
+    
+    The video is saved (or downloaded from MinIO) before queueing, since the uploaded
+    file is only available while the request is being handled.
+    """
+    # Validate the request parameters
+    RequestValidation.validate_form_data(request)
+
+    logger.info(f"Received transcription request for {'file upload' if request.file else 'MinIO video'}")
+    logger.debug(f"Transcription parameters: model={request.model_name}, device={request.device}, language={language}")
+
+    # Get video path either from direct upload or MinIO
+    video_path, filename = await get_video_path(request)
+
+    handler = partial(
+        _process_transcription,
+        video_path=video_path,
+        filename=filename,
+        model_name=request.model_name,
+        device=request.device,
+        language=language,
+        include_timestamps=request.include_timestamps,
+        minio_bucket=request.minio_bucket,
+        video_id=request.video_id
+    )
+    try:
+        job = transcription_jobs.submit(handler, video_name=filename)
+    except JobQueueFullError as e:
+        logger.warning(str(e))
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=ErrorResponse(
+                error_message="Transcription queue is full.",
+                details="Too many transcription jobs are waiting. Please retry later."
+            ).model_dump()
+        )
+
+    logger.info(f"Transcription job {job.job_id} queued")
+    return job
+
+
+async def _process_transcription(
+    job: TranscriptionJob,
+    video_path: Path | str,
+    filename: str,
+    model_name: Optional[str],
+    device: Optional[str],
+    language: Optional[str],
+    include_timestamps: bool,
+    minio_bucket: Optional[str],
+    video_id: Optional[str]
+) -> None:
+    """
+    Transcribe a queued video and store its transcript. Runs on a transcription worker.
+    """
+    # Get file duration by probing the container header, off the event loop
+    duration = await asyncio.to_thread(get_file_duration, video_path)
+    job.video_duration = duration
+    logger.debug(f"File duration: {duration} seconds")
+
+    # Stream the audio track into memory as 16 kHz mono PCM; no intermediate audio file is written
+    audio = await AudioExtractor.load_audio(video_path, duration=duration)
+    logger.debug(f"Audio extracted successfully: {len(audio)} samples")
+    
+    logger.info(f"Initializing transcription service with model: {model_name}, device: {device}")
+    transcriber = TranscriptionService(
+        model_name=model_name,
+        device=device
+    )
+    
+    # Perform transcription with the pooled model
+    _, transcript_path = await transcriber.transcribe(
+        audio,
+        language=language,
+        include_timestamps=include_timestamps,
+        video_duration=duration,  # Pass the video duration to optimize processing
+        job_id=job.job_id,
+        output_name=Path(filename).stem,
+        segment_callback=job.add_segments  # Publish segments to event stream listeners
+    )
+    
+    # Store the transcript output using the configured backend
+    output_location = store_transcript_output(
+        transcript_path, 
+        job.job_id, 
+        filename,
+        minio_bucket=minio_bucket,
+        video_id=video_id
+    )
+
+    if not output_location:
+        raise Exception("Failed to store transcript output.")
+
+    job.transcript_path = output_location
+    logger.info(f"Transcription completed using {transcriber.backend.value} on {transcriber.device_type.value}")
+
+
+def _job_response(job: TranscriptionJob) -> TranscriptionResponse:
+    """Build the API response for a transcription job"""
+    return TranscriptionResponse(
+        status=job.status,
+        message=job.message,
+        job_id=job.job_id,
+        transcript_path=job.transcript_path,
+        video_name=job.video_name,
+        video_duration=job.video_duration
+    )
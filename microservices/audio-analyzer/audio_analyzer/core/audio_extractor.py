@@ -1,55 +1,119 @@
 # Copyright (C) 2025 Intel Corporation
 # SPDX-License-Identifier: Apache-2.0
 
+import asyncio
 import traceback
+import wave
 from pathlib import Path
-from typing import Optional
+from typing import AsyncIterator, Optional
 
+import numpy as np
 from fastapi import HTTPException, status
-from moviepy import VideoFileClip, AudioFileClip
+from moviepy.config import FFMPEG_BINARY
 
 from audio_analyzer.core.settings import settings
+from audio_analyzer.utils.file_utils import redact_url
 from audio_analyzer.utils.logger import logger
 
 
+# FFmpeg error messages reported when the source has no audio stream to map
+NO_AUDIO_STREAM_ERRORS = ("matches no streams", "does not contain any stream")
+
+
 class AudioExtractor:
     """
-    Service for extracting audio from video files using MoviePy
+    Service for extracting audio from video files by streaming it through FFmpeg.
+
+    The audio track is demuxed and resampled by a single FFmpeg process straight to
+    16-bit PCM at the configured sample rate and channel count. The PCM stream is read
+    in fixed-size chunks, so no intermediate audio file has to be written and read back,
+    and `stream_audio` holds a single chunk at a time. `load_audio` keeps the complete
+    audio in memory (4 bytes per sample, about 230 MB per hour at 16 kHz mono), as the
+    transcription backends need all of it. The video stream is never decoded. The source
+    can be a local file or a URL (e.g. a presigned MinIO URL).
     """
-    
+
     @staticmethod
-    async def extract_audio(
-        video_path: Path, 
-        output_path: Optional[Path] = None,
-        audio_format: str = "wav"
-    ) -> Path:
+    def _ffmpeg_command(source: Path | str) -> list:
+        """Build the FFmpeg command decoding the first audio stream of a source to raw PCM"""
+        audio_params = settings.AUDIO_FORMAT_PARAMS
+        return [
+            FFMPEG_BINARY,
+            "-nostdin",
+            "-hide_banner",
+            "-loglevel", "error",
+            "-i", str(source),
+            "-map", "0:a:0",  # First audio stream only; the video stream is not decoded
+            "-ac", str(audio_params["nchannels"]),
+            "-ar", str(audio_params["fps"]),
+            "-f", "s16le",
+            "-acodec", "pcm_s16le",
+            "pipe:1",
+        ]
+
+    @staticmethod
+    async def stream_audio(
+        source: Path | str,
+        chunk_seconds: Optional[float] = None
+    ) -> AsyncIterator[np.ndarray]:
         """
-        Extract audio from a video file and save it to disk using MoviePy.
-        
+        Stream the audio of a video as chunks of normalized PCM samples.
+
         Args:
-            video_path: Path to the video file
-            output_path: Path to save the extracted audio to (optional)
-            audio_format: Format of the output audio file (default: wav)
-            
-        Returns:
-            Path to the extracted audio file
-            
+            source: Path or URL of the video file
+            chunk_seconds: Duration of each chunk in seconds (defaults to AUDIO_CHUNK_SECONDS setting)
+
+        Yields:
+            float32 arrays of samples in [-1, 1]; the last chunk may be shorter
+
         Raises:
-            HTTPException: If the video has no audio stream or another error occurs
+            HTTPException: If the video has no audio stream
+            RuntimeError: If FFmpeg fails to decode the audio
         """
-        logger.info(f"Extracting audio from video file: {video_path}")
-        logger.debug(f"Audio format: {audio_format}")
-        
-        if output_path is None:
-            audio_dir = Path(settings.AUDIO_DIR)
-            audio_dir.mkdir(parents=True, exist_ok=True)
-            output_path = audio_dir / f"{video_path.stem}.{audio_format}"
-            logger.debug(f"Using default output path: {output_path}")
-        
+        audio_params = settings.AUDIO_FORMAT_PARAMS
+        chunk_seconds = chunk_seconds or settings.AUDIO_CHUNK_SECONDS
+        frame_size = audio_params["nbytes"] * audio_params["nchannels"]
+        chunk_size = max(1, int(chunk_seconds * audio_params["fps"])) * frame_size
+
+        logger.info(f"Streaming audio from video source: {redact_url(source)}")
+        logger.debug(f"Using audio parameters: sample_rate={audio_params['fps']}, "
+                     f"bit_depth={audio_params['nbytes']*8}, channels={audio_params['nchannels']}, "
+                     f"chunk={chunk_seconds}s")
+
+        try:
+            process = await asyncio.create_subprocess_exec(
+                *AudioExtractor._ffmpeg_command(source),
+                stdin=asyncio.subprocess.DEVNULL,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+            )
+        except Exception as e:
+            error_msg = f"Failed to extract audio from video: {e}"
+            logger.error(error_msg)
+            logger.debug(f"Error details: {traceback.format_exc()}")
+            raise RuntimeError(error_msg) from e
+
+        # Drain stderr concurrently so that a verbose FFmpeg cannot block on a full pipe
+        stderr_task = asyncio.ensure_future(process.stderr.read())
+        total_bytes = 0
         try:
-            logger.debug(f"Opening video file: {video_path}")
-            with VideoFileClip(str(video_path)) as video:
-                if video.audio is None:
+            while True:
+                try:
+                    data = await process.stdout.readexactly(chunk_size)
+                except asyncio.IncompleteReadError as partial:
+                    data = partial.partial
+                if data:
+                    usable = len(data) - len(data) % frame_size
+                    total_bytes += usable
+                    yield np.frombuffer(data[:usable], dtype=np.int16).astype(np.float32) / 32768.0
+                if len(data) < chunk_size:
+                    break
+
+            return_code = await process.wait()
+            # FFmpeg names the input in its errors, which must not reveal a presigned URL
+            stderr = (await stderr_task).decode(errors="replace").strip().replace(str(source), redact_url(source))
+            if return_code != 0:
+                if any(message in stderr for message in NO_AUDIO_STREAM_ERRORS):
                     error_msg = "No audio stream found in the video file"
                     logger.error(error_msg)
                     raise HTTPException(
@@ -59,42 +123,85 @@ class AudioExtractor:
                             "details": "The video file doesn't contain any audible track that can be transcribed"
                         }
                     )
-                
-                # Extract audio with specific parameters for 16-bit audio
-                audio_params = settings.AUDIO_FORMAT_PARAMS
-                logger.debug(f"Using audio parameters: sample_rate={audio_params['fps']}, " 
-                            f"bit_depth={audio_params['nbytes']*8}, channels={audio_params['nchannels']}")
-                
-                # Write audio file with specified parameters
-                logger.info(f"Writing audio to file: {output_path}")
-                video.audio.write_audiofile(
-                    str(output_path),
-                    fps=audio_params["fps"],  # Sample rate (e.g., 16000 Hz)
-                    nbytes=audio_params["nbytes"],  # Bytes per sample (2 for 16-bit)
-                    codec='pcm_s16le' if audio_format == 'wav' else None,  # Ensure 16-bit PCM for WAV
-                    ffmpeg_params=["-ac", str(audio_params["nchannels"])] if audio_format == 'wav' else [],  # Set channels
-                    logger=None
-                )
-                
-                # Verify the audio file was created with correct parameters
-                if audio_format == 'wav' and output_path.exists():
-                    logger.debug("Verifying extracted audio file parameters")
-                    with AudioFileClip(str(output_path)) as audio_clip:
-                        logger.info(f"Audio extracted successfully: {output_path}")
-                        logger.debug(f"Audio properties - Sample rate: {audio_clip.fps}, Channels: {audio_clip.nchannels}")
-                        
-                        # Check if audio parameters match expected values
-                        if audio_clip.fps != audio_params["fps"]:
-                            logger.warning(f"Sample rate mismatch: expected {audio_params['fps']}, got {audio_clip.fps}")
-                        if audio_clip.nchannels != audio_params["nchannels"]:
-                            logger.warning(f"Channel count mismatch: expected {audio_params['nchannels']}, got {audio_clip.nchannels}")
-                
-            return output_path
-            
-        except HTTPException:
-            raise
-        except Exception as e:
-            error_msg = f"Failed to extract audio from video: {e}"
-            logger.error(error_msg)
-            logger.debug(f"Error details: {traceback.format_exc()}")
-            raise RuntimeError(error_msg) from e
\ No newline at end of file
+                raise RuntimeError(f"Failed to extract audio from video: FFmpeg exited with code {return_code}: {stderr}")
+
+            logger.info(f"Audio extracted successfully: "
+                        f"{total_bytes / frame_size / audio_params['fps']:.2f} seconds of audio")
+        finally:
+            # Stop FFmpeg if the consumer stopped early or an error occurred
+            if process.returncode is None:
+                process.kill()
+                await process.wait()
+            if not stderr_task.done():
+                stderr_task.cancel()
+
+    @staticmethod
+    async def load_audio(source: Path | str, duration: Optional[float] = None) -> np.ndarray:
+        """
+        Extract the complete audio of a video as normalized PCM samples, without intermediate files.
+
+        The samples are copied into a single buffer as they are streamed, so the audio is
+        not held twice in memory. The buffer is sized from `duration` when it is known and
+        grown if the audio turns out to be longer.
+
+        Args:
+            source: Path or URL of the video file
+            duration: Expected duration of the audio in seconds (optional)
+
+        Returns:
+            float32 array of samples in [-1, 1] at the configured sample rate
+
+        Raises:
+            HTTPException: If the video has no audio stream
+            RuntimeError: If FFmpeg fails to decode the audio
+        """
+        sample_rate = settings.AUDIO_FORMAT_PARAMS["fps"]
+        buffer = np.empty(int(duration * sample_rate) if duration else 0, dtype=np.float32)
+        size = 0
+        async for chunk in AudioExtractor.stream_audio(source):
+            if size + len(chunk) > len(buffer):
+                grown = np.empty(max(size + len(chunk), 2 * len(buffer)), dtype=np.float32)
+                grown[:size] = buffer[:size]
+                buffer = grown
+            buffer[size:size + len(chunk)] = chunk
+            size += len(chunk)
+        return buffer[:size]
+
+    @staticmethod
+    async def extract_audio(
+        video_path: Path | str,
+        output_path: Optional[Path] = None
+    ) -> Path:
+        """
+        Extract audio from a video file and save it to disk as a 16-bit PCM WAV file.
+
+        The audio is streamed to the file chunk by chunk. Prefer `stream_audio` or
+        `load_audio` when the samples are consumed in-process.
+
+        Args:
+            video_path: Path or URL of the video file
+            output_path: Path to save the extracted audio to (optional)
+
+        Returns:
+            Path to the extracted audio file
+
+        Raises:
+            HTTPException: If the video has no audio stream
+            RuntimeError: If FFmpeg fails to decode the audio
+        """
+        if output_path is None:
+            audio_dir = Path(settings.AUDIO_DIR)
+            audio_dir.mkdir(parents=True, exist_ok=True)
+            output_path = audio_dir / f"{Path(str(video_path).split('?')[0]).stem}.wav"
+            logger.debug(f"Using default output path: {output_path}")
+
+        audio_params = settings.AUDIO_FORMAT_PARAMS
+        logger.info(f"Writing audio to file: {output_path}")
+        with wave.open(str(output_path), "wb") as wav_file:
+            wav_file.setnchannels(audio_params["nchannels"])
+            wav_file.setsampwidth(audio_params["nbytes"])
+            wav_file.setframerate(audio_params["fps"])
+            async for chunk in AudioExtractor.stream_audio(video_path):
+                wav_file.writeframes((chunk * 32768.0).astype(np.int16).tobytes())
+
+        return output_path
@@ -0,0 +1,213 @@
+# Copyright (C) 2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+import asyncio
+import time
+import traceback
+import uuid
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from audio_analyzer.core.settings import settings
+from audio_analyzer.schemas.transcription import TranscriptSegment
+from audio_analyzer.schemas.types import TranscriptionStatus
+from audio_analyzer.utils.logger import logger
+
+
+class JobQueueFullError(Exception):
+    """Raised when a job is submitted while the transcription queue is full"""
+
+
+@dataclass
+class TranscriptionJob:
+    """State of a queued transcription job"""
+    job_id: str
+    video_name: Optional[str] = None
+    status: TranscriptionStatus = TranscriptionStatus.PENDING
+    message: str = "Transcription job queued"
+    transcript_path: Optional[str] = None
+    video_duration: Optional[float] = None
+    error: Optional[str] = None
+    exception: Optional[Exception] = field(default=None, repr=False)
+    created_at: float = field(default_factory=time.time)
+    finished_at: Optional[float] = None
+    done: Optional[asyncio.Event] = field(default=None, repr=False)
+    segments: List[TranscriptSegment] = field(default_factory=list, repr=False)
+    updated: asyncio.Event = field(default_factory=asyncio.Event, repr=False)
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in (TranscriptionStatus.COMPLETED, TranscriptionStatus.FAILED)
+
+    def add_segments(self, segments: List[TranscriptSegment]) -> None:
+        """Append transcribed segments and wake up listeners"""
+        self.segments.extend(segments)
+        self.notify()
+
+    def notify(self) -> None:
+        """Wake up everyone waiting on the current `updated` event and arm a new one"""
+        updated, self.updated = self.updated, asyncio.Event()
+        updated.set()
+
+
+# A job handler processes a job and fills in its result fields
+JobHandler = Callable[[TranscriptionJob], Awaitable[None]]
+
+
+class TranscriptionJobManager:
+    """
+    Job queue that runs transcriptions on a bounded pool of async workers.
+
+    Requests are queued and picked up by at most MAX_CONCURRENT_TRANSCRIPTIONS workers,
+    so the number of transcriptions competing for CPU/GPU is bounded no matter how many
+    requests arrive. Job state is kept in memory for polling until TRANSCRIPTION_JOB_TTL
+    seconds after the job has finished.
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        max_queue_size: Optional[int] = None,
+        job_ttl: Optional[int] = None
+    ):
+        """
+        Initialize the job manager.
+
+        Args:
+            max_workers: Number of concurrent workers (defaults to MAX_CONCURRENT_TRANSCRIPTIONS)
+            max_queue_size: Maximum number of waiting jobs (defaults to MAX_QUEUED_TRANSCRIPTIONS)
+            job_ttl: Seconds finished jobs are kept (defaults to TRANSCRIPTION_JOB_TTL)
+        """
+        self.max_workers = max(1, max_workers or settings.MAX_CONCURRENT_TRANSCRIPTIONS)
+        self.max_queue_size = max_queue_size or settings.MAX_QUEUED_TRANSCRIPTIONS
+        self.job_ttl = job_ttl if job_ttl is not None else settings.TRANSCRIPTION_JOB_TTL
+        self.jobs: Dict[str, TranscriptionJob] = {}
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: list = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def start(self) -> None:
+        """Start the worker pool on the running event loop if it is not already running there"""
+        loop = asyncio.get_running_loop()
+        if self._loop is loop and self._workers:
+            return
+
+        # Jobs queued on a previous (closed) event loop can never run; fail them
+        for job in self.jobs.values():
+            if not job.is_finished:
+                self._finish(job, TranscriptionStatus.FAILED, "Transcription job was interrupted", "Worker stopped")
+
+        self._loop = loop
+        self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+        self._workers = [
+            loop.create_task(self._worker(index, self._queue), name=f"transcription-worker-{index}")
+            for index in range(self.max_workers)
+        ]
+        logger.info(f"Started {self.max_workers} transcription worker(s)")
+
+    async def stop(self) -> None:
+        """Cancel the worker pool"""
+        workers, self._workers = self._workers, []
+        for worker in workers:
+            worker.cancel()
+        if workers:
+            await asyncio.gather(*workers, return_exceptions=True)
+            logger.info("Transcription workers stopped")
+
+    def submit(self, handler: JobHandler, video_name: Optional[str] = None, job_id: Optional[str] = None) -> TranscriptionJob:
+        """
+        Queue a transcription job.
+
+        Args:
+            handler: Coroutine function that processes the job
+            video_name: Name of the video being transcribed
+            job_id: Job identifier (optional, generated if not provided)
+
+        Returns:
+            The queued job
+
+        Raises:
+            JobQueueFullError: If the queue has no room for another job
+        """
+        self.start()
+        self._prune()
+
+        job = TranscriptionJob(
+            job_id=job_id or str(uuid.uuid4())[-8:],
+            video_name=video_name,
+            done=asyncio.Event()
+        )
+        try:
+            self._queue.put_nowait((job, handler))
+        except asyncio.QueueFull:
+            raise JobQueueFullError(f"Transcription queue is full ({self.max_queue_size} jobs waiting)")
+
+        self.jobs[job.job_id] = job
+        logger.debug(f"Queued transcription job {job.job_id} ({self._queue.qsize()} waiting)")
+        return job
+
+    def get(self, job_id: str) -> Optional[TranscriptionJob]:
+        """Return a job by its ID, or None if it is unknown or expired"""
+        self._prune()
+        return self.jobs.get(job_id)
+
+    async def wait(self, job: TranscriptionJob) -> TranscriptionJob:
+        """Wait until a job has finished and return it"""
+        await job.done.wait()
+        return job
+
+    @property
+    def queued(self) -> int:
+        """Number of jobs waiting for a worker"""
+        return self._queue.qsize() if self._queue is not None else 0
+
+    async def _worker(self, index: int, queue: asyncio.Queue) -> None:
+        """Process queued jobs one at a time"""
+        while True:
+            job, handler = await queue.get()
+            try:
+                job.status = TranscriptionStatus.PROCESSING
+                job.message = "Transcription in progress"
+                logger.debug(f"Worker {index} processing transcription job {job.job_id}")
+                await handler(job)
+                self._finish(job, TranscriptionStatus.COMPLETED, "Transcription completed successfully")
+            except asyncio.CancelledError:
+                self._finish(job, TranscriptionStatus.FAILED, "Transcription job was interrupted", "Worker stopped")
+                raise
+            except Exception as e:
+                logger.error(f"Transcription job {job.job_id} failed: {e}")
+                logger.debug(f"Error details: {traceback.format_exc()}")
+                self._finish(job, TranscriptionStatus.FAILED, "Transcription failed!", str(e), exception=e)
+            finally:
+                queue.task_done()
+
+    def _finish(
+        self,
+        job: TranscriptionJob,
+        status: TranscriptionStatus,
+        message: str,
+        error: Optional[str] = None,
+        exception: Optional[Exception] = None
+    ) -> None:
+        """Record the outcome of a job and wake up any waiters"""
+        job.status = status
+        job.message = message
+        job.error = error
+        job.exception = exception
+        job.finished_at = time.time()
+        job.done.set()
+        job.notify()
+
+    def _prune(self) -> None:
+        """Forget finished jobs older than the configured TTL"""
+        now = time.time()
+        expired = [
+            job_id for job_id, job in self.jobs.items()
+            if job.finished_at is not None and now - job.finished_at > self.job_ttl
+        ]
+        for job_id in expired:
+            del self.jobs[job_id]
+
+
+# Shared job manager used by the transcription API
+transcription_jobs = TranscriptionJobManager()
@@ -0,0 +1,132 @@
+# Copyright (C) 2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from audio_analyzer.core.settings import settings
+from audio_analyzer.utils.logger import logger
+
+
+@dataclass
+class PooledModel:
+    """A loaded model kept resident in the pool along with its usage lock."""
+    key: Hashable
+    model: Any
+    # Serializes inference on this model instance; whisper.cpp and OpenVINO
+    # pipelines are not safe for concurrent calls on the same instance.
+    lock: threading.Lock = field(default_factory=threading.Lock)
+    loaded_at: float = field(default_factory=time.time)
+    last_used: float = field(default_factory=time.time)
+
+
+class ModelPool:
+    """
+    Process-wide pool of loaded transcription models.
+
+    Models are keyed by (model name, device, backend) so that every request for the
+    same combination reuses one warm instance instead of reloading and recompiling it.
+    Chunk worker replicas add the worker index to the key and are shared by the jobs
+    using the same model. The pool is bounded; when it is full the least recently used
+    idle model is evicted.
+    """
+
+    def __init__(self, max_models: Optional[int] = None):
+        """
+        Initialize the model pool.
+
+        Args:
+            max_models: Maximum number of resident models (defaults to MAX_RESIDENT_MODELS setting,
+                or to one replica per chunk worker for each enabled model when it is not set)
+        """
+        self._max_models = max_models
+        self._models: "OrderedDict[Hashable, PooledModel]" = OrderedDict()
+        self._pool_lock = threading.Lock()
+        self._load_locks: Dict[Hashable, threading.Lock] = {}
+
+    @property
+    def max_models(self) -> int:
+        """Maximum number of models kept resident at the same time"""
+        max_models = self._max_models or settings.MAX_RESIDENT_MODELS
+        if not max_models:
+            enabled_models = len(settings.ENABLED_WHISPER_MODELS or [])
+            max_models = settings.TRANSCRIPTION_CHUNK_WORKERS * max(1, enabled_models)
+        return max(1, max_models)
+
+    def get(self, key: Hashable, loader: Callable[[], Any]) -> PooledModel:
+        """
+        Return the resident model for a key, loading it with `loader` on first use.
+
+        Concurrent callers asking for the same key wait for a single load instead of
+        loading the model several times.
+
+        Args:
+            key: Pool key, typically (model name, device, backend)
+            loader: Callable returning a freshly loaded model
+
+        Returns:
+            The pooled model entry
+        """
+        with self._pool_lock:
+            entry = self._touch(key)
+            if entry is not None:
+                return entry
+            load_lock = self._load_locks.setdefault(key, threading.Lock())
+
+        with load_lock:
+            with self._pool_lock:
+                entry = self._touch(key)
+                if entry is not None:
+                    return entry
+
+            start_time = time.time()
+            model = loader()
+            logger.info(f"Model {key} loaded into pool in {time.time() - start_time:.2f} seconds")
+
+            with self._pool_lock:
+                entry = PooledModel(key=key, model=model)
+                self._models[key] = entry
+                self._load_locks.pop(key, None)
+                self._evict()
+                return entry
+
+    def _touch(self, key: Hashable) -> Optional[PooledModel]:
+        """Mark a resident model as most recently used. Caller must hold the pool lock."""
+        entry = self._models.get(key)
+        if entry is not None:
+            entry.last_used = time.time()
+            self._models.move_to_end(key)
+        return entry
+
+    def _evict(self) -> None:
+        """Drop least recently used idle models above the pool limit. Caller must hold the pool lock."""
+        for key in list(self._models):
+            if len(self._models) <= self.max_models:
+                break
+            entry = self._models[key]
+            if entry.lock.locked():
+                continue  # Model is in use by a running transcription
+            del self._models[key]
+            logger.info(f"Evicted model {key} from pool")
+
+    def contains(self, key: Hashable) -> bool:
+        """Check whether a model is resident in the pool"""
+        with self._pool_lock:
+            return key in self._models
+
+    def clear(self) -> None:
+        """Release all resident models"""
+        with self._pool_lock:
+            self._models.clear()
+            self._load_locks.clear()
+
+    def __len__(self) -> int:
+        with self._pool_lock:
+            return len(self._models)
+
+
+# Shared pool used by every TranscriptionService in this process
+model_pool = ModelPool()
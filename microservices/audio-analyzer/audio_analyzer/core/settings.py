@@ -44,6 +44,8 @@ class Settings(BaseSettings):
     MINIO_ACCESS_KEY: str = ""
     MINIO_SECRET_KEY: str = ""
     MINIO_SECURE: bool = False
+    MINIO_STREAM_VIDEOS: bool = True  # Decode videos directly from MinIO instead of downloading them first
+    MINIO_PRESIGNED_URL_EXPIRY: int = 6 * 60 * 60  # Seconds a presigned video URL stays valid (covers queue wait)
     
     # Whisper model download configuration
     ENABLED_WHISPER_MODELS: Optional[List[WhisperModel]] = None # List of whisper model variants to be downloaded
@@ -57,14 +59,32 @@ class Settings(BaseSettings):
     # Device configuration
     DEFAULT_DEVICE: DeviceType = DeviceType.CPU  # Default compute device to use for transcription
     USE_FP16: bool = True  # Use 16-bit precision for GPU
-    
+
+    # Transcription worker configuration
+    MAX_CONCURRENT_TRANSCRIPTIONS: int = 2  # Number of transcription jobs processed in parallel
+    MAX_QUEUED_TRANSCRIPTIONS: int = 100  # Jobs waiting for a worker; new jobs are rejected when full
+    TRANSCRIPTION_JOB_TTL: int = 3600  # Seconds a finished job's status is kept for polling
+    # Loaded model instances (including chunk worker replicas) kept warm in memory; by default one per
+    # chunk worker for each enabled model, so jobs using different models do not evict each other's replicas
+    MAX_RESIDENT_MODELS: Optional[int] = None
+    PRELOAD_DEFAULT_MODEL: bool = True  # Load the default model on the default device at startup
+
+    # Chunked transcription configuration
+    TRANSCRIPTION_CHUNK_SECONDS: int = 30  # Maximum duration of the audio chunks cut at pauses in speech
+    TRANSCRIPTION_CHUNK_WORKERS: int = 2  # Chunks of one job transcribed in parallel, each on its own model replica shared by all jobs
+    VAD_MIN_SILENCE_MS: int = 300  # Minimum pause length used as a chunk boundary
+    VAD_ENERGY_THRESHOLD_DB: float = -50.0  # Frames quieter than this are always treated as silence
+    VAD_NOISE_MARGIN_DB: float = 10.0  # Frames within this margin above the noise floor are treated as silence
+
     # Audio configuration
     AUDIO_SAMPLE_RATE: int = 16000
     AUDIO_BIT_DEPTH: int = 16
     AUDIO_CHANNELS: int = 1
+    AUDIO_CHUNK_SECONDS: int = 30  # Duration of PCM chunks streamed from the audio decoder
     
     # Uploaded video file size limits (in bytes)
     MAX_FILE_SIZE: int = 300 * 1024 * 1024  # 300MB by default
+    UPLOAD_CHUNK_SIZE: int = 1024 * 1024  # Uploaded files are written to disk in chunks of this size
     
     model_config = SettingsConfigDict(
         case_sensitive=True,
@@ -1,26 +1,43 @@
 # Copyright (C) 2025 Intel Corporation
 # SPDX-License-Identifier: Apache-2.0
 
+import asyncio
 import importlib.util
 import multiprocessing
 import math
 import traceback
 import time
 import uuid
+from contextlib import nullcontext
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import Any, AsyncIterator, Callable, List, Optional, Tuple
 
+import numpy as np
+
+from audio_analyzer.core.model_pool import PooledModel, model_pool
 from audio_analyzer.core.settings import settings
+from audio_analyzer.schemas.transcription import TranscriptSegment
 from audio_analyzer.schemas.types import DeviceType, WhisperModel, TranscriptionBackend
 from audio_analyzer.utils.hardware_utils import is_intel_gpu_available
 from audio_analyzer.utils.logger import logger
 from audio_analyzer.utils.model_manager import ModelManager
+from audio_analyzer.utils.transcription_utils import write_srt
+from audio_analyzer.utils.vad import AudioChunk, split_on_silence
+
+# Callback receiving transcript segments as soon as they are available
+SegmentCallback = Callable[[List[TranscriptSegment]], None]
 
 class TranscriptionService:
     """
     Service for transcribing audio using Whisper models.
     
     Supports both whispercpp (for CPU) and OpenVINO-Genai based inferences (for GPU).
+    Loaded models are shared through the process-wide model pool, so creating a
+    service is cheap and only the first request for a model pays the load cost.
+    
+    In-memory audio is transcribed by the chunked engine: the audio is cut at pauses
+    in speech, chunks are transcribed in parallel on several model replicas and the
+    segments are stitched back together with timestamps relative to the full audio.
     """
 
     # Experimental optimal thread discount factor for each model type. 
@@ -53,6 +70,7 @@ class TranscriptionService:
         """
         logger.debug("Initializing TranscriptionService")
         self.model = None
+        self._model_lock = None
         self.model_name = WhisperModel(model_name.lower()) if model_name else settings.DEFAULT_WHISPER_MODEL
         self.device_type = DeviceType(device.lower()) if device else settings.DEFAULT_DEVICE
         logger.debug(f"Using model: {self.model_name.value} on device: {self.device_type.value}")
@@ -97,14 +115,57 @@ class TranscriptionService:
             logger.warning("No compatible GPU detected or required model not available, falling back to Whisper.cpp backend on CPU")
             return TranscriptionBackend.WHISPER_CPP
 
+    @property
+    def pool_key(self) -> Tuple[WhisperModel, DeviceType, TranscriptionBackend]:
+        """
+        Key of this service's model in the model pool.
+
+        The device is the one actually used by the backend, so 'auto' and an explicit
+        device share the same resident model when they resolve to the same backend.
+        """
+        device = DeviceType.CPU if self.backend == TranscriptionBackend.WHISPER_CPP else DeviceType.GPU
+        return (self.model_name, device, self.backend)
+
     def _load_model(self):
         """
-        Load the appropriate Whisper model based on the backend.
+        Get the appropriate Whisper model from the model pool, loading it if it is not resident.
         """
         if self.model is not None:
             logger.debug("Model already loaded, skipping initialization")
             return
-            
+
+        pooled = model_pool.get(self.pool_key, self._create_model)
+        self.model = pooled.model
+        self._model_lock = pooled.lock
+
+    def _optimal_thread_count(self) -> int:
+        """
+        Number of CPU threads used by a whispercpp model instance.
+        """
+        # set the number of threads by multiplying the core count with the optimal thread discount factor
+        thread_discount_factor: float = self.OPTIMAL_THREAD_DISCOUNT_FACTOR.get(self.model_name, 1.0)
+        thread_count: int = math.ceil(self.num_cores * thread_discount_factor)
+
+        # set number of threads to be at least 1; Max value: thread count or number of cores - 1, whichever is smaller
+        return min(max(1, self.num_cores-1), max(thread_count, self.DEFAULT_N_THREADS))
+
+    def _get_replica(self, index: int) -> PooledModel:
+        """
+        Get a model replica used by a chunk worker from the model pool.
+        
+        Replica 0 is the model used for whole-file transcription, so chunked and
+        whole-file requests share it; further replicas are loaded on first use.
+        """
+        key = self.pool_key if index == 0 else self.pool_key + (index,)
+        return model_pool.get(key, self._create_model)
+
+    def _create_model(self) -> Any:
+        """
+        Load the appropriate Whisper model based on the backend.
+
+        Returns:
+            The whispercpp model or a dict of compiled OpenVINO model components
+        """
         logger.info(f"Loading model: {self.model_name.value} using backend: {self.backend}")
         try:
             if self.backend == TranscriptionBackend.WHISPER_CPP:
@@ -117,16 +178,12 @@ class TranscriptionService:
                 if not model_path.is_file():
                     raise FileNotFoundError(f"GGML model file not found at {model_path}")
                 
-                # set the number of threads by multiplying the core count with the optimal thread discount factor
-                thread_discount_factor: float = self.OPTIMAL_THREAD_DISCOUNT_FACTOR.get(self.model_name, 1.0)
-                thread_count: int = math.ceil(self.num_cores * thread_discount_factor)
-
-                # set number of threads to be at least 1; Max value: thread count or number of cores - 1, whichever is smaller
-                n_threads: int = min(max(1, self.num_cores-1), max(thread_count, self.DEFAULT_N_THREADS))
+                n_threads = self._optimal_thread_count()
                 logger.debug(f"Using {n_threads} threads for CPU inference based on model size and core count: {self.model_name.value}")
 
-                self.model = Model(str(model_path), n_threads=n_threads)
+                model = Model(str(model_path), n_threads=n_threads)
                 logger.info("whispercpp model loaded successfully")
+                return model
             else: 
                 logger.debug("Initializing OpenVINO Whisper model")
                 import openvino as ov
@@ -159,59 +216,104 @@ class TranscriptionService:
             
                 processor = AutoProcessor.from_pretrained(str(model_path))
                 
-                self.model = {
+                model = {
                     "encoder": encoder_compiled,
                     "decoder": decoder_compiled,
                     "processor": processor
                 }
                 
                 logger.info("OpenVINO Whisper model loaded successfully")
+                return model
         except Exception as e:
             logger.error(f"Error loading model: {e}")
             logger.debug(f"Error details: {traceback.format_exc()}")
             raise RuntimeError(f"Failed to load transcription model: {e}")
 
+    async def _run_inference(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Run a blocking inference call in a worker thread, keeping the event loop free.
+
+        The call holds the pooled model's lock, so concurrent jobs on the same
+        model are serialized while jobs on different models run in parallel.
+        """
+        lock = self._model_lock or nullcontext()
+
+        def _call():
+            with lock:
+                return func(*args, **kwargs)
+
+        return await asyncio.to_thread(_call)
+
+    @staticmethod
+    async def _run_on_replica(replica: PooledModel, func: Callable[..., Any], *args) -> Any:
+        """Run a blocking call on a model replica in a worker thread, holding the replica's lock."""
+        def _call():
+            with replica.lock:
+                return func(replica.model, *args)
+
+        return await asyncio.to_thread(_call)
+
     async def transcribe(
         self, 
-        audio_path: Path, 
+        audio_path: Path | np.ndarray, 
         language: Optional[str] = None,
         include_timestamps: bool = True,
-        video_duration: Optional[float] = None
+        video_duration: Optional[float] = None,
+        job_id: Optional[str] = None,
+        output_name: Optional[str] = None,
+        segment_callback: Optional[SegmentCallback] = None
     ) -> Tuple[str, Path]:
         """
         Transcribe audio using the selected backend.
         
         Args:
-            audio_path: Path to the audio file
+            audio_path: Path to the audio file, or mono float32 PCM samples at the configured sample rate
             language: Language code for transcription (optional)
             include_timestamps: Whether to include timestamps in the output
             video_duration: Duration of the video in seconds (optional)
+            job_id: Identifier used for the output files (optional, generated if not provided)
+            output_name: Base name of the output files (optional, defaults to the audio file name)
+            segment_callback: Called with the segments of each chunk as soon as they are transcribed
+                (optional, only used for in-memory samples)
             
         Returns:
             Tuple containing the job ID and path to the transcription file
         """
-        logger.info(f"Starting transcription for audio: {audio_path}")
+        is_samples = isinstance(audio_path, np.ndarray)
+        logger.info(f"Starting transcription for audio: "
+                    f"{f'{len(audio_path)} in-memory samples' if is_samples else audio_path}")
         logger.debug(f"Transcription parameters - language: {language}, include_timestamps: {include_timestamps}, video_duration: {video_duration}")
         
         try:
-            self._load_model()
+            # Model loading may compile models on first use; keep it off the event loop
+            await asyncio.to_thread(self._load_model)
             
-            job_id = str(uuid.uuid4())[-8:]
+            job_id = job_id or str(uuid.uuid4())[-8:]
             logger.debug(f"Generated job ID: {job_id}")
             
             output_dir = Path(settings.OUTPUT_DIR / "transcript")
             output_dir.mkdir(parents=True, exist_ok=True)
             
             # Extract audio file name without extension
-            audio_filename = audio_path.stem
+            audio_filename = output_name or ("audio" if is_samples else audio_path.stem)
             
             # Define output paths with audio filename directly concatenated with job_id
             srt_path = output_dir / f"{audio_filename}-{job_id}.srt"
             txt_path = output_dir / f"{audio_filename}-{job_id}.txt"
             logger.debug(f"Output paths - SRT: {srt_path}, TXT: {txt_path}")
             
-            # Choose the appropriate transcription method based on backend
-            if self.backend == TranscriptionBackend.WHISPER_CPP:
+            # Choose the appropriate transcription method based on input and backend
+            if is_samples:
+                logger.info(f"Using chunked transcription on {self.backend.value} backend")
+                await self._transcribe_chunked(
+                    audio_path,
+                    srt_path,
+                    txt_path,
+                    language,
+                    include_timestamps,
+                    segment_callback
+                )
+            elif self.backend == TranscriptionBackend.WHISPER_CPP:
                 logger.info("Using whispercpp backend for transcription")
                 await self._transcribe_with_whisper_cpp(
                     audio_path, 
@@ -241,9 +343,173 @@ class TranscriptionService:
             logger.debug(f"Error details: {traceback.format_exc()}")
             raise RuntimeError(f"Transcription failed: {e}")
     
+    async def _transcribe_chunked(
+        self,
+        samples: np.ndarray,
+        srt_path: Path,
+        txt_path: Path,
+        language: Optional[str],
+        include_timestamps: bool,
+        segment_callback: Optional[SegmentCallback] = None
+    ) -> None:
+        """
+        Transcribe in-memory samples with the chunked engine and write the stitched output files.
+        
+        Args:
+            samples: Mono float32 PCM samples at the configured sample rate
+            srt_path: Output path for SRT file
+            txt_path: Output path for text file
+            language: Language code
+            include_timestamps: Whether to include timestamps
+            segment_callback: Called with the segments of each chunk in order as they become available
+        """
+        start_time = time.time()
+        segments: List[TranscriptSegment] = []
+        async for chunk_segments in self.stream_segments(samples, language):
+            segments.extend(chunk_segments)
+            if segment_callback is not None:
+                segment_callback(chunk_segments)
+
+        with open(txt_path, "w", encoding="utf-8") as txt_file:
+            txt_file.writelines(f"{segment.text}\n" for segment in segments)
+        logger.debug(f"Text file written to: {txt_path}")
+
+        if include_timestamps:
+            write_srt(segments, srt_path)
+            logger.debug(f"SRT file written to: {srt_path}")
+
+        elapsed_time = time.time() - start_time
+        audio_seconds = len(samples) / settings.AUDIO_SAMPLE_RATE
+        logger.debug(f"Chunked transcription of {audio_seconds:.2f}s of audio completed in {elapsed_time:.2f} seconds")
+
+    async def stream_segments(
+        self,
+        samples: np.ndarray,
+        language: Optional[str] = None
+    ) -> AsyncIterator[List[TranscriptSegment]]:
+        """
+        Transcribe in-memory samples chunk by chunk on a pool of chunk workers.
+        
+        The audio is cut at pauses in speech and the chunks are distributed over up to
+        TRANSCRIPTION_CHUNK_WORKERS workers, each using its own pooled model replica.
+        Segments are yielded in audio order as soon as all earlier chunks are done,
+        with timestamps relative to the start of the full audio.
+        
+        Args:
+            samples: Mono float32 PCM samples at the configured sample rate
+            language: Language code (optional)
+            
+        Yields:
+            The segments of each chunk, in order
+        """
+        chunks = split_on_silence(samples, settings.AUDIO_SAMPLE_RATE)
+        if not chunks:
+            logger.info("No speech detected in audio")
+            return
+
+        loop = asyncio.get_running_loop()
+        results = [loop.create_future() for _ in chunks]
+        pending = list(reversed(chunks))
+        n_workers = max(1, min(settings.TRANSCRIPTION_CHUNK_WORKERS, len(chunks)))
+        lang_code = language or settings.TRANSCRIPT_LANGUAGE
+        logger.debug(f"Transcribing {len(chunks)} chunk(s) with {n_workers} worker(s)")
+
+        async def worker(index: int) -> None:
+            replica = None
+            while pending:
+                chunk = pending.pop()
+                try:
+                    if replica is None:
+                        replica = await asyncio.to_thread(self._get_replica, index)
+                    segments = await self._run_on_replica(
+                        replica,
+                        self._transcribe_chunk,
+                        samples[chunk.start:chunk.end],
+                        chunk,
+                        lang_code,
+                        n_workers
+                    )
+                    results[chunk.index].set_result(segments)
+                except Exception as e:
+                    results[chunk.index].set_exception(e)
+                    return
+
+        workers = [asyncio.create_task(worker(index)) for index in range(n_workers)]
+        try:
+            for result in results:
+                yield await result
+        finally:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            # Retrieve exceptions of chunks that were not consumed to avoid "never retrieved" warnings
+            for result in results:
+                if result.done() and not result.cancelled():
+                    result.exception()
+
+    def _transcribe_chunk(
+        self,
+        model: Any,
+        audio: np.ndarray,
+        chunk: AudioChunk,
+        language: Optional[str],
+        n_workers: int
+    ) -> List[TranscriptSegment]:
+        """
+        Transcribe one chunk on a model replica. Runs in a worker thread.
+        
+        Args:
+            model: Model replica (whispercpp model or OpenVINO model components)
+            audio: Samples of the chunk
+            chunk: Position of the chunk in the full audio
+            language: Language code
+            n_workers: Number of chunk workers sharing the CPU
+            
+        Returns:
+            Segments with timestamps relative to the start of the full audio
+        """
+        offset = chunk.start_time
+        if self.backend == TranscriptionBackend.WHISPER_CPP:
+            params = {
+                # Share the cores between the chunk workers instead of oversubscribing them
+                "n_threads": max(1, self._optimal_thread_count() // n_workers),
+                "beam_search": {"beam_size": 5, "patience": 1.5},
+                "greedy": {"best_of": 1},
+            }
+            if language:
+                params["language"] = language
+            segments = model.transcribe(audio, **params)
+            # whisper.cpp timestamps are in units of 10 ms
+            return [
+                TranscriptSegment(start=offset + segment.t0 / 100, end=offset + segment.t1 / 100, text=segment.text.strip())
+                for segment in segments if segment.text.strip()
+            ]
+
+        result = self._openvino_pipeline(model)(audio, language=language, return_timestamps=True)
+        return [
+            TranscriptSegment(start=offset + start, end=offset + end, text=text)
+            for start, end, text in self._openvino_segments(result, chunk.duration)
+        ]
+
+    @staticmethod
+    def _openvino_segments(result: Any, duration: float) -> List[Tuple[float, float, str]]:
+        """Extract (start, end, text) tuples in seconds from a WhisperPipeline result"""
+        if isinstance(result, dict):
+            segments = [
+                (segment.get("start", 0), segment.get("end", segment.get("start", 0) + 1), segment.get("text", ""))
+                for segment in result.get("segments", [])
+            ]
+            if not segments and result.get("text"):
+                segments = [(0.0, duration, result["text"])]
+        else:
+            segments = [(chunk.start_ts, chunk.end_ts, chunk.text) for chunk in (getattr(result, "chunks", None) or [])]
+            if not segments and getattr(result, "texts", None):
+                segments = [(0.0, duration, result.texts[0])]
+        return [(start, end, text.strip()) for start, end, text in segments if text.strip()]
+
     async def _transcribe_with_whisper_cpp(
         self,
-        audio_path: Path,
+        audio_path: Path | np.ndarray,
         srt_path: Path,
         txt_path: Path,
         language: Optional[str],
@@ -254,7 +520,7 @@ class TranscriptionService:
         Transcribe using whisper.cpp backend with pywhispercpp package.
         
         Args:
-            audio_path: Path to the audio file
+            audio_path: Path to the audio file or float32 PCM samples
             srt_path: Output path for SRT file
             txt_path: Output path for text file
             language: Language code
@@ -290,8 +556,11 @@ class TranscriptionService:
             # perform transcription
             logger.debug(f"Starting whispercpp transcription with {n_processors} processors")
             start_time = time.time()
-            segments = self.model.transcribe(
-                str(audio_path),
+            # pywhispercpp accepts either a media file path or float32 samples at 16 kHz
+            media = audio_path if isinstance(audio_path, np.ndarray) else str(audio_path)
+            segments = await self._run_inference(
+                self.model.transcribe,
+                media,
                 n_processors=n_processors,
                 **params
             )
@@ -314,7 +583,7 @@ class TranscriptionService:
 
     async def _transcribe_with_openvino(
         self,
-        audio_path: Path,
+        audio_path: Path | np.ndarray,
         srt_path: Path,
         txt_path: Path,
         language: Optional[str],
@@ -324,7 +593,7 @@ class TranscriptionService:
         Transcribe using OpenVINO backend with WhisperPipeline from openvino-genai package.
         
         Args:
-            audio_path: Path to the audio file
+            audio_path: Path to the audio file or float32 PCM samples
             srt_path: Output path for SRT file
             txt_path: Output path for text file
             language: Language code
@@ -333,22 +602,14 @@ class TranscriptionService:
         
         try:
             start_time = time.time()
-            from openvino_genai import WhisperPipeline
-            
-            # Initialize the WhisperPipeline with pre-loaded model components
-            logger.debug("Initializing OpenVINO-Genai WhisperPipeline with pre-loaded model components")
-            pipeline = WhisperPipeline(
-                encoder=self.model["encoder"],
-                decoder=self.model["decoder"],
-                processor=self.model["processor"]
-            )
             
             # Perform transcription
             logger.debug(f"Starting transcription of {audio_path}")
-            result = pipeline(
-                str(audio_path),
-                language=language or settings.TRANSCRIPT_LANGUAGE,
-                return_timestamps=include_timestamps
+            result = await self._run_inference(
+                self._run_openvino_pipeline,
+                audio_path if isinstance(audio_path, np.ndarray) else str(audio_path),
+                language or settings.TRANSCRIPT_LANGUAGE,
+                include_timestamps
             )
             
             full_text = result.get("text", "")
@@ -358,28 +619,11 @@ class TranscriptionService:
             
             # If timestamps are required, generate SRT file
             if include_timestamps:
-                from pywhispercpp.utils import to_timestamp
-                
-                # Get segments with timestamps
-                segments = result.get("segments", [])
-                
-                # Generate SRT content
-                srt_content = ""
-                for i, segment in enumerate(segments, 1):
-                    start_time = segment.get("start", 0)
-                    end_time = segment.get("end", start_time + 1)
-                    text = segment.get("text", "").strip()
-                    
-                    # Format timestamps to - HH:MM:SS,mmm
-                    start_formatted = to_timestamp(start_time)
-                    end_formatted = to_timestamp(end_time)
-
-                    # Create SRT entry
-                    srt_content += f"{i}\n{start_formatted} --> {end_formatted}\n{text}\n\n"
-                
-                # Write SRT file
-                with open(srt_path, "w", encoding="utf-8") as srt_file:
-                    srt_file.write(srt_content)
+                segments = [
+                    TranscriptSegment(start=start, end=end, text=text)
+                    for start, end, text in self._openvino_segments(result, 0.0)
+                ]
+                write_srt(segments, srt_path)
                 logger.debug(f"SRT file written to: {srt_path}")
                 
             elapsed_time = time.time() - start_time
@@ -388,4 +632,34 @@ class TranscriptionService:
         except Exception as e:
             logger.error(f"Error in OpenVINO transcription: {e}")
             logger.debug(f"Error details: {traceback.format_exc()}")
-            raise
\ No newline at end of file
+            raise
+
+    def _run_openvino_pipeline(self, audio: str | np.ndarray, language: Optional[str], include_timestamps: bool) -> dict:
+        """
+        Run the WhisperPipeline of the pooled OpenVINO model, creating it on first use.
+
+        The pipeline is stored with the pooled model components so that it is built
+        once per resident model rather than once per transcribed file.
+        """
+        return self._openvino_pipeline(self.model)(
+            audio,
+            language=language,
+            return_timestamps=include_timestamps
+        )
+
+    @staticmethod
+    def _openvino_pipeline(model: dict) -> Any:
+        """Return the WhisperPipeline stored with pooled OpenVINO model components, creating it on first use."""
+        pipeline = model.get("pipeline")
+        if pipeline is None:
+            from openvino_genai import WhisperPipeline
+
+            # Initialize the WhisperPipeline with pre-loaded model components
+            logger.debug("Initializing OpenVINO-Genai WhisperPipeline with pre-loaded model components")
+            pipeline = WhisperPipeline(
+                encoder=model["encoder"],
+                decoder=model["decoder"],
+                processor=model["processor"]
+            )
+            model["pipeline"] = pipeline
+        return pipeline
@@ -1,13 +1,16 @@
 # Copyright (C) 2025 Intel Corporation
 # SPDX-License-Identifier: Apache-2.0
 
+import asyncio
 import pathlib
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from audio_analyzer.api.router import api_router
+from audio_analyzer.core.job_manager import transcription_jobs
 from audio_analyzer.core.settings import settings
+from audio_analyzer.core.transcriber import TranscriptionService
 from audio_analyzer.utils.model_manager import ModelManager
 from audio_analyzer.utils.logger import logger
 
@@ -34,8 +37,19 @@ async def lifespan(app: FastAPI):
     logger.info("Starting model download for enabled models")
     await ModelManager.download_models()
     logger.info("Models download completed")
+
+    # Keep the default model resident so that the first request does not pay the load cost
+    if settings.PRELOAD_DEFAULT_MODEL and settings.DEFAULT_WHISPER_MODEL:
+        try:
+            logger.info("Preloading default model into the model pool")
+            await asyncio.to_thread(TranscriptionService()._load_model)
+        except Exception as e:
+            logger.warning(f"Failed to preload default model, it will be loaded on first use: {e}")
+
+    transcription_jobs.start()
     
     yield
+    await transcription_jobs.stop()
     logger.info("Application shutdown")
 
 
@@ -105,6 +105,25 @@ class TranscriptionResponse(BaseModel):
     }
 
 
+class TranscriptSegment(BaseModel):
+    """Schema for a transcribed segment with timestamps relative to the start of the video"""
+    start: Annotated[float, Field(description="Start time of the segment in seconds")]
+    end: Annotated[float, Field(description="End time of the segment in seconds")]
+    text: Annotated[str, Field(description="Transcribed text of the segment")]
+
+    model_config = {
+        "json_schema_extra": {
+            "examples": [
+                {
+                    "start": 62.48,
+                    "end": 65.9,
+                    "text": "Welcome everyone to the quarterly review."
+                }
+            ]
+        }
+    }
+
+
 class ErrorResponse(BaseModel):
     """Response schema for errors"""
     error_message: Annotated[str, Field(description="Human-readable error message")]
@@ -70,7 +70,6 @@ class WhisperModel(str, Enum):
 
 class TranscriptionStatus(str, Enum):
     """Enum for the status of a transcription job"""
-    #TODO Use this type in asynchronous API design,if required. Currently, only COMPLETED status is used.
     PENDING = "pending"
     PROCESSING = "processing"
     COMPLETED = "completed"
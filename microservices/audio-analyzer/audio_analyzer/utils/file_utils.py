@@ -6,6 +6,7 @@ import time
 import traceback
 from pathlib import Path
 from typing import Optional
+from urllib.parse import urlsplit
 
 import aiofiles
 from fastapi import UploadFile
@@ -14,6 +15,26 @@ from audio_analyzer.core.settings import settings
 from audio_analyzer.utils.logger import logger
 
 
+def redact_url(source: Path | str) -> str:
+    """
+    Strip the query string and fragment of a URL so that it can be logged.
+
+    Presigned MinIO URLs carry their signature in the query string, which grants access to
+    the object until it expires. Local paths are returned unchanged.
+
+    Args:
+        source: Path or URL of a media file
+
+    Returns:
+        The source without credentials
+    """
+    source = str(source)
+    parts = urlsplit(source)
+    if not parts.scheme or not parts.netloc:
+        return source
+    return parts._replace(query="", fragment="").geturl()
+
+
 async def save_upload_file(file: UploadFile, upload_dir: Optional[Path] = None) -> Path:
     """
     Save an uploaded file to disk.
@@ -49,9 +70,11 @@ async def save_upload_file(file: UploadFile, upload_dir: Optional[Path] = None)
     # Save the file
     try:
         logger.debug(f"Writing file content to: {file_path}")
+        # Copy the upload in chunks so that memory use does not grow with the file size
+        chunk_size = settings.UPLOAD_CHUNK_SIZE
         async with aiofiles.open(file_path, "wb") as f:
-            content = await file.read()
-            await f.write(content)
+            while chunk := await file.read(chunk_size):
+                await f.write(chunk)
         logger.info(f"File saved successfully: {file_path}")
         
         file_size_mb = os.path.getsize(file_path) / (1024 * 1024)
@@ -65,27 +88,29 @@ async def save_upload_file(file: UploadFile, upload_dir: Optional[Path] = None)
         raise RuntimeError(error_msg) from e
 
 
-def get_file_duration(file_path: Path) -> float:
+def get_file_duration(file_path: Path | str) -> float:
     """
     Get the duration of a media file in seconds.
     
+    Only the container header is probed; no audio or video frames are decoded.
+    
     Args:
-        file_path: Path to the media file
+        file_path: Path or URL of the media file
         
     Returns:
         Duration in seconds
     """
-    logger.debug(f"Getting duration of file: {file_path}")
+    logger.debug(f"Getting duration of file: {redact_url(file_path)}")
     
     try:
-        from moviepy import VideoFileClip
+        from moviepy.video.io.ffmpeg_reader import ffmpeg_parse_infos
         
-        with VideoFileClip(str(file_path)) as clip:
-            duration = clip.duration
-            logger.debug(f"File duration: {duration:.2f} seconds")
-            return duration
+        infos = ffmpeg_parse_infos(str(file_path), decode_file=False)
+        duration = infos.get("duration") or 0.0
+        logger.debug(f"File duration: {duration:.2f} seconds")
+        return duration
     except Exception as e:
-        logger.error(f"Error getting file duration: {e}")
+        logger.error(f"Error getting file duration: {str(e).replace(str(file_path), redact_url(file_path))}")
         logger.debug(f"Error details: {traceback.format_exc()}")
         return 0.0
 
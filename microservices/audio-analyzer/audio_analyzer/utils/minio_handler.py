@@ -2,6 +2,7 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import traceback
+from datetime import timedelta
 from pathlib import Path
 from typing import Optional, Tuple
 
@@ -72,9 +73,13 @@ class MinioHandler:
             return False
 
     @classmethod
-    async def get_video_from_minio(cls, bucket_name: str, video_id: str, video_name: str) -> Tuple[Path, Optional[str]]:
+    async def get_video_from_minio(cls, bucket_name: str, video_id: str, video_name: str) -> Tuple[Path | str, Optional[str]]:
         """
-        Retrieve a video file from MinIO and save it to the local filesystem.
+        Retrieve a video file from MinIO.
+
+        With MINIO_STREAM_VIDEOS enabled, a presigned URL of the object is returned so that
+        the audio can be decoded directly from MinIO. Otherwise the video is saved to the
+        local filesystem.
 
         Args:
             bucket_name: Name of the bucket where the video is stored
@@ -82,7 +87,7 @@ class MinioHandler:
             video_name: Name of the video file
 
         Returns:
-            Tuple[Path, Optional[str]]: Path to the downloaded file and error message if any
+            Tuple[Path | str, Optional[str]]: Path to the downloaded file (or presigned URL) and error message if any
         """
         client = cls.get_client()
         
@@ -100,6 +105,17 @@ class MinioHandler:
                 logger.error(error_msg)
                 return None, error_msg
 
+            if settings.MINIO_STREAM_VIDEOS:
+                # Fail early if the object does not exist, then hand out a URL for range reads
+                client.stat_object(bucket_name, object_name)
+                video_url = client.presigned_get_object(
+                    bucket_name,
+                    object_name,
+                    expires=timedelta(seconds=settings.MINIO_PRESIGNED_URL_EXPIRY)
+                )
+                logger.debug(f"Streaming video {object_name} directly from MinIO")
+                return video_url, None
+
             client.fget_object(bucket_name, object_name, str(local_path))
             
             logger.debug(f"Video downloaded successfully to {local_path}")
@@ -4,18 +4,18 @@
 import os
 import traceback
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import Iterable, Optional, Tuple
 
 from fastapi import HTTPException, status
 
 from audio_analyzer.core.settings import settings
-from audio_analyzer.schemas.transcription import ErrorResponse, TranscriptionFormData
-from audio_analyzer.utils.file_utils import save_upload_file
+from audio_analyzer.schemas.transcription import ErrorResponse, TranscriptionFormData, TranscriptSegment
+from audio_analyzer.utils.file_utils import redact_url, save_upload_file
 from audio_analyzer.utils.minio_handler import MinioHandler
 from audio_analyzer.utils.logger import logger
 from audio_analyzer.schemas.types import StorageBackend
 
-async def get_video_path(request: TranscriptionFormData) -> Tuple[Path, str]:
+async def get_video_path(request: TranscriptionFormData) -> Tuple[Path | str, str]:
     """
     Get the video path from either direct upload or MinIO storage.
     
@@ -23,7 +23,7 @@ async def get_video_path(request: TranscriptionFormData) -> Tuple[Path, str]:
         request: The transcription request containing either file upload or MinIO parameters
         
     Returns:
-        Tuple[Path, str]: Path to the video file and the filename
+        Tuple[Path | str, str]: Path to the video file (or a URL to stream it from) and the filename
     """
     if settings.STORAGE_BACKEND == StorageBackend.FILESYSTEM and request.file:
         logger.debug(f"Handling direct file upload: {request.file.filename}")
@@ -52,7 +52,7 @@ async def get_video_path(request: TranscriptionFormData) -> Tuple[Path, str]:
                 ).model_dump()
             )
         
-        logger.debug(f"Video retrieved successfully from MinIO: {video_path}")
+        logger.debug(f"Video retrieved successfully from MinIO: {redact_url(video_path)}")
         return video_path, request.video_name
     
     else:
@@ -118,4 +118,36 @@ def store_transcript_output(
     else:
         # Using filesystem backend
         logger.debug(f"Using filesystem storage backend, transcript at: {transcript_path}")
-        return str(transcript_path)
\ No newline at end of file
+        return str(transcript_path)
+
+
+def format_srt_timestamp(seconds: float) -> str:
+    """
+    Format a time offset as an SRT timestamp.
+    
+    Args:
+        seconds: Offset from the start of the audio in seconds
+        
+    Returns:
+        str: Timestamp in the format HH:MM:SS,mmm
+    """
+    milliseconds = max(0, round(seconds * 1000))
+    hours, milliseconds = divmod(milliseconds, 3_600_000)
+    minutes, milliseconds = divmod(milliseconds, 60_000)
+    secs, milliseconds = divmod(milliseconds, 1000)
+    return f"{hours:02d}:{minutes:02d}:{secs:02d},{milliseconds:03d}"
+
+
+def write_srt(segments: Iterable[TranscriptSegment], srt_path: Path) -> None:
+    """
+    Write transcript segments to an SRT subtitle file.
+    
+    Args:
+        segments: Segments with timestamps relative to the start of the audio, in order
+        srt_path: Output path for the SRT file
+    """
+    with open(srt_path, "w", encoding="utf-8") as srt_file:
+        for index, segment in enumerate(segments, start=1):
+            srt_file.write(f"{index}\n")
+            srt_file.write(f"{format_srt_timestamp(segment.start)} --> {format_srt_timestamp(segment.end)}\n")
+            srt_file.write(f"{segment.text}\n\n")
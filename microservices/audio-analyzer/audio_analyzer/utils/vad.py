@@ -0,0 +1,118 @@
+# Copyright (C) 2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from audio_analyzer.core.settings import settings
+from audio_analyzer.utils.logger import logger
+
+
+@dataclass(frozen=True)
+class AudioChunk:
+    """A span of audio samples selected for transcription"""
+    index: int
+    start: int  # First sample (inclusive)
+    end: int    # Last sample (exclusive)
+    sample_rate: int
+
+    @property
+    def start_time(self) -> float:
+        """Offset of the chunk in the full audio, in seconds"""
+        return self.start / self.sample_rate
+
+    @property
+    def duration(self) -> float:
+        """Duration of the chunk in seconds"""
+        return (self.end - self.start) / self.sample_rate
+
+
+def _silence_runs(silent: np.ndarray) -> List[Tuple[int, int]]:
+    """Return (start_frame, end_frame) of every run of consecutive silent frames"""
+    padded = np.concatenate(([False], silent, [False]))
+    edges = np.flatnonzero(np.diff(padded.astype(np.int8)))
+    return list(zip(edges[0::2], edges[1::2]))
+
+
+def split_on_silence(
+    samples: np.ndarray,
+    sample_rate: Optional[int] = None,
+    max_chunk_seconds: Optional[float] = None,
+    min_chunk_seconds: Optional[float] = None,
+    min_silence_ms: Optional[int] = None,
+    frame_ms: int = 30
+) -> List[AudioChunk]:
+    """
+    Split audio into chunks cut at pauses in speech, using energy-based voice activity detection.
+
+    Frames whose energy is close to the noise floor of the recording are treated as
+    silence. Each chunk is cut at the middle of the longest pause found between
+    `min_chunk_seconds` and `max_chunk_seconds` after its start, so that no word is cut
+    in half; a hard cut is made only when there is no pause in that window. Chunks that
+    contain no speech at all are dropped.
+
+    Args:
+        samples: Mono float32 PCM samples
+        sample_rate: Sample rate of the samples (defaults to AUDIO_SAMPLE_RATE setting)
+        max_chunk_seconds: Maximum chunk duration (defaults to TRANSCRIPTION_CHUNK_SECONDS setting)
+        min_chunk_seconds: Minimum duration before a chunk may be cut (defaults to a third of the maximum)
+        min_silence_ms: Minimum pause length used as a cut point (defaults to VAD_MIN_SILENCE_MS setting)
+        frame_ms: Analysis frame length in milliseconds
+
+    Returns:
+        Chunks with speech, in order
+    """
+    sample_rate = sample_rate or settings.AUDIO_SAMPLE_RATE
+    max_chunk_seconds = max_chunk_seconds or settings.TRANSCRIPTION_CHUNK_SECONDS
+    min_chunk_seconds = min_chunk_seconds or max_chunk_seconds / 3
+    min_silence_ms = min_silence_ms or settings.VAD_MIN_SILENCE_MS
+
+    frame_size = max(1, sample_rate * frame_ms // 1000)
+    n_frames = len(samples) // frame_size
+    if n_frames == 0:
+        return [AudioChunk(0, 0, len(samples), sample_rate)] if len(samples) else []
+
+    # Frame energy in dB relative to full scale
+    frames = samples[:n_frames * frame_size].reshape(n_frames, frame_size).astype(np.float32)
+    energy_db = 10 * np.log10(np.mean(frames ** 2, axis=1) + 1e-10)
+
+    # Silence is anything within a margin of the noise floor, and always anything below the absolute
+    # threshold. Recordings without enough dynamic range (e.g. continuous music) only use the latter.
+    noise_floor, loud = np.percentile(energy_db, [10, 90])
+    threshold = settings.VAD_ENERGY_THRESHOLD_DB
+    if loud - noise_floor >= 2 * settings.VAD_NOISE_MARGIN_DB:
+        threshold = max(threshold, noise_floor + settings.VAD_NOISE_MARGIN_DB)
+    silent = energy_db < threshold
+
+    min_silence_frames = max(1, min_silence_ms // frame_ms)
+    pauses = [(start, end) for start, end in _silence_runs(silent) if end - start >= min_silence_frames]
+
+    max_frames = max(1, int(max_chunk_seconds * 1000 // frame_ms))
+    min_frames = min(max_frames, max(1, int(min_chunk_seconds * 1000 // frame_ms)))
+
+    # Choose cut points frame by frame
+    cuts = [0]
+    while n_frames - cuts[-1] > max_frames:
+        chunk_start = cuts[-1]
+        window = [
+            (end - start, (start + end) // 2) for start, end in pauses
+            if chunk_start + min_frames <= (start + end) // 2 <= chunk_start + max_frames
+        ]
+        # Longest pause wins; among equally long pauses the latest one keeps chunks large
+        cuts.append(max(window)[1] if window else chunk_start + max_frames)
+    cuts.append(n_frames)
+
+    chunks = []
+    for start_frame, end_frame in zip(cuts[:-1], cuts[1:]):
+        if silent[start_frame:end_frame].all():
+            continue
+        start = start_frame * frame_size
+        # The last chunk also covers the samples left over after the last full frame
+        end = len(samples) if end_frame == n_frames else end_frame * frame_size
+        chunks.append(AudioChunk(len(chunks), start, end, sample_rate))
+
+    logger.debug(f"VAD split {len(samples) / sample_rate:.2f}s of audio into {len(chunks)} chunk(s) "
+                 f"(threshold {threshold:.1f} dB, {len(pauses)} pause(s))")
+    return chunks
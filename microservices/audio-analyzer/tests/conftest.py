@@ -9,10 +9,20 @@ import pytest
 from fastapi import UploadFile
 from fastapi.testclient import TestClient
 
+from audio_analyzer.core.model_pool import model_pool
 from audio_analyzer.main import app
 from audio_analyzer.schemas.types import DeviceType, StorageBackend, WhisperModel
 
 
+@pytest.fixture(autouse=True)
+def clear_model_pool():
+    """Fixture to make sure models loaded by one test are not reused by another"""
+
+    model_pool.clear()
+    yield
+    model_pool.clear()
+
+
 @pytest.fixture
 def test_client():
     """Fixture for creating a FastAPI TestClient"""
@@ -133,8 +143,10 @@ async def mock_transcriber(mock_settings, mock_video_file):
         mock_instance = MagicMock()
         mock_transcription_class.return_value = mock_instance
         
-        # Set up the mock to return successful transcription results
+        # Set up the mock to return successful transcription results for the queued job's ID
         transcript_path = mock_settings.OUTPUT_DIR / f"{mock_video_file.stem}.srt"
-        mock_instance.transcribe.return_value = AsyncMock(return_value=("test-job-id", transcript_path))()
+        mock_instance.transcribe = AsyncMock(
+            side_effect=lambda *args, job_id=None, **kwargs: (job_id, transcript_path)
+        )
         
         yield mock_instance
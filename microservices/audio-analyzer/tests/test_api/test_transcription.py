@@ -5,9 +5,13 @@ import os
 from pathlib import Path
 from unittest.mock import AsyncMock, MagicMock, patch
 
+import numpy as np
 import pytest
+from fastapi import HTTPException, status
 from fastapi.testclient import TestClient
 
+from audio_analyzer.core.job_manager import JobQueueFullError, TranscriptionJob, TranscriptionJobManager
+from audio_analyzer.schemas.transcription import TranscriptSegment
 from audio_analyzer.schemas.types import StorageBackend, TranscriptionStatus
 
 
@@ -15,13 +19,13 @@ from audio_analyzer.schemas.types import StorageBackend, TranscriptionStatus
 @pytest.mark.asyncio
 @patch("audio_analyzer.utils.validation.settings")
 @patch("audio_analyzer.api.endpoints.transcription.get_video_path")
-@patch("audio_analyzer.api.endpoints.transcription.AudioExtractor.extract_audio")
+@patch("audio_analyzer.api.endpoints.transcription.AudioExtractor.load_audio")
 @patch("audio_analyzer.api.endpoints.transcription.get_file_duration")
 @patch("audio_analyzer.api.endpoints.transcription.store_transcript_output")
 async def test_transcription_endpoint_with_file_upload(
     mock_store_transcript, 
     mock_get_duration, 
-    mock_extract_audio, 
+    mock_load_audio, 
     mock_get_video_path,
     mock_validator,
     test_client: TestClient,
@@ -38,7 +42,7 @@ async def test_transcription_endpoint_with_file_upload(
     # Set up mock return values
     mock_store_transcript.return_value = str(transcript_path)
     mock_get_video_path.return_value = await AsyncMock(return_value=(mock_video_file, mock_video_file.name))()
-    mock_extract_audio.return_value = await AsyncMock(return_value=mock_audio_file)()
+    mock_load_audio.return_value = await AsyncMock(return_value=np.zeros(16000, dtype=np.float32))()
     mock_get_duration.return_value = 59
     
     # Set up mock transcription service
@@ -75,19 +79,20 @@ async def test_transcription_endpoint_with_file_upload(
     
     # Verify the response structure and content
     assert data["status"] == TranscriptionStatus.COMPLETED
-    assert data["job_id"] == "test-job-id"
+    job_id = mock_transcriber.transcribe.call_args.kwargs["job_id"]
+    assert data["job_id"] == job_id
     assert data["transcript_path"] == str(transcript_path)
     assert data["video_name"] == "test_video.mp4"
     assert data["video_duration"] == 59
     
     # Verify the mocks were called with expected parameters
     mock_get_video_path.assert_called_once()
-    mock_extract_audio.assert_called_once_with(mock_video_file)
+    mock_load_audio.assert_called_once_with(mock_video_file, duration=59)
     mock_get_duration.assert_called_once_with(mock_video_file)
     mock_transcriber.transcribe.assert_called_once()
     mock_store_transcript.assert_called_once_with(
         transcript_path,
-        "test-job-id",
+        job_id,
         mock_video_file.name,
         minio_bucket="",
         video_id=""
@@ -99,13 +104,13 @@ async def test_transcription_endpoint_with_file_upload(
 @patch("audio_analyzer.utils.validation.MinioHandler.ensure_bucket_exists")
 @patch("audio_analyzer.utils.validation.settings")
 @patch("audio_analyzer.api.endpoints.transcription.get_video_path")
-@patch("audio_analyzer.api.endpoints.transcription.AudioExtractor.extract_audio")
+@patch("audio_analyzer.api.endpoints.transcription.AudioExtractor.load_audio")
 @patch("audio_analyzer.api.endpoints.transcription.get_file_duration")
 @patch("audio_analyzer.api.endpoints.transcription.store_transcript_output")
 async def test_transcription_endpoint_with_minio(
     mock_store_transcript, 
     mock_get_duration, 
-    mock_extract_audio, 
+    mock_load_audio, 
     mock_get_video_path,
     mock_validator,
     mock_bucket_validation,
@@ -131,7 +136,7 @@ async def test_transcription_endpoint_with_minio(
     mock_bucket_validation.return_value = True
     mock_store_transcript.return_value = minio_location
     mock_get_video_path.return_value = await AsyncMock(return_value=(mock_video_file, mock_video_file.name))()
-    mock_extract_audio.return_value = await AsyncMock(return_value=mock_audio_file)()
+    mock_load_audio.return_value = await AsyncMock(return_value=np.zeros(16000, dtype=np.float32))()
     mock_get_duration.return_value = 59
     
     # Set up mock transcription service
@@ -165,7 +170,8 @@ async def test_transcription_endpoint_with_minio(
     
     # Verify the response structure and content
     assert data["status"] == TranscriptionStatus.COMPLETED
-    assert data["job_id"] == "test-job-id"
+    job_id = mock_transcriber.transcribe.call_args.kwargs["job_id"]
+    assert data["job_id"] == job_id
     assert data["transcript_path"] == minio_location
     assert data["video_name"] == mock_video_file.name
     assert data["video_duration"] == 59
@@ -173,12 +179,12 @@ async def test_transcription_endpoint_with_minio(
     # Verify the mocks were called with expected parameters
     mock_bucket_validation.assert_called_once()
     mock_get_video_path.assert_called_once()
-    mock_extract_audio.assert_called_once_with(mock_video_file)
+    mock_load_audio.assert_called_once_with(mock_video_file, duration=59)
     mock_get_duration.assert_called_once_with(mock_video_file)
     mock_transcriber.transcribe.assert_called_once()
     mock_store_transcript.assert_called_once_with(
         transcript_path, 
-        "test-job-id", 
+        job_id, 
         mock_video_file.name,
         minio_bucket=minio_bucket,
         video_id=minio_video_id
@@ -206,3 +212,165 @@ def test_transcription_endpoint_validation_error(mock_validator, test_client):
     assert "detail" in data
     assert "error_message" in data["detail"]
     assert "Missing file upload" in data["detail"]["error_message"]
+
+
+@pytest.mark.api
+@patch("audio_analyzer.utils.validation.settings")
+@patch("audio_analyzer.api.endpoints.transcription.transcription_jobs")
+@patch("audio_analyzer.api.endpoints.transcription.get_video_path")
+def test_transcription_job_endpoint_queues_job(
+    mock_get_video_path,
+    mock_jobs,
+    mock_validator,
+    test_client: TestClient,
+    mock_settings,
+    mock_upload_file,
+    mock_video_file
+):
+    """Test that the asynchronous endpoint queues a job and returns without waiting for it"""
+    mock_get_video_path.return_value = (mock_video_file, mock_video_file.name)
+    mock_jobs.submit.return_value = TranscriptionJob(job_id="abcd1234", video_name=mock_video_file.name)
+
+    mock_validator.STORAGE_BACKEND = StorageBackend.FILESYSTEM
+    mock_validator.ENABLED_WHISPER_MODELS = mock_settings.ENABLED_WHISPER_MODELS
+    mock_validator.MAX_FILE_SIZE = mock_settings.MAX_FILE_SIZE
+
+    with open(mock_video_file, "rb") as f:
+        files = {"file": (mock_upload_file.filename, f.read(), mock_upload_file.content_type)}
+
+    response = test_client.post(
+        "/api/v1/transcriptions/jobs",
+        data={"model_name": "tiny.en", "device": "cpu"},
+        files=files
+    )
+
+    assert response.status_code == 202
+    data = response.json()
+    assert data["status"] == TranscriptionStatus.PENDING
+    assert data["job_id"] == "abcd1234"
+    assert data["video_name"] == mock_video_file.name
+    mock_jobs.submit.assert_called_once()
+    mock_jobs.wait.assert_not_called()
+
+
+@pytest.mark.api
+@patch("audio_analyzer.utils.validation.settings")
+@patch("audio_analyzer.api.endpoints.transcription.get_video_path")
+@patch("audio_analyzer.api.endpoints.transcription.AudioExtractor.load_audio")
+@patch("audio_analyzer.api.endpoints.transcription.get_file_duration", return_value=59)
+def test_transcription_endpoint_keeps_client_error_status(
+    mock_get_duration,
+    mock_load_audio,
+    mock_get_video_path,
+    mock_validator,
+    test_client: TestClient,
+    mock_settings,
+    mock_upload_file,
+    mock_video_file
+):
+    """Test that a client error raised by a transcription worker is returned with its status code"""
+    mock_get_video_path.return_value = (mock_video_file, mock_video_file.name)
+    mock_load_audio.side_effect = HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail={"error_message": "No audio stream found in the video file"}
+    )
+
+    mock_validator.STORAGE_BACKEND = StorageBackend.FILESYSTEM
+    mock_validator.ENABLED_WHISPER_MODELS = mock_settings.ENABLED_WHISPER_MODELS
+    mock_validator.MAX_FILE_SIZE = mock_settings.MAX_FILE_SIZE
+
+    with open(mock_video_file, "rb") as f:
+        files = {"file": (mock_upload_file.filename, f.read(), mock_upload_file.content_type)}
+
+    response = test_client.post("/api/v1/transcriptions", data={"device": "cpu"}, files=files)
+
+    assert response.status_code == 400
+    assert response.json()["detail"]["error_message"] == "No audio stream found in the video file"
+
+
+@pytest.mark.api
+@patch("audio_analyzer.utils.validation.settings")
+@patch("audio_analyzer.api.endpoints.transcription.transcription_jobs.submit")
+@patch("audio_analyzer.api.endpoints.transcription.get_video_path")
+def test_transcription_job_endpoint_queue_full(
+    mock_get_video_path,
+    mock_submit,
+    mock_validator,
+    test_client: TestClient,
+    mock_settings,
+    mock_upload_file,
+    mock_video_file
+):
+    """Test that a full transcription queue is reported as service unavailable"""
+    mock_get_video_path.return_value = (mock_video_file, mock_video_file.name)
+    mock_submit.side_effect = JobQueueFullError("Transcription queue is full")
+
+    mock_validator.STORAGE_BACKEND = StorageBackend.FILESYSTEM
+    mock_validator.ENABLED_WHISPER_MODELS = mock_settings.ENABLED_WHISPER_MODELS
+    mock_validator.MAX_FILE_SIZE = mock_settings.MAX_FILE_SIZE
+
+    with open(mock_video_file, "rb") as f:
+        files = {"file": (mock_upload_file.filename, f.read(), mock_upload_file.content_type)}
+
+    response = test_client.post("/api/v1/transcriptions/jobs", data={"device": "cpu"}, files=files)
+
+    assert response.status_code == 503
+    assert "queue is full" in response.json()["detail"]["error_message"]
+
+
+@pytest.mark.api
+def test_get_transcription_job_status(test_client: TestClient):
+    """Test polling the status of a known and an unknown transcription job"""
+    manager = TranscriptionJobManager()
+    manager.jobs["abcd1234"] = TranscriptionJob(
+        job_id="abcd1234",
+        video_name="test_video.mp4",
+        status=TranscriptionStatus.COMPLETED,
+        message="Transcription completed successfully",
+        transcript_path="/tmp/output/test_video.srt",
+        video_duration=59.0
+    )
+
+    with patch("audio_analyzer.api.endpoints.transcription.transcription_jobs", manager):
+        response = test_client.get("/api/v1/transcriptions/jobs/abcd1234")
+        missing = test_client.get("/api/v1/transcriptions/jobs/unknown")
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["status"] == TranscriptionStatus.COMPLETED
+    assert data["transcript_path"] == "/tmp/output/test_video.srt"
+    assert data["video_duration"] == 59.0
+
+    assert missing.status_code == 404
+    assert "not found" in missing.json()["detail"]["error_message"]
+
+
+@pytest.mark.unit
+def test_stream_transcription_job_events(test_client: TestClient):
+    """Test streaming the segments and final status of a transcription job as server-sent events"""
+    manager = TranscriptionJobManager()
+    job = TranscriptionJob(
+        job_id="abcd1234",
+        video_name="test_video.mp4",
+        status=TranscriptionStatus.COMPLETED,
+        message="Transcription completed successfully",
+        transcript_path="/tmp/output/test_video.srt"
+    )
+    job.add_segments([
+        TranscriptSegment(start=0.0, end=2.5, text="Hello"),
+        TranscriptSegment(start=31.0, end=33.2, text="World"),
+    ])
+    manager.jobs["abcd1234"] = job
+
+    with patch("audio_analyzer.api.endpoints.transcription.transcription_jobs", manager):
+        response = test_client.get("/api/v1/transcriptions/jobs/abcd1234/events")
+        missing = test_client.get("/api/v1/transcriptions/jobs/unknown/events")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = [event.split("\n", 1) for event in response.text.strip().split("\n\n")]
+    assert [name for name, _ in events] == ["event: segment", "event: segment", "event: status"]
+    assert '"start":31.0' in events[1][1] and '"text":"World"' in events[1][1]
+    assert '"status":"completed"' in events[2][1]
+
+    assert missing.status_code == 404
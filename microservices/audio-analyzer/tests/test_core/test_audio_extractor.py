@@ -1,207 +1,182 @@
 # Copyright (C) 2025 Intel Corporation
 # SPDX-License-Identifier: Apache-2.0
 
-from pathlib import Path
-from unittest.mock import patch, MagicMock, AsyncMock
+import asyncio
+import wave
+from unittest.mock import patch
 
+import numpy as np
 import pytest
 from fastapi import HTTPException
-from moviepy import VideoFileClip, AudioFileClip
 
 from audio_analyzer.core.audio_extractor import AudioExtractor
 
 
+class FakeFFmpegProcess:
+    """Minimal stand-in for an asyncio subprocess running FFmpeg"""
+
+    def __init__(self, stdout: bytes, returncode: int = 0, stderr: bytes = b""):
+        self.stdout = asyncio.StreamReader()
+        self.stdout.feed_data(stdout)
+        self.stdout.feed_eof()
+        self.stderr = asyncio.StreamReader()
+        self.stderr.feed_data(stderr)
+        self.stderr.feed_eof()
+        self._exit_code = returncode
+        self.returncode = None
+        self.killed = False
+
+    async def wait(self):
+        self.returncode = self._exit_code
+        return self.returncode
+
+    def kill(self):
+        self.killed = True
+        self._exit_code = -9
+
+
+def pcm_bytes(samples: int) -> bytes:
+    """Create 16-bit mono PCM bytes with a simple ramp signal"""
+    return (np.arange(samples) % 1000).astype(np.int16).tobytes()
+
+
 @pytest.mark.asyncio
 @pytest.mark.unit
-async def test_extract_audio_success(
-    mock_video_file, 
-    mock_audio_file, 
-    mock_settings
-):
-    """Test successful audio extraction from video file"""
-    
-    # Mock VideoFileClip context manager behavior
-    mock_video_clip = MagicMock(spec=VideoFileClip)
-    mock_video_clip.__enter__.return_value = mock_video_clip
-    mock_video_clip.__exit__.return_value = None
-    
-    # Set up the audio mock
-    mock_audio = MagicMock()
-    mock_audio.write_audiofile = MagicMock()
-    mock_video_clip.audio = mock_audio
-    
-    # Mock Setup for AudioFileClip context manager
-    mock_audio_clip = MagicMock(spec=AudioFileClip)
-    mock_audio_clip.__enter__.return_value = mock_audio_clip
-    mock_audio_clip.__exit__.return_value = None
-    mock_audio_clip.fps = 16000
-    mock_audio_clip.nchannels = 1
-    
-    with patch("audio_analyzer.core.audio_extractor.VideoFileClip", return_value=mock_video_clip) as mock_video_instance, \
-         patch("audio_analyzer.core.audio_extractor.AudioFileClip", return_value=mock_audio_clip) as mock_audio_instance, \
-         patch("audio_analyzer.core.audio_extractor.settings", mock_settings):
-        
-        # Call the function
-        result = await AudioExtractor.extract_audio(mock_video_file)
-        
-        # Check results
-        assert result == mock_audio_file
-        
-        mock_video_instance.assert_called_once_with(str(mock_video_file))
-        mock_audio.write_audiofile.assert_called_once_with(
-            str(mock_audio_file),
-            fps=mock_settings.AUDIO_FORMAT_PARAMS["fps"],
-            nbytes=mock_settings.AUDIO_FORMAT_PARAMS["nbytes"],
-            codec='pcm_s16le',
-            ffmpeg_params=["-ac", str(mock_settings.AUDIO_FORMAT_PARAMS["nchannels"])],
-            logger=None
-        )
-        mock_audio_instance.assert_called_once_with(str(mock_audio_file))
-        mock_video_clip.__exit__.assert_called_once()
-        mock_audio_clip.__exit__.assert_called_once()
+async def test_stream_audio_yields_fixed_size_chunks(mock_video_file, mock_settings):
+    """Test that audio is streamed as chunks of normalized float32 samples"""
+    sample_rate = mock_settings.AUDIO_FORMAT_PARAMS["fps"]
+    process = FakeFFmpegProcess(pcm_bytes(sample_rate * 5 // 2))
+
+    with patch("audio_analyzer.core.audio_extractor.settings", mock_settings), \
+         patch("audio_analyzer.core.audio_extractor.asyncio.create_subprocess_exec",
+               return_value=process) as mock_exec:
+        chunks = [chunk async for chunk in AudioExtractor.stream_audio(mock_video_file, chunk_seconds=1)]
+
+    assert [len(chunk) for chunk in chunks] == [sample_rate, sample_rate, sample_rate // 2]
+    assert all(chunk.dtype == np.float32 for chunk in chunks)
+    assert chunks[0][999] == pytest.approx(999 / 32768.0)
+
+    # Decoding goes straight to raw PCM at the configured format, without decoding video
+    command = mock_exec.call_args.args
+    assert str(mock_video_file) in command
+    assert command[command.index("-map") + 1] == "0:a:0"
+    assert command[command.index("-ar") + 1] == str(sample_rate)
+    assert command[command.index("-ac") + 1] == "1"
+    assert command[-1] == "pipe:1"
 
 
 @pytest.mark.asyncio
 @pytest.mark.unit
-async def test_extract_audio_nonexisting_custom_output_path(mock_settings, temp_test_dir):
-    """Test audio extraction with custom output path which does not exist"""
-
-    # Create custom mock paths 
-    video_path = temp_test_dir / "test_video.mp4"
-    custom_output_path = temp_test_dir / "custom_output.wav" # Does not exist
-    
-    # Mock VideoFileClip context manager behavior
-    mock_video_clip = MagicMock(spec=VideoFileClip)
-    mock_video_clip.__enter__.return_value = mock_video_clip
-    mock_video_clip.__exit__.return_value = None
-
-    # Setup mocking for VideoFileClip's audio attribute
-    mock_audio = MagicMock()
-    mock_audio.write_audiofile = MagicMock()
-    mock_video_clip.audio = mock_audio
-    
-    # Mock AudioFileClip context manager
-    mock_audio_clip = MagicMock(spec=AudioFileClip)
-    mock_audio_clip.__enter__.return_value = mock_audio_clip
-    mock_audio_clip.__exit__.return_value = None
-    
-    with patch("audio_analyzer.core.audio_extractor.VideoFileClip", return_value=mock_video_clip) as mock_video_instance, \
-         patch("audio_analyzer.core.audio_extractor.AudioFileClip", return_value=mock_audio_clip) as mock_audio_instance, \
-         patch("audio_analyzer.core.audio_extractor.settings", mock_settings):
-        
-        # Call the function with custom output path
-        result = await AudioExtractor.extract_audio(video_path, custom_output_path)
-        
-        # Check results
-        assert result == custom_output_path
-        
-        mock_video_instance.assert_called_once_with(str(video_path))
-        mock_audio.write_audiofile.assert_called_once_with(
-            str(custom_output_path),
-            fps=mock_settings.AUDIO_FORMAT_PARAMS["fps"],
-            nbytes=mock_settings.AUDIO_FORMAT_PARAMS["nbytes"],
-            codec='pcm_s16le',
-            ffmpeg_params=["-ac", str(mock_settings.AUDIO_FORMAT_PARAMS["nchannels"])],
-            logger=None
-        )
-        mock_audio_instance.assert_not_called()
-        mock_video_clip.__exit__.assert_called_once()
-        mock_audio_clip.__exit__.assert_not_called()
+async def test_load_audio_concatenates_chunks(mock_video_file, mock_settings):
+    """Test that load_audio returns the complete audio without writing files"""
+    process = FakeFFmpegProcess(pcm_bytes(40000))
 
+    with patch("audio_analyzer.core.audio_extractor.settings", mock_settings), \
+         patch("audio_analyzer.core.audio_extractor.asyncio.create_subprocess_exec", return_value=process):
+        audio = await AudioExtractor.load_audio(mock_video_file)
+
+    assert audio.shape == (40000,)
+    assert not any(mock_settings.AUDIO_DIR.iterdir())
 
 
 @pytest.mark.asyncio
 @pytest.mark.unit
-async def test_extract_audio_custom_output_path(temp_test_dir, mock_settings):
-    """Test successful audio extraction using a custom output path which exists"""
-
-    # Create custom mock paths 
-    video_path = temp_test_dir / "test_video.mp4"
-    custom_output_path = temp_test_dir / "custom_output.wav"
-    
-    # Mock VideoFileClip context manager behavior
-    mock_video_clip = MagicMock(spec=VideoFileClip)
-    mock_video_clip.__enter__.return_value = mock_video_clip
-    mock_video_clip.__exit__.return_value = None
-    
-    # Set up the audio mock
-    mock_audio = MagicMock()
-    mock_audio.write_audiofile = MagicMock()
-    mock_video_clip.audio = mock_audio
-    
-    # Mock Setup for AudioFileClip context manager
-    mock_audio_clip = MagicMock(spec=AudioFileClip)
-    mock_audio_clip.__enter__.return_value = mock_audio_clip
-    mock_audio_clip.__exit__.return_value = None
-    mock_audio_clip.fps = 16000
-    mock_audio_clip.nchannels = 1
-    
-    with patch("audio_analyzer.core.audio_extractor.VideoFileClip", return_value=mock_video_clip) as mock_video_instance, \
-         patch("audio_analyzer.core.audio_extractor.AudioFileClip", return_value=mock_audio_clip) as mock_audio_instance, \
-         patch("audio_analyzer.core.audio_extractor.Path.exists", return_value=True), \
-         patch("audio_analyzer.core.audio_extractor.settings", mock_settings):
-        
-        # Call the function with custom output path
-        result = await AudioExtractor.extract_audio(video_path, custom_output_path)
-        
-        # Check results
-        assert result == custom_output_path
-        
-        mock_video_instance.assert_called_once_with(str(video_path))
-        mock_audio.write_audiofile.assert_called_once_with(
-            str(custom_output_path),
-            fps=mock_settings.AUDIO_FORMAT_PARAMS["fps"],
-            nbytes=mock_settings.AUDIO_FORMAT_PARAMS["nbytes"],
-            codec='pcm_s16le',
-            ffmpeg_params=["-ac", str(mock_settings.AUDIO_FORMAT_PARAMS["nchannels"])],
-            logger=None
-        )
-        mock_audio_instance.assert_called_once_with(str(custom_output_path))
-        mock_video_clip.__exit__.assert_called_once()
-        mock_audio_clip.__exit__.assert_called_once()
+@pytest.mark.parametrize("duration", [None, 1.0, 5.0])
+async def test_load_audio_fills_buffer_sized_from_duration(mock_video_file, mock_settings, duration):
+    """Test that load_audio returns all samples whether the expected duration is unknown, short or long"""
+    process = FakeFFmpegProcess(pcm_bytes(40000))
+
+    with patch("audio_analyzer.core.audio_extractor.settings", mock_settings), \
+         patch("audio_analyzer.core.audio_extractor.asyncio.create_subprocess_exec", return_value=process):
+        audio = await AudioExtractor.load_audio(mock_video_file, duration=duration)
 
+    assert audio.shape == (40000,)
+    np.testing.assert_array_equal(audio, np.frombuffer(pcm_bytes(40000), dtype=np.int16) / 32768.0)
 
 
 @pytest.mark.asyncio
 @pytest.mark.unit
-async def test_extract_audio_no_audio_stream(mock_video_file, mock_settings):
+async def test_extract_audio_writes_wav(mock_video_file, mock_settings):
+    """Test that extract_audio streams the PCM chunks into a WAV file"""
+    process = FakeFFmpegProcess(pcm_bytes(16000))
+
+    with patch("audio_analyzer.core.audio_extractor.settings", mock_settings), \
+         patch("audio_analyzer.core.audio_extractor.asyncio.create_subprocess_exec", return_value=process):
+        result = await AudioExtractor.extract_audio(mock_video_file)
+
+    assert result == mock_settings.AUDIO_DIR / f"{mock_video_file.stem}.wav"
+    with wave.open(str(result), "rb") as wav_file:
+        assert wav_file.getframerate() == 16000
+        assert wav_file.getnchannels() == 1
+        assert wav_file.getsampwidth() == 2
+        assert wav_file.readframes(16000) == pcm_bytes(16000)
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+async def test_stream_audio_no_audio_stream(mock_video_file, mock_settings):
     """Test audio extraction when video has no audio stream"""
-    
-    # Mock VideoFileClip context manager with no audio
-    mock_video = MagicMock(spec=VideoFileClip)
-    mock_video.__enter__.return_value = mock_video
-    mock_video.__exit__.return_value = None
-    mock_video.audio = None
-    
-    with patch("audio_analyzer.core.audio_extractor.VideoFileClip", return_value=mock_video) as mock_video_clip, \
-         patch("audio_analyzer.core.audio_extractor.settings", mock_settings):
-        
-        # Call the function and expect an exception
+    process = FakeFFmpegProcess(
+        b"",
+        returncode=1,
+        stderr=b"Stream map '0:a:0' matches no streams.\n"
+    )
+
+    with patch("audio_analyzer.core.audio_extractor.settings", mock_settings), \
+         patch("audio_analyzer.core.audio_extractor.asyncio.create_subprocess_exec", return_value=process):
         with pytest.raises(HTTPException) as exc_info:
-            await AudioExtractor.extract_audio(mock_video_file)
-        
-        # Verify error details
-        assert exc_info.value.status_code == 400
-        assert "No audio stream found" in exc_info.value.detail["error_message"]
-        
-        mock_video_clip.assert_called_once_with(str(mock_video_file))
-        # Assert VideoFileClip context caused exception before exiting
-        mock_video_clip.__exit__.assert_not_called()
+            await AudioExtractor.load_audio(mock_video_file)
+
+    assert exc_info.value.status_code == 400
+    assert "No audio stream found" in exc_info.value.detail["error_message"]
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+async def test_stream_audio_ffmpeg_error(mock_video_file, mock_settings):
+    """Test audio extraction when FFmpeg fails to decode the video"""
+    process = FakeFFmpegProcess(b"", returncode=1, stderr=b"Invalid data found when processing input\n")
+
+    with patch("audio_analyzer.core.audio_extractor.settings", mock_settings), \
+         patch("audio_analyzer.core.audio_extractor.asyncio.create_subprocess_exec", return_value=process):
+        with pytest.raises(RuntimeError) as exc_info:
+            await AudioExtractor.load_audio(mock_video_file)
+
+    assert "Failed to extract audio from video" in str(exc_info.value)
+    assert "Invalid data found" in str(exc_info.value)
 
 
 @pytest.mark.asyncio
 @pytest.mark.unit
-async def test_extract_audio_moviepy_error(mock_video_file):
-    """Test audio extraction when MoviePy raises an error"""
-    
-    # Mock VideoFileClip to raise an exception
-    with patch("audio_analyzer.core.audio_extractor.VideoFileClip", side_effect=Exception("MoviePy error")) as mock_video_clip:
-        # Call the function and expect an exception
+async def test_stream_audio_does_not_log_presigned_url(mock_settings):
+    """Test that the signature of a presigned URL is kept out of logs and errors"""
+    url = "http://minio:9000/videos/abc/video.mp4?X-Amz-Credential=key&X-Amz-Signature=secret"
+    process = FakeFFmpegProcess(b"", returncode=1, stderr=f"{url}: Server returned 403 Forbidden\n".encode())
+
+    with patch("audio_analyzer.core.audio_extractor.settings", mock_settings), \
+         patch("audio_analyzer.core.audio_extractor.logger") as mock_logger, \
+         patch("audio_analyzer.core.audio_extractor.asyncio.create_subprocess_exec", return_value=process):
         with pytest.raises(RuntimeError) as exc_info:
-            await AudioExtractor.extract_audio(mock_video_file)
-        
-        # Verify error message
-        assert "Failed to extract audio from video" in str(exc_info.value)
-        
-        # Verify interactions
-        mock_video_clip.assert_called_once_with(str(mock_video_file))
+            await AudioExtractor.load_audio(url)
+
+    logged = " ".join(str(call) for call in mock_logger.mock_calls)
+    assert "http://minio:9000/videos/abc/video.mp4" in logged
+    assert "secret" not in logged
+    assert "secret" not in str(exc_info.value)
+    assert "403 Forbidden" in str(exc_info.value)
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+async def test_stream_audio_stops_ffmpeg_when_consumer_stops(mock_video_file, mock_settings):
+    """Test that FFmpeg is terminated when the consumer stops reading early"""
+    process = FakeFFmpegProcess(pcm_bytes(16000 * 3))
+
+    with patch("audio_analyzer.core.audio_extractor.settings", mock_settings), \
+         patch("audio_analyzer.core.audio_extractor.asyncio.create_subprocess_exec", return_value=process):
+        stream = AudioExtractor.stream_audio(mock_video_file, chunk_seconds=1)
+        first = await stream.__anext__()
+        await stream.aclose()
+
+    assert len(first) == 16000
+    assert process.killed
@@ -0,0 +1,134 @@
+# Copyright (C) 2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+import asyncio
+
+import pytest
+
+from audio_analyzer.core.job_manager import JobQueueFullError, TranscriptionJobManager
+from audio_analyzer.schemas.transcription import TranscriptSegment
+from audio_analyzer.schemas.types import TranscriptionStatus
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+async def test_job_manager_runs_job():
+    """Test that a submitted job is processed and marked as completed"""
+    manager = TranscriptionJobManager(max_workers=1, max_queue_size=10, job_ttl=60)
+
+    async def handler(job):
+        job.transcript_path = "/tmp/output/test.srt"
+
+    job = manager.submit(handler, video_name="test.mp4")
+    assert job.status == TranscriptionStatus.PENDING
+    assert manager.get(job.job_id) is job
+
+    await asyncio.wait_for(manager.wait(job), timeout=5)
+    await manager.stop()
+
+    assert job.status == TranscriptionStatus.COMPLETED
+    assert job.transcript_path == "/tmp/output/test.srt"
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+async def test_job_manager_records_failure():
+    """Test that a failing job is marked as failed with its error"""
+    manager = TranscriptionJobManager(max_workers=1, max_queue_size=10, job_ttl=60)
+
+    async def handler(job):
+        raise RuntimeError("model not found")
+
+    job = manager.submit(handler)
+    await asyncio.wait_for(manager.wait(job), timeout=5)
+    await manager.stop()
+
+    assert job.status == TranscriptionStatus.FAILED
+    assert job.error == "model not found"
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+async def test_job_manager_bounds_concurrency():
+    """Test that no more than max_workers jobs run at the same time"""
+    manager = TranscriptionJobManager(max_workers=2, max_queue_size=10, job_ttl=60)
+    running = 0
+    peak = 0
+
+    async def handler(job):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+
+    jobs = [manager.submit(handler) for _ in range(6)]
+    await asyncio.wait_for(asyncio.gather(*(manager.wait(job) for job in jobs)), timeout=5)
+    await manager.stop()
+
+    assert peak == 2
+    assert all(job.status == TranscriptionStatus.COMPLETED for job in jobs)
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+async def test_job_manager_rejects_jobs_when_queue_is_full():
+    """Test that jobs beyond the queue size are rejected"""
+    manager = TranscriptionJobManager(max_workers=1, max_queue_size=1, job_ttl=60)
+    release = asyncio.Event()
+
+    async def handler(job):
+        await release.wait()
+
+    first = manager.submit(handler)
+    await asyncio.sleep(0)  # Let the worker pick up the first job
+    manager.submit(handler)
+
+    with pytest.raises(JobQueueFullError):
+        manager.submit(handler)
+
+    release.set()
+    await asyncio.wait_for(manager.wait(first), timeout=5)
+    await manager.stop()
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+async def test_job_manager_prunes_expired_jobs():
+    """Test that finished jobs are forgotten after the TTL"""
+    manager = TranscriptionJobManager(max_workers=1, max_queue_size=10, job_ttl=0)
+
+    async def handler(job):
+        return None
+
+    job = manager.submit(handler)
+    await asyncio.wait_for(manager.wait(job), timeout=5)
+    await manager.stop()
+    job.finished_at -= 1
+
+    assert manager.get(job.job_id) is None
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+async def test_job_notifies_segment_listeners():
+    """Test that listeners are woken up for new segments and when the job finishes"""
+    manager = TranscriptionJobManager(max_workers=1, max_queue_size=10, job_ttl=60)
+    release = asyncio.Event()
+
+    async def handler(job):
+        job.add_segments([TranscriptSegment(start=0.0, end=1.0, text="Hello")])
+        await release.wait()
+
+    job = manager.submit(handler)
+    updated = job.updated
+    await asyncio.wait_for(updated.wait(), timeout=5)
+    assert [segment.text for segment in job.segments] == ["Hello"]
+    assert not job.is_finished
+
+    updated = job.updated
+    release.set()
+    await asyncio.wait_for(updated.wait(), timeout=5)
+    await manager.stop()
+
+    assert job.status == TranscriptionStatus.COMPLETED
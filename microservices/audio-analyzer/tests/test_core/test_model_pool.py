@@ -0,0 +1,95 @@
+# Copyright (C) 2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+import threading
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from audio_analyzer.core.model_pool import ModelPool
+from audio_analyzer.core.transcriber import TranscriptionService
+from audio_analyzer.schemas.types import DeviceType, TranscriptionBackend, WhisperModel
+
+
+@pytest.mark.unit
+def test_model_pool_reuses_loaded_model():
+    """Test that a model is loaded once and reused for the same key"""
+    pool = ModelPool(max_models=2)
+    loader = MagicMock(side_effect=lambda: object())
+
+    first = pool.get(("tiny.en", "cpu"), loader)
+    second = pool.get(("tiny.en", "cpu"), loader)
+
+    assert first is second
+    loader.assert_called_once()
+    assert len(pool) == 1
+
+
+@pytest.mark.unit
+def test_model_pool_loads_once_for_concurrent_callers():
+    """Test that concurrent requests for the same key share a single model load"""
+    pool = ModelPool(max_models=2)
+    release = threading.Event()
+    calls = []
+
+    def slow_loader():
+        calls.append(1)
+        release.wait(timeout=5)
+        return object()
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(pool.get("key", slow_loader))) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert all(result is results[0] for result in results)
+
+
+@pytest.mark.unit
+def test_model_pool_evicts_least_recently_used_idle_model():
+    """Test that the pool stays within its limit and keeps models that are in use"""
+    pool = ModelPool(max_models=2)
+    busy = pool.get("busy", object)
+    pool.get("idle", object)
+
+    with busy.lock:
+        pool.get("new", object)
+
+    assert pool.contains("busy")
+    assert not pool.contains("idle")
+    assert pool.contains("new")
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("resident_models,enabled_models,chunk_workers,expected", [
+    (None, [WhisperModel.TINY_EN, WhisperModel.BASE_EN], 3, 6),
+    (None, None, 2, 2),
+    (5, [WhisperModel.TINY_EN], 3, 5),
+])
+def test_model_pool_default_size_fits_chunk_replicas(resident_models, enabled_models, chunk_workers, expected):
+    """Test that the default pool holds every chunk worker replica of each enabled model"""
+    settings = MagicMock()
+    settings.MAX_RESIDENT_MODELS = resident_models
+    settings.ENABLED_WHISPER_MODELS = enabled_models
+    settings.TRANSCRIPTION_CHUNK_WORKERS = chunk_workers
+
+    with patch("audio_analyzer.core.model_pool.settings", settings):
+        assert ModelPool().max_models == expected
+
+
+@pytest.mark.unit
+def test_transcription_services_share_pooled_model(mock_settings):
+    """Test that services for the same model and backend reuse one loaded model"""
+    with patch.object(TranscriptionService, "_create_model", return_value=MagicMock()) as mock_create:
+        first = TranscriptionService(model_name="tiny.en", device="cpu")
+        second = TranscriptionService(model_name="tiny.en", device="cpu")
+        first._load_model()
+        second._load_model()
+
+    mock_create.assert_called_once()
+    assert first.model is second.model
+    assert first.pool_key == (WhisperModel.TINY_EN, DeviceType.CPU, TranscriptionBackend.WHISPER_CPP)
@@ -4,10 +4,13 @@
 from pathlib import Path
 from unittest.mock import AsyncMock, MagicMock, patch
 
+import numpy as np
 import pytest
 
+from audio_analyzer.core.model_pool import PooledModel
 from audio_analyzer.core.transcriber import TranscriptionService
 from audio_analyzer.schemas.types import DeviceType, TranscriptionBackend, WhisperModel
+from audio_analyzer.utils.vad import AudioChunk
 
 
 @pytest.mark.unit
@@ -305,3 +308,114 @@ async def test_transcribe_with_whisper_cpp_implementation():
         # Verify output functions were called
         mock_output_txt.assert_called_once_with(mock_segments, str(txt_path))
         mock_output_srt.assert_called_once_with(mock_segments, str(srt_path))
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+async def test_transcribe_in_memory_samples(mock_settings):
+    """Test transcription of in-memory PCM samples without an audio file"""
+    samples = np.zeros(16000, dtype=np.float32)
+
+    with patch.object(TranscriptionService, "_load_model"), \
+         patch.object(TranscriptionService, "_transcribe_chunked") as mock_transcribe_chunked, \
+         patch.object(TranscriptionService, "_transcribe_with_whisper_cpp") as mock_transcribe_whisper, \
+         patch.object(TranscriptionService, "_determine_backend", return_value=TranscriptionBackend.WHISPER_CPP), \
+         patch("audio_analyzer.core.transcriber.settings", mock_settings):
+
+        service = TranscriptionService(model_name="tiny.en", device="cpu")
+        job_id, output_path = await service.transcribe(
+            samples,
+            include_timestamps=False,
+            job_id="abcd1234",
+            output_name="meeting"
+        )
+
+    assert job_id == "abcd1234"
+    assert output_path == mock_settings.OUTPUT_DIR / "transcript" / "meeting-abcd1234.txt"
+    
+    # In-memory samples are transcribed by the chunked engine
+    mock_transcribe_whisper.assert_not_called()
+    _, call_args, _ = mock_transcribe_chunked.mock_calls[0]
+    assert call_args[0] is samples
+
+
+def fake_whisper_cpp_replica(text: str) -> PooledModel:
+    """Create a pooled model replica whose whispercpp model returns one segment per chunk"""
+    model = MagicMock()
+    model.transcribe.return_value = [MagicMock(t0=150, t1=420, text=f" {text}")]
+    return PooledModel(key=text, model=model)
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+async def test_transcribe_chunked_stitches_segments(mock_settings):
+    """Test that chunks are transcribed on separate replicas and stitched with absolute timestamps"""
+    mock_settings.AUDIO_SAMPLE_RATE = 16000
+    mock_settings.TRANSCRIPTION_CHUNK_WORKERS = 2
+    mock_settings.TRANSCRIPT_LANGUAGE = None
+    samples = np.zeros(16000 * 70, dtype=np.float32)
+    chunks = [
+        AudioChunk(0, 0, 16000 * 28, 16000),
+        AudioChunk(1, 16000 * 28, 16000 * 55, 16000),
+        AudioChunk(2, 16000 * 55, 16000 * 70, 16000),
+    ]
+    replicas = [fake_whisper_cpp_replica("first"), fake_whisper_cpp_replica("second")]
+    srt_path = mock_settings.OUTPUT_DIR / "chunked.srt"
+    txt_path = mock_settings.OUTPUT_DIR / "chunked.txt"
+    received = []
+
+    with patch.object(TranscriptionService, "_determine_backend", return_value=TranscriptionBackend.WHISPER_CPP), \
+         patch.object(TranscriptionService, "_get_replica", side_effect=lambda index: replicas[index]) as mock_get_replica, \
+         patch("audio_analyzer.core.transcriber.split_on_silence", return_value=chunks), \
+         patch("audio_analyzer.core.transcriber.settings", mock_settings):
+
+        service = TranscriptionService(model_name="tiny.en", device="cpu")
+        await service._transcribe_chunked(
+            samples,
+            srt_path,
+            txt_path,
+            language="en",
+            include_timestamps=True,
+            segment_callback=received.append
+        )
+
+    # Each worker uses its own replica, and every chunk is transcribed exactly once
+    assert sorted(call.args[0] for call in mock_get_replica.call_args_list) == [0, 1]
+    assert sum(replica.model.transcribe.call_count for replica in replicas) == 3
+    assert all(
+        call.kwargs["language"] == "en" and len(call.args[0]) in (16000 * 28, 16000 * 27, 16000 * 15)
+        for replica in replicas for call in replica.model.transcribe.call_args_list
+    )
+
+    # Segments are delivered chunk by chunk, in audio order, offset by the chunk start
+    assert [[(segment.start, segment.end) for segment in batch] for batch in received] == [
+        [(1.5, 4.2)], [(29.5, 32.2)], [(56.5, 59.2)]
+    ]
+    srt = srt_path.read_text()
+    assert "1\n00:00:01,500 --> 00:00:04,200\n" in srt
+    assert "3\n00:00:56,500 --> 00:00:59,200\n" in srt
+    assert len(txt_path.read_text().splitlines()) == 3
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+async def test_stream_segments_propagates_chunk_errors(mock_settings):
+    """Test that a failing chunk fails the stream after the segments of earlier chunks"""
+    mock_settings.AUDIO_SAMPLE_RATE = 16000
+    mock_settings.TRANSCRIPTION_CHUNK_WORKERS = 1
+    chunks = [AudioChunk(0, 0, 16000, 16000), AudioChunk(1, 16000, 32000, 16000)]
+    replica = fake_whisper_cpp_replica("only")
+    replica.model.transcribe.side_effect = [replica.model.transcribe.return_value, RuntimeError("decoder crashed")]
+
+    with patch.object(TranscriptionService, "_determine_backend", return_value=TranscriptionBackend.WHISPER_CPP), \
+         patch.object(TranscriptionService, "_get_replica", return_value=replica), \
+         patch("audio_analyzer.core.transcriber.split_on_silence", return_value=chunks), \
+         patch("audio_analyzer.core.transcriber.settings", mock_settings):
+
+        service = TranscriptionService(model_name="tiny.en", device="cpu")
+        stream = service.stream_segments(np.zeros(32000, dtype=np.float32))
+        first = await stream.__anext__()
+        with pytest.raises(RuntimeError, match="decoder crashed"):
+            await stream.__anext__()
+
+    assert first[0].text == "only"
@@ -12,7 +12,8 @@ from fastapi import UploadFile
 from audio_analyzer.utils.file_utils import (
     save_upload_file, 
     get_file_duration, 
-    is_video_file
+    is_video_file,
+    redact_url
 )
 
 @pytest.mark.asyncio
@@ -107,3 +108,61 @@ def test_is_video_file_case_insensitive():
     
     for file_name in upper_case_files:
         assert is_video_file(file_name) is True
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+async def test_save_upload_file_in_chunks(temp_test_dir):
+    """Test that uploads are copied to disk chunk by chunk"""
+    content = b"0123456789" * 10
+    reads = []
+
+    mock_file = MagicMock(spec=UploadFile)
+    mock_file.filename = "test video.mp4"
+
+    offset = 0
+    async def mock_read(size=-1):
+        nonlocal offset
+        reads.append(size)
+        chunk = content[offset:offset + size]
+        offset += len(chunk)
+        return chunk
+    mock_file.read = mock_read
+
+    mock_settings = MagicMock()
+    mock_settings.UPLOAD_CHUNK_SIZE = 32
+
+    with patch("audio_analyzer.utils.file_utils.settings", mock_settings):
+        file_path = await save_upload_file(mock_file, temp_test_dir)
+
+    assert file_path.read_bytes() == content
+    assert file_path.name.endswith("test_video.mp4")
+    assert reads == [32, 32, 32, 32, 32]
+
+
+@pytest.mark.unit
+def test_get_file_duration_probes_without_decoding():
+    """Test that the duration is read from the container header only"""
+    with patch("moviepy.video.io.ffmpeg_reader.ffmpeg_parse_infos", return_value={"duration": 75.0}) as mock_probe:
+        assert get_file_duration(Path("/tmp/video.mp4")) == 75.0
+
+    mock_probe.assert_called_once_with("/tmp/video.mp4", decode_file=False)
+
+
+@pytest.mark.unit
+def test_get_file_duration_error():
+    """Test that probe failures report a zero duration"""
+    with patch("moviepy.video.io.ffmpeg_reader.ffmpeg_parse_infos", side_effect=IOError("probe failed")):
+        assert get_file_duration(Path("/tmp/video.mp4")) == 0.0
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("source,expected", [
+    ("http://minio:9000/videos/a.mp4?X-Amz-Signature=secret", "http://minio:9000/videos/a.mp4"),
+    ("https://host/a.mp4#t=10", "https://host/a.mp4"),
+    ("/tmp/uploads/a.mp4", "/tmp/uploads/a.mp4"),
+    (Path("/tmp/uploads/a?b.mp4"), "/tmp/uploads/a?b.mp4"),
+])
+def test_redact_url(source, expected):
+    """Test that URL query strings are stripped while local paths are kept"""
+    assert redact_url(source) == expected
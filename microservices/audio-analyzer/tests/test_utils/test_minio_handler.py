@@ -33,3 +33,40 @@ def test_get_client(mock_minio_client):
             secure=mock_settings.MINIO_SECURE
         )
 
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+async def test_get_video_from_minio_streaming(mock_minio_client):
+    """Test that a presigned URL is returned instead of downloading the video when streaming"""
+    mock_minio_client.presigned_get_object.return_value = "http://minio:9000/videos/video-1/test.mp4?X-Amz-Signature=abc"
+
+    with patch("audio_analyzer.utils.minio_handler.settings") as mock_settings, \
+         patch.object(MinioHandler, "_client", mock_minio_client):
+        mock_settings.MINIO_STREAM_VIDEOS = True
+        mock_settings.MINIO_PRESIGNED_URL_EXPIRY = 3600
+        mock_settings.UPLOAD_DIR = "/tmp/uploads"
+
+        video_path, error = await MinioHandler.get_video_from_minio("videos", "video-1", "test.mp4")
+
+    assert error is None
+    assert video_path == mock_minio_client.presigned_get_object.return_value
+    mock_minio_client.stat_object.assert_called_once_with("videos", "video-1/test.mp4")
+    mock_minio_client.fget_object.assert_not_called()
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+async def test_get_video_from_minio_download(mock_minio_client):
+    """Test that the video is downloaded when streaming is disabled"""
+    with patch("audio_analyzer.utils.minio_handler.settings") as mock_settings, \
+         patch.object(MinioHandler, "_client", mock_minio_client):
+        mock_settings.MINIO_STREAM_VIDEOS = False
+        mock_settings.UPLOAD_DIR = "/tmp/uploads"
+
+        video_path, error = await MinioHandler.get_video_from_minio("videos", "video-1", "test.mp4")
+
+    assert error is None
+    assert video_path == Path("/tmp/uploads/test.mp4")
+    mock_minio_client.fget_object.assert_called_once_with("videos", "video-1/test.mp4", "/tmp/uploads/test.mp4")
+    mock_minio_client.presigned_get_object.assert_not_called()
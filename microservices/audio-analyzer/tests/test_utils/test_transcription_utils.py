@@ -7,9 +7,14 @@ from unittest.mock import patch, MagicMock, AsyncMock
 import pytest
 from fastapi import HTTPException, UploadFile
 
-from audio_analyzer.schemas.transcription import TranscriptionFormData
+from audio_analyzer.schemas.transcription import TranscriptionFormData, TranscriptSegment
 from audio_analyzer.schemas.types import StorageBackend
-from audio_analyzer.utils.transcription_utils import get_video_path, store_transcript_output
+from audio_analyzer.utils.transcription_utils import (
+    format_srt_timestamp,
+    get_video_path,
+    store_transcript_output,
+    write_srt
+)
 
 
 @pytest.mark.asyncio
@@ -206,3 +211,30 @@ def test_store_transcript_output_different_extensions():
         store_transcript_output(txt_path, job_id, original_filename, minio_bucket, video_id)
         assert mock_save.call_args[0][0] == txt_path
         assert ".txt" in mock_save.call_args[0][2]
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("seconds, expected", [
+    (0, "00:00:00,000"),
+    (1.5, "00:00:01,500"),
+    (62.0004, "00:01:02,000"),
+    (3725.123, "01:02:05,123"),
+])
+def test_format_srt_timestamp(seconds, expected):
+    """Test formatting of second offsets as SRT timestamps"""
+    assert format_srt_timestamp(seconds) == expected
+
+
+@pytest.mark.unit
+def test_write_srt(tmp_path):
+    """Test writing numbered SRT cues for transcript segments"""
+    srt_path = tmp_path / "test.srt"
+    write_srt([
+        TranscriptSegment(start=0.5, end=2.0, text="Hello"),
+        TranscriptSegment(start=61.25, end=63.0, text="World"),
+    ], srt_path)
+
+    assert srt_path.read_text() == (
+        "1\n00:00:00,500 --> 00:00:02,000\nHello\n\n"
+        "2\n00:01:01,250 --> 00:01:03,000\nWorld\n\n"
+    )
@@ -0,0 +1,54 @@
+# Copyright (C) 2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+import numpy as np
+import pytest
+
+from audio_analyzer.utils.vad import split_on_silence
+
+SAMPLE_RATE = 16000
+
+
+def speech_with_pauses(pattern):
+    """Create audio from (seconds, is_speech) pairs; speech is a loud tone over low background noise"""
+    rng = np.random.default_rng(0)
+    parts = []
+    for seconds, is_speech in pattern:
+        n = int(seconds * SAMPLE_RATE)
+        part = rng.normal(0, 0.001, n).astype(np.float32)
+        if is_speech:
+            part += 0.3 * np.sin(2 * np.pi * 220 * np.arange(n) / SAMPLE_RATE).astype(np.float32)
+        parts.append(part)
+    return np.concatenate(parts)
+
+
+@pytest.mark.unit
+def test_split_on_silence_cuts_at_pauses():
+    """Test that chunks are cut in the middle of pauses and stay within the maximum duration"""
+    samples = speech_with_pauses([(8, True), (0.6, False), (8, True), (1, False), (8, True), (0.6, False), (8, True)])
+
+    chunks = split_on_silence(samples, SAMPLE_RATE, max_chunk_seconds=20, min_chunk_seconds=5, min_silence_ms=300)
+
+    assert [chunk.index for chunk in chunks] == list(range(len(chunks)))
+    assert chunks[0].start == 0 and chunks[-1].end == len(samples)
+    assert all(a.end == b.start for a, b in zip(chunks, chunks[1:]))
+    assert all(chunk.duration <= 20 for chunk in chunks)
+    # The longest pause within the window (1 s, centred at 17.1 s) is used as the first cut
+    assert chunks[0].duration == pytest.approx(17.1, abs=0.05)
+
+
+@pytest.mark.unit
+def test_split_on_silence_hard_cut_without_pauses():
+    """Test that continuous audio without pauses is cut at the maximum chunk duration"""
+    samples = speech_with_pauses([(50, True)])
+
+    chunks = split_on_silence(samples, SAMPLE_RATE, max_chunk_seconds=20, min_silence_ms=300)
+
+    assert [round(chunk.duration, 2) for chunk in chunks] == [19.98, 19.98, 10.04]
+
+
+@pytest.mark.unit
+def test_split_on_silence_drops_silent_audio():
+    """Test that chunks without speech are not transcribed"""
+    assert split_on_silence(np.zeros(SAMPLE_RATE * 60, dtype=np.float32), SAMPLE_RATE, max_chunk_seconds=20) == []
+    assert split_on_silence(np.zeros(0, dtype=np.float32), SAMPLE_RATE) == []
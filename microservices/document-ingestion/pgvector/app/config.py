@@ -37,6 +37,22 @@ It generates embeddings for documents, stores them in PGVector, and saves the do
 
     BATCH_SIZE: int = ...
 
+    # Ingestion parallelism
+    EXTRACTION_WORKERS: int = 0  # Processes extracting document text, 0 uses one per CPU
+    PDF_PAGES_PER_TASK: int = 8  # PDF pages extracted by one task of the extraction pool
+    EMBEDDING_CONCURRENCY: int = 4  # Embedding requests of BATCH_SIZE chunks in flight per ingestion
+
+    # URL ingestion
+    URL_FETCH_CONCURRENCY: int = 32  # Connections open at once while fetching URLs
+    URL_FETCH_PER_HOST: int = 4  # Connections open at once to a single host
+    URL_FETCH_TIMEOUT: int = 30  # Seconds allowed to download a single URL
+
+    # Chunks removed per transaction by background deletions
+    DELETE_BATCH_SIZE: int = 5000
+
+    # Comma separated URLs notified with a POST when documents are ingested or deleted
+    INDEX_UPDATE_NOTIFY_URL: str = ""
+
     # MINIO Configuration
     DEFAULT_BUCKET: str = ...
     OBJECT_PREFIX: str = ...
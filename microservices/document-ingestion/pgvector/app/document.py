@@ -3,20 +3,24 @@
 
 import psycopg
 from fastapi import UploadFile, HTTPException
+from starlette.concurrency import run_in_threadpool
 from http import HTTPStatus
 from pathlib import Path
+from concurrent.futures.process import BrokenProcessPool
 from typing import Optional
-from langchain_core.documents import Document
-from langchain.text_splitter import TokenTextSplitter
-from langchain_openai import OpenAIEmbeddings
-from langchain_postgres.vectorstores import PGVector
-import pdfplumber
-from docx import Document as DocxDocument
-from docx.text.paragraph import Paragraph
-from docx.table import Table
 from .logger import logger
 from .config import Settings
-from .db_config import pool_execution
+from .registry import FILE, list_documents, mark_for_deletion, schedule_deletions
+from .extraction import (
+    count_pdf_pages,
+    extract_docx_chunks,
+    extract_pdf_pages,
+    extract_txt_chunks,
+    get_extraction_pool,
+    reset_extraction_pool,
+)
+from .utils import notify_index_updated
+from .vector_writer import get_vector_writer
 
 config = Settings()
 
@@ -54,60 +58,64 @@ async def save_temp_file(file: UploadFile, bucket_name: str, filename: str) -> s
 
 async def get_documents_embeddings() -> list:
     """
-    Retrieves a list of document embeddings from the database, including file names and bucket names.
-    This function queries the database to fetch distinct file sources and bucket names
-    associated with a specific index name. The results are processed to extract the file
-    names and bucket names, which are returned as a list of dictionaries.
+    Retrieves the list of ingested documents, including file names and bucket names.
+    Documents are listed from the document registry, which holds one entry per document, so
+    listing does not scan the chunks in the embeddings table. Documents whose deletion is in
+    progress are not listed.
 
     Returns:
         list: A list of dictionaries, where each dictionary contains:
-            - file_name (str): The name of the file extracted from the source path.
+            - file_name (str): The name of the file.
             - bucket_name (str): The name of the bucket associated with the file.
 
     Raises:
         Exception: If there is an issue with the database query or execution.
     """
 
-    file_list = []
-    query = "SELECT DISTINCT \
-    lpc.cmetadata ->> 'source' as source, lpc.cmetadata ->> 'bucket' as bucket \
-    FROM \
-    langchain_pg_embedding lpc JOIN langchain_pg_collection lpcoll \
-    ON lpc.collection_id = lpcoll.uuid WHERE lpcoll.name = %(index_name)s \
-    AND lpc.cmetadata ->> 'source' IS NOT NULL \
-    AND lpc.cmetadata ->> 'bucket' IS NOT NULL"
+    result_rows = await run_in_threadpool(list_documents, FILE)
 
-    params = {"index_name": config.INDEX_NAME}
-    result_rows = pool_execution(query, params)
-
-    # Extract bucket name and filenames from returned query result
     file_list = [
-        {"file_name": row[0].split("/")[-1], "bucket_name": row[1]} for row in result_rows
+        {"file_name": name, "bucket_name": bucket} for bucket, name in result_rows
     ]
 
     return file_list
 
-def parse_paragraph(document: Document, para: Paragraph):
-    return para.text
+def _extract_pdf_chunks(doc_path: Path, pool):
+    """
+    Extracts and splits the pages of a PDF in ranges of `PDF_PAGES_PER_TASK` pages on the
+    extraction pool, and yields (page index, chunk) in page order as soon as the ranges complete.
+    """
 
-def parse_table(table: Table):
-    table_extracted = []
+    page_count = count_pdf_pages(doc_path)
+    pages_per_task = max(1, config.PDF_PAGES_PER_TASK)
+    futures = [
+        pool.submit(
+            extract_pdf_pages,
+            doc_path,
+            first_page,
+            min(first_page + pages_per_task, page_count),
+            config.CHUNK_SIZE,
+            config.CHUNK_OVERLAP,
+        )
+        for first_page in range(0, page_count, pages_per_task)
+    ]
 
-    for row in table.rows:
-        row_data = []
-        for cell in row.cells:
-            row_data.append(cell.text)
-        joined_row_data = "|".join(row_data)
-        table_extracted.append("|" + joined_row_data + "|")
-    table_string = "\n".join(table_extracted)
+    try:
+        for future in futures:
+            for page_num, page_chunks in future.result():
+                for chunk in page_chunks:
+                    yield page_num, chunk
+    finally:
+        for future in futures:
+            future.cancel()
 
-    return table_string
 
 def ingest_to_pgvector(doc_path: Path, bucket: str):
     """
     Ingests a document into a PostgreSQL database with PGVector extension for vector embeddings.
-    This function processes a document, splits it into chunks, generates embeddings for each chunk,
-    and uploads the embeddings to a PGVector collection in batches.
+    This function extracts the text of the document and splits it into chunks on the extraction
+    process pool, generates embeddings for batches of chunks concurrently and writes them to the
+    PGVector collection in bulk, while the remaining pages are still being extracted.
 
     Args:
         doc_path (Path): The file path to the document to be ingested.
@@ -117,114 +125,47 @@ def ingest_to_pgvector(doc_path: Path, bucket: str):
         HTTPException: If no text is found in the document or if an error occurs during ingestion.
     """
 
-
     try:
-        chunks = []
-        # Create one chunk per page or split the whole text
-        # Set chunk size to max tokens for your model (e.g., 512)
-        text_splitter = TokenTextSplitter(
-            chunk_size=config.CHUNK_SIZE,
-            chunk_overlap=config.CHUNK_OVERLAP,  # Use some overlap if needed
-            encoding_name="cl100k_base",  # Use the encoding for your model
-        )
-
-        if doc_path.suffix.lower() == ".pdf":
-            # Use pdfplumber to extract text
-            with pdfplumber.open(doc_path) as pdf:
-                texts = []
-                for i, page in enumerate(pdf.pages):
-                    page_text = page.extract_text() or ""
-                    if page_text.strip():
-                        texts.append((i, page_text))
-            if not texts:
-                raise HTTPException(status_code=HTTPStatus.INTERNAL_SERVER_ERROR, detail="No text found in the PDF for ingestion.")
-                        
-            for page_num, page_text in texts:
-                page_chunks = text_splitter.create_documents([page_text])
-                for chunk in page_chunks:
-                    if not hasattr(chunk, "metadata") or not isinstance(chunk.metadata, dict):
-                        chunk.metadata = {}
-                    chunk.metadata.update({
-                        "page": page_num,
-                        "source": str(doc_path)  # or doc_path.name if you want only filename
-                    })
-                    chunks.append(chunk)
-        elif doc_path.suffix.lower() == ".docx":
-            doc = DocxDocument(doc_path)
-            summary = []
-            for child in doc.iter_inner_content():
-                if isinstance(child, Paragraph):
-                    summary.append(parse_paragraph(doc, child))
-                elif isinstance(child, Table):
-                    summary.append(parse_table(child))
-
-            full_text = ""
-            for content in summary:
-                full_text += content + "\n"
-            if not full_text.strip():
-                raise HTTPException(status_code=HTTPStatus.INTERNAL_SERVER_ERROR, detail="No text found in the DOCX for ingestion.")
-
-            docx_chunks = text_splitter.create_documents([full_text])
-            for chunk in docx_chunks:
-                if not hasattr(chunk, "metadata") or not isinstance(chunk.metadata, dict):
-                    chunk.metadata = {}
-                chunk.metadata.update({
-                    "source": str(doc_path)
-                })
-                chunks.append(chunk)
-        elif doc_path.suffix.lower() == ".txt":
-            with open(doc_path, "r", encoding="utf-8") as f:
-                full_text = f.read()
-            if not full_text.strip():
-                raise HTTPException(status_code=HTTPStatus.INTERNAL_SERVER_ERROR, detail="No text found in the TXT file for ingestion.")
-
-            txt_chunks = text_splitter.create_documents([full_text])
-            for chunk in txt_chunks:
-                if not hasattr(chunk, "metadata") or not isinstance(chunk.metadata, dict):
-                    chunk.metadata = {}
-                chunk.metadata.update({
-                    "source": str(doc_path)
-                })
-                chunks.append(chunk)
-               
-        if not chunks:
-            raise HTTPException(status_code=HTTPStatus.INTERNAL_SERVER_ERROR, detail="No text found in the document for ingestion.")
-
-        documents = [
-            Document(
-                page_content=chunk.page_content,
-                metadata={"bucket": bucket, "filename": doc_path.name, **chunk.metadata},
-            )
-            for chunk in chunks
-        ]
-
-        embedder = OpenAIEmbeddings(
-            openai_api_key="EMPTY",
-            openai_api_base="{}".format(config.TEI_ENDPOINT_URL),
-            model=config.EMBEDDING_MODEL_NAME,
-            tiktoken_enabled=False
-        )
-
-        # Batch upload documents to handle large files
-        batch_size = config.BATCH_SIZE
-        for i in range(0, len(documents), batch_size):
-            batch_documents = documents[i : i + batch_size]
-
-            _ = PGVector.from_documents(
-                documents=batch_documents,
-                embedding=embedder,
-                collection_name=config.INDEX_NAME,
-                connection=config.PG_CONNECTION_STRING,
-                use_jsonb=True
+        pool = get_extraction_pool(config.EXTRACTION_WORKERS)
+        metadata = {"bucket": bucket, "filename": doc_path.name, "source": str(doc_path)}
+        suffix = doc_path.suffix.lower()
+
+        if suffix == ".pdf":
+            chunks = (
+                (chunk, {**metadata, "page": page_num})
+                for page_num, chunk in _extract_pdf_chunks(doc_path, pool)
             )
+            no_text_detail = "No text found in the PDF for ingestion."
+        elif suffix == ".docx":
+            docx_chunks = pool.submit(
+                extract_docx_chunks, doc_path, config.CHUNK_SIZE, config.CHUNK_OVERLAP
+            ).result()
+            chunks = ((chunk, dict(metadata)) for chunk in docx_chunks)
+            no_text_detail = "No text found in the DOCX for ingestion."
+        elif suffix == ".txt":
+            txt_chunks = pool.submit(
+                extract_txt_chunks, doc_path, config.CHUNK_SIZE, config.CHUNK_OVERLAP
+            ).result()
+            chunks = ((chunk, dict(metadata)) for chunk in txt_chunks)
+            no_text_detail = "No text found in the TXT file for ingestion."
+        else:
+            chunks = iter(())
+            no_text_detail = "No text found in the document for ingestion."
 
-            logger.info(
-                f"Processed batch {i // batch_size + 1}/{(len(documents) - 1) // batch_size + 1}"
-            )
+        stored = get_vector_writer().store_documents(chunks)
+        if not stored:
+            raise HTTPException(status_code=HTTPStatus.INTERNAL_SERVER_ERROR, detail=no_text_detail)
+        notify_index_updated(f"ingested {doc_path.name}")
 
     except HTTPException as e:
         raise e
 
+    except BrokenProcessPool as e:
+        # A worker died, e.g. on a malformed document; start a fresh pool for the next ingestion
+        logger.error(f"Extraction worker failed during ingestion: {e}")
+        reset_extraction_pool()
+        raise HTTPException(status_code=HTTPStatus.INTERNAL_SERVER_ERROR, detail="Internal Server Error")
+
     except Exception as e:
         logger.error(f"Error during ingestion: {e}")
         raise HTTPException(status_code=HTTPStatus.INTERNAL_SERVER_ERROR, detail="Internal Server Error")
@@ -240,6 +181,9 @@ async def delete_embeddings(
     and only embeddings associated with the specified file in the given bucket
     will be deleted.
 
+    The documents are marked for deletion in the document registry, which removes them from
+    the document list at once, and their embeddings are deleted in batches in the background.
+
     Args:
         bucket_name (str): The name of the bucket containing the embeddings.
         file_name (Optional[str]): The name of the file whose embeddings are to
@@ -248,7 +192,7 @@ async def delete_embeddings(
             in the specified bucket. Defaults to False.
 
     Returns:
-        bool: True if the embeddings were successfully deleted, False otherwise.
+        bool: True if the deletion of the embeddings was scheduled.
 
     Raises:
         ValueError: If `delete_all` is False and `file_name` is not provided.
@@ -259,43 +203,20 @@ async def delete_embeddings(
         # If `delete_all` is True, embeddings for all files in given bucket will be deleted,
         # irrespective of whether a `file_name` is provided or not.
         if delete_all:
-            query = """
-            DELETE FROM langchain_pg_embedding WHERE EXISTS (
-                SELECT * FROM langchain_pg_collection WHERE
-                langchain_pg_embedding.collection_id = langchain_pg_collection.uuid AND
-                langchain_pg_collection.name = %(indexname)s AND
-                langchain_pg_embedding.cmetadata ->> 'bucket' = %(bucket)s
-            )
-            """
-            params = {"indexname": config.INDEX_NAME, "bucket": bucket_name}
+            keys = await run_in_threadpool(mark_for_deletion, FILE, bucket=bucket_name)
 
         elif file_name:
-            query = """
-            DELETE FROM langchain_pg_embedding WHERE EXISTS (
-                SELECT 1 FROM langchain_pg_collection WHERE
-                langchain_pg_embedding.collection_id = langchain_pg_collection.uuid AND
-                langchain_pg_collection.name = %(indexname)s AND
-                langchain_pg_embedding.cmetadata ->> 'filename' = %(filename)s AND
-                langchain_pg_embedding.cmetadata ->> 'bucket' = %(bucket)s
-            )
-            """
-
-            params = {
-                "indexname": config.INDEX_NAME,
-                "filename": file_name,
-                "bucket": bucket_name,
-            }
+            keys = await run_in_threadpool(mark_for_deletion, FILE, bucket=bucket_name, name=file_name)
 
         else:
             raise ValueError(
                 "Invalid Arguments: file_name is required if delete_all is False."
             )
 
-        result = pool_execution(query, params)
-        if result:
-            return bool(result)
-        else:
-            raise ValueError(result)
+        schedule_deletions(keys)
+        logger.info(f"Scheduled deletion of {len(keys)} document(s) from bucket {bucket_name}")
+        notify_index_updated(f"deleting {len(keys)} document(s)")
+        return True
 
     except psycopg.Error as e:
         raise HTTPException(status_code=HTTPStatus.INTERNAL_SERVER_ERROR, detail=f"PSYCOPG Error: {e}")
@@ -304,4 +225,4 @@ async def delete_embeddings(
         raise e
 
     except HTTPException as e:
-        raise e
\ No newline at end of file
+        raise e
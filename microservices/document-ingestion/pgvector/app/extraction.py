@@ -0,0 +1,176 @@
+# Copyright (C) 2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+import hashlib
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import pdfplumber
+from docx import Document as DocxDocument
+from docx.table import Table
+from docx.text.paragraph import Paragraph
+from langchain.text_splitter import RecursiveCharacterTextSplitter, TokenTextSplitter
+from langchain_community.document_transformers import Html2TextTransformer
+from langchain_core.documents import Document as LangchainDocument
+
+# Functions in this module run in the extraction worker processes, so they only take and
+# return picklable values and must not depend on the application state.
+
+extraction_pool: Optional[ProcessPoolExecutor] = None
+
+
+def get_extraction_pool(max_workers: Optional[int] = None) -> ProcessPoolExecutor:
+    """
+    Retrieves the process pool that extracts and splits document text, creating it on first use.
+    Worker processes are spawned rather than forked, as the service process runs threads
+    (database pool, embedding requests) that must not be copied into the workers.
+
+    Args:
+        max_workers (int, optional): Number of worker processes. Defaults to the number of CPUs.
+
+    Returns:
+        ProcessPoolExecutor: The shared extraction pool.
+    """
+
+    global extraction_pool
+    if extraction_pool is None:
+        extraction_pool = ProcessPoolExecutor(
+            max_workers=max_workers or None,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return extraction_pool
+
+
+def reset_extraction_pool() -> None:
+    """Drops the extraction pool, e.g. after a worker crashed, so that the next ingestion creates a new one."""
+
+    global extraction_pool
+    if extraction_pool is not None:
+        extraction_pool.shutdown(wait=False, cancel_futures=True)
+        extraction_pool = None
+
+
+@lru_cache(maxsize=8)
+def get_text_splitter(chunk_size: int, chunk_overlap: int) -> TokenTextSplitter:
+    # Set chunk size to max tokens for your model (e.g., 512)
+    return TokenTextSplitter(
+        chunk_size=chunk_size,
+        chunk_overlap=chunk_overlap,  # Use some overlap if needed
+        encoding_name="cl100k_base",  # Use the encoding for your model
+    )
+
+
+def count_pdf_pages(doc_path: Path) -> int:
+    with pdfplumber.open(doc_path) as pdf:
+        return len(pdf.pages)
+
+
+def extract_pdf_pages(
+    doc_path: Path, first_page: int, last_page: int, chunk_size: int, chunk_overlap: int
+) -> List[Tuple[int, List[str]]]:
+    """
+    Extracts the text of a range of PDF pages and splits every page into chunks.
+
+    Args:
+        doc_path (Path): Path of the PDF document.
+        first_page (int): Index of the first page to extract.
+        last_page (int): Index after the last page to extract.
+        chunk_size (int): Maximum number of tokens per chunk.
+        chunk_overlap (int): Number of tokens shared by consecutive chunks.
+
+    Returns:
+        list: (page index, chunks) of every page in the range that contains text.
+    """
+
+    text_splitter = get_text_splitter(chunk_size, chunk_overlap)
+    pages = []
+    with pdfplumber.open(doc_path) as pdf:
+        for page_num in range(first_page, last_page):
+            page = pdf.pages[page_num]
+            page_text = page.extract_text() or ""
+            if page_text.strip():
+                pages.append((page_num, text_splitter.split_text(page_text)))
+            # Release the parsed page objects, long documents otherwise keep every page in memory
+            page.close()
+    return pages
+
+
+def parse_paragraph(document: DocxDocument, para: Paragraph):
+    return para.text
+
+
+def parse_table(table: Table):
+    table_extracted = []
+
+    for row in table.rows:
+        row_data = []
+        for cell in row.cells:
+            row_data.append(cell.text)
+        joined_row_data = "|".join(row_data)
+        table_extracted.append("|" + joined_row_data + "|")
+    table_string = "\n".join(table_extracted)
+
+    return table_string
+
+
+def extract_docx_chunks(doc_path: Path, chunk_size: int, chunk_overlap: int) -> List[str]:
+    """Extracts the paragraphs and tables of a DOCX document and splits the text into chunks."""
+
+    doc = DocxDocument(doc_path)
+    summary = []
+    for child in doc.iter_inner_content():
+        if isinstance(child, Paragraph):
+            summary.append(parse_paragraph(doc, child))
+        elif isinstance(child, Table):
+            summary.append(parse_table(child))
+
+    full_text = "".join(content + "\n" for content in summary)
+    if not full_text.strip():
+        return []
+    return get_text_splitter(chunk_size, chunk_overlap).split_text(full_text)
+
+
+def extract_txt_chunks(doc_path: Path, chunk_size: int, chunk_overlap: int) -> List[str]:
+    """Reads a text document and splits it into chunks."""
+
+    with open(doc_path, "r", encoding="utf-8") as f:
+        full_text = f.read()
+    if not full_text.strip():
+        return []
+    return get_text_splitter(chunk_size, chunk_overlap).split_text(full_text)
+
+
+def extract_html_chunks(
+    html: str, chunk_size: int, chunk_overlap: int, separators: List[str]
+) -> Tuple[str, List[str]]:
+    """
+    Converts the HTML of a web page to text and splits the text into chunks.
+
+    Args:
+        html (str): HTML content of the page.
+        chunk_size (int): Maximum number of characters per chunk.
+        chunk_overlap (int): Number of characters shared by consecutive chunks.
+        separators (list): Separators used to split the text, in order of preference.
+
+    Returns:
+        tuple: SHA-256 hash of the page text, which identifies unchanged pages on re-ingestion,
+            and the chunks of the text.
+    """
+
+    docs = Html2TextTransformer().transform_documents([LangchainDocument(page_content=html)])
+    page_docs = RecursiveCharacterTextSplitter(
+        chunk_size=chunk_size, chunk_overlap=chunk_overlap
+    ).split_documents(docs)
+    content = "".join(doc.page_content + "\n" for doc in page_docs)
+
+    text_splitter = RecursiveCharacterTextSplitter(
+        chunk_size=chunk_size,
+        chunk_overlap=chunk_overlap,
+        add_start_index=True,
+        separators=separators,
+    )
+    content_hash = hashlib.sha256(content.encode("utf-8")).hexdigest()
+    return content_hash, text_splitter.split_text(content)
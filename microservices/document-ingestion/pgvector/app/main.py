@@ -9,6 +9,7 @@ from pathlib import Path
 from fastapi import FastAPI, HTTPException, File, Query, UploadFile
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
 from pydantic import BeforeValidator
 from typing import Annotated, List, Optional
 from .logger import logger
@@ -16,6 +17,7 @@ from .config import Settings
 from .db_config import get_db_connection_pool
 from .document import get_documents_embeddings, ingest_to_pgvector, save_temp_file, delete_embeddings
 from .url import get_urls_embedding, ingest_url_to_pgvector, delete_embeddings_url
+from .registry import resume_deletions
 from .utils import check_tables_exist, Validation
 from .store import DataStore
 
@@ -33,6 +35,16 @@ app.add_middleware(
     allow_headers=config.ALLOW_HEADERS.split(","),
 )
 
+@app.on_event("startup")
+async def resume_pending_deletions():
+    """Resumes the background deletions of documents that were interrupted by a restart."""
+
+    try:
+        await run_in_threadpool(resume_deletions)
+    except Exception as ex:
+        logger.error(f"Failed to resume pending deletions: {ex}")
+
+
 @app.get(
     "/health",
     tags=["Status APIs"],
@@ -152,7 +164,7 @@ async def ingest_document(
                         file, bucket_name, uploaded_filename
                     )
                     logger.info(f"Temporary path of saved file: {temp_path}")
-                    ingest_to_pgvector(doc_path=temp_path, bucket=bucket_name)
+                    await run_in_threadpool(ingest_to_pgvector, doc_path=temp_path, bucket=bucket_name)
 
                 except Exception as e:
                     raise HTTPException(
@@ -367,7 +379,7 @@ async def ingest_links(urls: list[str]) -> dict:
     """
     try:
         if urls:
-            ingest_url_to_pgvector(urls)
+            await run_in_threadpool(ingest_url_to_pgvector, urls)
 
         result = {"status": 200, "message": "Data preparation succeeded"}
         return result
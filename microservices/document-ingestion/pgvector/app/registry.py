@@ -0,0 +1,347 @@
+# Copyright (C) 2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple
+from .logger import logger
+from .config import Settings
+from .db_config import get_db_connection_pool
+from .utils import notify_index_updated
+
+config = Settings()
+
+# Documents are identified by (kind, bucket, name): files by their bucket and file name,
+# URLs by the URL with an empty bucket.
+FILE = "file"
+URL = "url"
+
+RegistryKey = Tuple[str, str, str]
+
+READY = "ready"
+DELETING = "deleting"
+
+# Key of the advisory lock that serializes the registry setup across service workers
+_SETUP_LOCK_ID = 7311450261
+
+CREATE_REGISTRY = """
+CREATE TABLE IF NOT EXISTS dataprep_document_registry (
+    collection_name TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    bucket TEXT NOT NULL DEFAULT '',
+    name TEXT NOT NULL,
+    source TEXT,
+    content_hash TEXT,
+    chunk_count INTEGER NOT NULL DEFAULT 0,
+    status TEXT NOT NULL DEFAULT 'ready',
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+    PRIMARY KEY (collection_name, kind, bucket, name)
+)
+"""
+
+# Expression indexes on the metadata fields that chunks are deleted by
+EMBEDDING_INDEXES = [
+    """
+    CREATE INDEX IF NOT EXISTS ix_langchain_pg_embedding_bucket_filename ON langchain_pg_embedding
+    (collection_id, (cmetadata ->> 'bucket'), (cmetadata ->> 'filename'))
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS ix_langchain_pg_embedding_url ON langchain_pg_embedding
+    (collection_id, (cmetadata ->> 'url'))
+    """,
+]
+
+# Registers the documents stored before the registry existed, once
+BACKFILL_REGISTRY = [
+    """
+    INSERT INTO dataprep_document_registry (collection_name, kind, bucket, name, source, chunk_count)
+    SELECT lpcoll.name, 'file', lpc.cmetadata ->> 'bucket', lpc.cmetadata ->> 'filename',
+        MAX(lpc.cmetadata ->> 'source'), COUNT(*)
+    FROM langchain_pg_embedding lpc JOIN langchain_pg_collection lpcoll ON lpc.collection_id = lpcoll.uuid
+    WHERE lpc.cmetadata ->> 'bucket' IS NOT NULL AND lpc.cmetadata ->> 'filename' IS NOT NULL
+    GROUP BY 1, 2, 3, 4
+    ON CONFLICT DO NOTHING
+    """,
+    """
+    INSERT INTO dataprep_document_registry (collection_name, kind, bucket, name, content_hash, chunk_count)
+    SELECT lpcoll.name, 'url', '', lpc.cmetadata ->> 'url',
+        MAX(lpc.cmetadata ->> 'content_hash'), COUNT(*)
+    FROM langchain_pg_embedding lpc JOIN langchain_pg_collection lpcoll ON lpc.collection_id = lpcoll.uuid
+    WHERE lpc.cmetadata ->> 'url' IS NOT NULL
+    GROUP BY 1, 2, 3, 4
+    ON CONFLICT DO NOTHING
+    """,
+]
+
+DELETE_CHUNKS_BATCH = {
+    FILE: """
+    DELETE FROM langchain_pg_embedding WHERE id IN (
+        SELECT lpc.id FROM langchain_pg_embedding lpc JOIN langchain_pg_collection lpcoll
+        ON lpc.collection_id = lpcoll.uuid WHERE lpcoll.name = %(collection_name)s
+        AND lpc.cmetadata ->> 'bucket' = %(bucket)s AND lpc.cmetadata ->> 'filename' = %(name)s
+        LIMIT %(batch_size)s
+    )
+    """,
+    URL: """
+    DELETE FROM langchain_pg_embedding WHERE id IN (
+        SELECT lpc.id FROM langchain_pg_embedding lpc JOIN langchain_pg_collection lpcoll
+        ON lpc.collection_id = lpcoll.uuid WHERE lpcoll.name = %(collection_name)s
+        AND lpc.cmetadata ->> 'url' = %(name)s
+        LIMIT %(batch_size)s
+    )
+    """,
+}
+
+UPSERT_DOCUMENT = """
+INSERT INTO dataprep_document_registry
+    (collection_name, kind, bucket, name, source, content_hash, chunk_count, status, updated_at)
+VALUES
+    (%(collection_name)s, %(kind)s, %(bucket)s, %(name)s, %(source)s, %(content_hash)s, %(chunk_count)s, 'ready', now())
+ON CONFLICT (collection_name, kind, bucket, name) DO UPDATE SET
+    chunk_count = CASE WHEN dataprep_document_registry.status = 'ready'
+        THEN dataprep_document_registry.chunk_count + EXCLUDED.chunk_count
+        ELSE EXCLUDED.chunk_count END,
+    source = COALESCE(EXCLUDED.source, dataprep_document_registry.source),
+    content_hash = COALESCE(EXCLUDED.content_hash, dataprep_document_registry.content_hash),
+    status = 'ready',
+    updated_at = now()
+"""
+
+CLAIM_DOCUMENT = """
+INSERT INTO dataprep_document_registry (collection_name, kind, bucket, name, chunk_count, status, updated_at)
+VALUES (%(collection_name)s, %(kind)s, %(bucket)s, %(name)s, 0, 'ready', now())
+ON CONFLICT (collection_name, kind, bucket, name) DO UPDATE SET
+    chunk_count = 0, content_hash = NULL, status = 'ready', updated_at = now()
+"""
+
+registry_ready = False
+_setup_lock = threading.Lock()
+deletion_executor: Optional[ThreadPoolExecutor] = None
+
+
+def registry_key(metadata: dict) -> Optional[RegistryKey]:
+    """Returns the registry key of the document a chunk belongs to, based on the chunk metadata."""
+
+    if metadata.get("url"):
+        return (URL, "", metadata["url"])
+    if metadata.get("bucket") and metadata.get("filename"):
+        return (FILE, metadata["bucket"], metadata["filename"])
+    return None
+
+
+def _key_params(collection_name: str, key: RegistryKey) -> dict:
+    kind, bucket, name = key
+    return {"collection_name": collection_name, "kind": kind, "bucket": bucket, "name": name}
+
+
+def _setup_registry(conn) -> bool:
+    with conn.cursor() as cur:
+        cur.execute("SELECT pg_advisory_xact_lock(%s)", (_SETUP_LOCK_ID,))
+        created = cur.execute("SELECT to_regclass('dataprep_document_registry') IS NULL").fetchone()[0]
+        cur.execute(CREATE_REGISTRY)
+
+        # The embeddings table is created by the first ingestion
+        if not cur.execute("SELECT to_regclass('langchain_pg_embedding') IS NOT NULL").fetchone()[0]:
+            return False
+
+        for query in EMBEDDING_INDEXES:
+            cur.execute(query)
+
+        if created:
+            for query in BACKFILL_REGISTRY:
+                cur.execute(query)
+            logger.info("Registered the documents already stored in the database")
+
+    return True
+
+
+def ensure_registry() -> None:
+    """
+    Creates the document registry table and the metadata indexes of the embeddings table if
+    they don't exist. When the registry is created for an existing database, the stored
+    documents are registered once from their chunks.
+    """
+
+    global registry_ready
+    if registry_ready:
+        return
+
+    with _setup_lock:
+        if registry_ready:
+            return
+        with get_db_connection_pool().connection() as conn:
+            registry_ready = _setup_registry(conn)
+
+
+def list_documents(kind: str, collection_name: str = config.INDEX_NAME) -> List[tuple]:
+    """Returns (bucket, name) of the documents of a kind which are not being deleted."""
+
+    ensure_registry()
+    query = """
+    SELECT bucket, name FROM dataprep_document_registry
+    WHERE collection_name = %(collection_name)s AND kind = %(kind)s AND status = 'ready'
+    ORDER BY bucket, name
+    """
+    with get_db_connection_pool().connection() as conn:
+        with conn.cursor() as cur:
+            return cur.execute(query, {"collection_name": collection_name, "kind": kind}).fetchall()
+
+
+def get_content_hashes(
+    kind: str, names: List[str], bucket: str = "", collection_name: str = config.INDEX_NAME
+) -> Dict[str, Optional[str]]:
+    """
+    Returns the content hash of the registered documents among `names`. Documents without
+    a recorded hash or whose deletion is in progress map to None.
+    """
+
+    ensure_registry()
+    query = """
+    SELECT name, CASE WHEN status = 'ready' THEN content_hash END FROM dataprep_document_registry
+    WHERE collection_name = %(collection_name)s AND kind = %(kind)s AND bucket = %(bucket)s
+    AND name = ANY(%(names)s)
+    """
+    params = {"collection_name": collection_name, "kind": kind, "bucket": bucket, "names": names}
+    with get_db_connection_pool().connection() as conn:
+        with conn.cursor() as cur:
+            return dict(cur.execute(query, params).fetchall())
+
+
+def claim_documents(conn, collection_name: str, keys: Iterable[RegistryKey]) -> None:
+    """
+    Marks documents as being re-ingested in the transaction of `conn`. Any pending deletion
+    of the documents stops at its next batch, so it cannot remove the new chunks.
+    """
+
+    with conn.cursor() as cur:
+        cur.executemany(CLAIM_DOCUMENT, [_key_params(collection_name, key) for key in keys])
+
+
+def register_chunks(conn, collection_name: str, documents: Dict[RegistryKey, dict]) -> None:
+    """
+    Records chunks stored in the transaction of `conn`.
+
+    Args:
+        documents (dict): Registry key -> {"chunk_count", "source", "content_hash"} of the
+            chunks stored for every document.
+    """
+
+    params = [
+        {
+            **_key_params(collection_name, key),
+            "chunk_count": document["chunk_count"],
+            "source": document.get("source"),
+            "content_hash": document.get("content_hash"),
+        }
+        for key, document in documents.items()
+    ]
+    with conn.cursor() as cur:
+        cur.executemany(UPSERT_DOCUMENT, params)
+
+
+def mark_for_deletion(
+    kind: str, bucket: Optional[str] = None, name: Optional[str] = None, collection_name: str = config.INDEX_NAME
+) -> List[RegistryKey]:
+    """
+    Marks documents for deletion, which hides them from the document lists at once.
+
+    Args:
+        kind (str): FILE or URL.
+        bucket (str, optional): Only mark the documents of this bucket.
+        name (str, optional): Only mark the document with this name.
+
+    Returns:
+        list: Registry keys of the marked documents.
+    """
+
+    ensure_registry()
+    query = """
+    UPDATE dataprep_document_registry SET status = 'deleting', updated_at = now()
+    WHERE collection_name = %(collection_name)s AND kind = %(kind)s AND status = 'ready'
+    AND (%(bucket)s::text IS NULL OR bucket = %(bucket)s)
+    AND (%(name)s::text IS NULL OR name = %(name)s)
+    RETURNING kind, bucket, name
+    """
+    params = {"collection_name": collection_name, "kind": kind, "bucket": bucket, "name": name}
+    with get_db_connection_pool().connection() as conn:
+        with conn.cursor() as cur:
+            return [tuple(row) for row in cur.execute(query, params).fetchall()]
+
+
+def delete_chunks_batch(collection_name: str, key: RegistryKey, batch_size: int) -> bool:
+    """
+    Deletes one batch of chunks of a document marked for deletion, in its own transaction so
+    that ingestion and other deletions are not blocked for the whole document. The registry
+    entry is removed with the last batch.
+
+    Returns:
+        bool: True if chunks of the document remain to be deleted.
+    """
+
+    params = {**_key_params(collection_name, key), "batch_size": batch_size}
+    with get_db_connection_pool().connection() as conn:
+        with conn.cursor() as cur:
+            # Lock the entry so that a concurrent re-ingestion either waits for this batch or stops the deletion
+            row = cur.execute(
+                "SELECT status FROM dataprep_document_registry WHERE collection_name = %(collection_name)s "
+                "AND kind = %(kind)s AND bucket = %(bucket)s AND name = %(name)s FOR UPDATE",
+                params,
+            ).fetchone()
+            if row is None or row[0] != DELETING:
+                return False
+
+            deleted = cur.execute(DELETE_CHUNKS_BATCH[key[0]], params).rowcount
+            if deleted < batch_size:
+                cur.execute(
+                    "DELETE FROM dataprep_document_registry WHERE collection_name = %(collection_name)s "
+                    "AND kind = %(kind)s AND bucket = %(bucket)s AND name = %(name)s",
+                    params,
+                )
+                return False
+
+            cur.execute(
+                "UPDATE dataprep_document_registry SET chunk_count = GREATEST(chunk_count - %(deleted)s, 0), "
+                "updated_at = now() WHERE collection_name = %(collection_name)s AND kind = %(kind)s "
+                "AND bucket = %(bucket)s AND name = %(name)s",
+                {**params, "deleted": deleted},
+            )
+            return True
+
+
+def _run_deletion(collection_name: str, key: RegistryKey) -> None:
+    try:
+        batches = 1
+        while delete_chunks_batch(collection_name, key, config.DELETE_BATCH_SIZE):
+            batches += 1
+        logger.info(f"Deleted {key[0]} {key[2]} from {collection_name} in {batches} batch(es)")
+        notify_index_updated(f"deleted {key[0]} {key[2]}")
+
+    except Exception as e:
+        # The entry stays marked for deletion and is resumed on the next start
+        logger.error(f"Error while deleting {key[0]} {key[2]}: {e}")
+
+
+def schedule_deletions(keys: Iterable[RegistryKey], collection_name: str = config.INDEX_NAME) -> None:
+    """Deletes the chunks of documents marked for deletion in the background, one document at a time."""
+
+    global deletion_executor
+    if deletion_executor is None:
+        deletion_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="registry-deletion")
+
+    for key in keys:
+        deletion_executor.submit(_run_deletion, collection_name, key)
+
+
+def resume_deletions() -> None:
+    """Schedules the deletions that were interrupted, e.g. by a restart of the service."""
+
+    ensure_registry()
+    query = "SELECT collection_name, kind, bucket, name FROM dataprep_document_registry WHERE status = 'deleting'"
+    with get_db_connection_pool().connection() as conn:
+        with conn.cursor() as cur:
+            rows = cur.execute(query).fetchall()
+
+    for collection_name, kind, bucket, name in rows:
+        schedule_deletions([(kind, bucket, name)], collection_name)
+    if rows:
+        logger.info(f"Resumed {len(rows)} pending deletion(s)")
@@ -1,46 +1,40 @@
 # Copyright (C) 2025 Intel Corporation
 # SPDX-License-Identifier: Apache-2.0
 
-import requests
+import asyncio
+import aiohttp
 import psycopg
 import ipaddress
 import socket
 import os
+from concurrent.futures.process import BrokenProcessPool
 from urllib.parse import urlparse
 from http import HTTPStatus
 from fastapi import HTTPException
-from typing import List, Optional
-from langchain.text_splitter import RecursiveCharacterTextSplitter
-from langchain_openai import OpenAIEmbeddings
-from langchain_postgres.vectorstores import PGVector
+from starlette.concurrency import run_in_threadpool
+from typing import List, NamedTuple, Optional
 from .logger import logger
 from .config import Settings
-from .db_config import pool_execution
-from .utils import get_separators, parse_html
+from .registry import URL, get_content_hashes, list_documents, mark_for_deletion, schedule_deletions
+from .extraction import extract_html_chunks, get_extraction_pool, reset_extraction_pool
+from .utils import get_separators, notify_index_updated
+from .vector_writer import get_vector_writer
 
 config = Settings()
 
 async def get_urls_embedding() -> List[str]:
     """
-    Retrieve a list of distinct URLs from the database based on the specified index name.
-    This function executes a SQL query to fetch distinct URLs from the `langchain_pg_embedding`
-    table by joining it with the `langchain_pg_collection` table. The URLs are filtered based
-    on the collection name specified in the configuration.
+    Retrieve the list of ingested URLs from the document registry, which holds one entry
+    per URL, so listing does not scan the chunks in the embeddings table. URLs whose deletion
+    is in progress are not listed.
 
     Returns:
         List[str]: A list of distinct URLs retrieved from the database.
     """
 
-    url_list = []
-    query = "SELECT DISTINCT \
-    lpc.cmetadata ->> 'url' as url FROM \
-    langchain_pg_embedding lpc JOIN langchain_pg_collection lpcoll \
-    ON lpc.collection_id = lpcoll.uuid WHERE lpcoll.name = %(index_name)s"
+    result_rows = await run_in_threadpool(list_documents, URL)
 
-    params = {"index_name": config.INDEX_NAME}
-    result_rows = pool_execution(query, params)
-
-    url_list = [row[0] for row in result_rows if row[0]]
+    url_list = [name for _, name in result_rows]
 
     return url_list
 
@@ -105,11 +99,86 @@ def validate_url(url: str) -> bool:
         return False
 
 
+class FetchResult(NamedTuple):
+    url: str
+    html: Optional[str] = None
+    status: Optional[int] = None
+    error: Optional[str] = None
+    ssl_error: bool = False
+
+
+async def fetch_url(session: aiohttp.ClientSession, url: str) -> FetchResult:
+    """
+    Validates a URL and downloads its content. The page is fetched once and the content is
+    reused for parsing, the response status tells whether the URL is valid.
+
+    Args:
+        session (aiohttp.ClientSession): Session whose connection pool is shared by all fetches.
+        url (str): The URL to fetch.
+
+    Returns:
+        FetchResult: The HTML of the page, or the status or error that made the URL invalid.
+    """
+
+    # Hostname resolution is blocking, run it next to the other fetches
+    if not await asyncio.to_thread(validate_url, url):
+        return FetchResult(url, error="URL validation failed")
+
+    try:
+        async with session.get(url, allow_redirects=True) as response:
+            if response.status != HTTPStatus.OK:
+                return FetchResult(url, status=response.status, error=f"status code {response.status}")
+            html = await response.text(errors="replace")
+            return FetchResult(url, html=html, status=response.status)
+
+    # If the domain name is wrong, SSLError will be thrown
+    except aiohttp.ClientSSLError as e:
+        return FetchResult(url, error=str(e), ssl_error=True)
+
+    except Exception as e:
+        return FetchResult(url, error=str(e) or type(e).__name__)
+
+
+async def fetch_urls(url_list: List[str]) -> List[FetchResult]:
+    """
+    Fetches URLs concurrently over keep-alive connections, with at most `URL_FETCH_CONCURRENCY`
+    connections in total and `URL_FETCH_PER_HOST` connections to any single host.
+
+    Args:
+        url_list (List[str]): The URLs to fetch.
+
+    Returns:
+        List[FetchResult]: Result of every URL, in the order of `url_list`.
+    """
+
+    default_user_agent = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/117.0.0.0 Safari/537.36"
+
+    headers = {
+        "User-Agent": os.getenv("USER_AGENT_HEADER", default_user_agent)
+    }
+
+    connector = aiohttp.TCPConnector(
+        limit=config.URL_FETCH_CONCURRENCY,
+        limit_per_host=config.URL_FETCH_PER_HOST,
+        keepalive_timeout=30,
+    )
+    timeout = aiohttp.ClientTimeout(total=config.URL_FETCH_TIMEOUT, sock_connect=5, sock_read=5)
+
+    async with aiohttp.ClientSession(
+        connector=connector, timeout=timeout, headers=headers, trust_env=True
+    ) as session:
+        return await asyncio.gather(*(fetch_url(session, url) for url in url_list))
+
+
 def ingest_url_to_pgvector(url_list: List[str]) -> None:
     """
     Ingests a list of URLs into a PGVector database by fetching their content,
     splitting it into chunks, generating embeddings, and storing them.
 
+    All URLs are fetched concurrently, and every page is fetched once for both validation and
+    parsing. Pages whose text did not change since they were last ingested are skipped, the
+    chunks of changed pages replace their previous chunks.
+
     Args:
         url_list (List[str]): A list of URLs to be ingested.
 
@@ -118,97 +187,72 @@ def ingest_url_to_pgvector(url_list: List[str]) -> None:
             HTML parsing, or any other errors during the ingestion process.
     """
 
-    default_user_agent = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/117.0.0.0 Safari/537.36"
+    url_list = list(dict.fromkeys(url_list))
+    results = asyncio.run(fetch_urls(url_list))
 
-    headers = {
-        "User-Agent": os.getenv("USER_AGENT_HEADER", default_user_agent)
-    }
-
-    try:
-        invalid_urls = 0
-        for url in url_list:
-            if not validate_url(url):
-                logger.info(f"Invalid URL skipped: {url}")
-                invalid_urls += 1
-                continue
+    invalid_results = [result for result in results if result.html is None]
+    for result in invalid_results:
+        logger.info(f"Invalid URL skipped: {result.url} ({result.error})")
 
-            try:
-                # Use a custom HTTP adapter to enforce IP-based restrictions
-                with requests.Session() as session:
-                    adapter = requests.adapters.HTTPAdapter()
-                    session.mount("http://", adapter)
-                    session.mount("https://", adapter)
-                    response = session.get(url, headers=headers, timeout=5, allow_redirects=True)
-
-                if response.status_code != HTTPStatus.OK:
-                    logger.info(f"Failed to fetch URL: {url} with status code {response.status_code}")
-                    invalid_urls += 1
-            except Exception as e:
-                logger.error(f"Error fetching URL {url}: {e}")
-                invalid_urls += 1
-
-        if invalid_urls > 0:
-            raise Exception(
-                f"{invalid_urls} / {len(url_list)} URL(s) are invalid.",
-                response.status_code
-            )
-
-    # If the domain name is wrong, SSLError will be thrown
-    except requests.exceptions.SSLError as e:
+    ssl_errors = [result for result in invalid_results if result.ssl_error]
+    if ssl_errors:
         raise HTTPException(
-            status_code=HTTPStatus.FORBIDDEN, detail=f"SSL Error: {str(e)}"
+            status_code=HTTPStatus.FORBIDDEN, detail=f"SSL Error: {ssl_errors[0].error}"
         )
 
-    except Exception as e:
+    if invalid_results:
         raise HTTPException(
-            status_code=e.args[1], detail=e.args[0]
+            status_code=HTTPStatus.BAD_REQUEST,
+            detail=f"{len(invalid_results)} / {len(url_list)} URL(s) are invalid.",
         )
 
-    try:
-        text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=config.CHUNK_SIZE,
-            chunk_overlap=config.CHUNK_OVERLAP,
-            add_start_index=True,
-            separators=get_separators(),
+    # Convert the pages to text and split them in the extraction processes
+    pool = get_extraction_pool(config.EXTRACTION_WORKERS)
+    futures = [
+        pool.submit(
+            extract_html_chunks, result.html, config.CHUNK_SIZE, config.CHUNK_OVERLAP, get_separators()
         )
+        for result in results
+    ]
+
+    pages = []
+    for url, future in zip(url_list, futures):
+        try:
+            content_hash, chunks = future.result()
+        except Exception as e:
+            logger.error(f"Error while parsing HTML content for URL - {url}: {e}")
+            if isinstance(e, BrokenProcessPool):
+                reset_extraction_pool()
+            for pending in futures:
+                pending.cancel()
+            raise HTTPException(status_code=HTTPStatus.INTERNAL_SERVER_ERROR, detail=f"Error while parsing URL")
 
-        embedder = OpenAIEmbeddings(
-            openai_api_key="EMPTY",
-            openai_api_base="{}".format(config.TEI_ENDPOINT_URL),
-            model=config.EMBEDDING_MODEL_NAME,
-            tiktoken_enabled=False
+        pages.append((url, content_hash, chunks))
+
+    try:
+        # Hashes of URLs ingested before hashes were recorded, or being deleted, are None
+        ingested_hashes = get_content_hashes(URL, url_list)
+
+        changed_pages = []
+        for url, content_hash, chunks in pages:
+            if ingested_hashes.get(url) == content_hash:
+                logger.info(f"[ ingest url ] url: {url} is unchanged, skipped")
+                continue
+            logger.info(f"[ ingest url ] url: {url} chunks: {len(chunks)}")
+            changed_pages.append((url, content_hash, chunks))
+
+        if not changed_pages:
+            return
+
+        documents = (
+            (chunk, {"url": url, "content_hash": content_hash})
+            for url, content_hash, chunks in changed_pages
+            for chunk in chunks
         )
+        replaced_urls = [url for url, _, _ in changed_pages if url in ingested_hashes]
 
-        for url in url_list:
-            try:
-                content = parse_html(
-                    [url], chunk_size=config.CHUNK_SIZE, chunk_overlap=config.CHUNK_OVERLAP
-                )
-            except Exception as e:
-                logger.error(f"Error while parsing HTML content for URL - {url}: {e}")
-                raise HTTPException(status_code=HTTPStatus.INTERNAL_SERVER_ERROR, detail=f"Error while parsing URL")
-
-            logger.info(f"[ ingest url ] url: {url} content: {content} headers: {headers}")
-            metadata = [{"url": url}]
-
-            chunks = text_splitter.split_text(content)
-            batch_size = config.BATCH_SIZE
-
-            for i in range(0, len(chunks), batch_size):
-                batch_texts = chunks[i : i + batch_size]
-
-                _ = PGVector.from_texts(
-                    texts=batch_texts,
-                    embedding=embedder,
-                    metadatas=metadata,
-                    collection_name=config.INDEX_NAME,
-                    connection=config.PG_CONNECTION_STRING,
-                    use_jsonb=True
-                )
-
-                logger.info(
-                    f"Processed batch {i // batch_size + 1}/{(len(chunks) - 1) // batch_size + 1}"
-                )
+        get_vector_writer().store_documents(documents, replace=("url", replaced_urls))
+        notify_index_updated(f"ingested {len(changed_pages)} URL(s)")
 
     except Exception as e:
         logger.error(f"Error during ingestion : {e}")
@@ -220,13 +264,15 @@ def ingest_url_to_pgvector(url_list: List[str]) -> None:
 async def delete_embeddings_url(url: Optional[str], delete_all: bool = False) -> bool:
     """
     Deletes embeddings from the database based on the provided URL or deletes all embeddings.
+    The URLs are marked for deletion in the document registry, which removes them from the
+    URL list at once, and their embeddings are deleted in batches in the background.
 
     Args:
         url (Optional[str]): The URL whose embeddings should be deleted. Required if `delete_all` is False.
         delete_all (bool): If True, deletes embeddings for all URLs in the database. Defaults to False.
 
     Returns:
-        bool: True if the deletion was successful, False otherwise.
+        bool: True if the deletion of the embeddings was scheduled.
 
     Raises:
         HTTPException: If no URLs are present in the database when `delete_all` is True.
@@ -247,37 +293,26 @@ async def delete_embeddings_url(url: Optional[str], delete_all: bool = False) ->
                 detail="No URLs present in the database.",
             )
 
-            query = "DELETE FROM \
-            langchain_pg_embedding WHERE \
-            collection_id = (SELECT uuid FROM langchain_pg_collection WHERE name = %(indexname)s) \
-            AND cmetadata ? 'url'"
-
-            params = {"indexname": config.INDEX_NAME}
+            keys = await run_in_threadpool(mark_for_deletion, URL)
 
         elif url:
             if url not in url_list:
                 raise ValueError(f"URL {url} does not exist in the database.")
             else:
-                query = "DELETE FROM \
-                langchain_pg_embedding WHERE \
-                collection_id = (SELECT uuid FROM langchain_pg_collection WHERE name = %(indexname)s) \
-                AND cmetadata ->> 'url' = %(link)s"
-
-                params = {"indexname": config.INDEX_NAME, "link": url}
+                keys = await run_in_threadpool(mark_for_deletion, URL, name=url)
 
         else:
             raise ValueError(
                 "Invalid Arguments: url is required if delete_all is False."
             )
 
-        result = pool_execution(query, params)
-        if result:
-            return True
-        else:
-            return False
+        schedule_deletions(keys)
+        logger.info(f"Scheduled deletion of {len(keys)} URL(s)")
+        notify_index_updated(f"deleting {len(keys)} URL(s)")
+        return True
 
     except psycopg.Error as e:
         raise HTTPException(status_code=HTTPStatus.INTERNAL_SERVER_ERROR, detail=f"PSYCOPG Error: {e}")
 
     except ValueError as e:
-        raise e
\ No newline at end of file
+        raise e
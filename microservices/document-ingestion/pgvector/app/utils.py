@@ -1,10 +1,16 @@
 # Copyright (C) 2025 Intel Corporation
 # SPDX-License-Identifier: Apache-2.0
 
+import threading
+import requests
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 from langchain_community.document_loaders import AsyncHtmlLoader
 from langchain_community.document_transformers import Html2TextTransformer
+from .config import Settings
 from .db_config import pool_execution
+from .logger import logger
+
+config = Settings()
 
 def check_tables_exist() -> bool:
     """Check if the required tables exist in the database."""
@@ -21,6 +27,31 @@ def check_tables_exist() -> bool:
 
     return tables_exist[0][0]
 
+def notify_index_updated(reason: str) -> None:
+    """
+    Notifies the services that cache retrieval results, e.g. ChatQnA, that the documents of
+    the collection changed, without waiting for their answer. Does nothing unless
+    INDEX_UPDATE_NOTIFY_URL is set. Failures are only logged, as the documents were updated
+    regardless.
+
+    Args:
+        reason (str): What changed, for the logs.
+    """
+
+    urls = [url.strip() for url in config.INDEX_UPDATE_NOTIFY_URL.split(",") if url.strip()]
+    if not urls:
+        return
+
+    def _post():
+        for url in urls:
+            try:
+                requests.post(url, timeout=5).raise_for_status()
+            except requests.RequestException as ex:
+                logger.warning(f"Could not notify index update ({reason}) at {url}: {ex}")
+
+    threading.Thread(target=_post, name="index-notify", daemon=True).start()
+
+
 def get_separators():
     """
     Retrieves a list of separators commonly used for splitting text.
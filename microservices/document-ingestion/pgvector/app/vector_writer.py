@@ -0,0 +1,211 @@
+# Copyright (C) 2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+import threading
+import uuid
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import Iterable, List, Optional, Tuple
+
+from psycopg.types.json import Jsonb
+from langchain_openai import OpenAIEmbeddings
+from langchain_postgres.vectorstores import PGVector
+from .logger import logger
+from .config import Settings
+from .db_config import get_db_connection_pool
+from .registry import claim_documents, ensure_registry, register_chunks, registry_key
+
+config = Settings()
+
+COPY_EMBEDDINGS = (
+    "COPY langchain_pg_embedding (id, collection_id, embedding, document, cmetadata) FROM STDIN"
+)
+
+vector_writer = None
+_writer_lock = threading.Lock()
+
+
+def _vector_literal(embedding: List[float]) -> str:
+    """Formats an embedding in the text representation of the pgvector `vector` type."""
+    return "[" + ",".join(str(float(value)) for value in embedding) + "]"
+
+
+def _batched(items: Iterable, batch_size: int):
+    iterator = iter(items)
+    while batch := list(islice(iterator, batch_size)):
+        yield batch
+
+
+class VectorWriter:
+    """
+    Embeds document chunks and writes them to the PGVector collection in bulk.
+
+    The embedding client, the embedding thread pool and the database connection pool are
+    created once and shared by all ingestions. Chunks are embedded in batches of
+    `BATCH_SIZE` with up to `EMBEDDING_CONCURRENCY` requests in flight, and every batch is
+    written with a single `COPY` as soon as its embeddings arrive. The rows of one ingestion
+    are written in one transaction, so a failed ingestion leaves no partial document behind.
+    The stored documents are recorded in the document registry in the same transaction.
+
+    Rows use the tables created by `langchain_postgres`, so documents remain readable through
+    `PGVector` by the retrieval services.
+    """
+
+    def __init__(
+        self,
+        collection_name: str = config.INDEX_NAME,
+        batch_size: int = config.BATCH_SIZE,
+        concurrency: int = config.EMBEDDING_CONCURRENCY,
+    ):
+        self.collection_name = collection_name
+        self.batch_size = max(1, batch_size)
+        self.concurrency = max(1, concurrency)
+        self.embedder = OpenAIEmbeddings(
+            openai_api_key="EMPTY",
+            openai_api_base="{}".format(config.TEI_ENDPOINT_URL),
+            model=config.EMBEDDING_MODEL_NAME,
+            tiktoken_enabled=False
+        )
+        self.executor = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="embedding")
+        self._collection_lock = threading.Lock()
+
+    def _create_collection(self) -> None:
+        # PGVector creates the vector extension, the tables and the collection if they don't exist
+        PGVector(
+            embeddings=self.embedder,
+            collection_name=self.collection_name,
+            connection=config.PG_CONNECTION_STRING,
+            use_jsonb=True,
+        )
+
+    def get_collection_id(self, conn) -> str:
+        """Returns the uuid of the collection, creating the collection if needed."""
+
+        query = "SELECT uuid FROM langchain_pg_collection WHERE name = %(name)s"
+        params = {"name": self.collection_name}
+
+        with conn.cursor() as cur:
+            try:
+                row = cur.execute(query, params).fetchone()
+            except Exception:
+                # Tables are missing before the first ingestion
+                conn.rollback()
+                row = None
+
+        if row is None:
+            with self._collection_lock:
+                self._create_collection()
+            with conn.cursor() as cur:
+                row = cur.execute(query, params).fetchone()
+
+        return str(row[0])
+
+    def copy_rows(
+        self, conn, collection_id: str, texts: List[str], metadatas: List[dict], embeddings: List[List[float]]
+    ) -> int:
+        """Writes one batch of embedded chunks with COPY and returns the number of rows written."""
+
+        with conn.cursor() as cur:
+            with cur.copy(COPY_EMBEDDINGS) as copy:
+                for text, metadata, embedding in zip(texts, metadatas, embeddings):
+                    copy.write_row((
+                        str(uuid.uuid4()),
+                        collection_id,
+                        _vector_literal(embedding),
+                        # PostgreSQL text cannot contain NUL characters, which PDF extraction sometimes yields
+                        text.replace("\x00", ""),
+                        Jsonb(metadata),
+                    ))
+        return len(texts)
+
+    def delete_by_metadata(self, conn, collection_id: str, key: str, values: List[str]) -> int:
+        """Deletes the rows of the collection whose metadata `key` has one of `values`."""
+
+        query = (
+            "DELETE FROM langchain_pg_embedding WHERE collection_id = %(collection_id)s "
+            "AND cmetadata ->> %(key)s::text = ANY(%(values)s)"
+        )
+        with conn.cursor() as cur:
+            cur.execute(query, {"collection_id": collection_id, "key": key, "values": list(values)})
+            return cur.rowcount
+
+    def store_documents(
+        self, documents: Iterable[Tuple[str, dict]], replace: Optional[Tuple[str, List[str]]] = None
+    ) -> int:
+        """
+        Embeds and stores document chunks.
+
+        Args:
+            documents (Iterable[Tuple[str, dict]]): (text, metadata) of every chunk. The iterable
+                may be a generator that produces chunks while earlier batches are embedded.
+            replace (Tuple[str, List[str]], optional): Metadata key and values of the rows that
+                the new chunks replace. They are deleted in the same transaction, so readers see
+                either the old or the new rows.
+
+        Returns:
+            int: Number of chunks stored.
+        """
+
+        # Batches are written in order, while up to twice the number of embedding
+        # workers are embedded ahead
+        max_in_flight = self.concurrency * 2
+        pending = deque()
+        stored = 0
+        registered = {}
+
+        ensure_registry()
+        pool = get_db_connection_pool()
+        with pool.connection() as conn:
+            collection_id = self.get_collection_id(conn)
+            if replace and replace[1]:
+                replaced_keys = [registry_key({replace[0]: value}) for value in replace[1]]
+                claim_documents(conn, self.collection_name, [key for key in replaced_keys if key])
+                deleted = self.delete_by_metadata(conn, collection_id, *replace)
+                logger.info(f"Replacing {deleted} chunks of {len(replace[1])} {replace[0]}(s)")
+
+            def write_oldest() -> int:
+                texts, metadatas, future = pending.popleft()
+                return self.copy_rows(conn, collection_id, texts, metadatas, future.result())
+
+            try:
+                for batch_num, batch in enumerate(_batched(documents, self.batch_size), start=1):
+                    texts = [text for text, _ in batch]
+                    metadatas = [metadata for _, metadata in batch]
+                    for metadata in metadatas:
+                        key = registry_key(metadata)
+                        if key:
+                            document = registered.setdefault(key, {
+                                "chunk_count": 0,
+                                "source": metadata.get("source"),
+                                "content_hash": metadata.get("content_hash"),
+                            })
+                            document["chunk_count"] += 1
+                    pending.append((texts, metadatas, self.executor.submit(self.embedder.embed_documents, texts)))
+
+                    if len(pending) >= max_in_flight:
+                        stored += write_oldest()
+                        logger.info(f"Stored {stored} chunks after {batch_num} batches")
+
+                while pending:
+                    stored += write_oldest()
+
+                register_chunks(conn, self.collection_name, registered)
+
+            except BaseException:
+                for _, _, future in pending:
+                    future.cancel()
+                raise
+
+        logger.info(f"Stored {stored} chunks in collection {self.collection_name}")
+        return stored
+
+
+def get_vector_writer() -> VectorWriter:
+    """Retrieves the vector writer shared by all ingestions, creating it on first use."""
+
+    global vector_writer
+    with _writer_lock:
+        if vector_writer is None:
+            vector_writer = VectorWriter()
+    return vector_writer
@@ -0,0 +1,238 @@
+import contextlib
+import pytest
+from unittest.mock import patch
+from app import registry
+from app.document import delete_embeddings
+from app.registry import FILE, URL
+from app.url import delete_embeddings_url
+
+
+class FakeCursor:
+    """Answers every query with the (rows, rowcount) that `respond(query, params)` returns."""
+
+    def __init__(self, db):
+        self.db = db
+        self.rows = []
+        self.rowcount = 0
+
+    def execute(self, query, params=None):
+        self.db.queries.append((" ".join(query.split()), params))
+        self.rows, self.rowcount = self.db.respond(" ".join(query.split()), params)
+        return self
+
+    def executemany(self, query, params_seq):
+        for params in params_seq:
+            self.execute(query, params)
+
+    def fetchone(self):
+        return self.rows[0] if self.rows else None
+
+    def fetchall(self):
+        return self.rows
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, _exc_type, _exc_val, _exc_tb):
+        pass
+
+
+class FakeDatabase:
+    def __init__(self, respond=lambda query, params: ([], 0)):
+        self.respond = respond
+        self.queries = []
+
+    @contextlib.contextmanager
+    def connection(self):
+        yield self
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def executed(self, prefix):
+        return [(query, params) for query, params in self.queries if query.startswith(prefix)]
+
+
+@pytest.fixture
+def registry_ready():
+    with patch("app.registry.registry_ready", True):
+        yield
+
+
+def test_registry_key():
+    """
+    Tests that chunks map to the registry key of their document: URLs by the URL with an
+    empty bucket, files by their bucket and file name, and other chunks to no document.
+    """
+
+    assert registry.registry_key({"url": "http://example.com", "content_hash": "abc"}) == (URL, "", "http://example.com")
+    assert registry.registry_key({"bucket": "bucket1", "filename": "file1.txt"}) == (FILE, "bucket1", "file1.txt")
+    assert registry.registry_key({"bucket": "bucket1"}) is None
+
+
+def test_mark_for_deletion(registry_ready):
+    """
+    Tests that documents are marked pending deletion with a single UPDATE and that the keys of
+    the marked documents are returned. Without a name, every document of the bucket is marked.
+    """
+
+    db = FakeDatabase(lambda query, params: ([("file", "bucket1", "a.txt"), ("file", "bucket1", "b.txt")], 2))
+
+    with patch("app.registry.get_db_connection_pool", return_value=db):
+        keys = registry.mark_for_deletion(FILE, bucket="bucket1", collection_name="idx")
+
+    assert keys == [(FILE, "bucket1", "a.txt"), (FILE, "bucket1", "b.txt")]
+    [(query, params)] = db.queries
+    assert query.startswith("UPDATE dataprep_document_registry SET status = 'deleting'")
+    assert "status = 'ready'" in query
+    assert params == {"collection_name": "idx", "kind": FILE, "bucket": "bucket1", "name": None}
+
+
+def batch_database(status, deleted):
+    def respond(query, params):
+        if query.startswith("SELECT status"):
+            return ([(status,)] if status else []), 1
+        if query.startswith("DELETE FROM langchain_pg_embedding"):
+            return [], deleted
+        return [], 1
+
+    return FakeDatabase(respond)
+
+
+@pytest.mark.parametrize("key", [(FILE, "bucket1", "a.txt"), (URL, "", "http://example.com")])
+def test_delete_chunks_batch_full_batch(key):
+    """
+    Tests that a full batch of deleted chunks reports that chunks remain and lowers the chunk
+    count of the registry entry, deleting the chunks by the metadata of the document kind.
+    """
+
+    db = batch_database(registry.DELETING, deleted=100)
+
+    with patch("app.registry.get_db_connection_pool", return_value=db):
+        assert registry.delete_chunks_batch("idx", key, batch_size=100) is True
+
+    [(_, delete_params)] = db.executed("DELETE FROM langchain_pg_embedding")
+    assert delete_params == {"collection_name": "idx", "kind": key[0], "bucket": key[1], "name": key[2], "batch_size": 100}
+    [(_, update_params)] = db.executed("UPDATE dataprep_document_registry SET chunk_count")
+    assert update_params["deleted"] == 100
+    assert not db.executed("DELETE FROM dataprep_document_registry")
+
+
+def test_delete_chunks_batch_last_batch():
+    """
+    Tests that the last, partial batch removes the registry entry and reports that the
+    deletion is complete.
+    """
+
+    db = batch_database(registry.DELETING, deleted=12)
+
+    with patch("app.registry.get_db_connection_pool", return_value=db):
+        assert registry.delete_chunks_batch("idx", (FILE, "bucket1", "a.txt"), batch_size=100) is False
+
+    assert len(db.executed("DELETE FROM dataprep_document_registry")) == 1
+
+
+@pytest.mark.parametrize("status", [registry.READY, None])
+def test_delete_chunks_batch_stops_when_not_deleting(status):
+    """
+    Tests that a deletion stops without deleting chunks when the document was re-ingested
+    since it was marked (status back to ready) or its entry is gone.
+    """
+
+    db = batch_database(status, deleted=100)
+
+    with patch("app.registry.get_db_connection_pool", return_value=db):
+        assert registry.delete_chunks_batch("idx", (FILE, "bucket1", "a.txt"), batch_size=100) is False
+
+    assert not db.executed("DELETE")
+
+
+def test_run_deletion_deletes_in_batches():
+    """
+    Tests that a background deletion deletes batches until none remain and notifies the
+    retrieval services once the document is gone.
+    """
+
+    key = (FILE, "bucket1", "a.txt")
+    with patch("app.registry.delete_chunks_batch", side_effect=[True, True, False]) as mock_batch, \
+            patch("app.registry.notify_index_updated") as mock_notify:
+        registry._run_deletion("idx", key)
+
+    assert mock_batch.call_count == 3
+    mock_notify.assert_called_once()
+
+
+def test_run_deletion_failure_keeps_pending():
+    """
+    Tests that a failed deletion is logged rather than raised, without notifying, so the
+    entry stays marked for deletion and is resumed on the next start.
+    """
+
+    with patch("app.registry.delete_chunks_batch", side_effect=[True, RuntimeError("connection lost")]), \
+            patch("app.registry.notify_index_updated") as mock_notify:
+        registry._run_deletion("idx", (FILE, "bucket1", "a.txt"))
+
+    mock_notify.assert_not_called()
+
+
+def test_resume_deletions(registry_ready):
+    """
+    Tests that the deletions left pending by a restart are scheduled again, each in the
+    collection it was marked in.
+    """
+
+    rows = [("idx", FILE, "bucket1", "a.txt"), ("other", URL, "", "http://example.com")]
+    db = FakeDatabase(lambda query, params: (rows, len(rows)))
+
+    with patch("app.registry.get_db_connection_pool", return_value=db), \
+            patch("app.registry.schedule_deletions") as mock_schedule:
+        registry.resume_deletions()
+
+    assert "WHERE status = 'deleting'" in db.queries[0][0]
+    assert [call.args for call in mock_schedule.call_args_list] == [
+        ([(FILE, "bucket1", "a.txt")], "idx"),
+        ([(URL, "", "http://example.com")], "other"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_delete_embeddings_schedules_marked_documents():
+    """
+    Tests that deleting a file or a whole bucket marks the documents, schedules their
+    deletion in the background and returns True, which `/documents` DELETE relies on.
+    """
+
+    keys = [(FILE, "bucket1", "a.txt")]
+    with patch("app.document.mark_for_deletion", return_value=keys) as mock_mark, \
+            patch("app.document.schedule_deletions") as mock_schedule, \
+            patch("app.document.notify_index_updated"):
+        assert await delete_embeddings("bucket1", "a.txt") is True
+        mock_mark.assert_called_with(FILE, bucket="bucket1", name="a.txt")
+        mock_schedule.assert_called_with(keys)
+
+        assert await delete_embeddings("bucket1", None, delete_all=True) is True
+        mock_mark.assert_called_with(FILE, bucket="bucket1")
+
+        with pytest.raises(ValueError):
+            await delete_embeddings("bucket1", None)
+
+
+@pytest.mark.asyncio
+async def test_delete_embeddings_url():
+    """
+    Tests that deleting a listed URL schedules its deletion and returns True, and that an
+    unknown URL raises ValueError, which `/urls` DELETE reports as not found.
+    """
+
+    url = "http://example.com/doc1"
+    keys = [(URL, "", url)]
+    with patch("app.url.list_documents", return_value=[("", url)]), \
+            patch("app.url.mark_for_deletion", return_value=keys) as mock_mark, \
+            patch("app.url.schedule_deletions") as mock_schedule, \
+            patch("app.url.notify_index_updated"):
+        assert await delete_embeddings_url(url) is True
+        mock_mark.assert_called_with(URL, name=url)
+        mock_schedule.assert_called_with(keys)
+
+        with pytest.raises(ValueError):
+            await delete_embeddings_url("http://example.com/unknown")
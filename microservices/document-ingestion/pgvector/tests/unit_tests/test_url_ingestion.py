@@ -0,0 +1,179 @@
+import asyncio
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from unittest.mock import MagicMock, patch
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from fastapi import HTTPException
+from app.extraction import extract_html_chunks
+from app.url import FetchResult, fetch_urls, ingest_url_to_pgvector
+
+
+def page(text):
+    return f"<html><body><p>{text}</p></body></html>"
+
+
+async def fetch_from_test_server(paths, concurrency=2):
+    """
+    Serves pages from a local aiohttp server and fetches `paths` from it with `fetch_urls`.
+    Returns the fetch results and the highest number of requests served at the same time.
+    """
+
+    in_flight = 0
+    max_in_flight = 0
+
+    async def handler(request):
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        try:
+            await asyncio.sleep(0.05)
+            if request.path == "/missing":
+                return web.Response(status=404)
+            return web.Response(text=page(request.path), content_type="text/html")
+        finally:
+            in_flight -= 1
+
+    app = web.Application()
+    app.router.add_get("/{name}", handler)
+
+    async with TestServer(app, host="127.0.0.1") as server:
+        urls = [str(server.make_url(path)) for path in paths]
+        # The local server does not resolve to a public address
+        with patch("app.url.validate_url", return_value=True), \
+                patch("app.url.config.URL_FETCH_CONCURRENCY", concurrency), \
+                patch("app.url.config.URL_FETCH_PER_HOST", concurrency):
+            results = await fetch_urls(urls)
+
+    return urls, results, max_in_flight
+
+
+def test_fetch_urls_shares_bounded_pool():
+    """
+    Tests that URLs are fetched concurrently through one connection pool limited to
+    `URL_FETCH_CONCURRENCY` connections, and that the results keep the order of the URLs.
+    """
+
+    paths = [f"/page{i}" for i in range(6)]
+    urls, results, max_in_flight = asyncio.run(fetch_from_test_server(paths, concurrency=2))
+
+    assert [result.url for result in results] == urls
+    assert all(result.status == HTTPStatus.OK for result in results)
+    assert "/page3" in results[3].html
+    assert max_in_flight == 2
+
+
+def test_fetch_urls_reports_failing_url_in_batch():
+    """
+    Tests that a URL answering with an error status fails on its own, without affecting the
+    other URLs of the batch.
+    """
+
+    urls, results, _ = asyncio.run(fetch_from_test_server(["/page0", "/missing", "/page2"]))
+
+    assert [result.html is not None for result in results] == [True, False, True]
+    assert results[1].status == HTTPStatus.NOT_FOUND
+    assert results[1].error == "status code 404"
+
+
+def test_fetch_urls_skips_invalid_url():
+    """Tests that a URL failing validation is reported without being requested."""
+
+    with patch("app.url.validate_url", return_value=False):
+        [result] = asyncio.run(fetch_urls(["http://10.0.0.1/internal"]))
+
+    assert result == FetchResult("http://10.0.0.1/internal", error="URL validation failed")
+
+
+@pytest.fixture
+def ingestion():
+    """
+    Mocks the fetching, the registry lookups and the vector writer of URL ingestion. Pages are
+    extracted in a thread pool instead of the extraction processes.
+    """
+
+    executor = ThreadPoolExecutor(max_workers=2)
+    writer = MagicMock()
+    with patch("app.url.get_extraction_pool", return_value=executor), \
+            patch("app.url.get_vector_writer", return_value=writer), \
+            patch("app.url.notify_index_updated") as mock_notify, \
+            patch("app.url.get_content_hashes") as mock_hashes, \
+            patch("app.url.fetch_urls") as mock_fetch:
+        yield {"writer": writer, "notify": mock_notify, "hashes": mock_hashes, "fetch": mock_fetch}
+    executor.shutdown()
+
+
+def serve(mock_fetch, pages):
+    async def fetch(url_list):
+        return [
+            FetchResult(url, html=pages[url], status=HTTPStatus.OK) if pages[url] is not None
+            else FetchResult(url, status=HTTPStatus.NOT_FOUND, error="status code 404")
+            for url in url_list
+        ]
+
+    mock_fetch.side_effect = fetch
+
+
+def content_hash(html):
+    return extract_html_chunks(html, 1500, 200, ["\n\n", "\n", " ", ""])[0]
+
+
+def test_ingest_skips_unchanged_pages(ingestion):
+    """
+    Tests re-ingestion of URLs by content hash.
+    Assertions:
+        - A page whose text hash matches the stored hash is not embedded again.
+        - A changed page replaces the chunks of its previous version.
+        - A new page is stored without replacing anything.
+    """
+
+    pages = {
+        "http://example.com/unchanged": page("same text"),
+        "http://example.com/changed": page("new text"),
+        "http://example.com/new": page("first version"),
+    }
+    serve(ingestion["fetch"], pages)
+    ingestion["hashes"].return_value = {
+        "http://example.com/unchanged": content_hash(page("same text")),
+        "http://example.com/changed": content_hash(page("old text")),
+    }
+
+    ingest_url_to_pgvector(list(pages))
+
+    documents, = ingestion["writer"].store_documents.call_args.args
+    replace = ingestion["writer"].store_documents.call_args.kwargs["replace"]
+    stored = list(documents)
+    assert {metadata["url"] for _, metadata in stored} == {"http://example.com/changed", "http://example.com/new"}
+    assert all(metadata["content_hash"] == content_hash(pages[metadata["url"]]) for _, metadata in stored)
+    assert replace == ("url", ["http://example.com/changed"])
+    ingestion["notify"].assert_called_once()
+
+
+def test_ingest_all_unchanged_stores_nothing(ingestion):
+    """Tests that re-ingesting unchanged pages neither writes chunks nor notifies the retrievers."""
+
+    url = "http://example.com/unchanged"
+    serve(ingestion["fetch"], {url: page("same text")})
+    ingestion["hashes"].return_value = {url: content_hash(page("same text"))}
+
+    ingest_url_to_pgvector([url, url])
+
+    ingestion["writer"].store_documents.assert_not_called()
+    ingestion["notify"].assert_not_called()
+
+
+def test_ingest_failing_url_in_batch(ingestion):
+    """
+    Tests that a failing URL in a batch rejects the batch with 400 before any page is
+    extracted or stored.
+    """
+
+    serve(ingestion["fetch"], {"http://example.com/ok": page("text"), "http://example.com/missing": None})
+
+    with pytest.raises(HTTPException) as exc_info:
+        ingest_url_to_pgvector(["http://example.com/ok", "http://example.com/missing"])
+
+    assert exc_info.value.status_code == HTTPStatus.BAD_REQUEST
+    assert exc_info.value.detail == "1 / 2 URL(s) are invalid."
+    ingestion["writer"].store_documents.assert_not_called()
@@ -0,0 +1,198 @@
+import contextlib
+import pytest
+from unittest.mock import patch
+from app.vector_writer import VectorWriter, _vector_literal
+
+
+COLLECTION_ID = "5f1c6a52-3f0e-4d6b-9a57-6c1d2e0b7a11"
+
+
+class FakeCopy:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def write_row(self, row):
+        self.conn.pending.append(row)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, _exc_type, _exc_val, _exc_tb):
+        pass
+
+
+class FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+        self.rowcount = 0
+
+    def execute(self, query, params=None):
+        self.conn.queries.append((query, params))
+        if query.startswith("DELETE"):
+            self.rowcount = 3
+        return self
+
+    def fetchone(self):
+        return (COLLECTION_ID,)
+
+    def copy(self, statement):
+        self.conn.copy_statements.append(statement)
+        return FakeCopy(self.conn)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, _exc_type, _exc_val, _exc_tb):
+        pass
+
+
+class FakeConnection:
+    """Keeps the rows written in the current transaction apart from the committed rows."""
+
+    def __init__(self):
+        self.pending = []
+        self.committed = []
+        self.queries = []
+        self.copy_statements = []
+        self.rollbacks = 0
+
+    def cursor(self):
+        return FakeCursor(self)
+
+
+class FakePool:
+    def __init__(self):
+        self.conn = FakeConnection()
+
+    @contextlib.contextmanager
+    def connection(self):
+        # Like psycopg_pool, commit when the block succeeds and roll back when it raises
+        try:
+            yield self.conn
+        except BaseException:
+            self.conn.pending.clear()
+            self.conn.rollbacks += 1
+            raise
+        self.conn.committed.extend(self.conn.pending)
+        self.conn.pending.clear()
+
+
+class FakeEmbedder:
+    """Embeds every text as [length, 0.5] and fails on the texts listed in `fail_on`."""
+
+    def __init__(self, fail_on=()):
+        self.fail_on = set(fail_on)
+
+    def embed_documents(self, texts):
+        if self.fail_on.intersection(texts):
+            raise RuntimeError("embedding service unavailable")
+        return [[len(text), 0.5] for text in texts]
+
+
+@pytest.fixture
+def writer():
+    """
+    Provides a VectorWriter with a fake embedder and a fake connection pool, and mocks the
+    document registry calls made in the ingestion transaction.
+    """
+
+    pool = FakePool()
+    writer = VectorWriter(collection_name="test-collection", batch_size=2, concurrency=2)
+    writer.embedder = FakeEmbedder()
+
+    with patch("app.vector_writer.get_db_connection_pool", return_value=pool), \
+            patch("app.vector_writer.ensure_registry"), \
+            patch("app.vector_writer.claim_documents") as mock_claim, \
+            patch("app.vector_writer.register_chunks") as mock_register:
+        writer.pool = pool
+        writer.mock_claim = mock_claim
+        writer.mock_register = mock_register
+        yield writer
+
+    writer.executor.shutdown()
+
+
+def test_vector_literal():
+    """
+    Tests that embeddings are formatted in the text representation of the pgvector `vector` type.
+    """
+
+    assert _vector_literal([1, 0.25, -3.5]) == "[1.0,0.25,-3.5]"
+
+
+def test_store_documents_copy_rows(writer):
+    """
+    Tests the rows that `store_documents` writes with COPY.
+    Assertions:
+        - Every chunk is written as (id, collection id, vector literal, text, metadata), in order.
+        - NUL characters are removed from the text.
+        - The metadata is serialized as JSONB.
+        - The chunks are registered per document in the same transaction.
+    """
+
+    metadata = {"bucket": "bucket1", "filename": "file1.txt", "source": "/tmp/file1.txt"}
+    documents = [("first chunk", metadata), ("sec\x00ond", metadata), ("third", metadata)]
+
+    stored = writer.store_documents(iter(documents))
+
+    conn = writer.pool.conn
+    assert stored == 3
+    assert conn.copy_statements[0].startswith(
+        "COPY langchain_pg_embedding (id, collection_id, embedding, document, cmetadata)"
+    )
+    assert len(conn.committed) == 3
+
+    rows = conn.committed
+    assert len({row[0] for row in rows}) == 3
+    assert all(row[1] == COLLECTION_ID for row in rows)
+    assert [row[2] for row in rows] == ["[11.0,0.5]", "[7.0,0.5]", "[5.0,0.5]"]
+    assert [row[3] for row in rows] == ["first chunk", "second", "third"]
+    assert [row[4].obj for row in rows] == [metadata] * 3
+
+    registered = writer.mock_register.call_args[0][2]
+    assert registered == {
+        ("file", "bucket1", "file1.txt"): {"chunk_count": 3, "source": "/tmp/file1.txt", "content_hash": None}
+    }
+
+
+def test_store_documents_replace(writer):
+    """
+    Tests that the rows replaced by the new chunks are claimed in the registry and deleted
+    in the transaction that writes the new chunks.
+    """
+
+    url = "http://example.com/doc1"
+    documents = [("new chunk", {"url": url, "content_hash": "abc"})]
+
+    writer.store_documents(documents, replace=("url", [url]))
+
+    conn = writer.pool.conn
+    writer.mock_claim.assert_called_once_with(conn, "test-collection", [("url", "", url)])
+    params = next(p for q, p in conn.queries if q.startswith("DELETE"))
+    assert params == {"collection_id": COLLECTION_ID, "key": "url", "values": [url]}
+    assert [row[3] for row in conn.committed] == ["new chunk"]
+
+
+def test_store_documents_rolls_back_failed_document(writer):
+    """
+    Tests that a document whose embedding fails after earlier batches were written is rolled
+    back as a whole, while the documents stored before it stay committed.
+    Assertions:
+        - The failure is raised to the caller.
+        - No chunk of the failed document is committed and it is not registered.
+    """
+
+    first = [(f"chunk {i} of a", {"bucket": "b", "filename": "a.txt"}) for i in range(3)]
+    writer.store_documents(first)
+
+    writer.embedder = FakeEmbedder(fail_on={"chunk 4 of b"})
+    second = [(f"chunk {i} of b", {"bucket": "b", "filename": "b.txt"}) for i in range(6)]
+
+    with pytest.raises(RuntimeError, match="embedding service unavailable"):
+        writer.store_documents(second)
+
+    conn = writer.pool.conn
+    assert conn.rollbacks == 1
+    assert conn.pending == []
+    assert [row[3] for row in conn.committed] == [text for text, _ in first]
+    assert writer.mock_register.call_count == 1
@@ -0,0 +1,57 @@
+# Copyright (C) 2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+import pytest
+
+from video_analyzer.core.cache import SummaryCache
+
+
+@pytest.mark.unit
+def test_summary_cache_get_and_put():
+    """Test that a cached summary is returned for the same key"""
+    cache = SummaryCache(max_size=2)
+    key = cache.make_key("fingerprint", 0, 0.0, 10.0, "model", "prompt")
+
+    assert cache.get(key) is None
+    cache.put(key, "summary")
+    assert cache.get(key) == "summary"
+    assert len(cache) == 1
+
+
+@pytest.mark.unit
+def test_summary_cache_key_depends_on_every_part():
+    """Test that keys differ when any part identifying the summary differs"""
+    parts = ["fingerprint", 0, 0.0, 10.0, "model", "prompt"]
+    key = SummaryCache.make_key(*parts)
+
+    assert SummaryCache.make_key(*parts) == key
+    for i in range(len(parts)):
+        changed = list(parts)
+        changed[i] = "other"
+        assert SummaryCache.make_key(*changed) != key
+
+
+@pytest.mark.unit
+def test_summary_cache_evicts_least_recently_used():
+    """Test that the cache stays within its size and keeps recently read summaries"""
+    cache = SummaryCache(max_size=2)
+    cache.put("a", "summary a")
+    cache.put("b", "summary b")
+    cache.get("a")
+    cache.put("c", "summary c")
+
+    assert cache.get("a") == "summary a"
+    assert cache.get("b") is None
+    assert cache.get("c") == "summary c"
+    assert len(cache) == 2
+
+
+@pytest.mark.unit
+def test_summary_cache_disabled():
+    """Test that a cache of size 0 keeps nothing"""
+    cache = SummaryCache(max_size=0)
+    cache.put("a", "summary a")
+
+    assert not cache.enabled
+    assert cache.get("a") is None
+    assert len(cache) == 0
@@ -0,0 +1,151 @@
+# Copyright (C) 2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+import asyncio
+from typing import Dict, List, Optional
+from unittest.mock import MagicMock, patch
+
+import pytest
+from video_chunking.data import MicroChunkMeta
+
+from video_analyzer.core.summarizer import VideoSummarizer
+
+
+class FakeModel:
+    """Model serving stand-in recording its requests; requests can be held until released."""
+
+    def __init__(self, model_name: str):
+        self.model_name = model_name
+        self.requests: List[str] = []
+        self.gates: Dict[str, asyncio.Event] = {}
+        self.fail_on: Optional[str] = None
+
+    async def async_infer(self, prompt: str = None, frames=None, question: str = None) -> str:
+        text = question if question is not None else prompt
+        self.requests.append(text)
+        for marker, gate in self.gates.items():
+            if marker in text:
+                await gate.wait()
+        if self.fail_on and self.fail_on in text:
+            raise RuntimeError("model failed")
+        return f"summary {len(self.requests)}"
+
+
+def micro_chunks(count: int, duration: float = 10.0) -> List[MicroChunkMeta]:
+    chunks = []
+    for i in range(count):
+        chunk = MicroChunkMeta()
+        chunk.id = i
+        chunk.fps = 1
+        chunk.time_st = i * duration
+        chunk.time_end = (i + 1) * duration
+        chunks.append(chunk)
+    return chunks
+
+
+def make_summarizer(num_chunks: int = 4, t_minus_1_vlm: bool = False, t_minus_1_llm: bool = False) -> VideoSummarizer:
+    """Build a summarizer over fake chunks and models, without reading a video"""
+    summarizer = VideoSummarizer.__new__(VideoSummarizer)
+    summarizer.video_path = "video.mp4"
+    summarizer.user_prompt = None
+    summarizer.total_levels = 3
+    summarizer.level_sizes = [1, 2, 2]
+    summarizer.length = num_chunks * 10.0
+    summarizer.process_fps = 1
+    summarizer.fingerprint = None
+    summarizer.use_t_minus_1_for_vlm = t_minus_1_vlm
+    summarizer.use_t_minus_1_for_llm = t_minus_1_llm
+    summarizer.video_chunker = MagicMock()
+    summarizer.video_chunker.chunk.return_value = micro_chunks(num_chunks)
+    summarizer.vlm = FakeModel("vlm")
+    summarizer.llm = FakeModel("llm")
+    summarizer._tasks = {}
+    summarizer._started = {}
+    summarizer.chunk_dict = {}
+    summarizer.chunklist_dict = {}
+    summarizer.chunking()
+
+    async def encode_chunk(chunk):
+        return ["frame"]
+
+    summarizer.encode_chunk = encode_chunk
+    return summarizer
+
+
+@pytest.mark.unit
+async def test_macro_chunk_starts_before_other_micro_chunks_finish():
+    """Test that a macro chunk is reduced as soon as its own sub-chunks are summarized"""
+    summarizer = make_summarizer()
+    # Hold the micro chunks of the second macro chunk
+    gate = asyncio.Event()
+    summarizer.vlm.gates["Start time: 20"] = gate
+    summarizer.vlm.gates["Start time: 30"] = gate
+
+    job = asyncio.create_task(summarizer.summarize())
+    for _ in range(100):
+        if summarizer.llm.requests:
+            break
+        await asyncio.sleep(0)
+
+    assert len(summarizer.llm.requests) == 1
+    assert "Start time: 0 sec" in summarizer.llm.requests[0]
+    assert not job.done()
+
+    gate.set()
+    _, response = await job
+    # Two macro chunks and the root chunk
+    assert len(summarizer.llm.requests) == 3
+    assert response["summary"] == "summary 3"
+
+
+@pytest.mark.unit
+async def test_t_minus_1_waits_for_previous_chunk():
+    """Test that with T-1 prompting every chunk is prompted with the summary of its predecessor"""
+    summarizer = make_summarizer(t_minus_1_vlm=True, t_minus_1_llm=True)
+
+    await summarizer.summarize()
+
+    micro = summarizer.chunklist_dict[0]
+    assert [chunk.desc for chunk in micro] == ["summary 1", "summary 2", "summary 3", "summary 4"]
+    for previous, request in zip(micro, summarizer.vlm.requests[1:]):
+        assert previous.desc in request
+    macro = summarizer.chunklist_dict[1]
+    assert macro[0].desc in summarizer.llm.requests[1]
+    # The root chunk is not prompted with a previous chunk
+    assert macro[1].desc not in summarizer.llm.requests[2].split(">|<")[0]
+
+
+@pytest.mark.unit
+async def test_failed_chunk_cancels_the_other_chunks():
+    """Test that the job fails and leaves no task behind when a chunk fails"""
+    summarizer = make_summarizer()
+    summarizer.vlm.fail_on = "Start time: 10"
+    held = asyncio.Event()
+    summarizer.vlm.gates["Start time: 30"] = held
+
+    with pytest.raises(RuntimeError):
+        await summarizer.summarize()
+
+    assert summarizer._tasks == {}
+    assert summarizer.llm.requests == []
+
+
+@pytest.mark.unit
+async def test_cached_summaries_are_reused():
+    """Test that summarizing the same video again reuses the cached chunk summaries"""
+    from video_analyzer.core.cache import SummaryCache
+
+    cache = SummaryCache(max_size=100)
+    with patch("video_analyzer.core.summarizer.summary_cache", cache):
+        first = make_summarizer()
+        first.fingerprint = "fingerprint"
+        await first.summarize()
+
+        second = make_summarizer()
+        second.fingerprint = "fingerprint"
+        second.user_prompt = "What happens?"
+        await second.summarize()
+
+    # The micro chunk prompts do not depend on the user prompt, the macro chunk prompts do
+    assert second.vlm.requests == []
+    assert len(second.llm.requests) == 3
@@ -0,0 +1,55 @@
+# Copyright (C) 2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from video_analyzer.model_serving import LLM, RetryBudget
+
+
+@pytest.mark.unit
+def test_retry_budget_allows_min_retries_without_requests():
+    """Test that the minimum number of retries is always allowed"""
+    budget = RetryBudget(ratio=0.5, min_retries=2)
+
+    assert budget.try_retry()
+    assert budget.try_retry()
+    assert not budget.try_retry()
+    assert budget.retries == 2
+
+
+@pytest.mark.unit
+def test_retry_budget_grows_with_requests():
+    """Test that each request sent adds its share of retries to the budget"""
+    budget = RetryBudget(ratio=0.5, min_retries=0)
+    for _ in range(4):
+        budget.record_request()
+
+    assert [budget.try_retry() for _ in range(3)] == [True, True, False]
+
+    budget.record_request()
+    budget.record_request()
+    assert budget.try_retry()
+    assert not budget.try_retry()
+
+
+@pytest.mark.unit
+async def test_llm_stops_retrying_when_budget_is_exhausted():
+    """Test that failed requests of a job share its retry budget"""
+    budget = RetryBudget(ratio=0, min_retries=1)
+    llm = LLM(model_name="model", api_key="key", base_url="http://localhost:1/v1", retry_budget=budget)
+    create = AsyncMock(side_effect=RuntimeError("server down"))
+    llm.async_client = MagicMock()
+    llm.async_client.chat.completions.create = create
+
+    with patch("video_analyzer.model_serving.openai_llm.asyncio.sleep", AsyncMock()), \
+         patch.object(llm, "max_retries", 5):
+        first = await llm.async_infer("first")
+        second = await llm.async_infer("second")
+
+    assert first.startswith("Error:")
+    assert second.startswith("Error:")
+    # One retry for the whole job: two attempts for the first request, one for the second
+    assert create.await_count == 3
+    assert budget.requests == 2
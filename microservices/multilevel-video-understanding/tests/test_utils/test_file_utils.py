@@ -0,0 +1,72 @@
+# Copyright (C) 2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+import hashlib
+import os
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from video_analyzer.utils import file_utils
+from video_analyzer.utils.file_utils import video_fingerprint
+
+
+@pytest.fixture(autouse=True)
+def clear_fingerprints():
+    """Fixture to make sure fingerprints computed by one test are not reused by another"""
+    file_utils._fingerprints.clear()
+    yield
+    file_utils._fingerprints.clear()
+
+
+@pytest.mark.unit
+def test_video_fingerprint_hashes_content(tmp_path):
+    """Test that videos with the same content share a fingerprint, wherever they are stored"""
+    first = tmp_path / "first.mp4"
+    copy = tmp_path / "copy.mp4"
+    first.write_bytes(b"video content")
+    copy.write_bytes(b"video content")
+
+    assert video_fingerprint(str(first)) == hashlib.sha256(b"video content").hexdigest()
+    assert video_fingerprint(str(copy)) == video_fingerprint(str(first))
+
+
+@pytest.mark.unit
+def test_video_fingerprint_differs_for_same_size_edits(tmp_path):
+    """Test that an edited video of the same size and length gets another fingerprint"""
+    video = tmp_path / "video.mp4"
+    video.write_bytes(b"original cut")
+    original = video_fingerprint(str(video))
+    stat = os.stat(video)
+
+    video.write_bytes(b"modified cut")
+    os.utime(video, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+
+    assert video_fingerprint(str(video)) != original
+
+
+@pytest.mark.unit
+def test_video_fingerprint_reuses_hash_of_unchanged_file(tmp_path):
+    """Test that an unchanged file is not read again"""
+    video = tmp_path / "video.mp4"
+    video.write_bytes(b"video content")
+    fingerprint = video_fingerprint(str(video))
+
+    with patch("video_analyzer.utils.file_utils._read_chunks") as mock_read:
+        assert video_fingerprint(str(video)) == fingerprint
+    mock_read.assert_not_called()
+
+
+@pytest.mark.unit
+def test_video_fingerprint_streams_urls():
+    """Test that the content of a URL is hashed as it is streamed"""
+    response = MagicMock()
+    response.__enter__.return_value = response
+    response.iter_content.return_value = [b"video ", b"content"]
+
+    with patch("video_analyzer.utils.file_utils.requests.get", return_value=response) as mock_get:
+        fingerprint = video_fingerprint("https://example.com/video.mp4")
+
+    assert fingerprint == hashlib.sha256(b"video content").hexdigest()
+    assert mock_get.call_args.kwargs["stream"] is True
+    response.raise_for_status.assert_called_once()
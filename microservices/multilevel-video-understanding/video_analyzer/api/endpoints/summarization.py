@@ -2,6 +2,7 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import os
+import asyncio
 import logging
 import traceback
 from typing import Annotated
@@ -68,7 +69,9 @@ async def summarize_video(
                      f"{processor_kwargs}")
         
         # Create a VideoSummarizer instance
-        summarizer = VideoSummarizer(
+        # Loading and chunking the video runs in a thread, so that other requests are served meanwhile
+        summarizer = await asyncio.to_thread(
+            VideoSummarizer,
             video_path=video_path,
             user_prompt=user_prompt,
             method=method,
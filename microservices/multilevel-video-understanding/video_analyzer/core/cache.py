@@ -0,0 +1,68 @@
+# Copyright (C) 2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Optional
+
+from video_analyzer.core.settings import settings
+
+
+class SummaryCache:
+    """
+    In-memory LRU cache of the summaries of video chunks, shared by all summarization jobs.
+
+    A summary is cached under a key made of the video fingerprint, the span of the chunk,
+    the model and the full prompt sent to it. Since the prompt of a chunk includes the
+    summaries of its sub-chunks, summarizing a video again with a different user prompt
+    reuses every summary whose prompt does not depend on the user prompt.
+
+    Args:
+        max_size: Maximum number of summaries kept, 0 disables the cache
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max(0, max_size)
+        self._entries: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0
+
+    @staticmethod
+    def make_key(*parts: Any) -> str:
+        """
+        Build a cache key from the parts identifying a chunk summary.
+
+        Args:
+            parts: JSON serializable values, e.g. video fingerprint, chunk span, model and prompt
+
+        Returns:
+            Hex digest identifying the summary
+        """
+        return hashlib.sha256(json.dumps(parts).encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            summary = self._entries.get(key)
+            if summary is not None:
+                self._entries.move_to_end(key)
+            return summary
+
+    def put(self, key: str, summary: str) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self._entries[key] = summary
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+summary_cache = SummaryCache(settings.SUMMARY_CACHE_SIZE)
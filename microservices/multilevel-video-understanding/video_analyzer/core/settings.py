@@ -1,7 +1,7 @@
 # Copyright (C) 2025 Intel Corporation
 # SPDX-License-Identifier: Apache-2.0
 
-from typing import List
+from typing import List, Optional
 from pydantic_settings import BaseSettings
 from pydantic import Field
 
@@ -32,6 +32,8 @@ class Settings(BaseSettings):
     APP_NAME: str = "Multi-level Video Understanding Service"
     API_DESCRIPTION: str = "API for intelligent video summarization based on Large Language Models and Vision Language Models."
     MAX_CONCURRENT_REQUESTS: int = Field(6, env="MAX_CONCURRENT_REQUESTS")
+    VLM_MAX_CONCURRENT_REQUESTS: Optional[int] = Field(None, env="VLM_MAX_CONCURRENT_REQUESTS")   # Requests in flight to the VLM endpoint, across all jobs, defaults to MAX_CONCURRENT_REQUESTS
+    LLM_MAX_CONCURRENT_REQUESTS: Optional[int] = Field(None, env="LLM_MAX_CONCURRENT_REQUESTS")   # Requests in flight to the LLM endpoint, across all jobs, defaults to MAX_CONCURRENT_REQUESTS
 
     # API Health check configuration
     API_STATUS: str = "healthy"
@@ -60,6 +62,13 @@ class Settings(BaseSettings):
     ## Request settings
     REQUEST_TIMEOUT: int = 300      # seconds
     MAX_RETRIES: int = 3
+    RETRY_BACKOFF: float = Field(1, env="RETRY_BACKOFF")                 # Delay before the first retry, doubled for each following retry, unit: seconds
+    RETRY_BACKOFF_MAX: float = Field(30, env="RETRY_BACKOFF_MAX")         # Maximum delay between two retries, unit: seconds
+    RETRY_BUDGET_RATIO: float = Field(0.2, env="RETRY_BUDGET_RATIO")      # Retries allowed per summarization job, as a share of its requests
+    RETRY_BUDGET_MIN: int = Field(10, env="RETRY_BUDGET_MIN")             # Retries always allowed per summarization job
+
+    ## Partial summary cache settings
+    SUMMARY_CACHE_SIZE: int = Field(8192, env="SUMMARY_CACHE_SIZE")       # Chunk summaries kept in memory to be reused, 0 disables the cache
     
     # Inference parameters    
     LLM_REMOVE_THINKING: bool = True
@@ -15,6 +15,7 @@ from video_chunking import PeltChunking, UniformChunking
 from video_chunking.data import ChunkMeta, MicroChunkMeta, MacroChunkMeta
 
 from video_analyzer.core.settings import settings
+from video_analyzer.core.cache import summary_cache
 from video_analyzer.core.prompts import (
     GLOBAL_PROMPT, 
     GLOBAL_PROMPT_WITH_QUESTION,
@@ -24,15 +25,26 @@ from video_analyzer.core.prompts import (
     T_MINUS_1_PROMPT
 )
 from video_analyzer.schemas.summarization import SUMMARIZATION_METHOD_TYPE
-from video_analyzer.model_serving import LLM, VLM
+from video_analyzer.model_serving import LLM, VLM, RetryBudget
 from video_analyzer.utils.summarization_utils import remove_brackets, uniform_sample, warn_unused_kwargs
 from video_analyzer.utils.logger import logger
-from video_analyzer.utils.file_utils import robust_video_reader
+from video_analyzer.utils.file_utils import robust_video_reader, video_fingerprint
+
+# Semaphores limiting the requests in flight to each model endpoint, shared by all summarization jobs
+vlm_semaphore = asyncio.Semaphore(settings.VLM_MAX_CONCURRENT_REQUESTS or settings.MAX_CONCURRENT_REQUESTS)
+llm_semaphore = asyncio.Semaphore(settings.LLM_MAX_CONCURRENT_REQUESTS or settings.MAX_CONCURRENT_REQUESTS)
 
 
 class VideoSummarizer:
     """
     Video summarization pipeline that processes videos in a multi-level manner.
+
+    Every chunk of the hierarchy is summarized by its own task, which starts as soon as the
+    chunks it depends on are summarized: its sub-chunks, and its previous chunk at the same
+    level when T-1 prompting is enabled. Higher levels are therefore reduced while lower
+    levels are still being captioned, and the requests in flight to each model endpoint are
+    bounded across all jobs. Chunk summaries are cached by video fingerprint, chunk span,
+    model and prompt.
     """
     @warn_unused_kwargs
     def __init__(
@@ -91,12 +103,11 @@ class VideoSummarizer:
         self.use_t_minus_1_for_llm = ((self.method == SUMMARIZATION_METHOD_TYPE.USE_ALL_T_1.value) or \
                                       (self.method == SUMMARIZATION_METHOD_TYPE.USE_LLM_T_1.value))
         
-        # Create a semaphore to limit concurrent requests
+        # Concurrent requests are limited by the semaphores shared by all jobs
         ## use_concurrent: Whether to use concurrent processing for remote requests
         ## max_concurrent: Maximum number of concurrent requests (default: from config)
         self.max_concurrent = settings.MAX_CONCURRENT_REQUESTS
         self.use_concurrent = (self.max_concurrent > 1)
-        self._semaphore = asyncio.Semaphore(self.max_concurrent)
 
         # Thread lock for video reader access to prevent concurrent access issues
         self.vr_lock = threading.RLock()
@@ -107,6 +118,8 @@ class VideoSummarizer:
             self.origin_fps = round(self.vr.get_avg_fps())
             self.numFrame = len(self.vr)
             self.length = self.numFrame / self.origin_fps
+            # Fingerprint identifying the video in the summary cache
+            self.fingerprint = video_fingerprint(self.video_path) if summary_cache.enabled else None
             
         self.chunk_dict: Dict[Tuple[int, int], ChunkMeta] = {}
         self.chunklist_dict: Dict[int, List[ChunkMeta]] = {}
@@ -151,19 +164,27 @@ class VideoSummarizer:
         logger.info(f"Video chunking method: {self.video_chunker.METHOD_NAME}")
         
         # Initialize LLM and VLM model serving for inference
+        # The retry budget is shared by all requests of this job
+        self.retry_budget = RetryBudget(settings.RETRY_BUDGET_RATIO, settings.RETRY_BUDGET_MIN)
         self.llm = LLM(
             model_name=llm_model_name,
             api_key=llm_api_key,
             base_url=llm_base_url,
-            remove_thinking=settings.LLM_REMOVE_THINKING
+            remove_thinking=settings.LLM_REMOVE_THINKING,
+            retry_budget=self.retry_budget
         )
         self.vlm = VLM(
             model_name=vlm_model_name,
             api_key=vlm_api_key,
             base_url=vlm_base_url,
-            remove_thinking=settings.VLM_REMOVE_THINKING
+            remove_thinking=settings.VLM_REMOVE_THINKING,
+            retry_budget=self.retry_budget
         )
 
+        # Summarization tasks and request start events of the chunks, by chunk object id
+        self._tasks: Dict[int, asyncio.Task] = {}
+        self._started: Dict[int, asyncio.Event] = {}
+
         # Create chunks from the video
         self.chunking()
 
@@ -245,40 +266,26 @@ class VideoSummarizer:
             job_id = str(uuid.uuid4())[-8:]
             logger.debug(f"Generated job ID: {job_id}")
             
-            # Process micro chunks (level 0)
-            logger.debug("Processing level 0 (micro chunks)")
-            chunk_list = self.chunklist_dict[0]
-            if self.use_concurrent and not self.use_t_minus_1_for_vlm:
-                logger.debug("[Micro level-0] Using concurrent processing")
-                
-                # Create a coroutine object for each piece of data
-                async_tasks = [self.summarize_micro_chunk(chunk) for chunk in chunk_list]
-
-                # TODO: pipeline style with LLM?
-                # Execute in parallel and wait for all to complete
-                await asyncio.gather(*async_tasks, return_exceptions=False)
-            else:
-                logger.debug("[Micro level-0] Using sequential processing")
+            # Create a task per chunk, from the bottom level up, so that every task can wait for
+            # the tasks of its sub-chunks and of its previous chunk
+            for level in range(self.rootLevel + 1):
+                chunk_list = self.chunklist_dict[level] if level < self.rootLevel else [self.rootChunk]
+                previous = None
                 for chunk in chunk_list:
-                    await self.summarize_micro_chunk(chunk)
-
-            # Process macro chunks (level > 0)
-            for level in range(1, self.rootLevel):
-                logger.debug(f"Processing level {level} (macro chunks)")
-                chunk_list = self.chunklist_dict[level]
-
-                if self.use_concurrent and not self.use_t_minus_1_for_llm:
-                    logger.debug("[Macro level-{level}] Using concurrent processing")
-                    async_tasks = [self.summarize_macro_chunk(chunk) for chunk in chunk_list]
-                    await asyncio.gather(*async_tasks, return_exceptions=False)
-                else:
-                    logger.debug(f"[Macro level-{level}] Using sequential processing")
-                    for chunk in chunk_list:
-                        await self.summarize_macro_chunk(chunk)
-
-            # Process root chunks (top level)
-            logger.debug(f"Processing level {self.rootLevel} (top level)")
-            await self.summarize_macro_chunk(self.rootChunk)
+                    self._started[id(chunk)] = asyncio.Event()
+                    self._tasks[id(chunk)] = asyncio.create_task(self.summarize_chunk(chunk, previous))
+                    previous = chunk
+            logger.debug(f"Scheduled {len(self._tasks)} chunks over {self.rootLevel + 1} levels")
+
+            try:
+                await self._tasks[id(self.rootChunk)]
+            finally:
+                # Stop the remaining chunks if a chunk failed or the job was cancelled
+                for task in self._tasks.values():
+                    task.cancel()
+                await asyncio.gather(*self._tasks.values(), return_exceptions=True)
+                self._tasks.clear()
+                self._started.clear()
 
             # Get the final summary of this video
             summary = self.rootChunk.desc
@@ -296,130 +303,192 @@ class VideoSummarizer:
             logger.debug(f"Error details: {traceback.format_exc()}")
             raise RuntimeError(f"Summarization failed: {e}")
 
-    async def summarize_micro_chunk(self, chunk: MicroChunkMeta) -> None:
+    async def summarize_chunk(self, chunk: ChunkMeta, previous: Optional[ChunkMeta] = None) -> None:
+        """
+        Summarize a chunk once the chunks it depends on are summarized.
+
+        Args:
+            chunk: Chunk to summarize
+            previous: Previous chunk at the same level, if any
+        """
+        try:
+            if chunk.level == 0:
+                await self.summarize_micro_chunk(chunk, previous)
+            else:
+                # Start reducing as soon as the sub-chunks are summarized
+                await asyncio.gather(*(self._tasks[id(subchunk)] for subchunk in chunk.chunk_list))
+                if self.use_t_minus_1_for_llm and previous is not None and chunk.level < self.rootLevel:
+                    await self._tasks[id(previous)]
+                await self.summarize_macro_chunk(chunk, previous)
+        finally:
+            self._started[id(chunk)].set()
+
+    def _cache_key(self, chunk: ChunkMeta, model_name: str, prompt: str) -> Optional[str]:
+        """
+        Build the summary cache key of a chunk, None if the cache is disabled.
+        """
+        if self.fingerprint is None:
+            return None
+        parts = [self.fingerprint, chunk.level, chunk.time_st, chunk.time_end, model_name, prompt]
+        if chunk.level == 0:
+            # Micro chunk summaries also depend on the frames sent to the model
+            parts += [self.process_fps, settings.VIDEO_FRAME_WIDTH, settings.VIDEO_FRAME_HEIGHT,
+                      settings.MAX_NUM_FRAMES_PER_CHUNK]
+        return summary_cache.make_key(*parts)
+
+    async def summarize_micro_chunk(self, chunk: MicroChunkMeta, previous: Optional[MicroChunkMeta] = None) -> None:
         """
         Summarize a micro chunk using vision-language model.
 
         Args:
             chunk: Micro chunk to summarize
+            previous: Previous micro chunk, used as context when T-1 prompting is enabled
         """
         
-        # Use semaphore to limit concurrent requests
-        async with self._semaphore:
-            frames = await self.encode_chunk(chunk)
-
-            # If frames extraction failed, handle the error
-            if not frames:
-                logger.error(f"Failed to extract frames for micro chunk {chunk.id}")
-                chunk.desc = "Error occurred during frame extraction."
-                return
-
-            # Prepare question/prompt
-            question = LOCAL_PROMPT.format(st_tm=round(chunk.time_st), end_tm=round(chunk.time_end))
-
-            # Add previous chunk context if available and enabled
-            if self.use_t_minus_1_for_vlm and chunk.id > 0:
-                t_minus_1_chunk = self.chunk_dict[(chunk.level, chunk.id - 1)]
-                question = T_MINUS_1_PROMPT.format(
-                    dur=round(t_minus_1_chunk.time_end-t_minus_1_chunk.time_st),
-                    past_summary=t_minus_1_chunk.desc,
-                    st_tm=round(t_minus_1_chunk.time_st),
-                    end_tm=round(t_minus_1_chunk.time_end)
-                ) + '\n' + question
-
-            # Log input prompt
-            logger.debug("<#####> micro chunk input")
-            logger.debug(question)
-
-            # Run inference
-            answer = await self.vlm.async_infer(frames=frames, question=question)
+        # Prepare question/prompt
+        question = LOCAL_PROMPT.format(st_tm=round(chunk.time_st), end_tm=round(chunk.time_end))
+
+        frames = None
+        if self.use_t_minus_1_for_vlm and previous is not None:
+            # Extract the frames while the previous chunk is being summarized, but not earlier,
+            # so that the frames of at most two chunks are held in memory at a time
+            await self._started[id(previous)].wait()
+            frames_task = asyncio.create_task(self.encode_chunk(chunk))
+            try:
+                await self._tasks[id(previous)]
+            except BaseException:
+                frames_task.cancel()
+                raise
+
+            # Add previous chunk context
+            question = T_MINUS_1_PROMPT.format(
+                dur=round(previous.time_end-previous.time_st),
+                past_summary=previous.desc,
+                st_tm=round(previous.time_st),
+                end_tm=round(previous.time_end)
+            ) + '\n' + question
+            frames = await frames_task
+
+        cache_key = self._cache_key(chunk, self.vlm.model_name, question)
+        answer = summary_cache.get(cache_key) if cache_key else None
+        if answer is not None:
+            logger.debug(f"Reusing cached summary for micro chunk {chunk.id}")
+        else:
+            # Use semaphore to limit concurrent requests
+            async with vlm_semaphore:
+                if frames is None:
+                    frames = await self.encode_chunk(chunk)
+
+                # If frames extraction failed, handle the error
+                if not frames:
+                    logger.error(f"Failed to extract frames for micro chunk {chunk.id}")
+                    chunk.desc = "Error occurred during frame extraction."
+                    return
+
+                # Log input prompt
+                logger.debug("<#####> micro chunk input")
+                logger.debug(question)
+
+                # Run inference
+                self._started[id(chunk)].set()
+                answer = await self.vlm.async_infer(frames=frames, question=question)
 
             # Check for errors
-            if chunk.desc.startswith("Error:"):
+            if answer.startswith("Error:"):
                 logger.error(f"ERROR in model response: {answer}")
             else:
                 logger.debug(f"Raw answer from model: {answer}")
-            chunk.desc = remove_brackets(answer)
-
-            # Log output
-            logger.debug("<#####> micro chunk output")
-            logger.debug(chunk.get_timestamp_desc())
-            logger.debug(chunk.desc)
-
-            # Check for empty descriptions
-            if not chunk.desc or chunk.desc.isspace():
-                logger.debug(f"WARNING: Empty chunk description for chunk {chunk.id} at level {chunk.level}")
-            else:
-                logger.debug(f"Successfully generated description for chunk {chunk.id} at level {chunk.level}")
+                if cache_key:
+                    summary_cache.put(cache_key, answer)
+        chunk.desc = remove_brackets(answer)
+
+        # Log output
+        logger.debug("<#####> micro chunk output")
+        logger.debug(chunk.get_timestamp_desc())
+        logger.debug(chunk.desc)
+
+        # Check for empty descriptions
+        if not chunk.desc or chunk.desc.isspace():
+            logger.debug(f"WARNING: Empty chunk description for chunk {chunk.id} at level {chunk.level}")
+        else:
+            logger.debug(f"Successfully generated description for chunk {chunk.id} at level {chunk.level}")
 
-    async def summarize_macro_chunk(self, chunk: MacroChunkMeta) -> None:
+    async def summarize_macro_chunk(self, chunk: MacroChunkMeta, previous: Optional[MacroChunkMeta] = None) -> None:
         """
         Summarize a macro chunk using its sub-chunks.
 
         Args:
             chunk: Macro chunk to summarize
+            previous: Previous macro chunk, used as context when T-1 prompting is enabled
         """
         
-        # Use semaphore to limit concurrent requests
-        async with self._semaphore:
-            subchunk_summaries = []
-            for subchunk in chunk.chunk_list:
-                subchunk_summaries.append(subchunk.get_timestamp_desc() + '\n' + subchunk.desc)
-
-            # Choose prompt based on chunk level
-            if self.user_prompt is not None:
-                if self.rootLevel == chunk.level:
-                    full_summ_prompt = GLOBAL_PROMPT_WITH_QUESTION.format(question=self.user_prompt)
-                else:
-                    full_summ_prompt = MACRO_CHUNK_PROMPT_WITH_QUESTION.format(
-                        st_tm=round(chunk.time_st),
-                        end_tm=round(chunk.time_end),
-                        question=self.user_prompt
-                    )
+        subchunk_summaries = []
+        for subchunk in chunk.chunk_list:
+            subchunk_summaries.append(subchunk.get_timestamp_desc() + '\n' + subchunk.desc)
+
+        # Choose prompt based on chunk level
+        if self.user_prompt is not None:
+            if self.rootLevel == chunk.level:
+                full_summ_prompt = GLOBAL_PROMPT_WITH_QUESTION.format(question=self.user_prompt)
+            else:
+                full_summ_prompt = MACRO_CHUNK_PROMPT_WITH_QUESTION.format(
+                    st_tm=round(chunk.time_st),
+                    end_tm=round(chunk.time_end),
+                    question=self.user_prompt
+                )
+        else:
+            if self.rootLevel == chunk.level:
+                full_summ_prompt = GLOBAL_PROMPT
             else:
-                if self.rootLevel == chunk.level:
-                    full_summ_prompt = GLOBAL_PROMPT
-                else:
-                    full_summ_prompt = MACRO_CHUNK_PROMPT.format(
-                        st_tm=round(chunk.time_st),
-                        end_tm=round(chunk.time_end)
-                    )
-
-            full_summ_prompt += '\n\n>|<\n{}\n>|<'
-            prompt = full_summ_prompt.format("\n>|<\n".join(subchunk_summaries))
-
-            if self.use_t_minus_1_for_llm:
-                # Add previous macro chunk context if available and enabled
-                # Exclude for global chunk
-                if chunk.level < self.rootLevel and chunk.id > 0:
-                    t_minus_1_macro_chunk = self.chunk_dict[(chunk.level, chunk.id - 1)]
-                    prompt = T_MINUS_1_PROMPT.format(
-                        dur=round(t_minus_1_macro_chunk.time_end-t_minus_1_macro_chunk.time_st),
-                        past_summary=t_minus_1_macro_chunk.desc,
-                        st_tm=round(t_minus_1_macro_chunk.time_st),
-                        end_tm=round(t_minus_1_macro_chunk.time_end)
-                    ) + '\n' + prompt
-
-            # Log input prompt
-            logger.debug("<#####> macro chunk input")
-            logger.debug(prompt)
-
-            # Run inference
-            answer = await self.llm.async_infer(prompt)
+                full_summ_prompt = MACRO_CHUNK_PROMPT.format(
+                    st_tm=round(chunk.time_st),
+                    end_tm=round(chunk.time_end)
+                )
+
+        full_summ_prompt += '\n\n>|<\n{}\n>|<'
+        prompt = full_summ_prompt.format("\n>|<\n".join(subchunk_summaries))
+
+        if self.use_t_minus_1_for_llm:
+            # Add previous macro chunk context if available and enabled
+            # Exclude for global chunk
+            if chunk.level < self.rootLevel and previous is not None:
+                t_minus_1_macro_chunk = previous
+                prompt = T_MINUS_1_PROMPT.format(
+                    dur=round(t_minus_1_macro_chunk.time_end-t_minus_1_macro_chunk.time_st),
+                    past_summary=t_minus_1_macro_chunk.desc,
+                    st_tm=round(t_minus_1_macro_chunk.time_st),
+                    end_tm=round(t_minus_1_macro_chunk.time_end)
+                ) + '\n' + prompt
+
+        # Log input prompt
+        logger.debug("<#####> macro chunk input")
+        logger.debug(prompt)
+
+        cache_key = self._cache_key(chunk, self.llm.model_name, prompt)
+        answer = summary_cache.get(cache_key) if cache_key else None
+        if answer is not None:
+            logger.debug(f"Reusing cached summary for macro chunk {chunk.id} at level {chunk.level}")
+        else:
+            # Run inference, using semaphore to limit concurrent requests
+            async with llm_semaphore:
+                self._started[id(chunk)].set()
+                answer = await self.llm.async_infer(prompt)
 
             # Check for errors
-            if chunk.desc.startswith("Error:"):
+            if answer.startswith("Error:"):
                 logger.error(f"ERROR in model response: {answer}")
             else:
                 logger.debug(f"Raw answer from model: {answer}")
-            chunk.desc = remove_brackets(answer)
-
-            # Log output
-            logger.debug("<#####> macro chunk output")
-            logger.debug(chunk.get_timestamp_desc())
-            if self.rootLevel == chunk.level:
-                logger.debug("Final summary:\n")
-            logger.debug(chunk.desc)
+                if cache_key:
+                    summary_cache.put(cache_key, answer)
+        chunk.desc = remove_brackets(answer)
+
+        # Log output
+        logger.debug("<#####> macro chunk output")
+        logger.debug(chunk.get_timestamp_desc())
+        if self.rootLevel == chunk.level:
+            logger.debug("Final summary:\n")
+        logger.debug(chunk.desc)
           
     async def encode_chunk(self, chunk: ChunkMeta) -> List[Image.Image]:
         """
@@ -442,6 +511,10 @@ class VideoSummarizer:
             logger.warning(f"Too many frames, reducing the number of frames to the allowed max frames: {settings.MAX_NUM_FRAMES_PER_CHUNK}")
             frame_idx = uniform_sample(frame_idx, settings.MAX_NUM_FRAMES_PER_CHUNK)
 
+        # Decode in a thread, so that the requests of other chunks are not blocked meanwhile
+        return await asyncio.to_thread(self._read_frames, chunk, frame_idx)
+
+    def _read_frames(self, chunk: ChunkMeta, frame_idx: List[int]) -> List[Image.Image]:
         # Use lock to prevent concurrent access to video reader
         with self.vr_lock:
             try:
@@ -1,2 +1,3 @@
 from video_analyzer.model_serving.openai_llm import LLM
-from video_analyzer.model_serving.openai_vlm import VLM
\ No newline at end of file
+from video_analyzer.model_serving.openai_vlm import VLM
+from video_analyzer.model_serving.retry_budget import RetryBudget
\ No newline at end of file
@@ -1,12 +1,14 @@
 # Copyright (C) 2025 Intel Corporation
 # SPDX-License-Identifier: Apache-2.0
 
+import time
 import logging
 import asyncio
 from typing import List, Dict, Any, Optional
 from openai import OpenAI, AsyncOpenAI
 
 from video_analyzer.core.settings import settings
+from video_analyzer.model_serving.retry_budget import RetryBudget
 from video_analyzer.utils.logger import logger
 
 
@@ -22,6 +24,7 @@ class LLM:
         api_key: API key for authentication (optional if set in environment)
         base_url: Base URL for the API endpoint (optional for OpenAI-compatible APIs)
         remove_thinking: Whether to remove thinking patterns from responses (optional)
+        retry_budget: Budget shared by the requests of a job to limit their retries (optional)
     """
     
     def __init__(
@@ -30,6 +33,7 @@ class LLM:
         api_key: Optional[str] = None,
         base_url: Optional[str] = None,
         remove_thinking: Optional[bool] = False,
+        retry_budget: Optional[RetryBudget] = None,
     ):
         self.model_name = model_name
 
@@ -43,6 +47,7 @@ class LLM:
         self.timeout = settings.REQUEST_TIMEOUT
         self.max_retries = settings.MAX_RETRIES
         self.temperature = settings.DEFAULT_TEMPERATURE
+        self.retry_budget = retry_budget
         
         # Use remote inference
         self.client = OpenAI(api_key=self.api_key, base_url=self.base_url)
@@ -98,6 +103,29 @@ class LLM:
             
         return response
     
+    def _can_retry(self, retry_count: int) -> bool:
+        """
+        Check whether a failed request may be sent again.
+
+        Args:
+            retry_count: Number of failed attempts of the request
+
+        Returns:
+            True if attempts are left for the request and in the retry budget of the job
+        """
+        if retry_count >= self.max_retries:
+            return False
+        if self.retry_budget is not None and not self.retry_budget.try_retry():
+            logger.debug("Retry budget of the job is exhausted, not retrying")
+            return False
+        return True
+
+    def _backoff(self, retry_count: int) -> float:
+        """
+        Delay before the next attempt, doubled after each failed attempt.
+        """
+        return min(settings.RETRY_BACKOFF * 2 ** (retry_count - 1), settings.RETRY_BACKOFF_MAX)
+
     def _remote_infer(self, messages: List[Dict[str, Any]]) -> str:
         """
         Run remote inference using OpenAI API.
@@ -109,8 +137,10 @@ class LLM:
             Model's response
         """
         retry_count = 0
+        if self.retry_budget is not None:
+            self.retry_budget.record_request()
 
-        while retry_count < self.max_retries:
+        while True:
             try:
                 logger.debug(f"Sending request to remote LLM: {self.model_name} (attempt {retry_count+1}/{self.max_retries})")
                 logger.debug(f"API base URL: {self.base_url}")
@@ -130,10 +160,12 @@ class LLM:
             except Exception as e:
                 logger.debug(f"ERROR in API call (attempt {retry_count+1}): {str(e)}")
                 retry_count += 1
-                if retry_count >= self.max_retries:
-                    error_msg = f"Error: API call failed after {self.max_retries} attempts. Last error: {str(e)}"
+                if not self._can_retry(retry_count):
+                    error_msg = f"Error: API call failed after {retry_count} attempts. Last error: {str(e)}"
                     logger.debug(error_msg)
                     return error_msg
+                # Wait before retrying
+                time.sleep(self._backoff(retry_count))
                 
     async def _async_remote_infer(self, messages: List[Dict[str, Any]]) -> str:
         """
@@ -146,8 +178,10 @@ class LLM:
             Model's response
         """
         retry_count = 0
+        if self.retry_budget is not None:
+            self.retry_budget.record_request()
 
-        while retry_count < self.max_retries:
+        while True:
             try:
                 logger.debug(f"Sending async request to remote LLM: {self.model_name} (attempt {retry_count+1}/{self.max_retries})")
 
@@ -166,12 +200,12 @@ class LLM:
             except Exception as e:
                 logger.debug(f"ERROR in async API call (attempt {retry_count+1}): {str(e)}")
                 retry_count += 1
-                if retry_count >= self.max_retries:
-                    error_msg = f"Error: API call failed after {self.max_retries} attempts. Last error: {str(e)}"
+                if not self._can_retry(retry_count):
+                    error_msg = f"Error: API call failed after {retry_count} attempts. Last error: {str(e)}"
                     logger.debug(error_msg)
                     return error_msg
                 # Wait before retrying
-                await asyncio.sleep(1)
+                await asyncio.sleep(self._backoff(retry_count))
 
     @staticmethod
     def remove_think_in_response(response: str) -> str:
@@ -3,6 +3,7 @@
 
 import io
 import base64
+import asyncio
 import logging
 from PIL import Image
 from typing import List, Dict, Any
@@ -82,11 +83,12 @@ class VLM(LLM):
             return "Error: Empty frame input"
 
         # Prepare messages based on model type
+        # JPEG encoding of the frames runs in a thread, so that other requests are not blocked meanwhile
         if self.is_kimi:
-            msgs = self._prepare_kimi_format(frames, question)
+            msgs = await asyncio.to_thread(self._prepare_kimi_format, frames, question)
             logger.debug("Using Kimi format for API request")
         else:
-            msgs = self._prepare_qwen_format(frames, question)
+            msgs = await asyncio.to_thread(self._prepare_qwen_format, frames, question)
             logger.debug("Using Qwen format for API request")
 
         logger.debug(f"Sending request with {len(frames)} frames to model: {self.model_name}")
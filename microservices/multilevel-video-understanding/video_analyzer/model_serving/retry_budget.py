@@ -0,0 +1,46 @@
+# Copyright (C) 2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+import threading
+
+
+class RetryBudget:
+    """
+    Limits the retries of a summarization job to a share of its requests.
+
+    Each request may be retried up to `MAX_RETRIES` times, but when a model endpoint fails
+    for every request of a job, retrying all of them multiplies the load on the endpoint
+    and the duration of the job. The budget allows `min_retries` retries, plus `ratio`
+    retries for each request sent, after which failed requests are not retried any more.
+
+    Args:
+        ratio: Retries allowed per request sent
+        min_retries: Retries allowed regardless of the number of requests sent
+    """
+
+    def __init__(self, ratio: float, min_retries: int):
+        self.ratio = ratio
+        self.min_retries = min_retries
+        self.requests = 0
+        self.retries = 0
+        self._lock = threading.Lock()
+
+    def record_request(self) -> None:
+        """
+        Record a request sent for the first time.
+        """
+        with self._lock:
+            self.requests += 1
+
+    def try_retry(self) -> bool:
+        """
+        Take a retry from the budget.
+
+        Returns:
+            True if the request may be retried, False if the budget is exhausted
+        """
+        with self._lock:
+            if self.retries >= self.min_retries + self.ratio * self.requests:
+                return False
+            self.retries += 1
+            return True
@@ -1,8 +1,12 @@
 # Copyright (C) 2025 Intel Corporation
 # SPDX-License-Identifier: Apache-2.0
 
+import hashlib
+import threading
 import traceback
+from collections import OrderedDict
 from pathlib import Path
+from typing import Iterable, Iterator, Tuple
 import os
 from urllib.parse import urlparse
 import requests
@@ -79,3 +83,59 @@ def robust_video_reader(url, ctx=cpu(0), width=-1, height=-1, num_threads=0, ver
     os.unlink(temp_path)
     
     return vr
+
+
+# Content hashes of local files by (path, size, mtime), so that a file is only read again once it changed
+_FINGERPRINT_CACHE_SIZE = 1024
+_fingerprints: "OrderedDict[Tuple[str, int, int], str]" = OrderedDict()
+_fingerprints_lock = threading.Lock()
+
+
+def _hash_stream(chunks: Iterable[bytes]) -> str:
+    digest = hashlib.sha256()
+    for chunk in chunks:
+        digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _read_chunks(file_path: str, chunk_size: int = 1 << 20) -> Iterator[bytes]:
+    with open(file_path, "rb") as f:
+        while chunk := f.read(chunk_size):
+            yield chunk
+
+
+def video_fingerprint(source: str, verify_ssl: bool = True) -> str:
+    """
+    Identify the content of a video, independently of its path or URL.
+
+    The bytes of the video are hashed, so two videos only share a fingerprint when their
+    content is identical. For a local file the hash is kept by path, size and modification
+    time and only computed again once one of them changed; a URL is streamed and hashed on
+    every call, as the content behind it may change at any time.
+
+    Args:
+        source: Path or URL of the video
+        verify_ssl: Whether to verify the certificate of HTTPS URLs
+
+    Returns:
+        Hex digest identifying the video
+    """
+    if urlparse(source).scheme in ["http", "https"]:
+        with requests.get(source, stream=True, verify=verify_ssl, timeout=30) as response:
+            response.raise_for_status()
+            return _hash_stream(response.iter_content(chunk_size=1 << 20))
+
+    stat = os.stat(source)
+    key = (os.path.realpath(source), stat.st_size, stat.st_mtime_ns)
+    with _fingerprints_lock:
+        fingerprint = _fingerprints.get(key)
+        if fingerprint is not None:
+            _fingerprints.move_to_end(key)
+            return fingerprint
+
+    fingerprint = _hash_stream(_read_chunks(source))
+    with _fingerprints_lock:
+        _fingerprints[key] = fingerprint
+        while len(_fingerprints) > _FINGERPRINT_CACHE_SIZE:
+            _fingerprints.popitem(last=False)
+    return fingerprint
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+# Copyright (C) 2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Startup-time benchmark for Multimodal Embedding Serving
+
+Measures how long the service takes to become ready for a given model: package
+import, model handler creation, ``load_model()`` (OpenVINO conversion and
+compilation) and the first text embedding. Every run happens in a fresh Python
+interpreter so that in-process caches do not hide the cold-start cost, while
+OpenVINO's persistent compiled-model cache (``OV_CACHE_DIR``) carries over
+between runs exactly as it would across container restarts.
+
+Usage:
+    python scripts/benchmark_startup.py --model CLIP/clip-vit-b-16 --device CPU --runs 3
+    python scripts/benchmark_startup.py --model CLIP/clip-vit-b-16 --clear-cache
+
+With ``--clear-cache`` the compiled-model cache is removed before the first run,
+so the first run reports the cold start and the following runs report warm starts.
+"""
+
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+SERVICE_ROOT = Path(__file__).resolve().parent.parent
+
+# Executed in a child interpreter; prints one JSON line with the phase timings.
+_CHILD_SCRIPT = """
+import json, sys, time
+sys.path.insert(0, {root!r})
+t0 = time.perf_counter()
+from src.models import get_model_handler
+t1 = time.perf_counter()
+handler = get_model_handler({model!r}, device={device!r}, use_openvino={use_openvino!r})
+t2 = time.perf_counter()
+handler.load_model()
+t3 = time.perf_counter()
+handler.encode_text(["startup benchmark"])
+t4 = time.perf_counter()
+print("BENCHMARK_RESULT " + json.dumps({{
+    "import_s": t1 - t0,
+    "create_handler_s": t2 - t1,
+    "load_model_s": t3 - t2,
+    "first_inference_s": t4 - t3,
+    "total_s": t4 - t0,
+}}))
+"""
+
+
+def _run_once(args) -> dict:
+    """Run a single startup measurement in a fresh interpreter."""
+    script = _CHILD_SCRIPT.format(
+        root=str(SERVICE_ROOT),
+        model=args.model,
+        device=args.device,
+        use_openvino=not args.no_openvino,
+    )
+    env = dict(os.environ)
+    env["EMBEDDING_OV_MODELS_DIR"] = args.ov_models_dir
+    if args.cache_dir is not None:
+        env["OV_CACHE_DIR"] = args.cache_dir
+
+    completed = subprocess.run(
+        [sys.executable, "-c", script],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    for line in completed.stdout.splitlines():
+        if line.startswith("BENCHMARK_RESULT "):
+            return json.loads(line[len("BENCHMARK_RESULT "):])
+
+    sys.stderr.write(completed.stderr)
+    raise RuntimeError(f"Benchmark run failed with exit code {completed.returncode}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Measure embedding service startup time")
+    parser.add_argument("--model", default=os.getenv("EMBEDDING_MODEL_NAME", "CLIP/clip-vit-b-16"))
+    parser.add_argument("--device", default=os.getenv("EMBEDDING_DEVICE", "CPU"))
+    parser.add_argument("--runs", type=int, default=3, help="Number of fresh-process runs")
+    parser.add_argument(
+        "--ov-models-dir",
+        default=os.getenv("EMBEDDING_OV_MODELS_DIR", str(SERVICE_ROOT / "ov-models")),
+    )
+    parser.add_argument(
+        "--cache-dir",
+        default=os.getenv("OV_CACHE_DIR"),
+        help="OpenVINO compiled-model cache directory (default: <ov-models-dir>/cache)",
+    )
+    parser.add_argument(
+        "--clear-cache",
+        action="store_true",
+        help="Remove the compiled-model cache before the first run",
+    )
+    parser.add_argument("--no-openvino", action="store_true", help="Benchmark the PyTorch path")
+    args = parser.parse_args()
+
+    if args.clear_cache:
+        cache_dir = Path(args.cache_dir or Path(args.ov_models_dir) / "cache")
+        if cache_dir.exists():
+            shutil.rmtree(cache_dir)
+            print(f"Cleared OpenVINO cache at {cache_dir}")
+
+    results = []
+    for run in range(1, args.runs + 1):
+        result = _run_once(args)
+        results.append(result)
+        print(
+            f"run {run}: total={result['total_s']:.2f}s "
+            f"import={result['import_s']:.2f}s "
+            f"load_model={result['load_model_s']:.2f}s "
+            f"first_inference={result['first_inference_s']:.2f}s"
+        )
+
+    if len(results) > 1:
+        warm = results[1:]
+        print(f"first run total:      {results[0]['total_s']:.2f}s")
+        print(f"warm runs median:     {statistics.median(r['total_s'] for r in warm):.2f}s")
+        print(f"warm load_model median: {statistics.median(r['load_model_s'] for r in warm):.2f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
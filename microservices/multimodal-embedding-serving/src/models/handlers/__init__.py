@@ -6,15 +6,24 @@ Model handlers for different multimodal embedding models.
 
 This module contains the implementation of various multimodal embedding model handlers
 including CLIP, MobileCLIP, SigLIP, and BLIP2.
+
+Handler modules pull in heavy dependencies (torch, open_clip, transformers,
+optimum-intel), so they are imported lazily on first attribute access. Only the
+handler for the configured model is imported at service startup.
 """
 
-from .clip_handler import CLIPHandler
-from .cn_clip_handler import CNClipHandler
-from .mobileclip_handler import MobileCLIPHandler
-from .siglip_handler import SigLIPHandler
-from .blip2_handler import BLIP2Handler
-from .blip2_transformers_handler import BLIP2TransformersHandler
-from .qwen_handler import QwenEmbeddingHandler
+import importlib
+
+# Maps each exported handler class to the submodule that defines it
+HANDLER_MODULES = {
+    "CLIPHandler": ".clip_handler",
+    "CNClipHandler": ".cn_clip_handler",
+    "MobileCLIPHandler": ".mobileclip_handler",
+    "SigLIPHandler": ".siglip_handler",
+    "BLIP2Handler": ".blip2_handler",
+    "BLIP2TransformersHandler": ".blip2_transformers_handler",
+    "QwenEmbeddingHandler": ".qwen_handler",
+}
 
 __all__ = [
     "CLIPHandler",
@@ -24,4 +33,18 @@ __all__ = [
     "BLIP2Handler",
     "BLIP2TransformersHandler",
     "QwenEmbeddingHandler",
-]
\ No newline at end of file
+]
+
+
+def __getattr__(name):
+    """Import the requested handler class on first access."""
+    module_name = HANDLER_MODULES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    handler_class = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = handler_class
+    return handler_class
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -16,6 +16,7 @@ from torch import Tensor
 from transformers import AutoModel, AutoTokenizer
 
 from ..base import BaseEmbeddingModel
+from ..utils import resolve_openvino_cache_dir
 from ...utils import logger
 
 try:  # pragma: no cover - optional dependency at runtime
@@ -144,11 +145,16 @@ class QwenEmbeddingHandler(BaseEmbeddingModel):
     def _load_openvino_model(self):
         xml_path = self._export_openvino(Path(self.ov_models_dir))
         logger.info("Loading OpenVINO model from %s on %s", xml_path, self.device)
+        ov_config = {}
+        cache_dir = resolve_openvino_cache_dir(self.ov_models_dir)
+        if cache_dir:
+            ov_config["CACHE_DIR"] = cache_dir
         return OVModelForFeatureExtraction.from_pretrained(
             xml_path.parent,
             device=self.device,
             export=False,
             trust_remote_code=self.trust_remote_code,
+            ov_config=ov_config,
         )
 
     def _export_openvino(self, base_dir: Path) -> Path:
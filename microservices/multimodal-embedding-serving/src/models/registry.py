@@ -17,33 +17,49 @@ The registry supports various multimodal embedding models including:
 
 Each model type has its own handler class that implements the BaseEmbeddingModel
 interface, providing consistent text and image encoding capabilities.
+
+Built-in handler classes are resolved lazily so that creating one model does not
+import the dependencies of every other handler.
 """
 
 from typing import Dict, Type
 from .base import BaseEmbeddingModel
-from .handlers import (
-    CLIPHandler,
-    CNClipHandler,
-    MobileCLIPHandler,
-    SigLIPHandler,
-    BLIP2Handler,
-    BLIP2TransformersHandler,
-    QwenEmbeddingHandler,
-)
+from . import handlers
 from .config import get_model_config, list_available_models
 from ..utils import logger
 
 
-# Registry mapping handler class names to actual classes
-MODEL_HANDLER_REGISTRY: Dict[str, Type[BaseEmbeddingModel]] = {
-    "CLIPHandler": CLIPHandler,
-    "CNClipHandler": CNClipHandler,
-    "MobileCLIPHandler": MobileCLIPHandler,
-    "SigLIPHandler": SigLIPHandler,
-    "BLIP2Handler": BLIP2Handler,
-    "BLIP2TransformersHandler": BLIP2TransformersHandler,
-    "QwenEmbeddingHandler": QwenEmbeddingHandler,
-}
+# Registry mapping handler class names to actual classes. Built-in handlers are
+# added on first use by resolve_handler_class(); custom handlers are added via
+# register_model_handler().
+MODEL_HANDLER_REGISTRY: Dict[str, Type[BaseEmbeddingModel]] = {}
+
+
+def resolve_handler_class(handler_class_name: str) -> Type[BaseEmbeddingModel]:
+    """
+    Look up a handler class by name, importing built-in handlers on demand.
+
+    Args:
+        handler_class_name: Handler class name as used in model configurations
+
+    Returns:
+        The handler class
+
+    Raises:
+        ValueError: If no handler with that name is registered or built in
+    """
+    handler_class = MODEL_HANDLER_REGISTRY.get(handler_class_name)
+    if handler_class is not None:
+        return handler_class
+
+    if handler_class_name not in handlers.HANDLER_MODULES:
+        raise ValueError(
+            f"Handler class {handler_class_name} not found in registry"
+        )
+
+    handler_class = getattr(handlers, handler_class_name)
+    MODEL_HANDLER_REGISTRY[handler_class_name] = handler_class
+    return handler_class
 
 
 class ModelFactory:
@@ -93,13 +109,8 @@ class ModelFactory:
             )
             handler_class_name = config["handler_class"]
 
-            # Get handler class from registry
-            if handler_class_name not in MODEL_HANDLER_REGISTRY:
-                raise ValueError(
-                    f"Handler class {handler_class_name} not found in registry"
-                )
-
-            handler_class = MODEL_HANDLER_REGISTRY[handler_class_name]
+            # Get handler class from registry (imports the handler module on first use)
+            handler_class = resolve_handler_class(handler_class_name)
 
             # Create and return handler instance
             logger.info(
@@ -11,6 +11,7 @@ conversion pipeline from PyTorch models to optimized OpenVINO representations.
 Key functionality:
 - Automated OpenVINO model conversion with caching
 - Model loading and compilation for target devices
+- Persistent compiled-model cache and concurrent encoder compilation
 - Conversion validation and error handling
 - Memory management during conversion processes
 
@@ -18,9 +19,14 @@ The utilities ensure efficient model deployment by providing seamless conversion
 from research models to production-optimized formats suitable for inference.
 """
 
-from .openvino_utils import check_and_convert_openvino_models, load_openvino_models
+from .openvino_utils import (
+    check_and_convert_openvino_models,
+    load_openvino_models,
+    resolve_openvino_cache_dir,
+)
 
 __all__ = [
     "check_and_convert_openvino_models",
     "load_openvino_models",
+    "resolve_openvino_cache_dir",
 ]
\ No newline at end of file
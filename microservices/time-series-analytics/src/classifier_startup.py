@@ -447,6 +447,12 @@ def classifier_startup(config):
         'MODEL_PATH': os.path.join(SECURE_TEMP_DIR, dir_name, "models", model_name),
         'DEVICE': device
     }
+    udf_mode = config['udfs'].get("mode")
+    if udf_mode:
+        udf_mode = udf_mode.lower()
+        if udf_mode not in ("stream", "batch"):
+            raise ValueError(f"Invalid value for 'mode' in udfs: {config['udfs']['mode']}, must be 'stream' or 'batch'")
+        udf_section[udf_name]['env']['UDF_MODE'] = udf_mode
     if "alerts" in config.keys() and "mqtt" in config["alerts"].keys():
         config_data["mqtt"][0]["name"] = config["alerts"]["mqtt"]["name"]
         mqtt_url = config_data["mqtt"][0]["url"]
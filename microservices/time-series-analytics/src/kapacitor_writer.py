@@ -0,0 +1,202 @@
+#
+# Apache v2 license
+# Copyright (C) 2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+#
+
+"""
+Kapacitor Writer Module.
+
+This module provides a batching line-protocol writer for the Kapacitor write
+API. Writes from concurrent requests are coalesced into a single HTTP POST per
+flush over a pooled, keep-alive async HTTP client, and the Kapacitor health
+state is cached so that it is not probed for every data point. When Kapacitor
+rejects a coalesced batch, the lines of each request are written again on
+their own, so that malformed data only fails the request that sent it.
+"""
+import os
+import asyncio
+import logging
+import time
+
+import httpx
+
+log_level = os.getenv('KAPACITOR_LOGGING_LEVEL', 'INFO').upper()
+logging_level = getattr(logging, log_level, logging.INFO)
+
+# Configure logging
+logging.basicConfig(
+    level=logging_level,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+)
+
+logger = logging.getLogger()
+
+WRITE_PATH = "/kapacitor/v1/write?db=datain&rp=autogen"
+PING_PATH = "/kapacitor/v1/ping"
+
+
+class KapacitorWriteError(Exception):
+    """Raised when Kapacitor rejects or cannot receive a batch of points."""
+
+    def __init__(self, status_code, detail):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+class KapacitorWriter:
+    """Batching async writer for the Kapacitor line-protocol write endpoint."""
+
+    def __init__(self, kapacitor_url, batch_size=None, flush_interval=None,
+                 health_ttl=None, max_connections=None, timeout=30):
+        """
+        Initialize the writer.
+
+        Args:
+            kapacitor_url: Base URL of the Kapacitor daemon
+            batch_size: Number of lines that triggers an immediate flush
+            flush_interval: Seconds to wait for more lines before flushing
+            health_ttl: Seconds a Kapacitor health probe result stays valid
+            max_connections: Size of the HTTP connection pool
+            timeout: Timeout in seconds for write requests
+        """
+        self.kapacitor_url = kapacitor_url.rstrip("/")
+        self.batch_size = batch_size or int(os.getenv("KAPACITOR_WRITE_BATCH_SIZE", "5000"))
+        self.flush_interval = flush_interval if flush_interval is not None else \
+            float(os.getenv("KAPACITOR_WRITE_FLUSH_INTERVAL", "0.05"))
+        self.health_ttl = health_ttl if health_ttl is not None else \
+            float(os.getenv("KAPACITOR_HEALTH_CACHE_TTL", "5"))
+        max_connections = max_connections or int(os.getenv("KAPACITOR_MAX_CONNECTIONS", "10"))
+
+        self.client = httpx.AsyncClient(
+            base_url=self.kapacitor_url,
+            timeout=timeout,
+            limits=httpx.Limits(max_connections=max_connections,
+                                max_keepalive_connections=max_connections),
+        )
+        self.loop = asyncio.get_running_loop()
+        self._pending = []
+        self._pending_count = 0
+        self._flush_handle = None
+        self._inflight = set()
+        self._healthy = None
+        self._health_checked_at = 0.0
+
+    async def is_healthy(self):
+        """
+        Return the cached Kapacitor health state, probing it if the cache expired.
+
+        Returns:
+            bool: True if the Kapacitor daemon answered its ping endpoint
+        """
+        now = time.monotonic()
+        if self._healthy is not None and now - self._health_checked_at < self.health_ttl:
+            return self._healthy
+        try:
+            response = await self.client.get(PING_PATH, timeout=1)
+            healthy = response.status_code in (200, 204)
+        except httpx.HTTPError as error:
+            logger.debug("Kapacitor health probe failed: %s", error)
+            healthy = False
+        self._healthy = healthy
+        self._health_checked_at = time.monotonic()
+        return healthy
+
+    def mark_unhealthy(self):
+        """Invalidate the cached health state after a connection failure."""
+        self._healthy = False
+        self._health_checked_at = time.monotonic()
+
+    async def write(self, lines):
+        """
+        Queue line-protocol lines and wait until the batch containing them is written.
+
+        Args:
+            lines: List of line-protocol strings
+
+        Raises:
+            KapacitorWriteError: If Kapacitor rejects the batch or is unreachable
+        """
+        if not lines:
+            return
+        waiter = self.loop.create_future()
+        self._pending.append((lines, waiter))
+        self._pending_count += len(lines)
+
+        if self._pending_count >= self.batch_size:
+            self._flush_now()
+        elif self._flush_handle is None:
+            self._flush_handle = self.loop.call_later(self.flush_interval, self._flush_now)
+        await waiter
+
+    def _flush_now(self):
+        """Hand the pending lines to a background send task."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if not self._pending:
+            return
+        requests = self._pending
+        self._pending, self._pending_count = [], 0
+        task = self.loop.create_task(self._send(requests))
+        self._inflight.add(task)
+        task.add_done_callback(self._inflight.discard)
+
+    async def _post(self, lines):
+        """
+        POST lines to Kapacitor.
+
+        Returns:
+            KapacitorWriteError: The error if the lines were not written, else None
+        """
+        try:
+            response = await self.client.post(
+                WRITE_PATH,
+                content="\n".join(lines).encode("utf-8"),
+                headers={"Content-Type": "text/plain"},
+            )
+        except httpx.HTTPError as http_error:
+            self.mark_unhealthy()
+            return KapacitorWriteError(500, f"Failed to write to Kapacitor: {http_error}")
+        if response.status_code != 204:
+            return KapacitorWriteError(response.status_code, response.text)
+        logger.debug("Wrote %d points to Kapacitor", len(lines))
+        return None
+
+    @staticmethod
+    def _resolve(waiter, error):
+        """Complete a request waiter with the outcome of its write."""
+        if waiter.done():
+            return
+        if error is None:
+            waiter.set_result(None)
+        else:
+            waiter.set_exception(error)
+
+    async def _send(self, requests):
+        """POST one batch of request lines to Kapacitor and resolve the request waiters."""
+        error = await self._post([line for lines, _ in requests for line in lines])
+        if error is not None and 400 <= error.status_code < 500 and len(requests) > 1:
+            # Kapacitor rejects the whole batch for a single malformed line; write the
+            # lines of each request separately so that only the faulty requests fail
+            logger.debug("Kapacitor rejected a batch of %d requests, writing them one by one",
+                         len(requests))
+            errors = await asyncio.gather(*(self._post(lines) for lines, _ in requests))
+            for (_, waiter), request_error in zip(requests, errors):
+                self._resolve(waiter, request_error)
+            return
+
+        for _, waiter in requests:
+            self._resolve(waiter, error)
+
+    async def flush(self):
+        """Write all pending lines and wait for in-flight batches to complete."""
+        self._flush_now()
+        if self._inflight:
+            await asyncio.gather(*self._inflight, return_exceptions=True)
+
+    async def aclose(self):
+        """Flush pending lines and close the HTTP connection pool."""
+        await self.flush()
+        await self.client.aclose()
@@ -11,20 +11,22 @@ This module exposes FastAPI server providing capabilities for data ingestion,
 configuration management, and OPC UA alerts.
 """
 import os
+import asyncio
 import logging
 import time
 import json
 import subprocess
 import threading
-from typing import Optional
+from typing import List, Optional
 import requests
 
 from fastapi import FastAPI, HTTPException, Response, status, Request, Query, BackgroundTasks
-from pydantic import BaseModel
+from pydantic import BaseModel, TypeAdapter, ValidationError
 from starlette.responses import JSONResponse
 import uvicorn
 import classifier_startup
-from opcua_alerts import OpcuaAlerts
+from opcua_alerts import OpcuaAlerts, OpcuaAlertDispatcher
+from kapacitor_writer import KapacitorWriter, KapacitorWriteError
 
 log_level = os.getenv('KAPACITOR_LOGGING_LEVEL', 'INFO').upper()
 logging_level = getattr(logging, log_level, logging.INFO)
@@ -43,9 +45,11 @@ app = FastAPI(root_path=REST_API_ROOT_PATH)
 KAPACITOR_URL = os.getenv('KAPACITOR_URL', 'http://localhost:9092')
 CONFIG_FILE = "/app/config.json"
 MAX_SIZE = 5 * 1024  # 5 KB
+MAX_BATCH_POINTS = int(os.getenv('MAX_BATCH_POINTS', '100000'))
 
 config = {}
-OPCUA_SEND_ALERT = None
+OPCUA_ALERT_DISPATCHER = None
+KAPACITOR_WRITER = None
 config_updated_event = threading.Event()
 
 
@@ -70,12 +74,18 @@ class OpcuaAlertsMessage(BaseModel):
         """Pydantic configuration."""
         extra = 'allow'
 
-def json_to_line_protocol(data_point: DataPoint):
+
+DATA_POINT_LIST = TypeAdapter(List[DataPoint])
+
+
+def json_to_line_protocol(data_point: DataPoint, default_timestamp: Optional[int] = None):
     """
     Convert a DataPoint object to InfluxDB line protocol format.
     
     Args:
         data_point: DataPoint object containing topic, tags, fields, and timestamp
+        default_timestamp: Timestamp in nanoseconds used when the point has none.
+            If omitted, the current time is used.
         
     Returns:
         str: Formatted line protocol string
@@ -88,7 +98,7 @@ def json_to_line_protocol(data_point: DataPoint):
     fields_part = ','.join([f"{key}={value}" for key, value in data_point.fields.items()])
 
     # Use current time in nanoseconds if timestamp is None
-    timestamp = data_point.timestamp or int(time.time() * 1e9)
+    timestamp = data_point.timestamp or default_timestamp or int(time.time() * 1e9)
 
     if tags_part:
         line_protocol = f"{data_point.topic},{tags_part} {fields_part} {timestamp}"
@@ -98,6 +108,61 @@ def json_to_line_protocol(data_point: DataPoint):
     return line_protocol
 
 
+def points_to_line_protocol(data_points: List[DataPoint]):
+    """
+    Convert a batch of DataPoint objects to InfluxDB line protocol lines.
+
+    Points without a timestamp are stamped with the batch arrival time plus their
+    index in nanoseconds, so that they keep their order and do not overwrite each
+    other in the same series.
+
+    Args:
+        data_points: List of DataPoint objects
+
+    Returns:
+        list: Line protocol strings, one per data point
+    """
+    now = time.time_ns()
+    return [json_to_line_protocol(data_point, now + index)
+            for index, data_point in enumerate(data_points)]
+
+
+def get_kapacitor_writer():
+    """
+    Return the batching Kapacitor writer bound to the running event loop.
+
+    Returns:
+        KapacitorWriter: Shared writer instance
+    """
+    global KAPACITOR_WRITER
+    loop = asyncio.get_running_loop()
+    if KAPACITOR_WRITER is None or KAPACITOR_WRITER.loop is not loop:
+        KAPACITOR_WRITER = KapacitorWriter(KAPACITOR_URL)
+    return KAPACITOR_WRITER
+
+
+async def write_line_protocol(lines):
+    """
+    Send line protocol lines to Kapacitor through the batching writer.
+
+    Args:
+        lines: List of line protocol strings
+
+    Raises:
+        HTTPException: If Kapacitor is not running or rejects the data
+    """
+    writer = get_kapacitor_writer()
+    if not await writer.is_healthy():
+        logger.info("Kapacitor daemon is not running.")
+        raise HTTPException(status_code=500, detail="Kapacitor daemon is not running")
+    try:
+        await writer.write(lines)
+    except KapacitorWriteError as error:
+        # Kapacitor rejects malformed points with a 4xx status, which is a client error
+        status_code = 400 if 400 <= error.status_code < 500 else error.status_code
+        raise HTTPException(status_code=status_code, detail=error.detail) from error
+
+
 def start_kapacitor_service(service_config):
     """
     Start the Kapacitor service with the given configuration.
@@ -134,6 +199,15 @@ def restart_kapacitor():
     start_kapacitor_service(config)
 
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Flush buffered data points and close the Kapacitor and OPC UA connections."""
+    if KAPACITOR_WRITER is not None:
+        await KAPACITOR_WRITER.aclose()
+    if OPCUA_ALERT_DISPATCHER is not None:
+        await OPCUA_ALERT_DISPATCHER.close()
+
+
 @app.get("/health")
 def health_check(response: Response):
     """Get the health status of the kapacitor daemon."""
@@ -153,15 +227,47 @@ def health_check(response: Response):
         response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
         return {"status": "An error occurred while checking the service"}
 
+async def get_alert_dispatcher(opcua_config):
+    """
+    Return the OPC UA alert dispatcher for the configured server.
+
+    The dispatcher, and with it the OPC UA session, is kept across requests and
+    only replaced when the server changes. Node id or namespace changes are
+    applied to the existing session.
+
+    Args:
+        opcua_config: The "opcua" section of the alerts configuration
+
+    Returns:
+        OpcuaAlertDispatcher: Running dispatcher instance
+    """
+    global OPCUA_ALERT_DISPATCHER
+    loop = asyncio.get_running_loop()
+    dispatcher = OPCUA_ALERT_DISPATCHER
+    if dispatcher is None or dispatcher.loop is not loop or \
+            dispatcher.opcua_server != opcua_config["opcua_server"]:
+        if dispatcher is not None and dispatcher.loop is loop:
+            await dispatcher.close()
+        logger.info("Initializing OPC UA alert dispatcher")
+        opcua_alerts = OpcuaAlerts(config)
+        opcua_alerts.load_opcua_config()
+        dispatcher = OpcuaAlertDispatcher(opcua_alerts)
+        OPCUA_ALERT_DISPATCHER = dispatcher
+    dispatcher.alerts.set_alert_node(opcua_config["node_id"], opcua_config["namespace"])
+    dispatcher.start()
+    return dispatcher
+
+
 @app.post("/opcua_alerts")
 async def receive_alert(alert: OpcuaAlertsMessage):
     """
     Receive and process OPC UA alerts.
 
-    This endpoint accepts alert messages in JSON format and forwards them to the 
-    configured OPC UA client.
-    If the OPC UA client is not initialized, it will attempt to initialize it 
-    using the current configuration.
+    This endpoint accepts alert messages in JSON format and queues them for
+    delivery to the configured OPC UA server. Delivery happens in the background
+    over a persistent OPC UA session, which is (re)connected with backoff when
+    needed. Repeated identical alerts and bursts for the same alert key are
+    suppressed.
 
     Request Body Example:
         {
@@ -170,7 +276,7 @@ async def receive_alert(alert: OpcuaAlertsMessage):
 
     Responses:
         200:
-            description: Alert received and processed successfully.
+            description: Alert received and queued, or suppressed as a duplicate.
             content:
                 application/json:
                     example:
@@ -179,50 +285,42 @@ async def receive_alert(alert: OpcuaAlertsMessage):
                             "status": "success",
                             "message": "Alert received"
                         }
+        429:
+            description: Alert was rate limited or the alert queue is full.
+            content:
+                application/json:
+                    example:
+                        {
+                            "detail": "Alert rate_limited"
+                        }
         500:
-            description: Failed to process the alert due to server error or misconfiguration.
+            description: OPC UA alerts are not configured or the dispatcher failed.
             content:
                 application/json:
                     example:
                         {
-                            "detail": "Failed to initialize OPC UA client: <error_message>"
+                            "detail": "OPC UA alerts are not configured in the service"
                         }
 
     Raises:
-        HTTPException: If OPC UA alerts are not configured or if there is an error during 
-        processing.
+        HTTPException: If OPC UA alerts are not configured, the alert cannot be
+        queued, or there is an error during processing.
     """
-    global OPCUA_SEND_ALERT
+    if "alerts" not in config.keys() or "opcua" not in config["alerts"].keys():
+        raise HTTPException(status_code=500,
+                            detail="OPC UA alerts are not configured in the service")
     try:
-        if "alerts" in config.keys() and "opcua" in config["alerts"].keys():
-            try:
-                if OPCUA_SEND_ALERT is None or \
-                    OPCUA_SEND_ALERT.opcua_server != config["alerts"]["opcua"]["opcua_server"] or \
-                    not (await OPCUA_SEND_ALERT.is_connected()):
-                    logger.info("Initializing OPC UA client for sending alerts")
-                    OPCUA_SEND_ALERT = OpcuaAlerts(config)
-                    await OPCUA_SEND_ALERT.initialize_opcua()
-            except Exception as error:
-                logger.exception("Failed to initialize OPC UA client")
-                raise HTTPException(status_code=500,
-                                  detail=f"Failed to initialize OPC UA client: {error}") from error
-
-            if OPCUA_SEND_ALERT.node_id != config["alerts"]["opcua"]["node_id"] or \
-                OPCUA_SEND_ALERT.namespace != config["alerts"]["opcua"]["namespace"]:
-                OPCUA_SEND_ALERT.node_id = config["alerts"]["opcua"]["node_id"]
-                OPCUA_SEND_ALERT.namespace = config["alerts"]["opcua"]["namespace"]
-
-            alert_message = json.dumps(alert.model_dump())
-            try:
-                await OPCUA_SEND_ALERT.send_alert_to_opcua(alert_message)
-            except Exception as e:
-                logger.exception("Failed to send alert to OPC UA node: %s", e)
-                raise HTTPException(status_code=500, detail=f"Failed to send alert: {e}")
-        else:
-            raise HTTPException(status_code=500,
-                              detail="OPC UA alerts are not configured in the service")
+        dispatcher = await get_alert_dispatcher(config["alerts"]["opcua"])
+        result = dispatcher.submit(alert.model_dump())
     except Exception as error:
-        raise HTTPException(status_code=500, detail=str(error)) from error
+        logger.exception("Failed to queue OPC UA alert")
+        raise HTTPException(status_code=500,
+                            detail=f"Failed to queue alert: {error}") from error
+
+    if result in ("rate_limited", "dropped"):
+        raise HTTPException(status_code=429, detail=f"Alert {result}")
+    if result == "duplicate":
+        return {"status_code": 200, "status": "success", "message": "Duplicate alert suppressed"}
     return {"status_code": 200, "status": "success", "message": "Alert received"}
 
 @app.post("/input")
@@ -287,24 +385,80 @@ async def receive_data(data_point: DataPoint):
         # Convert JSON to line protocol
         line_protocol = json_to_line_protocol(data_point)
         logging.debug("Received data point: %s", line_protocol)
-        response = Response()
-        result = health_check(response)
-        if result["status"] != "kapacitor daemon is running":
-            logger.info("Kapacitor daemon is not running.")
-            raise HTTPException(status_code=500, detail="Kapacitor daemon is not running")
-        url = f"{KAPACITOR_URL}/kapacitor/v1/write?db=datain&rp=autogen"
-        # Send data to Kapacitor
-        kapacitor_response = requests.post(url, data=line_protocol,
-                                         headers={"Content-Type": "text/plain"}, timeout=30)
-
-        if kapacitor_response.status_code == 204:
-            return {"status": "success",
-                   "message": "Data sent to Time Series Analytics microservice"}
-
-        raise HTTPException(status_code=kapacitor_response.status_code,
-                          detail=kapacitor_response.text)
+        # Send data to Kapacitor, batched with concurrent requests
+        await write_line_protocol([line_protocol])
+        return {"status": "success",
+               "message": "Data sent to Time Series Analytics microservice"}
+    except HTTPException:
+        raise
+    except Exception as error:
+        raise HTTPException(status_code=500, detail=str(error)) from error
+
+@app.post("/input/batch")
+async def receive_data_batch(request: Request):
+    """
+    Receives a batch of data points, converts them to InfluxDB line protocol in bulk,
+    and sends them to the Kapacitor service.
+
+    The request body is either a JSON array of data points or, when the
+    Content-Type is application/x-ndjson, one JSON data point per line. Each data
+    point has the same schema as the /input endpoint.
+
+    Example request body:
+    [
+        {"topic": "sensor_data", "fields": {"temperature": 23.5}, "timestamp": 1718000000000000000},
+        {"topic": "sensor_data", "fields": {"temperature": 23.7}, "timestamp": 1718000001000000000}
+    ]
+
+    responses:
+        '200':
+        description: Data successfully sent to the Time series Analytics microservice
+        content:
+            application/json:
+            schema:
+                type: object
+                properties:
+                status:
+                    type: string
+                    example: success
+                message:
+                    type: string
+                    example: Data sent to Time series Analytics microservice
+                points:
+                    type: integer
+                    example: 2
+        '400':
+        description: Kapacitor rejected the data points (e.g., malformed line protocol)
+        '413':
+        description: Batch exceeds MAX_BATCH_POINTS data points
+        '422':
+        description: Invalid data points in the request body
+        '500':
+        description: Internal server error
+    """
+    body = await request.body()
+    content_type = request.headers.get("content-type", "")
+    try:
+        if "ndjson" in content_type or "jsonlines" in content_type:
+            data_points = [DataPoint.model_validate_json(line)
+                           for line in body.splitlines() if line.strip()]
+        else:
+            data_points = DATA_POINT_LIST.validate_json(body)
+    except ValidationError as error:
+        raise HTTPException(status_code=422, detail=str(error)) from error
+
+    if len(data_points) > MAX_BATCH_POINTS:
+        raise HTTPException(status_code=413,
+                            detail=f"Batch exceeds the maximum of {MAX_BATCH_POINTS} data points")
+    try:
+        await write_line_protocol(points_to_line_protocol(data_points))
+    except HTTPException:
+        raise
     except Exception as error:
         raise HTTPException(status_code=500, detail=str(error)) from error
+    return {"status": "success",
+            "message": "Data sent to Time Series Analytics microservice",
+            "points": len(data_points)}
 
 @app.get("/config")
 async def get_config(
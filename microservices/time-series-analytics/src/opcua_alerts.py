@@ -9,8 +9,16 @@ OPC UA Alerts Module.
 
 This module provides functionality for sending alerts to OPC UA servers
 in the Time Series Analytics Microservice.
+
+Alerts are delivered through an OpcuaAlertDispatcher, which queues them in a
+bounded asyncio queue, suppresses duplicates and bursts per alert key, and
+sends them over one persistent OPC UA session with a cached node handle. The
+session is re-established in the background with exponential backoff, so an
+unreachable server never blocks the API.
 """
 import os
+import asyncio
+import collections
 import logging
 import time
 import sys
@@ -44,6 +52,9 @@ class OpcuaAlerts:
         self.node_id = None
         self.namespace = None
         self.opcua_server = None
+        self.connected = False
+        self._alert_node = None
+        self._alert_node_key = None
 
     def load_opcua_config(self):
         """
@@ -62,17 +73,24 @@ class OpcuaAlerts:
             return None, None, None
 
 
-    async def connect_opcua_client(self, secure_mode, max_retries=10):
+    async def connect_opcua_client(self, secure_mode, max_retries=10,
+                                   retry_delay=1.0, max_retry_delay=30.0):
         """
         Connect to OPC UA client with retry mechanism.
+
+        Retries wait with exponential backoff without blocking the event loop.
         
         Args:
             secure_mode: String indicating if secure mode should be used
             max_retries: Maximum number of connection retry attempts
+            retry_delay: Delay in seconds before the first retry
+            max_retry_delay: Upper bound for the delay between retries
             
         Returns:
             bool: True if connection successful, False otherwise
         """
+        self.connected = False
+        self._alert_node = None
         if self.opcua_server:
             logger.info("Creating OPC UA client for server: %s", self.opcua_server)
             self.client = Client(self.opcua_server)
@@ -103,13 +121,15 @@ class OpcuaAlerts:
                             "%s (Attempt %s)", self.opcua_server, self.client, attempt + 1)
                 await self.client.connect()
                 logger.info("Connected to OPC UA server: %s successfully.", self.opcua_server)
+                self.connected = True
                 return True
             except Exception as error:
                 logger.error("Connection failed: %s", error)
                 attempt += 1
                 if attempt < max_retries:
-                    logger.info("Retrying in %s seconds...", max_retries)
-                    time.sleep(max_retries)
+                    delay = min(max_retry_delay, retry_delay * (2 ** (attempt - 1)))
+                    logger.info("Retrying in %s seconds...", delay)
+                    await asyncio.sleep(delay)
                 else:
                     logger.error("Max retries reached. Could not connect to the OPC UA server: %s",
                                  self.opcua_server)
@@ -131,6 +151,27 @@ class OpcuaAlerts:
             logger.error("Failed to connect to OPC UA server.")
             raise RuntimeError("Failed to connect to OPC UA server.")
 
+    def set_alert_node(self, node_id, namespace):
+        """
+        Point the alerts at a different node, dropping the cached node handle.
+
+        Args:
+            node_id: Numeric identifier of the alert node
+            namespace: Namespace index of the alert node
+        """
+        if node_id != self.node_id or namespace != self.namespace:
+            self.node_id = node_id
+            self.namespace = namespace
+            self._alert_node = None
+
+    def _get_alert_node(self):
+        """Return the alert node handle, resolving it only when the target changes."""
+        key = (self.namespace, self.node_id)
+        if self._alert_node is None or self._alert_node_key != key:
+            self._alert_node = self.client.get_node(f"ns={self.namespace};i={self.node_id}")
+            self._alert_node_key = key
+        return self._alert_node
+
     async def send_alert_to_opcua(self, alert_message):
         """
         Send alert message to OPC UA server.
@@ -145,13 +186,15 @@ class OpcuaAlerts:
             logger.error("OPC UA client is not initialized.")
             return
         try:
-            alert_node = self.client.get_node(f"ns={self.namespace};i={self.node_id}")
+            alert_node = self._get_alert_node()
             await alert_node.write_value(alert_message)
             alert_dict = json.loads(alert_message)
             alert_message_text = alert_dict.get("message", "")
             logger.info("ALERT sent to OPC UA server: %s", alert_message_text)
         except Exception as error:
             logger.error("%s", error)
+            self.connected = False
+            self._alert_node = None
             raise RuntimeError(f"Failed to send alert to OPC UA server node \
                                {self.node_id}: {error}")
 
@@ -167,3 +210,176 @@ class OpcuaAlerts:
         except Exception as error:
             logger.error("Error checking OPC UA connection status: %s", error)
             return False
+
+    async def disconnect(self):
+        """Close the OPC UA session if one is open."""
+        self.connected = False
+        self._alert_node = None
+        if self.client is None:
+            return
+        try:
+            await self.client.disconnect()
+        except Exception as error:
+            logger.debug("Error while disconnecting OPC UA client: %s", error)
+
+
+class OpcuaAlertDispatcher:
+    """Queue, coalesce and deliver alerts over a persistent OPC UA session."""
+
+    # Alert payload keys that change on every notification and are ignored
+    # when deciding whether two alerts are duplicates
+    VOLATILE_KEYS = ("time", "duration")
+
+    def __init__(self, alerts, queue_size=None, dedup_window=None, rate_limit=None,
+                 rate_window=None, max_send_attempts=3, reconnect_delay=None):
+        """
+        Initialize the dispatcher.
+
+        Args:
+            alerts: OpcuaAlerts instance used to deliver the alerts
+            queue_size: Maximum number of alerts waiting for delivery
+            dedup_window: Seconds during which identical alerts for a key are dropped
+            rate_limit: Maximum alerts accepted per key within rate_window
+            rate_window: Length in seconds of the rate-limiting window
+            max_send_attempts: Delivery attempts per alert before it is dropped
+            reconnect_delay: Upper bound in seconds for the delay between reconnects
+        """
+        self.alerts = alerts
+        self.queue_size = queue_size or int(os.getenv("OPCUA_ALERT_QUEUE_SIZE", "1000"))
+        self.dedup_window = dedup_window if dedup_window is not None else \
+            float(os.getenv("OPCUA_ALERT_DEDUP_WINDOW", "5"))
+        self.rate_limit = rate_limit or int(os.getenv("OPCUA_ALERT_RATE_LIMIT", "10"))
+        self.rate_window = rate_window if rate_window is not None else \
+            float(os.getenv("OPCUA_ALERT_RATE_WINDOW", "1"))
+        self.max_send_attempts = max_send_attempts
+        self.reconnect_delay = reconnect_delay if reconnect_delay is not None else \
+            float(os.getenv("OPCUA_RECONNECT_MAX_BACKOFF", "30"))
+
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(maxsize=self.queue_size)
+        self.stats = collections.Counter()
+        self._last_seen = {}
+        self._accepted = collections.defaultdict(collections.deque)
+        self._worker = None
+
+    @property
+    def opcua_server(self):
+        """OPC UA server URL the dispatcher delivers to."""
+        return self.alerts.opcua_server
+
+    def start(self):
+        """Start the background delivery task."""
+        if self._worker is None or self._worker.done():
+            self._worker = self.loop.create_task(self._run())
+
+    def alert_key(self, alert):
+        """
+        Return the de-duplication and rate-limiting key of an alert.
+
+        Kapacitor alerts carry an ``id``; other payloads fall back to their message.
+        """
+        return str(alert.get("id") or alert.get("message") or
+                   json.dumps(alert, sort_keys=True, default=str))
+
+    def submit(self, alert):
+        """
+        Queue an alert for delivery unless it is suppressed.
+
+        Args:
+            alert: Alert payload as a dict
+
+        Returns:
+            str: "queued", "duplicate", "rate_limited" or "dropped"
+        """
+        self.stats["received"] += 1
+        now = time.monotonic()
+        key = self.alert_key(alert)
+        fingerprint = json.dumps({k: v for k, v in alert.items() if k not in self.VOLATILE_KEYS},
+                                 sort_keys=True, default=str)
+
+        last = self._last_seen.get(key)
+        if last is not None and last[0] == fingerprint and now - last[1] < self.dedup_window:
+            self.stats["duplicate"] += 1
+            return "duplicate"
+
+        accepted = self._accepted[key]
+        while accepted and now - accepted[0] >= self.rate_window:
+            accepted.popleft()
+        if len(accepted) >= self.rate_limit:
+            self.stats["rate_limited"] += 1
+            return "rate_limited"
+
+        try:
+            self.queue.put_nowait(json.dumps(alert))
+        except asyncio.QueueFull:
+            self.stats["dropped"] += 1
+            logger.warning("OPC UA alert queue is full, dropping alert %s", key)
+            return "dropped"
+
+        accepted.append(now)
+        self._last_seen[key] = (fingerprint, now)
+        if len(self._last_seen) > 10 * self.queue_size:
+            self._prune(now)
+        self.stats["queued"] += 1
+        return "queued"
+
+    def _prune(self, now):
+        """Forget keys that have not been seen within the suppression windows."""
+        horizon = max(self.dedup_window, self.rate_window)
+        for key in [k for k, (_, seen) in self._last_seen.items() if now - seen >= horizon]:
+            del self._last_seen[key]
+            self._accepted.pop(key, None)
+
+    async def _run(self):
+        """Deliver queued alerts one at a time over the persistent session."""
+        while True:
+            alert_message = await self.queue.get()
+            try:
+                await self._deliver(alert_message)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Unexpected error while delivering OPC UA alert")
+            finally:
+                self.queue.task_done()
+
+    async def _deliver(self, alert_message):
+        """Send one alert, reconnecting with backoff when the session is down."""
+        attempts = 0
+        while attempts < self.max_send_attempts:
+            if not self.alerts.connected:
+                await self._reconnect()
+            attempts += 1
+            try:
+                await self.alerts.send_alert_to_opcua(alert_message)
+                self.stats["sent"] += 1
+                return
+            except Exception as error:
+                logger.warning("Sending OPC UA alert failed (attempt %s/%s): %s",
+                               attempts, self.max_send_attempts, error)
+        self.stats["failed"] += 1
+        logger.error("Dropping OPC UA alert after %s attempts", self.max_send_attempts)
+
+    async def _reconnect(self):
+        """Re-establish the OPC UA session, waiting between failed rounds."""
+        delay = 1.0
+        while True:
+            try:
+                await self.alerts.disconnect()
+                await self.alerts.initialize_opcua()
+                return
+            except Exception as error:
+                logger.error("Reconnecting to OPC UA server failed: %s", error)
+                await asyncio.sleep(delay)
+                delay = min(self.reconnect_delay, delay * 2)
+
+    async def close(self):
+        """Stop the delivery task and close the OPC UA session."""
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+        await self.alerts.disconnect()
@@ -0,0 +1,323 @@
+#
+# Apache v2 license
+# Copyright (C) 2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+#
+
+"""
+UDF Framework Module.
+
+This module provides a reusable base handler for Kapacitor Python UDFs that run
+a model over windows of points instead of one point at a time. Points are
+buffered (per Kapacitor batch in BATCH mode, or per window of N points in
+STREAM mode), converted to a NumPy feature matrix, passed to the model in a
+single call and the selected points are written back to Kapacitor in bulk.
+
+A UDF only has to declare its feature fields and implement ``predict``:
+
+    class TemperatureClassifier(WindowedUDFHandler):
+        fields = ("temperature",)
+
+        def predict(self, features):
+            return (features[:, 0] < 20) | (features[:, 0] > 25)
+
+The wire mode is STREAM by default and can be switched to BATCH by setting the
+``mode`` class attribute or the ``UDF_MODE`` environment variable. Window size,
+feature fields and the optional output field can be overridden from the TICK
+script via the ``window``, ``period``, ``field`` and ``as`` options. When the
+``DEVICE`` environment variable selects a GPU, ``predict`` runs inside a
+scikit-learn-intelex ``config_context`` that offloads to that device.
+"""
+import os
+import logging
+import struct
+
+import numpy as np
+from kapacitor.udf.agent import Handler
+from kapacitor.udf import udf_pb2
+
+log_level = os.getenv('KAPACITOR_LOGGING_LEVEL', 'INFO').upper()
+logging_level = getattr(logging, log_level, logging.INFO)
+
+# Configure logging
+logging.basicConfig(
+    level=logging_level,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+)
+
+logger = logging.getLogger()
+
+SNAPSHOT_VERSION = 1
+_HEADER = struct.Struct(">BBI")
+_LENGTH = struct.Struct(">I")
+
+
+class WindowedUDFHandler(Handler):
+    """Base Kapacitor UDF handler that runs a model once per window of points."""
+
+    # Feature fields read from each point, in column order
+    fields = ()
+    # Number of points per window in STREAM mode
+    window_size = 1
+    # Maximum time span of a STREAM window in nanoseconds (0 disables)
+    window_period = 0
+    # Field name used to attach the prediction to emitted points (None keeps points as-is)
+    output_field = None
+    # Wire mode: udf_pb2.STREAM or udf_pb2.BATCH
+    mode = None
+
+    def __init__(self, agent):
+        """
+        Initialize the handler.
+
+        Args:
+            agent: Kapacitor UDF agent used to write responses
+        """
+        self._agent = agent
+        self.fields = tuple(self.fields)
+        if self.mode is None:
+            udf_mode = os.getenv("UDF_MODE", "stream").lower()
+            self.mode = udf_pb2.BATCH if udf_mode == "batch" else udf_pb2.STREAM
+        self.device = os.getenv("DEVICE", "auto")
+        self.model_path = os.getenv("MODEL_PATH", "")
+        self.model = None
+        self._points = []
+        self._begin = None
+
+    # ------------------------------------------------------------------
+    # Hooks for subclasses
+    # ------------------------------------------------------------------
+    def load_model(self, model_path, device):
+        """
+        Load the model used by ``predict``. Called once from ``init``.
+
+        Args:
+            model_path: Value of the MODEL_PATH environment variable
+            device: Value of the DEVICE environment variable ("auto", "gpu" or "gpu:N")
+
+        Returns:
+            The loaded model, stored as ``self.model``
+        """
+        return None
+
+    def predict(self, features):
+        """
+        Run the model over one window.
+
+        Args:
+            features: float64 array of shape (points, len(fields)); missing values are NaN
+
+        Returns:
+            Array with one prediction per point
+        """
+        raise NotImplementedError
+
+    def select(self, features, predictions):
+        """
+        Choose which points of the window are written back to Kapacitor.
+
+        Args:
+            features: Feature matrix passed to ``predict``
+            predictions: Array returned by ``predict``
+
+        Returns:
+            Boolean array with one entry per point
+        """
+        return np.asarray(predictions).astype(bool)
+
+    # ------------------------------------------------------------------
+    # Kapacitor handler interface
+    # ------------------------------------------------------------------
+    def info(self):
+        response = udf_pb2.Response()
+        response.info.wants = self.mode
+        response.info.provides = self.mode
+        response.info.options['field'].valueTypes.append(udf_pb2.STRING)
+        response.info.options['window'].valueTypes.append(udf_pb2.INT)
+        response.info.options['period'].valueTypes.append(udf_pb2.DURATION)
+        response.info.options['as'].valueTypes.append(udf_pb2.STRING)
+        return response
+
+    def init(self, init_req):
+        response = udf_pb2.Response()
+        fields = []
+        try:
+            for option in init_req.options:
+                if option.name == 'field':
+                    fields.append(option.values[0].stringValue)
+                elif option.name == 'window':
+                    self.window_size = int(option.values[0].intValue)
+                elif option.name == 'period':
+                    self.window_period = int(option.values[0].durationValue)
+                elif option.name == 'as':
+                    self.output_field = option.values[0].stringValue
+            if fields:
+                self.fields = tuple(fields)
+            if not self.fields:
+                raise ValueError("at least one feature field must be configured")
+            if self.window_size < 1:
+                raise ValueError("window must be a positive number of points")
+            self.model = self.load_model(self.model_path, self.device)
+        except Exception as error:
+            logger.exception("UDF initialization failed")
+            response.init.success = False
+            response.init.error = str(error)
+            return response
+        logger.info("UDF initialized: mode=%s fields=%s window=%s device=%s",
+                    "batch" if self.mode == udf_pb2.BATCH else "stream",
+                    self.fields, self.window_size, self.device)
+        response.init.success = True
+        return response
+
+    def snapshot(self):
+        response = udf_pb2.Response()
+        response.snapshot.snapshot = self._encode_state()
+        return response
+
+    def restore(self, restore_req):
+        response = udf_pb2.Response()
+        try:
+            self._decode_state(restore_req.snapshot)
+            response.restore.success = True
+        except Exception as error:
+            logger.exception("Failed to restore UDF state")
+            response.restore.success = False
+            response.restore.error = str(error)
+        return response
+
+    def begin_batch(self, begin_req):
+        self._begin = udf_pb2.BeginBatch()
+        self._begin.CopyFrom(begin_req)
+        self._points = []
+
+    def point(self, point):
+        self._points.append(point)
+        if self.mode == udf_pb2.BATCH:
+            return
+        if len(self._points) >= self.window_size or (
+                self.window_period and point.time - self._points[0].time >= self.window_period):
+            self._flush_stream_window()
+
+    def end_batch(self, end_req):
+        points, self._points = self._points, []
+        selected = self._process_window(points)
+        begin = udf_pb2.Response()
+        if self._begin is not None:
+            begin.begin.CopyFrom(self._begin)
+        begin.begin.size = len(selected)
+        self._agent.write_response(begin)
+        self._write_points(selected, flush=False)
+        end = udf_pb2.Response()
+        end.end.CopyFrom(end_req)
+        self._agent.write_response(end, True)
+        self._begin = None
+
+    # ------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------
+    def features_from_points(self, points):
+        """
+        Build the feature matrix for a window of points.
+
+        Args:
+            points: List of udf_pb2.Point
+
+        Returns:
+            float64 array of shape (len(points), len(fields))
+        """
+        features = np.full((len(points), len(self.fields)), np.nan, dtype=np.float64)
+        for row, point in enumerate(points):
+            doubles = point.fieldsDouble
+            ints = point.fieldsInt
+            for column, field in enumerate(self.fields):
+                if field in doubles:
+                    features[row, column] = doubles[field]
+                elif field in ints:
+                    features[row, column] = ints[field]
+        return features
+
+    def _flush_stream_window(self):
+        points, self._points = self._points, []
+        selected = self._process_window(points)
+        self._write_points(selected, flush=True)
+
+    def _process_window(self, points):
+        """Run the model over a window and return the points to emit."""
+        if not points:
+            return []
+        features = self.features_from_points(points)
+        missing = np.isnan(features).any(axis=1)
+        if missing.any():
+            logger.error("Invalid data received - %d of %d points are missing fields %s",
+                         int(missing.sum()), len(points), self.fields)
+        predictions = np.asarray(self._predict_on_device(features))
+        mask = self.select(features, predictions) & ~missing
+        indices = np.flatnonzero(mask)
+        logger.debug("Window of %d points produced %d results", len(points), len(indices))
+
+        selected = []
+        for index in indices:
+            point = points[index]
+            if self.output_field:
+                point.fieldsDouble[self.output_field] = float(predictions[index])
+            selected.append(point)
+        return selected
+
+    def _predict_on_device(self, features):
+        """Call ``predict`` with scikit-learn-intelex offloaded to the configured GPU."""
+        if not self.device.startswith("gpu"):
+            return self.predict(features)
+        try:
+            from sklearnex import config_context
+        except ImportError:
+            logger.warning("scikit-learn-intelex is not available, running %s on CPU",
+                           type(self).__name__)
+            return self.predict(features)
+        with config_context(target_offload=self.device):
+            return self.predict(features)
+
+    def _write_points(self, points, flush):
+        """Write points back to Kapacitor, flushing the agent only once."""
+        last = len(points) - 1
+        for index, point in enumerate(points):
+            response = udf_pb2.Response()
+            response.point.CopyFrom(point)
+            self._agent.write_response(response, flush and index == last)
+
+    def _encode_state(self):
+        """Serialize buffered points (and the open batch) into snapshot bytes."""
+        begin = self._begin.SerializeToString() if self._begin is not None else b''
+        chunks = [_HEADER.pack(SNAPSHOT_VERSION, 1 if self._begin is not None else 0,
+                               len(self._points)),
+                  _LENGTH.pack(len(begin)), begin]
+        for point in self._points:
+            data = point.SerializeToString()
+            chunks.append(_LENGTH.pack(len(data)))
+            chunks.append(data)
+        return b''.join(chunks)
+
+    def _decode_state(self, data):
+        """Restore buffered points (and the open batch) from snapshot bytes."""
+        if not data:
+            self._points, self._begin = [], None
+            return
+        version, has_begin, count = _HEADER.unpack_from(data, 0)
+        if version != SNAPSHOT_VERSION:
+            raise ValueError(f"unsupported snapshot version {version}")
+        offset = _HEADER.size
+        (length,) = _LENGTH.unpack_from(data, offset)
+        offset += _LENGTH.size
+        begin = None
+        if has_begin:
+            begin = udf_pb2.BeginBatch()
+            begin.ParseFromString(data[offset:offset + length])
+        offset += length
+        points = []
+        for _ in range(count):
+            (length,) = _LENGTH.unpack_from(data, offset)
+            offset += _LENGTH.size
+            point = udf_pb2.Point()
+            point.ParseFromString(data[offset:offset + length])
+            offset += length
+            points.append(point)
+        self._points, self._begin = points, begin
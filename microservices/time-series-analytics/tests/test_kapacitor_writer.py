@@ -0,0 +1,119 @@
+#
+# Apache v2 license
+# Copyright (C) 2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+#
+import asyncio
+import time
+import httpx
+import pytest
+from kapacitor_writer import KapacitorWriter, KapacitorWriteError
+
+
+def make_writer(handler, **kwargs):
+    writer = KapacitorWriter("http://kapacitor:9092", **kwargs)
+    writer.client = httpx.AsyncClient(base_url=writer.kapacitor_url,
+                                      transport=httpx.MockTransport(handler))
+    return writer
+
+
+@pytest.mark.asyncio
+async def test_concurrent_writes_are_coalesced():
+    bodies = []
+    def handler(request):
+        bodies.append(request.content.decode())
+        return httpx.Response(204)
+    writer = make_writer(handler, batch_size=100, flush_interval=0.01)
+    await asyncio.gather(writer.write(["a x=1 1"]), writer.write(["a x=2 2", "a x=3 3"]))
+    assert bodies == ["a x=1 1\na x=2 2\na x=3 3"]
+    await writer.aclose()
+
+
+@pytest.mark.asyncio
+async def test_batch_size_triggers_immediate_flush():
+    bodies = []
+    def handler(request):
+        bodies.append(request.content.decode())
+        return httpx.Response(204)
+    writer = make_writer(handler, batch_size=2, flush_interval=60)
+    await asyncio.wait_for(writer.write(["a x=1 1", "a x=2 2"]), timeout=1)
+    assert bodies == ["a x=1 1\na x=2 2"]
+    await writer.aclose()
+
+
+@pytest.mark.asyncio
+async def test_rejected_batch_raises_for_every_waiter():
+    writer = make_writer(lambda request: httpx.Response(400, text="bad line"), flush_interval=0.01)
+    results = await asyncio.gather(writer.write(["bad"]), writer.write(["worse"]),
+                                   return_exceptions=True)
+    assert all(isinstance(r, KapacitorWriteError) for r in results)
+    assert results[0].status_code == 400
+    assert results[0].detail == "bad line"
+    await writer.aclose()
+
+
+@pytest.mark.asyncio
+async def test_rejected_batch_only_fails_faulty_requests():
+    bodies = []
+    def handler(request):
+        body = request.content.decode()
+        bodies.append(body)
+        return httpx.Response(400, text="bad line") if "bad" in body else httpx.Response(204)
+    writer = make_writer(handler, batch_size=100, flush_interval=0.01)
+    results = await asyncio.gather(writer.write(["a x=1 1"]), writer.write(["bad"]),
+                                   writer.write(["a x=2 2", "a x=3 3"]), return_exceptions=True)
+    assert results[0] is None and results[2] is None
+    assert isinstance(results[1], KapacitorWriteError)
+    assert results[1].status_code == 400
+    assert bodies[0] == "a x=1 1\nbad\na x=2 2\na x=3 3"
+    assert sorted(bodies[1:]) == ["a x=1 1", "a x=2 2\na x=3 3", "bad"]
+    await writer.aclose()
+
+
+@pytest.mark.asyncio
+async def test_connection_error_marks_unhealthy():
+    def handler(request):
+        raise httpx.ConnectError("refused")
+    writer = make_writer(handler, flush_interval=0.01, health_ttl=60)
+    writer._healthy = True
+    writer._health_checked_at = time.monotonic()
+    with pytest.raises(KapacitorWriteError):
+        await writer.write(["a x=1 1"])
+    assert await writer.is_healthy() is False
+    await writer.aclose()
+
+
+@pytest.mark.asyncio
+async def test_health_state_is_cached():
+    pings = []
+    def handler(request):
+        pings.append(request.url.path)
+        return httpx.Response(204)
+    writer = make_writer(handler, health_ttl=60)
+    assert await writer.is_healthy() is True
+    assert await writer.is_healthy() is True
+    assert pings == ["/kapacitor/v1/ping"]
+    await writer.aclose()
+
+
+@pytest.mark.asyncio
+async def test_health_probe_failure():
+    def handler(request):
+        raise httpx.ConnectError("refused")
+    writer = make_writer(handler, health_ttl=0)
+    assert await writer.is_healthy() is False
+    await writer.aclose()
+
+
+@pytest.mark.asyncio
+async def test_aclose_flushes_pending_lines():
+    bodies = []
+    def handler(request):
+        bodies.append(request.content.decode())
+        return httpx.Response(204)
+    writer = make_writer(handler, flush_interval=60)
+    task = asyncio.ensure_future(writer.write(["a x=1 1"]))
+    await asyncio.sleep(0)
+    await writer.aclose()
+    await task
+    assert bodies == ["a x=1 1"]
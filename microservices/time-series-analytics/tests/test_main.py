@@ -47,14 +47,21 @@ def test_health_check_not_running(monkeypatch):
     assert resp.status_code == 503
     assert "kapacitor daemon not running" in resp.json()["status"]
 
+class FakeKapacitorWriter:
+    def __init__(self, healthy=True, error=None):
+        self.healthy = healthy
+        self.error = error
+        self.lines = []
+    async def is_healthy(self):
+        return self.healthy
+    async def write(self, lines):
+        if self.error is not None:
+            raise self.error
+        self.lines.extend(lines)
+
 def test_receive_data_success(monkeypatch):
-    class MockHealthResp:
-        def __getitem__(self, k): return "kapacitor daemon is running"
-    monkeypatch.setattr(main, "health_check", lambda r: {"status": "kapacitor daemon is running"})
-    class MockResp:
-        status_code = 204
-        text = ""
-    monkeypatch.setattr(main.requests, "post", lambda *a, **k: MockResp())
+    writer = FakeKapacitorWriter()
+    monkeypatch.setattr(main, "get_kapacitor_writer", lambda: writer)
     data = {
         "topic": "sensor_data",
         "tags": {"location": "factory1"},
@@ -64,9 +71,10 @@ def test_receive_data_success(monkeypatch):
     resp = client.post("/input", json=data)
     assert resp.status_code == 200
     assert resp.json()["status"] == "success"
+    assert writer.lines == ["sensor_data,location=factory1 temperature=23.5 1718000000000000000"]
 
 def test_receive_data_kapacitor_down(monkeypatch):
-    monkeypatch.setattr(main, "health_check", lambda r: {"status": "kapacitor daemon is not running"})
+    monkeypatch.setattr(main, "get_kapacitor_writer", lambda: FakeKapacitorWriter(healthy=False))
     data = {
         "topic": "sensor_data",
         "tags": {"location": "factory1"},
@@ -77,6 +85,67 @@ def test_receive_data_kapacitor_down(monkeypatch):
     assert resp.status_code == 500
     assert "Kapacitor daemon is not running" in resp.json()["detail"]
 
+def test_receive_data_write_error(monkeypatch):
+    writer = FakeKapacitorWriter(error=main.KapacitorWriteError(400, "bad line"))
+    monkeypatch.setattr(main, "get_kapacitor_writer", lambda: writer)
+    resp = client.post("/input", json={"topic": "t", "fields": {"x": 1}})
+    assert resp.status_code == 400
+    assert "bad line" in resp.json()["detail"]
+
+def test_receive_data_batch_json_array(monkeypatch):
+    writer = FakeKapacitorWriter()
+    monkeypatch.setattr(main, "get_kapacitor_writer", lambda: writer)
+    data = [
+        {"topic": "sensor_data", "fields": {"temperature": 23.5}, "timestamp": 1},
+        {"topic": "sensor_data", "tags": {"a": "b"}, "fields": {"temperature": 23.7}, "timestamp": 2},
+    ]
+    resp = client.post("/input/batch", json=data)
+    assert resp.status_code == 200
+    assert resp.json()["points"] == 2
+    assert writer.lines == ["sensor_data temperature=23.5 1", "sensor_data,a=b temperature=23.7 2"]
+
+def test_receive_data_batch_ndjson(monkeypatch):
+    writer = FakeKapacitorWriter()
+    monkeypatch.setattr(main, "get_kapacitor_writer", lambda: writer)
+    body = '{"topic": "t", "fields": {"x": 1}, "timestamp": 5}\n\n{"topic": "t", "fields": {"x": 2}, "timestamp": 6}\n'
+    resp = client.post("/input/batch", content=body,
+                       headers={"Content-Type": "application/x-ndjson"})
+    assert resp.status_code == 200
+    assert resp.json()["points"] == 2
+    assert writer.lines == ["t x=1 5", "t x=2 6"]
+
+def test_receive_data_batch_invalid_point(monkeypatch):
+    monkeypatch.setattr(main, "get_kapacitor_writer", lambda: FakeKapacitorWriter())
+    resp = client.post("/input/batch", json=[{"topic": "t"}])
+    assert resp.status_code == 422
+
+def test_receive_data_batch_too_large(monkeypatch):
+    monkeypatch.setattr(main, "get_kapacitor_writer", lambda: FakeKapacitorWriter())
+    monkeypatch.setattr(main, "MAX_BATCH_POINTS", 1)
+    data = [{"topic": "t", "fields": {"x": 1}}, {"topic": "t", "fields": {"x": 2}}]
+    resp = client.post("/input/batch", json=data)
+    assert resp.status_code == 413
+
+def test_receive_data_batch_write_error(monkeypatch):
+    writer = FakeKapacitorWriter(error=main.KapacitorWriteError(400, "bad line"))
+    monkeypatch.setattr(main, "get_kapacitor_writer", lambda: writer)
+    resp = client.post("/input/batch", json=[{"topic": "t", "fields": {"x": 1}}])
+    assert resp.status_code == 400
+    assert "bad line" in resp.json()["detail"]
+
+def test_receive_data_batch_kapacitor_down(monkeypatch):
+    monkeypatch.setattr(main, "get_kapacitor_writer", lambda: FakeKapacitorWriter(healthy=False))
+    resp = client.post("/input/batch", json=[{"topic": "t", "fields": {"x": 1}}])
+    assert resp.status_code == 500
+    assert "Kapacitor daemon is not running" in resp.json()["detail"]
+
+def test_points_to_line_protocol_assigns_ordered_timestamps(monkeypatch):
+    monkeypatch.setattr(main.time, "time_ns", lambda: 1000)
+    points = [main.DataPoint(topic="t", fields={"x": 1}),
+              main.DataPoint(topic="t", fields={"x": 2}, timestamp=7),
+              main.DataPoint(topic="t", fields={"x": 3})]
+    assert main.points_to_line_protocol(points) == ["t x=1 1000", "t x=2 7", "t x=3 1002"]
+
 def test_get_config(monkeypatch):
     resp = client.get("/config")
     assert resp.status_code == 200
@@ -209,88 +278,93 @@ def test_health_check_request_exception(monkeypatch):
     assert response == {"status": "An error occurred while checking the service"}
     assert resp_obj.status_code == main.status.HTTP_503_SERVICE_UNAVAILABLE
 
-def test_receive_alert_success(monkeypatch):
-    # Patch OpcuaAlerts and its methods
+class FakeDispatcher:
+    def __init__(self, result="queued"):
+        self.result = result
+        self.alerts = []
+    def submit(self, alert):
+        self.alerts.append(alert)
+        return self.result
+
+def make_opcua_alerts_mock(monkeypatch):
     mock_opcua_alerts = mock.Mock()
-    mock_instance = mock.Mock()
-    monkeypatch.setitem(sys.modules, "opcua_alerts", mock.Mock())
-    mock_instance.opcua_server = main.config["alerts"]["opcua"]["opcua_server"]
-    mock_instance.node_id = main.config["alerts"]["opcua"]["node_id"]
-    mock_instance.namespace = main.config["alerts"]["opcua"]["namespace"]
-    mock_instance.is_connected = mock.AsyncMock(return_value=True)
-    mock_instance.send_alert_to_opcua = mock.AsyncMock()
-    mock_instance.initialize_opcua = mock.AsyncMock()
-    mock_opcua_alerts.return_value = mock_instance
+    def create(cfg):
+        instance = mock.Mock()
+        instance.opcua_server = cfg["alerts"]["opcua"]["opcua_server"]
+        instance.node_id = cfg["alerts"]["opcua"]["node_id"]
+        instance.namespace = cfg["alerts"]["opcua"]["namespace"]
+        instance.connected = False
+        instance.initialize_opcua = mock.AsyncMock()
+        instance.send_alert_to_opcua = mock.AsyncMock()
+        instance.disconnect = mock.AsyncMock()
+        return instance
+    mock_opcua_alerts.side_effect = create
     monkeypatch.setattr(main, "OpcuaAlerts", mock_opcua_alerts)
-    # Ensure global is None to trigger initialization
-    main.OPCUA_SEND_ALERT = None
+    return mock_opcua_alerts
+
+def test_receive_alert_success(monkeypatch):
+    make_opcua_alerts_mock(monkeypatch)
+    main.OPCUA_ALERT_DISPATCHER = None
     alert_data = {"alert": "test message"}
     resp = client.post("/opcua_alerts", json=alert_data)
     assert resp.status_code == 200
     assert resp.json()["status"] == "success"
     assert resp.json()["message"] == "Alert received"
-    mock_instance.initialize_opcua.assert_awaited()
-    mock_instance.send_alert_to_opcua.assert_awaited()
+    assert main.OPCUA_ALERT_DISPATCHER.stats["queued"] == 1
 
-def test_receive_alert_reinitialize_on_server_change(monkeypatch):
-    # Existing OPCUA_SEND_ALERT with different server triggers re-init
-    mock_opcua_alerts = mock.Mock()
-    mock_instance = mock.Mock()
-    monkeypatch.setitem(sys.modules, "opcua_alerts", mock.Mock())
-    mock_instance.opcua_server = "wrong_server"
-    mock_instance.node_id = main.config["alerts"]["opcua"]["node_id"]
-    mock_instance.namespace = main.config["alerts"]["opcua"]["namespace"]
-    mock_instance.is_connected = mock.AsyncMock(return_value=True)
-    mock_instance.send_alert_to_opcua = mock.AsyncMock()
-    mock_instance.initialize_opcua = mock.AsyncMock()
-    mock_opcua_alerts.return_value = mock_instance
-    monkeypatch.setattr(main, "OpcuaAlerts", mock_opcua_alerts)
-    main.OPCUA_SEND_ALERT = mock_instance
-    alert_data = {"alert": "test message"}
-    resp = client.post("/opcua_alerts", json=alert_data)
+def test_receive_alert_duplicate_suppressed(monkeypatch):
+    dispatcher = FakeDispatcher("duplicate")
+    monkeypatch.setattr(main, "get_alert_dispatcher", mock.AsyncMock(return_value=dispatcher))
+    resp = client.post("/opcua_alerts", json={"alert": "test message"})
     assert resp.status_code == 200
-    mock_instance.initialize_opcua.assert_awaited()
-    mock_instance.send_alert_to_opcua.assert_awaited()
+    assert resp.json()["message"] == "Duplicate alert suppressed"
+    assert dispatcher.alerts == [{"alert": "test message"}]
+
+def test_receive_alert_rate_limited(monkeypatch):
+    monkeypatch.setattr(main, "get_alert_dispatcher",
+                        mock.AsyncMock(return_value=FakeDispatcher("rate_limited")))
+    resp = client.post("/opcua_alerts", json={"alert": "test message"})
+    assert resp.status_code == 429
+    assert "rate_limited" in resp.json()["detail"]
+
+def test_receive_alert_queue_full(monkeypatch):
+    monkeypatch.setattr(main, "get_alert_dispatcher",
+                        mock.AsyncMock(return_value=FakeDispatcher("dropped")))
+    resp = client.post("/opcua_alerts", json={"alert": "test message"})
+    assert resp.status_code == 429
 
-def test_receive_alert_reinitialize_on_not_connected(monkeypatch):
-    # Existing OPCUA_SEND_ALERT not connected triggers re-init
-    mock_opcua_alerts = mock.Mock()
-    mock_instance = mock.Mock()
-    monkeypatch.setitem(sys.modules, "opcua_alerts", mock.Mock())
-    mock_instance.opcua_server = main.config["alerts"]["opcua"]["opcua_server"]
-    mock_instance.node_id = main.config["alerts"]["opcua"]["node_id"]
-    mock_instance.namespace = main.config["alerts"]["opcua"]["namespace"]
-    mock_instance.is_connected = mock.AsyncMock(return_value=False)
-    mock_instance.send_alert_to_opcua = mock.AsyncMock()
-    mock_instance.initialize_opcua = mock.AsyncMock()
-    mock_opcua_alerts.return_value = mock_instance
-    monkeypatch.setattr(main, "OpcuaAlerts", mock_opcua_alerts)
-    main.OPCUA_SEND_ALERT = mock_instance
-    alert_data = {"alert": "test message"}
-    resp = client.post("/opcua_alerts", json=alert_data)
-    assert resp.status_code == 200
-    mock_instance.initialize_opcua.assert_awaited()
-    mock_instance.send_alert_to_opcua.assert_awaited()
+@pytest.mark.asyncio
+async def test_get_alert_dispatcher_reused(monkeypatch):
+    make_opcua_alerts_mock(monkeypatch)
+    main.OPCUA_ALERT_DISPATCHER = None
+    first = await main.get_alert_dispatcher(main.config["alerts"]["opcua"])
+    second = await main.get_alert_dispatcher(main.config["alerts"]["opcua"])
+    assert first is second
+    assert main.OpcuaAlerts.call_count == 1
+    await first.close()
 
-def test_receive_alert_update_node_id_and_namespace(monkeypatch):
-    # Should update node_id and namespace if different
-    mock_opcua_alerts = mock.Mock()
-    mock_instance = mock.Mock()
-    monkeypatch.setitem(sys.modules, "opcua_alerts", mock.Mock())
-    mock_instance.opcua_server = main.config["alerts"]["opcua"]["opcua_server"]
-    mock_instance.node_id = "old_node"
-    mock_instance.namespace = 999
-    mock_instance.is_connected = mock.AsyncMock(return_value=True)
-    mock_instance.send_alert_to_opcua = mock.AsyncMock()
-    mock_instance.initialize_opcua = mock.AsyncMock()
-    mock_opcua_alerts.return_value = mock_instance
-    monkeypatch.setattr(main, "OpcuaAlerts", mock_opcua_alerts)
-    main.OPCUA_SEND_ALERT = mock_instance
-    alert_data = {"alert": "test message"}
-    resp = client.post("/opcua_alerts", json=alert_data)
-    assert resp.status_code == 200
-    assert mock_instance.node_id == main.config["alerts"]["opcua"]["node_id"]
-    assert mock_instance.namespace == main.config["alerts"]["opcua"]["namespace"]
+@pytest.mark.asyncio
+async def test_get_alert_dispatcher_recreated_on_server_change(monkeypatch):
+    make_opcua_alerts_mock(monkeypatch)
+    main.OPCUA_ALERT_DISPATCHER = None
+    first = await main.get_alert_dispatcher(main.config["alerts"]["opcua"])
+    main.config["alerts"]["opcua"]["opcua_server"] = "opc.tcp://other:4840"
+    second = await main.get_alert_dispatcher(main.config["alerts"]["opcua"])
+    assert first is not second
+    first.alerts.disconnect.assert_awaited()
+    assert second.opcua_server == "opc.tcp://other:4840"
+    await second.close()
+
+@pytest.mark.asyncio
+async def test_get_alert_dispatcher_updates_node_id_and_namespace(monkeypatch):
+    make_opcua_alerts_mock(monkeypatch)
+    main.OPCUA_ALERT_DISPATCHER = None
+    dispatcher = await main.get_alert_dispatcher(main.config["alerts"]["opcua"])
+    main.config["alerts"]["opcua"]["node_id"] = "ns=2;i=3"
+    main.config["alerts"]["opcua"]["namespace"] = 3
+    await main.get_alert_dispatcher(main.config["alerts"]["opcua"])
+    dispatcher.alerts.set_alert_node.assert_called_with("ns=2;i=3", 3)
+    await dispatcher.close()
 
 def test_receive_alert_opcua_not_configured(monkeypatch):
     # Remove opcua from config
@@ -300,42 +374,13 @@ def test_receive_alert_opcua_not_configured(monkeypatch):
     assert resp.status_code == 500
     assert "OPC UA alerts are not configured" in resp.json()["detail"]
 
-def test_receive_alert_initialize_opcua_fails(monkeypatch):
-    # Simulate exception during initialize_opcua
-    mock_opcua_alerts = mock.Mock()
-    mock_instance = mock.Mock()
-    monkeypatch.setitem(sys.modules, "opcua_alerts", mock.Mock())
-    mock_instance.opcua_server = "wrong"
-    mock_instance.is_connected = mock.AsyncMock(return_value=False)
-    mock_instance.initialize_opcua = mock.AsyncMock(side_effect=Exception("init fail"))
-    mock_opcua_alerts.return_value = mock_instance
-    monkeypatch.setattr(main, "OpcuaAlerts", mock_opcua_alerts)
-    main.OPCUA_SEND_ALERT = None
-    # Restore config for alerts
-    main.config["alerts"] = {"opcua": {"opcua_server": "opc.tcp://localhost:4840", "node_id": "ns=2;i=2", "namespace": 2}}
-    alert_data = {"alert": "test message"}
-    resp = client.post("/opcua_alerts", json=alert_data)
-    assert resp.status_code == 500
-    assert "Failed to initialize OPC UA client" in resp.json()["detail"]
-
-def test_receive_alert_send_alert_fails(monkeypatch):
-    # Simulate exception during send_alert_to_opcua
-    mock_opcua_alerts = mock.Mock()
-    mock_instance = mock.Mock()
-    monkeypatch.setitem(sys.modules, "opcua_alerts", mock.Mock())
-    mock_instance.opcua_server = main.config["alerts"]["opcua"]["opcua_server"]
-    mock_instance.node_id = main.config["alerts"]["opcua"]["node_id"]
-    mock_instance.namespace = main.config["alerts"]["opcua"]["namespace"]
-    mock_instance.is_connected = mock.AsyncMock(return_value=True)
-    mock_instance.initialize_opcua = mock.AsyncMock()
-    mock_instance.send_alert_to_opcua = mock.AsyncMock(side_effect=Exception("send fail"))
-    mock_opcua_alerts.return_value = mock_instance
-    monkeypatch.setattr(main, "OpcuaAlerts", mock_opcua_alerts)
-    main.OPCUA_SEND_ALERT = None
+def test_receive_alert_dispatcher_fails(monkeypatch):
+    monkeypatch.setattr(main, "get_alert_dispatcher",
+                        mock.AsyncMock(side_effect=Exception("init fail")))
     alert_data = {"alert": "test message"}
     resp = client.post("/opcua_alerts", json=alert_data)
     assert resp.status_code == 500
-    assert "Failed to send alert" in resp.json()["detail"]
+    assert "Failed to queue alert" in resp.json()["detail"]
 
 @pytest.mark.asyncio
 async def test_get_config_returns_full_config(monkeypatch):
@@ -9,7 +9,8 @@ from fastapi.testclient import TestClient
 from unittest.mock import patch, MagicMock, mock_open
 import types
 from unittest.mock import patch, MagicMock, AsyncMock
-from opcua_alerts import OpcuaAlerts
+import asyncio
+from opcua_alerts import OpcuaAlerts, OpcuaAlertDispatcher
 
 
 @pytest.fixture
@@ -75,7 +76,8 @@ async def test_connect_opcua_client_secure_mode(valid_config):
 async def test_connect_opcua_client_failure(valid_config):
     alerts = OpcuaAlerts(valid_config)
     alerts.node_id, alerts.namespace, alerts.opcua_server = alerts.load_opcua_config()
-    with patch("opcua_alerts.Client") as MockClient, patch("opcua_alerts.time.sleep", return_value=None):
+    with patch("opcua_alerts.Client") as MockClient, \
+            patch("opcua_alerts.asyncio.sleep", new=AsyncMock()) as mock_sleep:
         mock_client_instance = AsyncMock()
         MockClient.return_value = mock_client_instance
         mock_client_instance.connect.side_effect = Exception("fail")
@@ -84,6 +86,8 @@ async def test_connect_opcua_client_failure(valid_config):
             result = await alerts.connect_opcua_client("false", max_retries=2)
             assert result is False or result is None
             assert mock_client_instance.connect.await_count == 2
+            mock_sleep.assert_awaited_once_with(1.0)
+            assert alerts.connected is False
 
 @pytest.mark.asyncio
 async def test_connect_opcua_client_no_server(valid_config):
@@ -159,3 +163,128 @@ async def test_is_connected_false(valid_config, caplog):
     result = await alerts.is_connected()
     assert result is False
     assert "Error checking OPC UA connection status" in caplog.text
+
+@pytest.mark.asyncio
+async def test_connect_opcua_client_backoff_is_capped(valid_config):
+    alerts = OpcuaAlerts(valid_config)
+    alerts.load_opcua_config()
+    with patch("opcua_alerts.Client") as MockClient, \
+            patch("opcua_alerts.asyncio.sleep", new=AsyncMock()) as mock_sleep:
+        MockClient.return_value = AsyncMock()
+        MockClient.return_value.connect.side_effect = Exception("fail")
+        await alerts.connect_opcua_client("false", max_retries=5, max_retry_delay=4.0)
+        assert [c.args[0] for c in mock_sleep.await_args_list] == [1.0, 2.0, 4.0, 4.0]
+
+@pytest.mark.asyncio
+async def test_send_alert_caches_node_handle(valid_config):
+    alerts = OpcuaAlerts(valid_config)
+    alerts.load_opcua_config()
+    alerts.client = MagicMock()
+    alerts.client.get_node.return_value = AsyncMock()
+    await alerts.send_alert_to_opcua(json.dumps({"message": "a"}))
+    await alerts.send_alert_to_opcua(json.dumps({"message": "b"}))
+    assert alerts.client.get_node.call_count == 1
+    alerts.set_alert_node("456", "3")
+    await alerts.send_alert_to_opcua(json.dumps({"message": "c"}))
+    alerts.client.get_node.assert_called_with("ns=3;i=456")
+
+@pytest.mark.asyncio
+async def test_send_alert_failure_marks_disconnected(valid_config):
+    alerts = OpcuaAlerts(valid_config)
+    alerts.load_opcua_config()
+    alerts.client = MagicMock()
+    alerts.connected = True
+    node = AsyncMock()
+    node.write_value.side_effect = Exception("session closed")
+    alerts.client.get_node.return_value = node
+    with pytest.raises(RuntimeError):
+        await alerts.send_alert_to_opcua(json.dumps({"message": "a"}))
+    assert alerts.connected is False
+    assert alerts._alert_node is None
+
+def make_sink(valid_config):
+    sink = OpcuaAlerts(valid_config)
+    sink.load_opcua_config()
+    sink.initialize_opcua = AsyncMock(side_effect=lambda: setattr(sink, "connected", True))
+    sink.send_alert_to_opcua = AsyncMock()
+    sink.disconnect = AsyncMock()
+    return sink
+
+@pytest.mark.asyncio
+async def test_dispatcher_delivers_queued_alerts(valid_config):
+    sink = make_sink(valid_config)
+    dispatcher = OpcuaAlertDispatcher(sink)
+    dispatcher.start()
+    assert dispatcher.submit({"id": "a", "message": "hot"}) == "queued"
+    assert dispatcher.submit({"id": "b", "message": "cold"}) == "queued"
+    await asyncio.wait_for(dispatcher.queue.join(), timeout=1)
+    sink.initialize_opcua.assert_awaited_once()
+    assert sink.send_alert_to_opcua.await_count == 2
+    assert dispatcher.stats["sent"] == 2
+    await dispatcher.close()
+
+@pytest.mark.asyncio
+async def test_dispatcher_deduplicates_within_window(valid_config):
+    dispatcher = OpcuaAlertDispatcher(make_sink(valid_config), dedup_window=60, rate_limit=100)
+    assert dispatcher.submit({"id": "a", "message": "hot", "time": 1}) == "queued"
+    assert dispatcher.submit({"id": "a", "message": "hot", "time": 2}) == "duplicate"
+    assert dispatcher.submit({"id": "a", "message": "hotter", "time": 3}) == "queued"
+    assert dispatcher.submit({"id": "b", "message": "hot", "time": 4}) == "queued"
+    assert dispatcher.stats["duplicate"] == 1
+
+@pytest.mark.asyncio
+async def test_dispatcher_rate_limits_per_key(valid_config):
+    dispatcher = OpcuaAlertDispatcher(make_sink(valid_config), dedup_window=0,
+                                      rate_limit=2, rate_window=60)
+    results = [dispatcher.submit({"id": "a", "message": str(i)}) for i in range(3)]
+    assert results == ["queued", "queued", "rate_limited"]
+    assert dispatcher.submit({"id": "b", "message": "0"}) == "queued"
+
+@pytest.mark.asyncio
+async def test_dispatcher_drops_when_queue_full(valid_config):
+    dispatcher = OpcuaAlertDispatcher(make_sink(valid_config), queue_size=1, dedup_window=0)
+    assert dispatcher.submit({"id": "a", "message": "1"}) == "queued"
+    assert dispatcher.submit({"id": "b", "message": "2"}) == "dropped"
+    assert dispatcher.stats["dropped"] == 1
+
+@pytest.mark.asyncio
+async def test_dispatcher_reconnects_after_send_failure(valid_config):
+    sink = make_sink(valid_config)
+    def fail_once(message):
+        if sink.send_alert_to_opcua.await_count == 1:
+            sink.connected = False
+            raise RuntimeError("session lost")
+    sink.send_alert_to_opcua.side_effect = fail_once
+    dispatcher = OpcuaAlertDispatcher(sink)
+    dispatcher.start()
+    dispatcher.submit({"id": "a", "message": "hot"})
+    await asyncio.wait_for(dispatcher.queue.join(), timeout=1)
+    assert sink.initialize_opcua.await_count == 2
+    assert dispatcher.stats["sent"] == 1
+    await dispatcher.close()
+
+@pytest.mark.asyncio
+async def test_dispatcher_reconnect_backs_off_without_blocking(valid_config):
+    sink = make_sink(valid_config)
+    attempts = []
+    def flaky_connect():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise RuntimeError("unreachable")
+        sink.connected = True
+    sink.initialize_opcua.side_effect = flaky_connect
+    dispatcher = OpcuaAlertDispatcher(sink, reconnect_delay=1.5)
+    with patch("opcua_alerts.asyncio.sleep", new=AsyncMock()) as mock_sleep:
+        await dispatcher._reconnect()
+    assert [c.args[0] for c in mock_sleep.await_args_list] == [1.0, 1.5]
+    assert sink.connected is True
+
+@pytest.mark.asyncio
+async def test_dispatcher_gives_up_after_max_attempts(valid_config):
+    sink = make_sink(valid_config)
+    sink.connected = True
+    sink.send_alert_to_opcua.side_effect = RuntimeError("bad node")
+    dispatcher = OpcuaAlertDispatcher(sink, max_send_attempts=2)
+    await dispatcher._deliver("{}")
+    assert sink.send_alert_to_opcua.await_count == 2
+    assert dispatcher.stats["failed"] == 1
@@ -0,0 +1,217 @@
+#
+# Apache v2 license
+# Copyright (C) 2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+#
+import collections
+import copy
+import pickle
+import sys
+import types
+from unittest import mock
+
+import numpy as np
+import pytest
+
+
+class FakeMessage:
+    """Minimal stand-in for the protobuf messages used by the UDF agent."""
+    def __init__(self, **kwargs):
+        self.__dict__.update(kwargs)
+
+    def __getattr__(self, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        value = collections.defaultdict(FakeMessage) if name == "options" else FakeMessage()
+        if name == "valueTypes":
+            value = []
+        setattr(self, name, value)
+        return value
+
+    def CopyFrom(self, other):
+        self.__dict__.clear()
+        self.__dict__.update(copy.deepcopy(other.__dict__))
+
+    def SerializeToString(self):
+        return pickle.dumps(self.__dict__)
+
+    def ParseFromString(self, data):
+        self.__dict__.update(pickle.loads(data))
+
+
+udf_pb2 = types.SimpleNamespace(
+    STREAM=0, BATCH=1, STRING=2, INT=3, DURATION=4,
+    Response=FakeMessage, Point=FakeMessage, BeginBatch=FakeMessage,
+)
+kapacitor = types.ModuleType("kapacitor")
+kapacitor_udf = types.ModuleType("kapacitor.udf")
+kapacitor_udf.udf_pb2 = udf_pb2
+agent_module = types.ModuleType("kapacitor.udf.agent")
+agent_module.Handler = object
+sys.modules.setdefault("kapacitor", kapacitor)
+sys.modules.setdefault("kapacitor.udf", kapacitor_udf)
+sys.modules.setdefault("kapacitor.udf.agent", agent_module)
+
+import udf_framework  # noqa: E402
+
+
+class RangeClassifier(udf_framework.WindowedUDFHandler):
+    fields = ("temperature",)
+
+    def __init__(self, agent):
+        super().__init__(agent)
+        self.calls = []
+
+    def predict(self, features):
+        self.calls.append(features.shape[0])
+        return (features[:, 0] < 20) | (features[:, 0] > 25)
+
+
+def make_point(t, value, field="fieldsDouble"):
+    point = FakeMessage(time=t, fieldsDouble={}, fieldsInt={})
+    getattr(point, field)["temperature"] = value
+    return point
+
+
+def make_init(**options):
+    values = []
+    for name, (attr, value) in options.items():
+        values.append(FakeMessage(name=name, values=[FakeMessage(**{attr: value})]))
+    return FakeMessage(options=values)
+
+
+def written(agent):
+    return [c.args[0] for c in agent.write_response.call_args_list]
+
+
+def test_stream_window_runs_model_once_per_window():
+    agent = mock.Mock()
+    handler = RangeClassifier(agent)
+    assert handler.init(make_init(window=("intValue", 3))).init.success is True
+    for t, value in enumerate([10, 22, 30, 21]):
+        handler.point(make_point(t, value))
+    assert handler.calls == [3]
+    responses = written(agent)
+    assert [r.point.fieldsDouble["temperature"] for r in responses] == [10, 30]
+    assert [c.args[1] for c in agent.write_response.call_args_list] == [False, True]
+    assert len(handler._points) == 1
+
+
+def test_stream_window_flushes_on_period():
+    agent = mock.Mock()
+    handler = RangeClassifier(agent)
+    handler.init(make_init(window=("intValue", 100), period=("durationValue", 10)))
+    handler.point(make_point(0, 30))
+    handler.point(make_point(10, 31))
+    assert handler.calls == [2]
+    assert len(written(agent)) == 2
+
+
+def test_missing_and_int_fields():
+    agent = mock.Mock()
+    handler = RangeClassifier(agent)
+    handler.init(make_init(window=("intValue", 3)))
+    handler.point(make_point(0, 40, field="fieldsInt"))
+    handler.point(FakeMessage(time=1, fieldsDouble={}, fieldsInt={}))
+    handler.point(make_point(2, 22))
+    responses = written(agent)
+    assert len(responses) == 1
+    assert responses[0].point.fieldsInt["temperature"] == 40
+
+
+def test_output_field_attaches_prediction():
+    agent = mock.Mock()
+
+    class Scorer(udf_framework.WindowedUDFHandler):
+        fields = ("temperature",)
+
+        def predict(self, features):
+            return features[:, 0] / 10.0
+
+    handler = Scorer(agent)
+    handler.init(make_init(window=("intValue", 2), **{"as": ("stringValue", "score")}))
+    handler.point(make_point(0, 5))
+    handler.point(make_point(1, 0))
+    responses = written(agent)
+    assert len(responses) == 1
+    assert responses[0].point.fieldsDouble["score"] == 0.5
+
+
+def test_batch_mode_emits_one_batch(monkeypatch):
+    monkeypatch.setenv("UDF_MODE", "batch")
+    agent = mock.Mock()
+    handler = RangeClassifier(agent)
+    assert handler.info().info.wants == udf_pb2.BATCH
+    handler.init(make_init())
+    handler.begin_batch(FakeMessage(name="cpu"))
+    for t, value in enumerate([10, 22, 30]):
+        handler.point(make_point(t, value))
+    assert written(agent) == []
+    handler.end_batch(FakeMessage(name="cpu", tmax=2))
+    responses = written(agent)
+    assert handler.calls == [3]
+    assert responses[0].begin.size == 2
+    assert [r.point.fieldsDouble["temperature"] for r in responses[1:3]] == [10, 30]
+    assert responses[3].end.tmax == 2
+    assert agent.write_response.call_args_list[-1].args[1] is True
+
+
+def test_init_requires_fields():
+    class NoFields(udf_framework.WindowedUDFHandler):
+        def predict(self, features):
+            return features
+
+    response = NoFields(mock.Mock()).init(make_init())
+    assert response.init.success is False
+    assert "field" in response.init.error
+
+
+def test_init_fields_from_options():
+    handler = RangeClassifier(mock.Mock())
+    handler.init(make_init(field=("stringValue", "pressure")))
+    assert handler.fields == ("pressure",)
+
+
+def test_snapshot_restore_round_trip(monkeypatch):
+    monkeypatch.setenv("UDF_MODE", "batch")
+    handler = RangeClassifier(mock.Mock())
+    handler.init(make_init())
+    handler.begin_batch(FakeMessage(name="cpu"))
+    handler.point(make_point(1, 30))
+    handler.point(make_point(2, 21))
+    snapshot = handler.snapshot().snapshot.snapshot
+
+    agent = mock.Mock()
+    restored = RangeClassifier(agent)
+    restored.init(make_init())
+    assert restored.restore(FakeMessage(snapshot=snapshot)).restore.success is True
+    assert restored._begin.name == "cpu"
+    assert [p.time for p in restored._points] == [1, 2]
+    restored.end_batch(FakeMessage(name="cpu"))
+    assert written(agent)[0].begin.size == 1
+
+
+def test_restore_rejects_unknown_version():
+    handler = RangeClassifier(mock.Mock())
+    bad = udf_framework._HEADER.pack(99, 0, 0)
+    response = handler.restore(FakeMessage(snapshot=bad))
+    assert response.restore.success is False
+
+
+def test_gpu_device_uses_sklearnex_offload(monkeypatch):
+    monkeypatch.setenv("DEVICE", "gpu:0")
+    contexts = []
+
+    class FakeContext:
+        def __init__(self, **kwargs):
+            contexts.append(kwargs)
+        def __enter__(self):
+            return self
+        def __exit__(self, *args):
+            return False
+
+    monkeypatch.setitem(sys.modules, "sklearnex", types.SimpleNamespace(config_context=FakeContext))
+    handler = RangeClassifier(mock.Mock())
+    handler.init(make_init())
+    handler.point(make_point(0, 30))
+    assert contexts == [{"target_offload": "gpu:0"}]
@@ -4,8 +4,8 @@
 # SPDX-License-Identifier: Apache-2.0
 #
 
-from kapacitor.udf.agent import Agent, Handler, Server
-from kapacitor.udf import udf_pb2
+from kapacitor.udf.agent import Agent
+from udf_framework import WindowedUDFHandler
 import logging
 import os
 
@@ -20,53 +20,19 @@ logging.basicConfig(
 
 logger = logging.getLogger()
 
-# Mirrors all points it receives back to Kapacitor
-class MirrorHandler(Handler):
-    def __init__(self, agent):
-        self._agent = agent
-
-    def info(self):
-        response = udf_pb2.Response()
-        response.info.wants = udf_pb2.STREAM
-        response.info.provides = udf_pb2.STREAM
-        return response
-
-    def init(self, init_req):
-        response = udf_pb2.Response()
-        response.init.success = True
-        return response
-
-    def snapshot(self):
-        response = udf_pb2.Response()
-        response.snapshot.snapshot = b''
-        return response
-
-    def restore(self, restore_req):
-        response = udf_pb2.Response()
-        response.restore.success = False
-        response.restore.error = 'not implemented'
-        return response
-
-    def begin_batch(self, begin_req):
-        raise Exception("not supported")
-
-    def point(self, point):
-        temp = None
-        if "temperature" in point.fieldsDouble:
-            temp = point.fieldsDouble["temperature"]
-            
-        if temp is None or isinstance(temp, (int, float)) is False:
-            logger.error(f"Invalid temperature data received - {temp}")
-        else:
-            logger.debug(f"Received temperature point data {temp}")
-            if temp < 20 or temp > 25:
-                response = udf_pb2.Response()
-                response.point.CopyFrom(point)
-                logger.info(f"Temperature {temp} is outside the range 20-25.")
-                self._agent.write_response(response, True)
-
-    def end_batch(self, end_req):
-        raise Exception("not supported")
+# Mirrors the points whose temperature is outside the 20-25 range back to Kapacitor.
+# Points are classified one window at a time; the window size and the STREAM/BATCH
+# mode can be changed without touching the classification logic.
+class MirrorHandler(WindowedUDFHandler):
+    fields = ("temperature",)
+
+    def predict(self, features):
+        temp = features[:, 0]
+        outside = (temp < 20) | (temp > 25)
+        if logger.isEnabledFor(logging.INFO):
+            for value in temp[outside]:
+                logger.info(f"Temperature {value} is outside the range 20-25.")
+        return outside
 
 if __name__ == '__main__':
     # Create an agent
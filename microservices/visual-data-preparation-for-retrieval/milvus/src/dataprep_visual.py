@@ -8,10 +8,11 @@ import os
 import re
 import logging
 import json
-from tqdm import tqdm
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 
 from indexer import Indexer
+from utils import scan_media_files
 
 from pydantic import BaseModel
 from typing import Optional, Dict, Union
@@ -49,6 +50,8 @@ DEVICE = os.getenv("DEVICE", "CPU")
 MOUNT_DATA_PATH = "/home/user/data"
 HOST_DATA_PATH = os.getenv("HOST_DATA_PATH", "/home/user/data")
 LOCAL_EMBED_MODEL_ID = os.getenv("LOCAL_EMBED_MODEL_ID", "CLIP-ViT-H-14")
+SCAN_WORKERS = int(os.getenv("SCAN_WORKERS", 8))
+MEDIA_EXTENSIONS = ('.jpg', '.png', '.jpeg', '.mp4')
 
 indexer = Indexer()
 
@@ -139,30 +142,33 @@ async def ingest_host_dir(request: IngestHostDirRequest = Body(...)):
         if not os.path.isdir(file_dir_cont):
             raise HTTPException(status_code=404, detail="Invalid directory path.")
 
-        proc_files = []
-        metas = []
-        for root, _, files in os.walk(file_dir_cont): 
-            if root.split("/")[-1] == "meta":
-                continue
-            for file_name in tqdm(files):                
-                if not file_name.lower().endswith(('.jpg', '.png', '.jpeg', '.mp4')):
-                    logger.debug(f"Unsupported file type: {file_name}, skipped. Supported types are: jpg, jpeg, png, mp4")
-                    continue
-                file_path = os.path.join(root, file_name)
-                # find a json file with the same name as the file to get its metadata
-                base_name, _ = os.path.splitext(file_name)
-                meta_path = os.path.join(file_dir_cont, "meta", f"{base_name}.json")
-                if os.path.exists(meta_path):
-                    with open(meta_path, "r") as meta_file:
-                        meta = json.load(meta_file)
-                    meta["file_path"] = helper_map2host(file_path)
-                    proc_files.append(file_path)
-                    metas.append(meta)
-                else:
-                    meta = {}
-                    meta["file_path"] = helper_map2host(file_path)
-                    proc_files.append(file_path)
-                    metas.append(meta)
+        entries = scan_media_files(file_dir_cont, MEDIA_EXTENSIONS, skip_dir_names=("meta",), workers=SCAN_WORKERS)
+        # Unchanged files are dropped before their metadata is read
+        changed = indexer.filter_changed(
+            [(file_path, helper_map2host(file_path), stat) for file_path, stat in entries]
+        )
+        logger.info(f"Found {len(entries)} files in {file_dir}, {len(changed)} new or changed.")
+
+        # find a json file with the same name as the file to get its metadata
+        meta_dir = os.path.join(file_dir_cont, "meta")
+        try:
+            meta_names = set(os.listdir(meta_dir))
+        except FileNotFoundError:
+            meta_names = set()
+
+        def load_meta(entry):
+            file_path, host_file_path, _ = entry
+            base_name, _ = os.path.splitext(os.path.basename(file_path))
+            meta = {}
+            if f"{base_name}.json" in meta_names:
+                with open(os.path.join(meta_dir, f"{base_name}.json"), "r") as meta_file:
+                    meta = json.load(meta_file)
+            meta["file_path"] = host_file_path
+            return meta
+
+        proc_files = [file_path for file_path, _, _ in changed]
+        with ThreadPoolExecutor(max_workers=SCAN_WORKERS) as executor:
+            metas = list(executor.map(load_meta, changed))
                 
         res = indexer.add_embedding(proc_files, metas, frame_extract_interval=frame_extract_interval, do_detect_and_crop=do_detect_and_crop)
 
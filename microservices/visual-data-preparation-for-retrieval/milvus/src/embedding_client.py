@@ -0,0 +1,70 @@
+# Copyright (C) 2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from utils import encode_image_to_base64
+
+EMBEDDING_CONCURRENCY = int(os.getenv("EMBEDDING_CONCURRENCY", 8))
+EMBEDDING_TIMEOUT = float(os.getenv("EMBEDDING_TIMEOUT", 30))
+
+
+class EmbeddingClient:
+    """
+    Client of the multimodal embedding service that embeds batches of images.
+
+    The service embeds one image per request, so a batch is sent as concurrent requests
+    over a pooled keep-alive session instead of one blocking request after another.
+    Base64 encoding runs in the same worker threads, overlapping with the requests.
+    """
+
+    def __init__(self, base_url, model_name, concurrency=EMBEDDING_CONCURRENCY, timeout=EMBEDDING_TIMEOUT):
+        self.base_url = base_url
+        self.model_name = model_name
+        self.concurrency = max(1, int(concurrency))
+        self.timeout = timeout
+
+        self.session = requests.Session()
+        retry = Retry(total=3, backoff_factor=0.5, status_forcelist=[502, 503, 504], allowed_methods=["POST"])
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.concurrency, max_retries=retry)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers.update({"Content-Type": "application/json"})
+
+        self._executor = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="embed")
+
+    def embed_image(self, image):
+        payload = {
+            "model": self.model_name,
+            "encoding_format": "float",
+            "input": {
+                "type": "image_base64",
+                "image_base64": encode_image_to_base64(image),
+            },
+        }
+        response = self.session.post(f"{self.base_url}/embeddings", json=payload, timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()["embedding"]
+
+    def embed_images(self, images):
+        """
+        Embed a batch of images concurrently.
+
+        Args:
+            images: PIL images or RGB numpy arrays.
+
+        Returns:
+            Embeddings in the order of the input images.
+        """
+        if len(images) == 1:
+            return [self.embed_image(images[0])]
+        return list(self._executor.map(self.embed_image, images))
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+        self.session.close()
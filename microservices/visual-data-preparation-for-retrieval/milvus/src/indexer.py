@@ -4,21 +4,29 @@
 import os
 import copy
 import json
+import subprocess
+import threading
 import requests
 import numpy as np
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+from moviepy.config import get_setting
 from moviepy.editor import VideoFileClip
 from PIL import Image
 
 from detector import Detector
-from utils import generate_unique_id, encode_image_to_base64
-from milvus_client import MilvusClientWrapper
+from utils import generate_unique_id
+from embedding_client import EmbeddingClient
+from manifest import IngestManifest, compute_file_hash
+from milvus_client import MilvusClientWrapper, MilvusBatchInserter
 
 
 DEVICE = os.getenv("DEVICE", "CPU")
 EMBEDDING_BASE_URL = os.getenv("EMBEDDING_BASE_URL", None)
 EMBEDDING_MODEL_NAME = os.getenv("EMBEDDING_MODEL_NAME", "openai/clip-vit-base-patch32")
+EMBEDDING_BATCH_SIZE = int(os.getenv("EMBEDDING_BATCH_SIZE", 16))
+INGEST_FILE_WORKERS = int(os.getenv("INGEST_FILE_WORKERS", 2))
 
 
 def create_milvus_data(embedding, meta=None):
@@ -38,16 +46,21 @@ class Indexer:
         self.embed_url = EMBEDDING_BASE_URL
 
         self.detector = Detector(device=DEVICE)
+        self.embedding_client = EmbeddingClient(self.embed_url, self.model_name)
 
-        self.id_map = {}
         self.db_inited = False
+        self._db_lock = threading.Lock()
         self.client = MilvusClientWrapper()
         self.collection_name = collection_name
+        self.manifest = IngestManifest(collection_name)
 
         if self.client.load_collection(collection_name=self.collection_name) == 3:  # loaded
             print(f"Collection '{self.collection_name}' already exist.")
             self.db_inited = True
-            self.recover_id_map()
+            self.recover_manifest()
+        elif self.client.has_collection(collection_name=self.collection_name) is False:
+            # The collection was dropped, and with it every entity the manifest refers to
+            self.manifest.clear()
 
 
     def check_db_service(self, url="http://localhost:9091/healthz"):
@@ -63,39 +76,38 @@ class Indexer:
             return False
 
     def init_db_client(self, dim):
-        self.client.create_collection(dim, collection_name=self.collection_name)
+        # Files are processed concurrently, so only the first embedding creates the collection
+        with self._db_lock:
+            if self.db_inited:
+                return
+            self.client.create_collection(dim, collection_name=self.collection_name)
 
-        self.db_inited = True
-        self.recover_id_map()
-
-    def update_id_map(self, file_path, node_id):
-        if file_path not in self.id_map:
-            self.id_map[file_path] = []
-        self.id_map[file_path].append(node_id)
+            self.db_inited = True
+            self.recover_manifest()
 
-    def recover_id_map(self):
+    def recover_manifest(self):
+        """Rebuild the manifest from the collection when it has no record of the ingested files yet."""
+        if self.manifest.count_files() > 0:
+            return
         res = self.client.query_all(self.collection_name, output_fields=["id", "meta"])
         if not res:
             print("No data found in the collection.")
             return
+        id_map = {}
         for item in res:
             if "file_path" in item["meta"]:
-                file_path = item["meta"]["file_path"]
-                if file_path not in self.id_map:
-                    self.id_map[file_path] = []
-                self.id_map[file_path].append(item["id"])
+                id_map.setdefault(item["meta"]["file_path"], []).append(item["id"])
+        # The stat and hash of recovered files are unknown, so the ones they have when next seen are adopted
+        self.manifest.record_files(
+            (file_path, None, None, None, ids) for file_path, ids in id_map.items()
+        )
+        print(f"Recovered {len(id_map)} files from collection '{self.collection_name}'.")
 
     def count_files(self):
-        files = set()
-        for key, value in self.id_map.items():
-            if key not in files:  
-                files.add(key)    
-        return len(files)
+        return self.manifest.count_files()
     
     def query_file(self, file_path):
-        ids = []
-        if file_path in self.id_map:
-            ids = self.id_map[file_path]
+        ids = self.manifest.get_ids(file_path)
 
         res = None
         # TBD: are vector and meta needed from db?
@@ -109,140 +121,250 @@ class Indexer:
         
     
     def delete_by_file_path(self, file_path):
-        ids = []
-        if file_path in self.id_map:
-            ids = self.id_map[file_path]
+        res = None
+        ids = self.manifest.get_ids(file_path)
+        if ids:
             res = self.client.delete(
                 collection_name=self.collection_name,
                 ids=ids,
             )
-            del self.id_map[file_path]
+            self.manifest.remove(file_path)
         else:
             print(f"File {file_path} not found in db.")
         return res, ids
     
     def delete_all(self):
-        if not self.id_map:
+        ids = self.manifest.get_all_ids()
+        if not ids:
             return None, []
-        ids = []
-        for key, value in self.id_map.items():
-            ids.extend(value)
         res = self.client.delete(
             collection_name=self.collection_name,
             ids=ids,
         )
-        self.id_map.clear()
+        self.manifest.clear()
 
         return res, ids
-    
+
+    def filter_changed(self, entries):
+        """
+        Select the files that are new or whose stat differs from the one recorded at ingest.
+
+        Args:
+            entries: Sequence of (file, file_path, stat) tuples, where file is the path to read
+                and file_path the path recorded in the metadata.
+
+        Returns:
+            The entries that need to be passed to add_embedding.
+        """
+        records = self.manifest.get_many(file_path for _, file_path, _ in entries)
+        changed = []
+        for entry in entries:
+            _, file_path, stat = entry
+            record = records.get(file_path)
+            if record is None or not self._stat_matches(record, stat):
+                changed.append(entry)
+        return changed
+
+    @staticmethod
+    def _stat_matches(record, stat):
+        mtime, size, _ = record
+        # A file recovered from Milvus has no stat yet, so its hash has to be computed
+        return mtime is not None and mtime == stat.st_mtime and size == stat.st_size
+
+    def _check_file(self, file, file_path):
+        """
+        Decide whether a file needs to be ingested.
+
+        Returns:
+            (stat, record, content_hash, needs_ingest). The content hash is only computed when
+            the stat changed, to tell a touched file from a modified one. A file recovered from
+            Milvus is assumed to be the one its entities were embedded from, and its current
+            stat and hash are recorded.
+        """
+        stat = os.stat(file)
+        record = self.manifest.get(file_path)
+        if record is None:
+            return stat, None, None, True
+        if self._stat_matches(record, stat):
+            return stat, record, None, False
+
+        content_hash = compute_file_hash(file)
+        if record[2] is None:
+            self.manifest.update_stat(file_path, stat.st_mtime, stat.st_size, content_hash)
+            return stat, record, content_hash, False
+        if content_hash == record[2]:
+            self.manifest.update_stat(file_path, stat.st_mtime, stat.st_size)
+            return stat, record, content_hash, False
+        return stat, record, content_hash, True
+
     def get_image_embedding(self, image):
-        base64_img = encode_image_to_base64(image)
-        headers = { 'Content-Type': 'application/json'}
-
-        payload = {
-            "model": EMBEDDING_MODEL_NAME,
-            "encoding_format": "float",
-            "input": {
-                "type": "image_base64",
-                "image_base64": base64_img
-            }
-        }
-    
-        response = requests.post(f"{self.embed_url}/embeddings", json=payload, headers=headers, timeout=10)
-        data = response.json()
-        embedding = data["embedding"]
-        return embedding
-        
-    def process_video(self, video_path, meta, frame_interval=15, minimal_duration=1, do_detect_and_crop=True):
+        return self.embedding_client.embed_image(image)
+
+    def get_image_embeddings(self, images):
+        return self.embedding_client.embed_images(images)
+
+    def _embed_and_submit(self, inserter, ids, images, metas):
+        """Embed a batch of images, hand the resulting entities to the inserter and collect their ids."""
+        if not images:
+            return
+        embeddings = self.get_image_embeddings(images)
+        if not self.db_inited:
+            self.init_db_client(len(embeddings[0]))
+
         entities = []
-        video = VideoFileClip(video_path)
+        for embedding, meta_data in zip(embeddings, metas):
+            node = create_milvus_data(embedding, meta_data)
+            entities.append(node)
+            ids.append(node["id"])
+        self._submit_embedding(inserter, entities)
+
+    @staticmethod
+    def _iter_sampled_frames(video_path, frame_interval):
+        """
+        Yield (seconds, frame) for every frame_interval-th frame of a video.
 
-        frame_counter = 0
-        frame_interval = int(frame_interval)
+        FFmpeg still decodes every frame, as inter-coded frames depend on the previous ones,
+        but its select filter drops the others before they are converted to RGB and piped.
+        """
+        video = VideoFileClip(video_path, audio=False)
         fps = video.fps
-        for frame in video.iter_frames():
-            if frame_counter % frame_interval == 0:
-                image = Image.fromarray(frame)
-                seconds = frame_counter / fps
-                meta_data = copy.deepcopy(meta)
-                meta_data["video_pin_second"] = seconds
-                if do_detect_and_crop:
-                    crops = self.detector.get_cropped_images(image)
-                    for crop in crops:
-                        embedding = self.get_image_embedding(crop)
-                        if not self.db_inited:
-                            self.init_db_client(len(embedding))
-                        node = create_milvus_data(embedding, meta_data)
-                        entities.append(node)
-                        self.update_id_map(meta_data["file_path"], node["id"])
-
-                embedding = self.get_image_embedding(image)
-                if not self.db_inited:
-                    self.init_db_client(len(embedding))
-                node = create_milvus_data(embedding, meta_data)
-                entities.append(node)
-                self.update_id_map(meta_data["file_path"], node["id"])
-            frame_counter += 1
-            
-        return entities
-
-    def process_image(self, image_path, meta, do_detect_and_crop=True):
-        entities = []
+        width, height = video.size
+        video.close()
+
+        cmd = [
+            get_setting("FFMPEG_BINARY"), "-loglevel", "error", "-i", video_path, "-an",
+            "-vf", f"select=not(mod(n\\,{frame_interval}))", "-vsync", "0",
+            "-f", "rawvideo", "-pix_fmt", "rgb24", "-",
+        ]
+        frame_size = width * height * 3
+        proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, bufsize=frame_size)
+        try:
+            frame_idx = 0
+            while True:
+                data = proc.stdout.read(frame_size)
+                if len(data) < frame_size:
+                    break
+                yield frame_idx / fps, np.frombuffer(data, dtype=np.uint8).reshape(height, width, 3)
+                frame_idx += frame_interval
+        finally:
+            proc.stdout.close()
+            proc.kill()
+            proc.wait()
+
+    def process_video(self, inserter, ids, video_path, meta, frame_interval=15, minimal_duration=1, do_detect_and_crop=True):
+        images, image_metas = [], []
+        frame_interval = max(1, int(frame_interval))
+        for seconds, frame in self._iter_sampled_frames(video_path, frame_interval):
+            image = Image.fromarray(frame)
+            meta_data = copy.deepcopy(meta)
+            meta_data["video_pin_second"] = seconds
+            if do_detect_and_crop:
+                for crop in self.detector.get_cropped_images(image):
+                    images.append(crop)
+                    image_metas.append(meta_data)
+            images.append(image)
+            image_metas.append(meta_data)
+
+            if len(images) >= EMBEDDING_BATCH_SIZE:
+                self._embed_and_submit(inserter, ids, images, image_metas)
+                images, image_metas = [], []
+
+        self._embed_and_submit(inserter, ids, images, image_metas)
+
+    def process_image(self, inserter, ids, image_path, meta, do_detect_and_crop=True):
         image = Image.open(image_path).convert('RGB')
         meta_data = copy.deepcopy(meta)
+        images = []
         if do_detect_and_crop:
-            crops = self.detector.get_cropped_images(image)
-            for crop in crops:
-                embedding = self.get_image_embedding(crop)
-                if not self.db_inited:
-                    self.init_db_client(len(embedding))
-                node = create_milvus_data(embedding, meta_data)
-                entities.append(node)
-                self.update_id_map(meta_data["file_path"], node["id"])
-        
-        embedding = self.get_image_embedding(image)
-        if not self.db_inited:
-            self.init_db_client(len(embedding))
-        node = create_milvus_data(embedding, meta_data)
-        entities.append(node)
-        self.update_id_map(meta_data["file_path"], node["id"])
-        return entities
+            images.extend(self.detector.get_cropped_images(image))
+        images.append(image)
+        self._embed_and_submit(inserter, ids, images, [meta_data] * len(images))
+
+    def _process_file(self, inserter, ids, file, meta, frame_interval, minimal_duration, do_detect_and_crop):
+        if file.lower().endswith(('.mp4')):
+            meta["type"] = "local_video"
+            self.process_video(inserter, ids, file, meta, frame_interval, minimal_duration, do_detect_and_crop)
+        elif file.lower().endswith(('.jpg', '.png', '.jpeg')):
+            meta["type"] = "local_image"
+            self.process_image(inserter, ids, file, meta, do_detect_and_crop)
+        else:
+            print(f"Unsupported file type: {file}. Supported types are: jpg, png, mp4")
+
+    def _ingest_file(self, inserter, ids, file, meta, stat, record, content_hash, **kwargs):
+        file_path = meta["file_path"]
+        if content_hash is None:
+            content_hash = compute_file_hash(file)
+        if record is not None:
+            # The file changed since it was ingested, so its previous entities are stale
+            print(f"File {file} changed, re-ingesting.")
+            self.delete_by_file_path(file_path)
+        self._process_file(inserter, ids, file, meta, **kwargs)
+        return file_path, stat.st_mtime, stat.st_size, content_hash, ids
 
     def add_embedding(self, files, metas, **kwargs):
         if len(files) != len(metas):
             raise ValueError(f"Number of files and metas must be the same. files: {len(files)}, metas: {len(metas)}")
         
-        frame_interval = kwargs.get("frame_interval", 15)
-        minimal_duration = kwargs.get("minimal_duration", 1)
-        do_detect_and_crop = kwargs.get("do_detect_and_crop", True)
-        entities = []
+        options = {
+            "frame_interval": kwargs.get("frame_interval", kwargs.get("frame_extract_interval", 15)),
+            "minimal_duration": kwargs.get("minimal_duration", 1),
+            "do_detect_and_crop": kwargs.get("do_detect_and_crop", True),
+        }
+
+        pending = []
         for file, meta in zip(files, metas):
-            # print("processing file: ", file)
-            if meta["file_path"] in self.id_map:
+            stat, record, content_hash, needs_ingest = self._check_file(file, meta["file_path"])
+            if not needs_ingest:
                 print(f"File {file} already processed, skipping.")
                 continue
-            if file.lower().endswith(('.mp4')):
-                meta["type"] = "local_video"
-                entities.extend(self.process_video(file, meta, frame_interval, minimal_duration, do_detect_and_crop))
-            elif file.lower().endswith(('.jpg', '.png', '.jpeg')):
-                meta["type"] = "local_image"
-                entities.extend(self.process_image(file, meta, do_detect_and_crop))
-            else:
-                print(f"Unsupported file type: {file}. Supported types are: jpg, png, mp4")
+            pending.append((file, meta, stat, record, content_hash))
+        if not pending:
+            return {}
 
-        res = {}
-        if entities:
-            res = self.client.insert(
-                collection_name=self.collection_name,
-                data=entities,
-            )
-        return res
+        # Entities are written in batches while later files are still being embedded
+        inserter = MilvusBatchInserter(self.client, self.collection_name)
+        workers = max(1, min(INGEST_FILE_WORKERS, len(pending)))
+        file_ids = [[] for _ in pending]
+        ingested, errors = [], []
+        try:
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ingest") as executor:
+                futures = [
+                    executor.submit(self._ingest_file, inserter, ids, *item, **options)
+                    for ids, item in zip(file_ids, pending)
+                ]
+                for future, ids in zip(futures, file_ids):
+                    try:
+                        ingested.append(future.result())
+                    except Exception as e:
+                        errors.append((e, ids))
+        finally:
+            try:
+                res = inserter.close()
+            except Exception as e:
+                # A batch failed and the inserter stopped writing, so only the files whose
+                # entities all made it to Milvus are ingested
+                written = set(inserter.ids)
+                failed = [record for record in ingested if not written.issuperset(record[4])]
+                ingested = [record for record in ingested if written.issuperset(record[4])]
+                errors = [(e, [])] + errors + [(e, record[4]) for record in failed]
+                res = None
 
+        # Only files whose entities were all written are recorded, so a failed file is retried
+        self.manifest.record_files(ingested)
+        if errors:
+            orphan_ids = [entity_id for _, ids in errors for entity_id in ids]
+            if orphan_ids:
+                self.client.delete(collection_name=self.collection_name, ids=orphan_ids)
+            raise errors[0][0]
+
+        if res["insert_count"]:
+            self._build_index()
+        return res
 
-    def _submit_embedding(self, entities):
-        # aync thread which collects embeddings and insert to db in batch
-        pass
+    def _submit_embedding(self, inserter, entities):
+        # the inserter thread collects entities and inserts them to db in batches
+        inserter.submit(entities)
 
     def _build_index(self):
-        # build index
-        pass
+        # seal the inserted segments so they are indexed instead of searched by brute force
+        self.client.flush(collection_name=self.collection_name)
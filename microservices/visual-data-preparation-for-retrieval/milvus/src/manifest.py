@@ -0,0 +1,163 @@
+# Copyright (C) 2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+import hashlib
+import os
+import sqlite3
+import threading
+
+MANIFEST_DB_PATH = os.getenv("MANIFEST_DB_PATH", "/home/user/state/ingest_manifest.db")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    collection_name TEXT NOT NULL,
+    file_path TEXT NOT NULL,
+    mtime REAL,
+    size INTEGER,
+    content_hash TEXT,
+    PRIMARY KEY (collection_name, file_path)
+);
+CREATE TABLE IF NOT EXISTS entity_ids (
+    collection_name TEXT NOT NULL,
+    file_path TEXT NOT NULL,
+    entity_id INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entity_ids_file ON entity_ids (collection_name, file_path);
+"""
+
+# Number of parameters bound per IN (...) lookup, below SQLite's variable limit
+_LOOKUP_CHUNK = 900
+
+
+def compute_file_hash(file_path, chunk_size=1 << 20):
+    sha = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+
+class IngestManifest:
+    """
+    Persistent record of the ingested files of a collection and their Milvus ids.
+
+    Each file is stored with the mtime, size and content hash it had when it was ingested,
+    so a restart neither has to query Milvus for the ids nor re-process unchanged files.
+    Files recovered from an existing collection have no stat nor hash yet: the ones they have
+    when they are next seen are adopted, so recovered files are not re-processed.
+    """
+
+    def __init__(self, collection_name, db_path=MANIFEST_DB_PATH):
+        self.collection_name = collection_name
+        self.db_path = db_path
+        if os.path.dirname(db_path):
+            os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+
+    def count_files(self):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT COUNT(*) FROM files WHERE collection_name = ?", (self.collection_name,)
+            ).fetchone()
+        return row[0]
+
+    def get(self, file_path):
+        """Return the (mtime, size, content_hash) recorded for a file, or None if it was not ingested."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT mtime, size, content_hash FROM files WHERE collection_name = ? AND file_path = ?",
+                (self.collection_name, file_path),
+            ).fetchone()
+        return row
+
+    def get_many(self, file_paths):
+        """Return {file_path: (mtime, size, content_hash)} for the given files that were ingested."""
+        file_paths = list(file_paths)
+        records = {}
+        with self._lock:
+            for start in range(0, len(file_paths), _LOOKUP_CHUNK):
+                chunk = file_paths[start:start + _LOOKUP_CHUNK]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT file_path, mtime, size, content_hash FROM files "
+                    f"WHERE collection_name = ? AND file_path IN ({placeholders})",
+                    (self.collection_name, *chunk),
+                )
+                for file_path, mtime, size, content_hash in rows:
+                    records[file_path] = (mtime, size, content_hash)
+        return records
+
+    def get_ids(self, file_path):
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT entity_id FROM entity_ids WHERE collection_name = ? AND file_path = ?",
+                (self.collection_name, file_path),
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def get_all_ids(self):
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT entity_id FROM entity_ids WHERE collection_name = ?", (self.collection_name,)
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def record_files(self, records):
+        """
+        Record ingested files in one transaction, replacing their previous ids.
+
+        Args:
+            records: Iterable of (file_path, mtime, size, content_hash, ids).
+        """
+        with self._lock, self._conn:
+            for file_path, mtime, size, content_hash, ids in records:
+                self._delete_file(file_path)
+                self._conn.execute(
+                    "INSERT INTO files (collection_name, file_path, mtime, size, content_hash) VALUES (?, ?, ?, ?, ?)",
+                    (self.collection_name, file_path, mtime, size, content_hash),
+                )
+                self._conn.executemany(
+                    "INSERT INTO entity_ids (collection_name, file_path, entity_id) VALUES (?, ?, ?)",
+                    [(self.collection_name, file_path, entity_id) for entity_id in ids],
+                )
+
+    def update_stat(self, file_path, mtime, size, content_hash=None):
+        """
+        Refresh the stat of a file whose content did not change, e.g. after it was touched or copied.
+
+        The content hash is only replaced when one is given, to fill in the hash of a recovered file.
+        """
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE files SET mtime = ?, size = ?, content_hash = COALESCE(?, content_hash) "
+                "WHERE collection_name = ? AND file_path = ?",
+                (mtime, size, content_hash, self.collection_name, file_path),
+            )
+
+    def remove(self, file_path):
+        """Forget a file and return the ids it had in Milvus."""
+        ids = self.get_ids(file_path)
+        with self._lock, self._conn:
+            self._delete_file(file_path)
+        return ids
+
+    def clear(self):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM files WHERE collection_name = ?", (self.collection_name,))
+            self._conn.execute("DELETE FROM entity_ids WHERE collection_name = ?", (self.collection_name,))
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def _delete_file(self, file_path):
+        self._conn.execute(
+            "DELETE FROM files WHERE collection_name = ? AND file_path = ?", (self.collection_name, file_path)
+        )
+        self._conn.execute(
+            "DELETE FROM entity_ids WHERE collection_name = ? AND file_path = ?", (self.collection_name, file_path)
+        )
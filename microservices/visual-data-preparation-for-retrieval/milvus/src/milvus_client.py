@@ -2,12 +2,18 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import os
+import queue
+import threading
 
 from pymilvus import MilvusClient, DataType, Collection
 
 MILVUS_HOST = os.getenv("MILVUS_HOST", "localhost")
 MILVUS_PORT = int(os.getenv("MILVUS_PORT", 19530))
 MILVUS_URI = f"http://{MILVUS_HOST}:{MILVUS_PORT}"
+MILVUS_INSERT_BATCH_SIZE = int(os.getenv("MILVUS_INSERT_BATCH_SIZE", 512))
+
+# Marker telling the inserter thread that no more entities will be submitted
+_END_OF_INPUT = object()
 
 
 class MilvusClientWrapper:
@@ -25,6 +31,13 @@ class MilvusClientWrapper:
             print(f"Failed to load collection {collection_name}: {e}")
             return None
 
+    def has_collection(self, collection_name: str):
+        try:
+            return self.client.has_collection(collection_name=collection_name)
+        except Exception as e:
+            print(f"Failed to check collection {collection_name}: {e}")
+            return None
+
     def create_collection(self, dim: int, collection_name: str = "default", index_params=None, schema=None):
         if self.load_collection(collection_name) == 3:  # loaded
             print(f"Collection {collection_name} already exists and is loaded.")
@@ -90,4 +103,69 @@ class MilvusClientWrapper:
                 output_fields=output_fields
             )
         
-        return res
\ No newline at end of file
+        return res
+
+    def flush(self, collection_name: str):
+        # Seal the growing segments so the vector index is built for the inserted data
+        self.client.flush(collection_name=collection_name)
+
+
+class MilvusBatchInserter:
+    """
+    Insert entities into Milvus from a background thread in bounded batches.
+
+    Producers submit entities as soon as they are embedded; the inserter writes them
+    whenever a full batch is collected, so entities never accumulate for a whole
+    directory. The submit queue is bounded, so producers block while Milvus falls behind.
+    """
+
+    def __init__(self, client: MilvusClientWrapper, collection_name: str, batch_size: int = MILVUS_INSERT_BATCH_SIZE):
+        self.client = client
+        self.collection_name = collection_name
+        self.batch_size = max(1, batch_size)
+        self.insert_count = 0
+        self.ids = []
+        self._error = None
+        self._queue = queue.Queue(maxsize=4 * self.batch_size)
+        self._thread = threading.Thread(target=self._run, name="milvus-inserter", daemon=True)
+        self._thread.start()
+
+    def submit(self, entities: list):
+        if self._error is not None:
+            raise self._error
+        for entity in entities:
+            self._queue.put(entity)
+
+    def close(self):
+        """Write the remaining entities, stop the thread and return the insert result."""
+        self._queue.put(_END_OF_INPUT)
+        self._thread.join()
+        if self._error is not None:
+            raise self._error
+        return {"insert_count": self.insert_count, "ids": self.ids}
+
+    def _run(self):
+        pending = []
+        while True:
+            entity = self._queue.get()
+            if entity is _END_OF_INPUT:
+                break
+            pending.append(entity)
+            if len(pending) >= self.batch_size:
+                self._insert(pending)
+                pending = []
+        if pending:
+            self._insert(pending)
+
+    def _insert(self, entities: list):
+        if self._error is not None:
+            # Keep draining the queue so producers are not blocked, but stop writing
+            return
+        try:
+            res = self.client.insert(collection_name=self.collection_name, data=entities)
+        except Exception as e:
+            print(f"Failed to insert {len(entities)} entities into {self.collection_name}: {e}")
+            self._error = e
+            return
+        self.insert_count += res.get("insert_count", len(entities))
+        self.ids.extend(res.get("ids", []))
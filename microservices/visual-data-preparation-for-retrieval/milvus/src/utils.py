@@ -4,6 +4,7 @@
 import os
 import uuid
 import numpy as np
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
 from pathlib import Path
 from PIL import Image
 import base64
@@ -68,4 +69,48 @@ def encode_image_to_base64(image, format="PNG", add_header=False):
     encoded = base64.b64encode(buffer.getvalue()).decode("utf-8")
     if add_header:
         return f"data:image/{format.lower()};base64,{encoded}"
-    return encoded
\ No newline at end of file
+    return encoded
+
+
+def _scan_dir(dir_path, extensions, skip_dir_names):
+    files, subdirs = [], []
+    try:
+        with os.scandir(dir_path) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name not in skip_dir_names:
+                        subdirs.append(entry.path)
+                elif entry.name.lower().endswith(extensions):
+                    files.append((entry.path, entry.stat()))
+    except OSError as e:
+        print(f"Failed to scan directory {dir_path}: {e}")
+    return files, subdirs
+
+
+def scan_media_files(root, extensions, skip_dir_names=(), workers=8):
+    """
+    Walk a directory tree with a pool of threads and collect the matching files.
+
+    Directories are listed and their files stat'ed concurrently, which hides the
+    latency of network file systems on large trees.
+
+    Args:
+        root: Directory to walk. Symlinked directories are not followed.
+        extensions: Tuple of lower-case file extensions to collect.
+        skip_dir_names: Names of directories that are not descended into.
+        workers: Number of directories scanned at the same time.
+
+    Returns:
+        Sorted list of (file path, os.stat_result) tuples.
+    """
+    results = []
+    with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="scan") as executor:
+        pending = {executor.submit(_scan_dir, root, extensions, skip_dir_names)}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                files, subdirs = future.result()
+                results.extend(files)
+                pending.update(executor.submit(_scan_dir, d, extensions, skip_dir_names) for d in subdirs)
+    results.sort(key=lambda item: item[0])
+    return results
@@ -0,0 +1,214 @@
+import functools
+import os
+import subprocess
+from unittest import mock
+
+import numpy as np
+import pytest
+from moviepy.config import get_setting
+
+import indexer as indexer_module
+from indexer import Indexer, create_milvus_data
+from manifest import IngestManifest, compute_file_hash
+from milvus_client import MilvusBatchInserter
+
+
+@pytest.fixture
+def indexer(tmp_path):
+    # Built without __init__, so neither the detector, the embedding service nor Milvus is needed
+    indexer = Indexer.__new__(Indexer)
+    indexer.collection_name = "test_collection"
+    indexer.client = mock.MagicMock()
+    indexer.manifest = IngestManifest("test_collection", db_path=str(tmp_path / "manifest.db"))
+    indexer.db_inited = True
+    yield indexer
+    indexer.manifest.close()
+
+
+@pytest.fixture
+def image_file(tmp_path):
+    path = tmp_path / "image.jpg"
+    path.write_bytes(b"image content")
+    return str(path)
+
+
+def record(indexer, file, ids=(1,)):
+    stat = os.stat(file)
+    indexer.manifest.record_files([(file, stat.st_mtime, stat.st_size, compute_file_hash(file), list(ids))])
+
+
+def test_check_file_new(indexer, image_file):
+    _, existing, _, needs_ingest = indexer._check_file(image_file, image_file)
+    assert existing is None
+    assert needs_ingest
+
+
+def test_check_file_unchanged_skips_hashing(indexer, image_file):
+    record(indexer, image_file)
+    with mock.patch("indexer.compute_file_hash") as hash_mock:
+        _, _, content_hash, needs_ingest = indexer._check_file(image_file, image_file)
+    hash_mock.assert_not_called()
+    assert content_hash is None
+    assert not needs_ingest
+
+
+def test_check_file_touched_refreshes_stat(indexer, image_file):
+    record(indexer, image_file)
+    os.utime(image_file, (1000, 1000))
+
+    _, _, _, needs_ingest = indexer._check_file(image_file, image_file)
+    assert not needs_ingest
+    assert indexer.manifest.get(image_file)[0] == 1000
+
+
+def test_check_file_modified(indexer, image_file):
+    record(indexer, image_file)
+    with open(image_file, "ab") as f:
+        f.write(b" edited")
+
+    _, existing, content_hash, needs_ingest = indexer._check_file(image_file, image_file)
+    assert existing is not None
+    assert content_hash == compute_file_hash(image_file)
+    assert needs_ingest
+
+
+def test_check_file_recovered_adopts_stat_and_hash(indexer, image_file):
+    indexer.client.query_all.return_value = [
+        {"id": 1, "meta": {"file_path": image_file}},
+        {"id": 2, "meta": {"file_path": image_file}},
+    ]
+    indexer.recover_manifest()
+    assert indexer.manifest.get(image_file) == (None, None, None)
+    assert sorted(indexer.manifest.get_ids(image_file)) == [1, 2]
+
+    _, _, _, needs_ingest = indexer._check_file(image_file, image_file)
+    stat = os.stat(image_file)
+    assert not needs_ingest
+    assert indexer.manifest.get(image_file) == (stat.st_mtime, stat.st_size, compute_file_hash(image_file))
+    assert sorted(indexer.manifest.get_ids(image_file)) == [1, 2]
+
+    # Once adopted, a later modification is detected
+    with open(image_file, "ab") as f:
+        f.write(b" edited")
+    assert indexer._check_file(image_file, image_file)[3]
+
+
+def test_filter_changed(indexer, tmp_path):
+    files = {}
+    for name in ("unchanged", "touched", "modified", "recovered", "new"):
+        path = tmp_path / f"{name}.jpg"
+        path.write_bytes(name.encode())
+        files[name] = str(path)
+    for name in ("unchanged", "touched", "modified"):
+        record(indexer, files[name])
+    indexer.manifest.record_files([(files["recovered"], None, None, None, [5])])
+    os.utime(files["touched"], (1000, 1000))
+    with open(files["modified"], "ab") as f:
+        f.write(b" edited")
+
+    entries = [(path, path, os.stat(path)) for path in files.values()]
+    changed = {entry[1] for entry in indexer.filter_changed(entries)}
+
+    # Only the stat is compared here: touched and recovered files are told apart by add_embedding
+    assert changed == {files["touched"], files["modified"], files["recovered"], files["new"]}
+
+
+@pytest.fixture
+def video_file(tmp_path):
+    path = str(tmp_path / "video.mp4")
+    subprocess.run(
+        [
+            get_setting("FFMPEG_BINARY"), "-loglevel", "error", "-y", "-f", "lavfi",
+            "-i", "testsrc=size=64x48:rate=30", "-frames:v", "100", "-pix_fmt", "yuv420p", path,
+        ],
+        check=True,
+    )
+    return path
+
+
+def decode_all_frames(video_path):
+    out = subprocess.run(
+        [get_setting("FFMPEG_BINARY"), "-loglevel", "error", "-i", video_path, "-f", "rawvideo", "-pix_fmt", "rgb24", "-"],
+        check=True, capture_output=True,
+    ).stdout
+    return np.frombuffer(out, dtype=np.uint8).reshape(-1, 48, 64, 3)
+
+
+def test_sampled_frames_match_decoded_frames(video_file):
+    all_frames = decode_all_frames(video_file)
+    sampled = list(Indexer._iter_sampled_frames(video_file, 15))
+
+    assert [seconds for seconds, _ in sampled] == pytest.approx([i * 15 / 30 for i in range(7)])
+    for i, (_, frame) in enumerate(sampled):
+        assert np.array_equal(frame, all_frames[i * 15])
+
+
+def test_sampled_frames_stop_early(video_file):
+    frames = Indexer._iter_sampled_frames(video_file, 1)
+    next(frames)
+    # Closing the generator kills ffmpeg instead of waiting for the whole video
+    frames.close()
+
+
+class FakeClient:
+    """Milvus client whose inserts fail from the given batch on."""
+
+    def __init__(self, fail_from_batch):
+        self.fail_from_batch = fail_from_batch
+        self.batches = 0
+        self.deleted = []
+
+    def insert(self, collection_name, data):
+        self.batches += 1
+        if self.batches > self.fail_from_batch:
+            raise RuntimeError("insert failed")
+        return {"insert_count": len(data), "ids": [entity["id"] for entity in data]}
+
+    def delete(self, collection_name, ids):
+        self.deleted.extend(ids)
+
+    def flush(self, collection_name):
+        pass
+
+
+def submit_entities(inserter, ids, file, meta, **kwargs):
+    entities = [create_milvus_data([0.0], meta) for _ in range(2)]
+    ids.extend(entity["id"] for entity in entities)
+    inserter.submit(entities)
+
+
+def test_add_embedding_records_only_fully_written_files(indexer, tmp_path):
+    files = []
+    for name in ("a.jpg", "b.jpg"):
+        path = tmp_path / name
+        path.write_bytes(name.encode())
+        files.append(str(path))
+    indexer.client = FakeClient(fail_from_batch=1)
+    indexer._process_file = submit_entities
+
+    with mock.patch.object(indexer_module, "INGEST_FILE_WORKERS", 1), \
+            mock.patch.object(indexer_module, "MilvusBatchInserter", functools.partial(MilvusBatchInserter, batch_size=2)):
+        with pytest.raises(RuntimeError):
+            indexer.add_embedding(files, [{"file_path": file} for file in files])
+
+    # The entities of the first file were written in the first batch, the second batch failed
+    assert indexer.manifest.count_files() == 1
+    written_ids = indexer.manifest.get_ids(files[0])
+    assert len(written_ids) == 2
+    assert indexer.manifest.get(files[1]) is None
+    assert len(indexer.client.deleted) == 2
+    assert not set(indexer.client.deleted) & set(written_ids)
+
+
+def test_add_embedding_records_files(indexer, tmp_path):
+    path = tmp_path / "a.jpg"
+    path.write_bytes(b"a")
+    indexer.client = FakeClient(fail_from_batch=10)
+    indexer._process_file = submit_entities
+
+    res = indexer.add_embedding([str(path)], [{"file_path": str(path)}])
+
+    assert res["insert_count"] == 2
+    assert sorted(indexer.manifest.get_ids(str(path))) == sorted(res["ids"])
+    # A second ingest of the unchanged file is skipped
+    assert indexer.add_embedding([str(path)], [{"file_path": str(path)}]) == {}
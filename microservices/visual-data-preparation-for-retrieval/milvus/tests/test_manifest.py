@@ -0,0 +1,95 @@
+import pytest
+
+from manifest import IngestManifest, compute_file_hash
+
+
+@pytest.fixture
+def manifest(tmp_path):
+    manifest = IngestManifest("test_collection", db_path=str(tmp_path / "manifest.db"))
+    yield manifest
+    manifest.close()
+
+
+def test_record_and_get_files(manifest):
+    manifest.record_files([
+        ("/data/a.jpg", 1.0, 10, "hash_a", [1, 2]),
+        ("/data/b.mp4", 2.0, 20, "hash_b", [3]),
+    ])
+
+    assert manifest.count_files() == 2
+    assert manifest.get("/data/a.jpg") == (1.0, 10, "hash_a")
+    assert manifest.get("/data/missing.jpg") is None
+    assert manifest.get_many(["/data/a.jpg", "/data/missing.jpg"]) == {"/data/a.jpg": (1.0, 10, "hash_a")}
+    assert sorted(manifest.get_ids("/data/a.jpg")) == [1, 2]
+    assert sorted(manifest.get_all_ids()) == [1, 2, 3]
+
+
+def test_record_files_replaces_previous_ids(manifest):
+    manifest.record_files([("/data/a.jpg", 1.0, 10, "hash_a", [1, 2])])
+    manifest.record_files([("/data/a.jpg", 3.0, 12, "hash_new", [4])])
+
+    assert manifest.count_files() == 1
+    assert manifest.get("/data/a.jpg") == (3.0, 12, "hash_new")
+    assert manifest.get_ids("/data/a.jpg") == [4]
+
+
+def test_update_stat_keeps_hash_unless_given(manifest):
+    manifest.record_files([("/data/a.jpg", 1.0, 10, "hash_a", [1])])
+
+    manifest.update_stat("/data/a.jpg", 2.0, 10)
+    assert manifest.get("/data/a.jpg") == (2.0, 10, "hash_a")
+
+    manifest.update_stat("/data/a.jpg", 3.0, 10, "hash_b")
+    assert manifest.get("/data/a.jpg") == (3.0, 10, "hash_b")
+
+
+def test_remove_and_clear(manifest):
+    manifest.record_files([
+        ("/data/a.jpg", 1.0, 10, "hash_a", [1, 2]),
+        ("/data/b.jpg", 2.0, 20, "hash_b", [3]),
+    ])
+
+    assert sorted(manifest.remove("/data/a.jpg")) == [1, 2]
+    assert manifest.get("/data/a.jpg") is None
+    assert manifest.get_all_ids() == [3]
+
+    manifest.clear()
+    assert manifest.count_files() == 0
+    assert manifest.get_all_ids() == []
+
+
+def test_collections_are_isolated(tmp_path):
+    db_path = str(tmp_path / "manifest.db")
+    first = IngestManifest("first", db_path=db_path)
+    second = IngestManifest("second", db_path=db_path)
+    try:
+        first.record_files([("/data/a.jpg", 1.0, 10, "hash_a", [1])])
+        assert second.count_files() == 0
+        second.clear()
+        assert first.get_ids("/data/a.jpg") == [1]
+    finally:
+        first.close()
+        second.close()
+
+
+def test_manifest_persists_across_restarts(tmp_path):
+    db_path = str(tmp_path / "manifest.db")
+    manifest = IngestManifest("test_collection", db_path=db_path)
+    manifest.record_files([("/data/a.jpg", 1.0, 10, "hash_a", [1])])
+    manifest.close()
+
+    manifest = IngestManifest("test_collection", db_path=db_path)
+    try:
+        assert manifest.get("/data/a.jpg") == (1.0, 10, "hash_a")
+    finally:
+        manifest.close()
+
+
+def test_compute_file_hash(tmp_path):
+    path = tmp_path / "a.bin"
+    path.write_bytes(b"content" * 1000)
+
+    original = compute_file_hash(str(path))
+    assert compute_file_hash(str(path), chunk_size=64) == original
+    path.write_bytes(b"changed")
+    assert compute_file_hash(str(path)) != original
@@ -0,0 +1,54 @@
+import threading
+
+import pytest
+
+from milvus_client import MilvusBatchInserter
+
+
+class FakeClient:
+    """Records inserted batches and fails the batches whose index is in fail_batches."""
+
+    def __init__(self, fail_batches=()):
+        self.batches = []
+        self.fail_batches = set(fail_batches)
+        self._lock = threading.Lock()
+
+    def insert(self, collection_name, data):
+        with self._lock:
+            index = len(self.batches)
+            self.batches.append([entity["id"] for entity in data])
+        if index in self.fail_batches:
+            raise RuntimeError(f"batch {index} failed")
+        return {"insert_count": len(data), "ids": [entity["id"] for entity in data]}
+
+
+def entities(start, count):
+    return [{"id": i, "vector": [0.0], "meta": {}} for i in range(start, start + count)]
+
+
+def test_inserter_writes_bounded_batches():
+    client = FakeClient()
+    inserter = MilvusBatchInserter(client, "test_collection", batch_size=3)
+    inserter.submit(entities(0, 4))
+    inserter.submit(entities(4, 3))
+
+    res = inserter.close()
+
+    assert client.batches == [[0, 1, 2], [3, 4, 5], [6]]
+    assert res == {"insert_count": 7, "ids": list(range(7))}
+
+
+def test_inserter_stops_writing_after_a_failed_batch():
+    client = FakeClient(fail_batches={0})
+    inserter = MilvusBatchInserter(client, "test_collection", batch_size=2)
+    inserter.submit(entities(0, 2))
+    try:
+        inserter.submit(entities(2, 4))
+    except RuntimeError:
+        # Reported to the next submit when the batch failed by then
+        pass
+    with pytest.raises(RuntimeError):
+        inserter.close()
+
+    assert client.batches == [[0, 1]]
+    assert inserter.ids == []
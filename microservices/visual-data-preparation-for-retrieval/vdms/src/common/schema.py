@@ -2,7 +2,7 @@
 # SPDX-License-Identifier: Apache-2.0
 
 from enum import Enum
-from typing import Annotated, List, Optional, Tuple
+from typing import Annotated, Any, Dict, List, Optional, Tuple
 
 from pydantic import BaseModel, Field
 
@@ -63,6 +63,59 @@ class DataPrepErrorResponse(DataPrepResponse):
     status: StatusEnum = StatusEnum.error
 
 
+class VideoIngestionResponse(DataPrepResponse):
+    """Response model for video ingestion requests"""
+
+    job_id: Optional[str] = None
+
+
+class IngestionJobStatusEnum(str, Enum):
+    """States of a video ingestion job"""
+
+    running = "running"
+    completed = "completed"
+    failed = "failed"
+    interrupted = "interrupted"
+
+
+class IngestionJobInfo(BaseModel):
+    """Progress and timings of a video ingestion job"""
+
+    job_id: str
+    status: IngestionJobStatusEnum
+    bucket_name: str
+    video_id: str
+    filename: Optional[str] = None
+    params: Dict[str, Any] = Field(default_factory=dict, description="Processing parameters of the job")
+    attempts: int = Field(description="Number of times the job was started, including resumes")
+    total_frames: int = Field(description="Number of sampled frames in the video")
+    frames_skipped: int = Field(description="Sampled frames already stored before the current attempt")
+    frames_committed: int = Field(description="Frames fully stored by the current attempt")
+    embeddings_stored: int = Field(description="Embeddings stored by the current attempt")
+    progress_pct: float
+    eta_seconds: Optional[float] = Field(default=None, description="Estimated seconds until the job completes")
+    stage_stats: Dict[str, Dict[str, float]] = Field(
+        default_factory=dict, description="Per-stage item counts, busy time and throughput"
+    )
+    error: Optional[str] = None
+    created_at: float
+    started_at: Optional[float] = None
+    updated_at: float
+    finished_at: Optional[float] = None
+
+
+class IngestionJobResponse(DataPrepResponse):
+    """Response model for a single video ingestion job"""
+
+    job: IngestionJobInfo
+
+
+class IngestionJobListResponse(DataPrepResponse):
+    """Response model for a list of video ingestion jobs"""
+
+    jobs: List[IngestionJobInfo] = Field(default_factory=list)
+
+
 class VideoRequest(BaseModel):
     """Request model for video processing from Minio storage"""
 
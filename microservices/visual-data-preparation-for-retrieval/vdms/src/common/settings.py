@@ -40,6 +40,10 @@ class Settings(BaseSettings):
     # VDMS and embedding settings
     VDMS_VDB_HOST: str = ""
     VDMS_VDB_PORT: str = ""
+    VDMS_WRITER_CONNECTIONS: int = 2  # VDMS connections used concurrently by the SDK mode bulk writer
+    VDMS_WRITE_BATCH_SIZE: int = 200  # Initial embeddings per VDMS AddDescriptor command (adapted at runtime)
+    VDMS_WRITE_MAX_BATCH_SIZE: int = 2000  # Upper bound for the adaptive write batch size
+    VDMS_WRITE_TARGET_LATENCY: float = 0.5  # Seconds a single VDMS write should take; larger batches are used while faster
     MULTIMODAL_EMBEDDING_MODEL_NAME: str = ""  # Model name for both SDK and API modes - must be explicitly set
     MULTIMODAL_EMBEDDING_ENDPOINT: str = ""  # 0 means auto-detect from API
     
@@ -63,7 +67,18 @@ class Settings(BaseSettings):
     ENABLE_OBJECT_DETECTION: bool = True
     DETECTION_CONFIDENCE: float = 0.85
     DETECTION_MODEL_DIR: str = "/app/models/yolox"  # Directory for object detection models
+    DETECTION_BATCH_SIZE: int | None = None  # Frames per object detection inference request (config file default: 8)
     FRAMES_TEMP_DIR: str = "/tmp/dataprep"  # Must match Docker volume mount for shared access
+    FRAME_DECODE_BATCH_SIZE: int = 16  # Sampled frames decoded per sequential batch in SDK mode
+    DOWNSCALE_FRAMES_ON_DECODE: bool = True  # Decode frames at the resolution used by the embedding/detection models
+
+    # Ingestion jobs: progress and per-frame checkpoints of video ingestion (SDK mode)
+    INGESTION_JOBS_DB: str = "/tmp/dataprep/ingestion_jobs.db"  # Keep on the persistent dataprep volume so jobs survive restarts
+    ENABLE_INGESTION_CHECKPOINTS: bool = True  # Skip frames already stored for the same video, model and detection settings
+
+    # Optional URL POSTed to after embeddings are stored, e.g. the search service's /index-version
+    # endpoint, so that caches of search results are dropped when the index changes
+    SEARCH_INDEX_NOTIFY_URL: str = ""
 
     # Allow environment override for bucket name (useful for different deployments)
     # If PM_MINIO_BUCKET is set (from sample app), use that; otherwise use DEFAULT_BUCKET_NAME
@@ -20,3 +20,6 @@ class Strings:
     text_validation_error: str = "Invalid text or video timestamp parameters."
     invalid_time_range: str = "End time must be greater than start time."
     vdms_client_error: str = "Error occurred while initializing VDMS client."
+    job_not_found: str = "No ingestion job found for the specified job ID."
+    job_already_running: str = "The ingestion job is still running."
+    job_resume_unsupported: str = "Ingestion jobs can only be resumed in SDK processing mode."
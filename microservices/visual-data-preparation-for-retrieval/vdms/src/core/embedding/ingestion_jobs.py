@@ -0,0 +1,539 @@
+# Copyright (C) 2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Resumable Video Ingestion Jobs
+
+Every video ingestion request runs as a job whose state is kept in a local SQLite
+database (`settings.INGESTION_JOBS_DB`), next to a checkpoint of the frames that are
+already stored in VDMS:
+
+1. **Per-batch checkpoints**: after each storage batch of the streaming pipeline, the
+   stored items are recorded and every frame whose full frame and object crops are all
+   stored is committed, in one transaction
+2. **Resume and de-duplication**: committed frames are keyed by (bucket, video ID, video
+   hash, model key, frame number) and are neither decoded nor embedded again, whether
+   the same job is resumed after a crash or the same video is ingested again under the
+   same video ID. Items of a partially stored frame are not written twice
+3. **Progress reporting**: jobs expose committed frames, per-stage timings and an ETA
+   while they run, so they can be polled through the REST API
+
+The model key combines the VDMS collection, the embedding model and the object
+detection settings, because any of them changes which descriptors a frame produces.
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from src.common import logger, settings
+from src.core.embedding.streaming_pipeline import DetectFn, StoreFn
+from src.core.embedding.vdms_bulk_writer import VDMSPartialWriteError
+
+# Job states
+JOB_RUNNING = "running"
+JOB_COMPLETED = "completed"
+JOB_FAILED = "failed"
+JOB_INTERRUPTED = "interrupted"
+
+# Metadata key that carries an item's position within its frame from detection to storage
+_CHECKPOINT_ITEM_KEY = "_checkpoint_item"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    bucket_name TEXT NOT NULL,
+    video_id TEXT NOT NULL,
+    filename TEXT,
+    params TEXT NOT NULL,
+    video_hash TEXT,
+    model_key TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    total_frames INTEGER NOT NULL DEFAULT 0,
+    frames_skipped INTEGER NOT NULL DEFAULT 0,
+    frames_committed INTEGER NOT NULL DEFAULT 0,
+    embeddings_stored INTEGER NOT NULL DEFAULT 0,
+    eta_seconds REAL,
+    stage_stats TEXT,
+    error TEXT,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    updated_at REAL NOT NULL,
+    finished_at REAL
+);
+CREATE TABLE IF NOT EXISTS frame_checkpoints (
+    video_hash TEXT NOT NULL,
+    model_key TEXT NOT NULL,
+    frame_number INTEGER NOT NULL,
+    bucket_name TEXT NOT NULL,
+    video_id TEXT NOT NULL,
+    job_id TEXT NOT NULL,
+    items INTEGER NOT NULL,
+    committed_at REAL NOT NULL,
+    PRIMARY KEY (bucket_name, video_id, video_hash, model_key, frame_number)
+);
+CREATE TABLE IF NOT EXISTS stored_items (
+    video_hash TEXT NOT NULL,
+    model_key TEXT NOT NULL,
+    frame_number INTEGER NOT NULL,
+    item_index INTEGER NOT NULL,
+    bucket_name TEXT NOT NULL,
+    video_id TEXT NOT NULL,
+    PRIMARY KEY (bucket_name, video_id, video_hash, model_key, frame_number, item_index)
+);
+"""
+
+# Checkpoints of version 0 databases were keyed without the video; their rows already
+# carry the bucket and video ID, so they are copied into the tables keyed by them
+_SCHEMA_VERSION = 1
+_MIGRATE_V0 = """
+DROP INDEX IF EXISTS idx_checkpoints_video;
+DROP INDEX IF EXISTS idx_items_video;
+ALTER TABLE frame_checkpoints RENAME TO frame_checkpoints_v0;
+ALTER TABLE stored_items RENAME TO stored_items_v0;
+"""
+_MIGRATE_V0_COPY = """
+INSERT OR IGNORE INTO frame_checkpoints SELECT * FROM frame_checkpoints_v0;
+INSERT OR IGNORE INTO stored_items SELECT * FROM stored_items_v0;
+DROP TABLE frame_checkpoints_v0;
+DROP TABLE stored_items_v0;
+"""
+
+_job_store: Optional["IngestionJobStore"] = None
+_job_store_lock = threading.Lock()
+
+
+def compute_video_hash(video_content: bytes) -> str:
+    """Return the SHA-256 hex digest identifying a video's content."""
+    return hashlib.sha256(video_content).hexdigest()
+
+
+def build_model_key(model_id: str, detector: Any = None, detection_confidence: Optional[float] = None) -> str:
+    """
+    Identify everything that determines which descriptors a frame produces.
+
+    Args:
+        model_id: Embedding model ID
+        detector: Object detector in use, or None when detection is disabled
+        detection_confidence: Confidence threshold of the detector
+    """
+    key = f"{settings.DB_COLLECTION}/{model_id}"
+    if detector is not None:
+        key += f"/{getattr(detector, 'model_name', 'detector')}@{detection_confidence}"
+    return key
+
+
+class IngestionJobStore:
+    """SQLite-backed store of ingestion jobs and frame checkpoints."""
+
+    def __init__(self, db_path: str) -> None:
+        """
+        Args:
+            db_path: Path of the SQLite database; ":memory:" keeps everything in memory
+        """
+        if db_path != ":memory:":
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self.db_path = db_path
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            if db_path != ":memory:":
+                self._conn.execute("PRAGMA journal_mode=WAL")
+            self._migrate()
+            self._conn.executescript(_SCHEMA)
+            self._conn.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+
+    def _migrate(self) -> None:
+        """Re-key the checkpoint tables of a database created by an earlier version."""
+        version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+        exists = self._conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'frame_checkpoints'"
+        ).fetchone()
+        if version >= _SCHEMA_VERSION or not exists:
+            return
+        self._conn.executescript(_MIGRATE_V0)
+        self._conn.executescript(_SCHEMA)
+        self._conn.executescript(_MIGRATE_V0_COPY)
+        logger.info("Migrated ingestion checkpoints to per-video keys")
+
+    # ------------------------------------------------------------------
+    # Jobs
+    # ------------------------------------------------------------------
+
+    def create_job(self, bucket_name: str, video_id: str, filename: Optional[str], params: Dict[str, Any]) -> str:
+        """Register a new job and return its ID."""
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO jobs (job_id, status, bucket_name, video_id, filename, params, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (job_id, JOB_RUNNING, bucket_name, video_id, filename, json.dumps(params), now, now),
+            )
+        logger.info("Created ingestion job %s for %s/%s", job_id, bucket_name, video_id)
+        return job_id
+
+    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Return a job as a dictionary, or None if it does not exist."""
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        return self._job_from_row(row) if row else None
+
+    def list_jobs(self, status: Optional[str] = None, limit: int = 100) -> List[Dict[str, Any]]:
+        """Return the most recently created jobs, optionally only those in one state."""
+        query = "SELECT * FROM jobs"
+        args: Tuple[Any, ...] = ()
+        if status:
+            query += " WHERE status = ?"
+            args = (status,)
+        query += " ORDER BY created_at DESC LIMIT ?"
+        with self._lock:
+            rows = self._conn.execute(query, args + (limit,)).fetchall()
+        return [self._job_from_row(row) for row in rows]
+
+    def start_attempt(
+        self,
+        job_id: str,
+        video_hash: str,
+        model_key: str,
+        total_frames: int,
+        frames_skipped: int,
+    ) -> None:
+        """Mark a job as running a new attempt over `total_frames` sampled frames."""
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, video_hash = ?, model_key = ?, attempts = attempts + 1, "
+                "total_frames = ?, frames_skipped = ?, frames_committed = 0, embeddings_stored = 0, "
+                "eta_seconds = NULL, error = NULL, started_at = ?, updated_at = ?, finished_at = NULL WHERE job_id = ?",
+                (JOB_RUNNING, video_hash, model_key, total_frames, frames_skipped, now, now, job_id),
+            )
+
+    def update_progress(
+        self,
+        job_id: str,
+        frames_committed: int,
+        embeddings_stored: int,
+        eta_seconds: Optional[float] = None,
+        stage_stats: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """Record the progress of the running attempt."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE jobs SET frames_committed = ?, embeddings_stored = ?, eta_seconds = ?, "
+                "stage_stats = COALESCE(?, stage_stats), updated_at = ? WHERE job_id = ?",
+                (
+                    frames_committed,
+                    embeddings_stored,
+                    eta_seconds,
+                    json.dumps(stage_stats) if stage_stats is not None else None,
+                    time.time(),
+                    job_id,
+                ),
+            )
+
+    def mark_running(self, job_id: str) -> None:
+        """Mark a finished or interrupted job as running again."""
+        self._set_status(job_id, JOB_RUNNING, finished=False)
+
+    def finish_job(self, job_id: str, status: str, error: Optional[str] = None) -> None:
+        """Mark a job as completed or failed."""
+        self._set_status(job_id, status, error=error, finished=True)
+
+    @contextmanager
+    def track(self, job_id: str) -> Iterator[None]:
+        """Mark the job completed when the block finishes and failed when it raises."""
+        try:
+            yield
+        except BaseException as exc:
+            self.finish_job(job_id, JOB_FAILED, error=str(exc) or type(exc).__name__)
+            raise
+        self.finish_job(job_id, JOB_COMPLETED)
+
+    def mark_interrupted_jobs(self) -> int:
+        """Mark jobs left running by a previous process as interrupted; returns how many."""
+        now = time.time()
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET status = ?, eta_seconds = NULL, updated_at = ? WHERE status = ?",
+                (JOB_INTERRUPTED, now, JOB_RUNNING),
+            )
+        if cursor.rowcount:
+            logger.warning("Marked %d unfinished ingestion job(s) as interrupted; they can be resumed", cursor.rowcount)
+        return cursor.rowcount
+
+    def _set_status(self, job_id: str, status: str, error: Optional[str] = None, finished: bool = False) -> None:
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, error = ?, eta_seconds = NULL, updated_at = ?, finished_at = ? "
+                "WHERE job_id = ?",
+                (status, error, now, now if finished else None, job_id),
+            )
+
+    @staticmethod
+    def _job_from_row(row: sqlite3.Row) -> Dict[str, Any]:
+        job = dict(row)
+        job["params"] = json.loads(job["params"]) if job["params"] else {}
+        job["stage_stats"] = json.loads(job["stage_stats"]) if job["stage_stats"] else {}
+        frames_done = job["frames_skipped"] + job["frames_committed"]
+        job["progress_pct"] = (
+            min(100.0, frames_done / job["total_frames"] * 100.0) if job["total_frames"] else 0.0
+        )
+        return job
+
+    # ------------------------------------------------------------------
+    # Checkpoints
+    # ------------------------------------------------------------------
+
+    def committed_frames(self, bucket_name: str, video_id: str, video_hash: str, model_key: str) -> Set[int]:
+        """Return the frame numbers of a video whose descriptors are all stored."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT frame_number FROM frame_checkpoints "
+                "WHERE bucket_name = ? AND video_id = ? AND video_hash = ? AND model_key = ?",
+                (bucket_name, video_id, video_hash, model_key),
+            ).fetchall()
+        return {row[0] for row in rows}
+
+    def stored_items(self, bucket_name: str, video_id: str, video_hash: str, model_key: str) -> Dict[int, Set[int]]:
+        """Return the already stored item indices of frames that are not committed yet."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT frame_number, item_index FROM stored_items "
+                "WHERE bucket_name = ? AND video_id = ? AND video_hash = ? AND model_key = ?",
+                (bucket_name, video_id, video_hash, model_key),
+            ).fetchall()
+        items: Dict[int, Set[int]] = {}
+        for frame_number, item_index in rows:
+            items.setdefault(frame_number, set()).add(item_index)
+        return items
+
+    def record_batch(
+        self,
+        job_id: str,
+        video_hash: str,
+        model_key: str,
+        bucket_name: str,
+        video_id: str,
+        items: Iterable[Tuple[int, int]],
+        completed_frames: Iterable[Tuple[int, int]],
+    ) -> None:
+        """
+        Checkpoint one storage batch in a single transaction.
+
+        Args:
+            items: (frame_number, item_index) of every stored item of frames still in progress
+            completed_frames: (frame_number, item_count) of frames whose items are now all stored
+        """
+        completed_frames = list(completed_frames)
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO stored_items VALUES (?, ?, ?, ?, ?, ?)",
+                [(video_hash, model_key, frame, index, bucket_name, video_id) for frame, index in items],
+            )
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO frame_checkpoints VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (video_hash, model_key, frame, bucket_name, video_id, job_id, count, now)
+                    for frame, count in completed_frames
+                ],
+            )
+            self._conn.executemany(
+                "DELETE FROM stored_items WHERE bucket_name = ? AND video_id = ? AND video_hash = ? "
+                "AND model_key = ? AND frame_number = ?",
+                [(bucket_name, video_id, video_hash, model_key, frame) for frame, _ in completed_frames],
+            )
+
+    def forget_video(self, bucket_name: str, video_id: str) -> int:
+        """Drop the checkpoints of a video so it is fully ingested again; returns the frames dropped."""
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "DELETE FROM frame_checkpoints WHERE bucket_name = ? AND video_id = ?", (bucket_name, video_id)
+            )
+            self._conn.execute("DELETE FROM stored_items WHERE bucket_name = ? AND video_id = ?", (bucket_name, video_id))
+        return cursor.rowcount
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class IngestionJobTracker:
+    """Checkpoint one attempt of a job while its frames stream through the pipeline."""
+
+    def __init__(
+        self,
+        store: IngestionJobStore,
+        job_id: str,
+        video_hash: str,
+        model_key: str,
+        bucket_name: str,
+        video_id: str,
+    ) -> None:
+        self.store = store
+        self.job_id = job_id
+        self.video_hash = video_hash
+        self.model_key = model_key
+        self.bucket_name = bucket_name
+        self.video_id = video_id
+
+        self.committed_frames: Set[int] = store.committed_frames(bucket_name, video_id, video_hash, model_key)
+        # Items stored per frame that is not committed yet, including those from earlier attempts
+        self._stored_items = store.stored_items(bucket_name, video_id, video_hash, model_key)
+        self._expected_items: Dict[int, int] = {}
+        self._frames_committed = 0
+        self._embeddings_stored = 0
+        self._frames_to_process = 0
+        self._started_at = time.time()
+        self._lock = threading.Lock()
+
+    def begin(self, sampled_frames: Iterable[int]) -> Set[int]:
+        """
+        Start the attempt over the sampled frame numbers.
+
+        Returns:
+            Frame numbers that are already committed and must be skipped
+        """
+        sampled_frames = list(sampled_frames)
+        skipped = self.committed_frames.intersection(sampled_frames)
+        self._frames_to_process = len(sampled_frames) - len(skipped)
+        self._started_at = time.time()
+        self.store.start_attempt(self.job_id, self.video_hash, self.model_key, len(sampled_frames), len(skipped))
+        if skipped:
+            logger.info(
+                "Job %s: skipping %d of %d frames already stored for this video",
+                self.job_id,
+                len(skipped),
+                len(sampled_frames),
+            )
+        return skipped
+
+    @property
+    def frames_committed(self) -> int:
+        return self._frames_committed
+
+    def wrap_detect(self, detect_fn: DetectFn) -> DetectFn:
+        """Number the items of every frame and drop those stored by an earlier attempt."""
+
+        def detect(frames):
+            results = detect_fn(frames)
+            remaining = []
+            item_counts: Dict[int, int] = {}
+            with self._lock:
+                for image, metadata in results:
+                    frame_number = metadata["frame_number"]
+                    item_index = item_counts.get(frame_number, 0)
+                    item_counts[frame_number] = item_index + 1
+                    if item_index in self._stored_items.get(frame_number, ()):
+                        continue
+                    metadata[_CHECKPOINT_ITEM_KEY] = item_index
+                    remaining.append((image, metadata))
+                self._expected_items.update(item_counts)
+                completed = self._take_completed(item_counts)
+            if completed:
+                # Every item of these frames was stored before the previous attempt stopped
+                self._checkpoint([], completed)
+            return remaining
+
+        return detect
+
+    def wrap_store(self, store_fn: StoreFn) -> StoreFn:
+        """Checkpoint the items of every stored batch, including the stored part of a failed one."""
+
+        def store(embeddings, metadatas):
+            # Checkpoint key of every item, aligned with the metadata
+            keys = [
+                (metadata["frame_number"], metadata.pop(_CHECKPOINT_ITEM_KEY))
+                if _CHECKPOINT_ITEM_KEY in metadata else None
+                for metadata in metadatas
+            ]
+            try:
+                ids = store_fn(embeddings, metadatas)
+            except VDMSPartialWriteError as exc:
+                # The leading items are stored in VDMS; checkpoint them so a resume does not write them twice
+                self._record_stored([key for key in keys[:len(exc.stored_ids)] if key is not None], len(exc.stored_ids))
+                raise
+            self._record_stored([key for key in keys if key is not None], len(ids))
+            return ids
+
+        return store
+
+    def _record_stored(self, items: List[Tuple[int, int]], stored: int) -> None:
+        """Checkpoint stored (frame_number, item_index) items and the frames they complete."""
+        with self._lock:
+            self._embeddings_stored += stored
+            for frame_number, item_index in items:
+                self._stored_items.setdefault(frame_number, set()).add(item_index)
+            completed = self._take_completed({frame_number for frame_number, _ in items})
+        try:
+            self._checkpoint(items, completed)
+        except sqlite3.Error as exc:
+            # The descriptors are stored; a lost checkpoint only means they are written again on resume
+            logger.warning("Job %s: failed to checkpoint %d stored items: %s", self.job_id, len(items), exc)
+
+    def record_stage_stats(self, stage_stats: Dict[str, Dict[str, float]]) -> None:
+        """Publish the pipeline's per-stage statistics with the current progress and ETA."""
+        with self._lock:
+            frames_committed = self._frames_committed
+            embeddings_stored = self._embeddings_stored
+        self.store.update_progress(
+            self.job_id, frames_committed, embeddings_stored, self._eta(frames_committed), stage_stats
+        )
+
+    def _take_completed(self, frame_numbers: Iterable[int]) -> List[Tuple[int, int]]:
+        """Return (frame, items) of frames whose items are now all stored; caller holds the lock."""
+        completed = []
+        for frame_number in frame_numbers:
+            expected = self._expected_items.get(frame_number)
+            if expected is not None and len(self._stored_items.get(frame_number, ())) >= expected:
+                completed.append((frame_number, expected))
+                self._stored_items.pop(frame_number, None)
+                self._expected_items.pop(frame_number, None)
+                self.committed_frames.add(frame_number)
+        self._frames_committed += len(completed)
+        return completed
+
+    def _checkpoint(self, items: List[Tuple[int, int]], completed: List[Tuple[int, int]]) -> None:
+        completed_frames = {frame_number for frame_number, _ in completed}
+        self.store.record_batch(
+            self.job_id,
+            self.video_hash,
+            self.model_key,
+            self.bucket_name,
+            self.video_id,
+            [item for item in items if item[0] not in completed_frames],
+            completed,
+        )
+        with self._lock:
+            frames_committed = self._frames_committed
+            embeddings_stored = self._embeddings_stored
+        self.store.update_progress(self.job_id, frames_committed, embeddings_stored, self._eta(frames_committed))
+
+    def _eta(self, frames_committed: int) -> Optional[float]:
+        """Seconds until the remaining frames are committed at the rate of this attempt."""
+        elapsed = time.time() - self._started_at
+        if frames_committed <= 0 or elapsed <= 0:
+            return None
+        remaining = max(0, self._frames_to_process - frames_committed)
+        return remaining / (frames_committed / elapsed)
+
+
+def get_job_store() -> IngestionJobStore:
+    """Return the process-wide job store, opening the database on first use."""
+    global _job_store
+    if _job_store is None:
+        with _job_store_lock:
+            if _job_store is None:
+                _job_store = IngestionJobStore(settings.INGESTION_JOBS_DB)
+                logger.info("Ingestion job store opened at %s", settings.INGESTION_JOBS_DB)
+    return _job_store
@@ -6,7 +6,6 @@
 import threading
 import time
 import traceback
-import uuid
 from collections.abc import Iterable
 from typing import Any, Dict, List, Optional
 
@@ -17,6 +16,8 @@ from langchain_vdms.vectorstores import VDMS, VDMS_Client
 from multimodal_embedding_serving import EmbeddingModel, get_model_handler
 
 from src.common import Strings, logger, settings
+from src.core.embedding.vdms_bulk_writer import VDMSBulkWriter, VDMSPartialWriteError
+from src.core.utils.common_utils import tag_properties
 
 
 class DummyEmbedding(Embeddings):
@@ -44,7 +45,7 @@ class SDKVDMSClient:
     This client provides maximum performance by combining:
     1. SDK-based embedding generation (no HTTP overhead)
     2. Standard langchain-vdms vector store APIs for durability across restarts
-    3. Optimized batch processing for high-throughput storage
+    3. A bulk writer that streams float32 blobs to VDMS over concurrent connections
 
     Performance improvements:
     - Eliminates network latency for embedding generation
@@ -80,6 +81,23 @@ class SDKVDMSClient:
         except TypeError:
             return [float(candidate)]
 
+    @staticmethod
+    def _to_vector(embedding: Any) -> Optional[np.ndarray]:
+        """Convert an embedding tensor/array into a 1-D float32 NumPy array (None if empty)."""
+        if embedding is None:
+            return None
+
+        candidate = embedding
+        if hasattr(candidate, "detach"):
+            candidate = candidate.detach()
+        if hasattr(candidate, "cpu"):
+            candidate = candidate.cpu()
+        if hasattr(candidate, "numpy"):
+            candidate = candidate.numpy()
+
+        vector = np.asarray(candidate, dtype=np.float32).reshape(-1)
+        return vector if vector.size else None
+
     def __init__(
         self,
         model_id: str = "",
@@ -266,6 +284,18 @@ class SDKVDMSClient:
                 embedding_dimensions=self.embedding_dimensions
             )
             
+            # Embeddings are written by the bulk writer over its own connections
+            self.bulk_writer = VDMSBulkWriter(
+                host=self.vdms_host,
+                port=int(self.vdms_port),
+                collection_name=self.collection_name,
+                dimensions=self.embedding_dimensions,
+                connections=settings.VDMS_WRITER_CONNECTIONS,
+                batch_size=settings.VDMS_WRITE_BATCH_SIZE,
+                max_batch_size=settings.VDMS_WRITE_MAX_BATCH_SIZE,
+                target_latency=settings.VDMS_WRITE_TARGET_LATENCY,
+            )
+            
             logger.info("VDMS initialized - Collection: %s", self.collection_name)
             logger.info("Collection configured with %dD embeddings", self.embedding_dimensions)
             logger.warning(
@@ -315,15 +345,21 @@ class SDKVDMSClient:
             else:
                 # Convert any other type to string
                 cleaned[key] = str(value)
+
+        # Make every tag searchable with an equality constraint
+        cleaned.update(tag_properties(metadata.get("tags")))
         
         return cleaned
 
-    def store_frame_embeddings(self, embeddings: List[List[float]], frame_metadatas: List[dict]) -> List[str]:
+    def store_frame_embeddings(self, embeddings: List[Any], frame_metadatas: List[dict]) -> List[str]:
         """
-        Store frame embeddings using optimized langchain-vdms batching.
+        Store frame embeddings through the bulk writer.
+
+        New metadata properties are not registered with the collection here; call
+        :meth:`flush_properties` once the whole video has been stored.
 
         Args:
-            embeddings: Pre-computed embeddings from SDK
+            embeddings: Pre-computed embeddings from SDK (float32 arrays or float lists)
             frame_metadatas: Metadata for each frame
 
         Returns:
@@ -365,16 +401,19 @@ class SDKVDMSClient:
             # Store embeddings using optimized langchain-vdms approach
             logger.debug(
                 "Storage payload: dim=%s, sample_text=%s, metadata_keys=%s",
-                len(embeddings[0]) if embeddings and len(embeddings[0]) > 0 else "unknown",
+                len(embeddings[0]) if len(embeddings) and len(embeddings[0]) > 0 else "unknown",
                 (frame_texts[0][:50] + "...") if frame_texts else "<none>",
                 list(cleaned_metadatas[0].keys()) if cleaned_metadatas else []
             )
             
-            ids = self._store_embeddings(embeddings, frame_texts, cleaned_metadatas)
+            ids = self._store_embeddings(embeddings, frame_texts, cleaned_metadatas, refresh_properties=False)
             total_time = time.time() - start_time
             logger.info("Stored %d embeddings in %.3fs", len(ids), total_time)
             return ids
-            
+
+        except VDMSPartialWriteError:
+            # Keep the IDs of the stored descriptors so that callers can account for them
+            raise
         except Exception as ex:
             total_time = time.time() - start_time if 'start_time' in locals() else 0
             logger.error("store_frame_embeddings() failed after %.3fs", total_time)
@@ -384,59 +423,49 @@ class SDKVDMSClient:
     
     def _store_embeddings(
         self,
-        embeddings: List[List[float]],
+        embeddings: List[Any],
         texts: List[str],
         metadatas: List[dict],
+        refresh_properties: bool = True,
     ) -> List[str]:
-        """Persist embeddings using the langchain-vdms vector store."""
+        """Persist embeddings with the bulk writer, optionally registering new properties right away."""
 
-        if not embeddings:
+        if len(embeddings) == 0:
             return []
 
-        logger.info("Storing %d embeddings via langchain-vdms", len(embeddings))
-        batch_size = 200
-        generated_ids: List[str] = []
+        logger.info("Storing %d embeddings via VDMS bulk writer", len(embeddings))
+        try:
+            generated_ids = self.bulk_writer.write(embeddings, texts, metadatas)
+        except Exception as exc:
+            logger.error("VDMS bulk write of %d embeddings failed: %s", len(embeddings), exc)
+            raise
 
-        with self._vdms_lock:
-            for start_idx in range(0, len(embeddings), batch_size):
-                end_idx = min(start_idx + batch_size, len(embeddings))
-
-                batch_embeddings = embeddings[start_idx:end_idx]
-                batch_texts = texts[start_idx:end_idx]
-                batch_metadatas = metadatas[start_idx:end_idx]
-                batch_ids = [str(uuid.uuid4()) for _ in batch_embeddings]
-
-                try:
-                    inserted_ids = self.video_db.add_from(
-                        texts=batch_texts,
-                        embeddings=batch_embeddings,
-                        metadatas=batch_metadatas,
-                        ids=batch_ids,
-                        batch_size=batch_size,
-                    )
-                except Exception as exc:
-                    logger.error(
-                        "VDMS add_from failed for batch %d-%d: %s",
-                        start_idx,
-                        end_idx - 1,
-                        exc,
-                    )
-                    raise
-
-                if not inserted_ids or len(inserted_ids) != len(batch_ids):
-                    raise ValueError(
-                        "VDMS add_from returned unexpected result size. "
-                        f"Expected {len(batch_ids)}, received {len(inserted_ids) if inserted_ids else 0}."
-                    )
-
-                generated_ids.extend(inserted_ids)
-
-        self.video_db.check_and_update_properties()
+        if refresh_properties:
+            self.flush_properties()
         logger.info("Stored %d embeddings in VDMS", len(generated_ids))
         return generated_ids
-    
 
-    
+    def flush_properties(self) -> None:
+        """
+        Register the metadata properties written since the last flush with the collection.
+
+        langchain-vdms keeps the list of queryable properties in a separate VDMS entity.
+        Updating it is a read-modify-write round trip, so bulk ingestion defers it to the
+        end of a job instead of repeating it after every batch.
+        """
+        new_keys = self.bulk_writer.take_property_keys()
+        if not new_keys:
+            return
+
+        with self._vdms_lock:
+            missing = new_keys.difference(self.video_db.collection_properties)
+            if missing:
+                self.video_db.collection_properties.extend(missing)
+                self.video_db.collection_properties.sort()
+            self.video_db.push_update_properties(self.collection_name)
+            self.video_db.check_and_update_properties()
+        logger.debug("Refreshed VDMS collection properties (%d new)", len(missing))
+
     def generate_embedding_for_image(self, image_input: Any) -> Optional[List[float]]:
         """
         Generate embedding for a single image using SDK.
@@ -479,7 +508,7 @@ class SDKVDMSClient:
             logger.error("Error generating image embedding: %s", exc)
             return None
 
-    def generate_embeddings_for_images(self, image_inputs: List[Any]) -> List[Optional[List[float]]]:
+    def generate_embeddings_for_images(self, image_inputs: List[Any]) -> List[Optional[np.ndarray]]:
         """
         Generate embeddings for multiple images using SDK in batch.
         
@@ -487,7 +516,7 @@ class SDKVDMSClient:
             image_inputs: List of image inputs (PIL Images, numpy arrays, or paths)
             
         Returns:
-            List of embeddings as lists of floats or None for failed images
+            List of embeddings as float32 arrays (ready for the bulk writer) or None for failed images
         """
         try:
             if not self.supports_image:
@@ -518,11 +547,7 @@ class SDKVDMSClient:
             if embeddings is not None:
                 results = []
                 for embedding in embeddings:
-                    if embedding is not None:
-                        vector = self._to_list(embedding)
-                        results.append(vector or None)
-                    else:
-                        results.append(None)
+                    results.append(self._to_vector(embedding))
                 return results
             return [None] * len(image_inputs)
             
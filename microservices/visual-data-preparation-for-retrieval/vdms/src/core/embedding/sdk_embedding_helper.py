@@ -8,33 +8,45 @@ This module provides optimized video processing using the multimodal embedding s
 as an SDK for direct function calls. Final implementation strategy:
 
 1. **SDK-based Embedding Generation**: Direct function calls instead of HTTP API
-2. **Parallel Processing**: Process embeddings in parallel using ThreadPoolExecutor
-3. **Bulk Vector DB Storage**: Store all embeddings in VDMS in single bulk operation
-4. **Memory-based Video Processing**: Process video directly from memory using decord
+2. **Streaming Pipeline**: Decode, detection, embedding and storage run as concurrent
+   stages connected by bounded queues (see `streaming_pipeline.py`)
+3. **Bulk Vector DB Storage**: Writer threads send float32 embedding blobs to VDMS in
+   adaptively sized batches (see `vdms_bulk_writer.py`)
+4. **Memory-based Video Processing**: Sample frames directly from memory using batched,
+   sequential decord decoding at the resolution the models consume
+5. **Resumable Jobs**: Stored frames are checkpointed per batch, so an interrupted or
+   repeated ingestion skips them (see `ingestion_jobs.py`)
 
 Performance Benefits:
 - Eliminates network latency for embedding generation
-- Parallel embedding generation for better CPU utilization
+- Decode, inference and VDMS I/O overlap instead of running one after another
+- Memory use stays constant regardless of video length
 - Bulk storage reduces VDMS operation overhead
-- Memory-only processing avoids disk I/O
 """
 
 import io
-import tempfile
 import pathlib
 import time
 import os
 import multiprocessing
 import threading
-from typing import Dict, Any, List, Optional, Tuple
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Tuple
 import cv2
 import numpy as np
 from PIL import Image
 import decord
 
 from src.common import logger, settings
+from src.core.embedding.ingestion_jobs import (
+    IngestionJobTracker,
+    build_model_key,
+    compute_video_hash,
+    get_job_store,
+)
 from src.core.embedding.sdk_client import SDKVDMSClient
+from src.core.embedding.streaming_pipeline import StreamingIngestionPipeline
+from src.core.utils.frame_sampler import VideoFrameSampler
+from src.core.object_detection.yolox_utils import clip_boxes
 
 # Global SDK client instance (initialized once per worker process)
 _sdk_client: Optional[SDKVDMSClient] = None
@@ -42,6 +54,9 @@ _sdk_client: Optional[SDKVDMSClient] = None
 # Global object detector instance (initialized once per worker process)
 _global_detector = None
 
+# Detected objects smaller than this many pixels in either dimension are not cropped
+MIN_CROP_SIZE = 10
+
 
 def _get_decord_context(device: Optional[str] = None):
     """Return the decord context used for frame extraction."""
@@ -57,6 +72,18 @@ def _get_decord_context(device: Optional[str] = None):
     return decord.cpu(0)
 
 
+def _get_positive_int_env(name: str, default: int) -> int:
+    """Read a positive integer from the environment, falling back to the default when unset or invalid."""
+    value = os.getenv(name)
+    if not value:
+        return default
+    try:
+        return max(1, int(value))
+    except ValueError:
+        logger.warning("Ignoring non-integer %s=%s", name, value)
+        return default
+
+
 def get_pipeline_config():
     """Get optimized pipeline configuration based on CPU cores."""
     from src.common import settings
@@ -114,26 +141,46 @@ def get_pipeline_config():
                 cpu_cores,
             )
     
+    if not enable_pipelines:
+        logger.info("ENABLE_PARALLEL_PIPELINE=false; using a single detection and embedding worker")
+        max_workers = 1
+
     config = {
         'pipeline_count': max_workers,
         'batch_size': 32,  # Optimal batch size for embedding generation
         'enable_pipelines': enable_pipelines,
-        'use_openvino': use_openvino
+        'use_openvino': use_openvino,
+        # Streaming pipeline stage sizing
+        'detection_workers': _get_positive_int_env('PIPELINE_DETECTION_WORKERS', max_workers),
+        'embedding_workers': _get_positive_int_env('PIPELINE_EMBEDDING_WORKERS', max_workers),
+        'queue_size': _get_positive_int_env('PIPELINE_QUEUE_SIZE', 32),  # Items buffered between two stages
+        'storage_batch_size': _get_positive_int_env('PIPELINE_STORAGE_BATCH_SIZE', 200),  # Embeddings per VDMS write
+        'storage_workers': _get_positive_int_env('PIPELINE_STORAGE_WORKERS', settings.VDMS_WRITER_CONNECTIONS),
     }
 
     if performance_mode:
         logger.info(
-            "Pipeline config: %s pipelines, batch size %s, OpenVINO: %s (performance_mode=%s)",
-            config['pipeline_count'],
+            "Pipeline config: %s detection / %s embedding workers, batch size %s, queue size %s, "
+            "storage batch size %s, %s writer(s), OpenVINO: %s (performance_mode=%s)",
+            config['detection_workers'],
+            config['embedding_workers'],
             config['batch_size'],
+            config['queue_size'],
+            config['storage_batch_size'],
+            config['storage_workers'],
             use_openvino,
             performance_mode,
         )
     else:
         logger.info(
-            "Pipeline config: %s pipelines, batch size %s, OpenVINO: %s",
-            config['pipeline_count'],
+            "Pipeline config: %s detection / %s embedding workers, batch size %s, queue size %s, "
+            "storage batch size %s, %s writer(s), OpenVINO: %s",
+            config['detection_workers'],
+            config['embedding_workers'],
             config['batch_size'],
+            config['queue_size'],
+            config['storage_batch_size'],
+            config['storage_workers'],
             use_openvino,
         )
     return config
@@ -383,27 +430,6 @@ class SimplePipelineManager:
         else:
             logger.info("PyTorch mode: Using shared model instance across all threads (thread-safe)")
     
-    @staticmethod
-    def _summarize_stage_times(samples: List[float]) -> Dict[str, float]:
-        """Compute aggregate statistics for a collection of stage timings."""
-        if not samples:
-            return {
-                "total": 0.0,
-                "avg": 0.0,
-                "max": 0.0,
-                "min": 0.0,
-                "count": 0,
-            }
-
-        total = float(sum(samples))
-        return {
-            "total": total,
-            "avg": total / len(samples),
-            "max": max(samples),
-            "min": min(samples),
-            "count": len(samples),
-        }
-
     def _initialize_object_detector(self):
         """Initialize object detector for frame processing."""
         logger.info("Using global object detector for SDK mode...")
@@ -421,498 +447,153 @@ class SimplePipelineManager:
             logger.info(f"Using global object detector with confidence threshold: {self.detection_confidence}")
         
     
-    def _process_frame_with_detection(self, frame_numpy: np.ndarray, frame_metadata: Dict[str, Any]) -> List[Tuple[Image.Image, Dict[str, Any]]]:
+    def _process_detection_batch(self, frames: List[Tuple[np.ndarray, Dict[str, Any]]]) -> List[Tuple[np.ndarray, Dict[str, Any]]]:
         """
-        Process a single frame and optionally detect objects to create crops.
+        Process a batch of frames, detecting objects in all of them with one batched call.
+        
+        Every frame is returned as-is followed by its object crops. Crops are NumPy views
+        into the frame, so no image is copied or converted before the embedding stage.
         
         Args:
-            frame_numpy: Frame as numpy array (H, W, C)
-            frame_metadata: Metadata for the frame
+            frames: Batch of (frame numpy array (H, W, C), frame metadata) pairs
             
         Returns:
             List of (image, metadata) tuples for processing
         """
-        results = []
-        
-        # Always include the full frame
-        frame_pil = Image.fromarray(frame_numpy)
-        results.append((frame_pil, frame_metadata))
-        
-        # If object detection is enabled, detect objects and create crops
+        detections = None
         if self.enable_object_detection and self.detector is not None:
             try:
-                detections = self.detector.detect(frame_numpy, return_metadata=True)
-
-                if detections:
-                    logger.debug(
-                        "Detected %d objects in frame %s",
-                        len(detections),
-                        frame_metadata.get("frame_id", "unknown"),
-                    )
-
-                    for crop_idx, det_meta in enumerate(detections):
-                        try:
-                            box = det_meta.get("bbox")
-                            score = det_meta.get("confidence")
-                            class_id = det_meta.get("class_id")
-                            class_name = det_meta.get("class_name")
-
-                            if not box or score is None or class_id is None:
-                                logger.debug("Skipping detection %d due to incomplete metadata", crop_idx)
-                                continue
-
-                            x1, y1, x2, y2 = box
-
-                            h, w = frame_numpy.shape[:2]
-                            x1 = max(0, min(int(x1), w - 1))
-                            y1 = max(0, min(int(y1), h - 1))
-                            x2 = max(x1 + 1, min(int(x2), w))
-                            y2 = max(y1 + 1, min(int(y2), h))
-
-                            if (x2 - x1) < 10 or (y2 - y1) < 10:
-                                continue
-
-                            crop = frame_numpy[y1:y2, x1:x2]
-                            crop_pil = Image.fromarray(crop)
-
-                            crop_metadata = frame_metadata.copy()
-                            crop_metadata.update(
-                                {
-                                    "frame_type": "detected_crop",
-                                    "is_detected_crop": True,
-                                    "crop_index": crop_idx,
-                                    "detection_confidence": float(score),
-                                    "crop_bbox": [int(x1), int(y1), int(x2), int(y2)],
-                                    "detected_class_id": int(class_id),
-                                    "detected_label": class_name,
-                                    "frame_id": f"{frame_metadata.get('frame_id', 'unknown')}_crop_{crop_idx}",
-                                }
-                            )
-
-                            results.append((crop_pil, crop_metadata))
-
-                        except Exception as e:
-                            logger.warning(
-                                "Failed to create crop %d from frame %s: %s",
-                                crop_idx,
-                                frame_metadata.get("frame_id", "unknown"),
-                                e,
-                            )
-                            continue
-
+                detections = self.detector.detect_objects_batch([frame_numpy for frame_numpy, _ in frames])
             except Exception as e:
-                logger.warning(
-                    "Object detection failed for frame %s: %s",
-                    frame_metadata.get("frame_id", "unknown"),
-                    e,
-                )
-        
-        return results
-    
-    def _process_frames_with_parallel_detection(self, all_frames: List[np.ndarray], all_metadata: List[Dict[str, Any]]) -> Tuple[List[Image.Image], List[Dict[str, Any]]]:
-        """
-        Process frames with parallel object detection.
+                logger.warning("Object detection failed for a batch of %d frames: %s", len(frames), e)
         
-        Args:
-            all_frames: List of frame numpy arrays
-            all_metadata: List of frame metadata
+        results = []
+        for index, (frame_numpy, frame_metadata) in enumerate(frames):
+            # Always include the full frame
+            results.append((frame_numpy, frame_metadata))
+            if detections is None:
+                continue
             
-        Returns:
-            Tuple of (images_list, metadata_list) including original frames and detected crops
-        """
-        logger.info(f"Starting parallel object detection on {len(all_frames)} frames")
-        
-        # Create batches for parallel detection processing
-        detection_batch_size = max(1, len(all_frames) // self.config['pipeline_count'])
-        detection_batches = []
-        
-        for i in range(0, len(all_frames), detection_batch_size):
-            batch_frames = all_frames[i:i + detection_batch_size]
-            batch_metadata = all_metadata[i:i + detection_batch_size]
-            detection_batches.append((batch_frames, batch_metadata))
-        
-        logger.info(f"Created {len(detection_batches)} detection batches (batch_size={detection_batch_size})")
-        
-        # Process detection batches in parallel
-        all_images_for_embedding = []
-        all_metadata_for_embedding = []
-        
-        with ThreadPoolExecutor(max_workers=self.config['pipeline_count']) as executor:
-            detection_futures = [
-                executor.submit(self._process_detection_batch, batch_frames, batch_metadata)
-                for batch_frames, batch_metadata in detection_batches
-            ]
+            boxes, scores, class_ids = detections[index]
+            if len(boxes) == 0:
+                continue
+            
+            logger.debug(
+                "Detected %d objects in frame %s",
+                len(boxes),
+                frame_metadata.get("frame_id", "unknown"),
+            )
             
-            # Process completed futures as they finish (true parallel processing)
-            for future in as_completed(detection_futures):
-                batch_images, batch_metadata = future.result()
-                all_images_for_embedding.extend(batch_images)
-                all_metadata_for_embedding.extend(batch_metadata)
+            crop_boxes, kept = clip_boxes(boxes, frame_numpy.shape, min_size=MIN_CROP_SIZE)
+            
+            # Report boxes in source video coordinates when frames were downscaled on decode
+            decode_scale = frame_metadata.get("decode_scale", 1.0) or 1.0
+            source_boxes = np.round(crop_boxes / decode_scale).astype(int)
+            
+            for (x1, y1, x2, y2), source_box, crop_idx in zip(crop_boxes, source_boxes, kept):
+                class_id = int(class_ids[crop_idx])
+                crop_metadata = frame_metadata.copy()
+                crop_metadata.update(
+                    {
+                        "frame_type": "detected_crop",
+                        "is_detected_crop": True,
+                        "crop_index": int(crop_idx),
+                        "detection_confidence": float(scores[crop_idx]),
+                        "crop_bbox": source_box.tolist(),
+                        "detected_class_id": class_id,
+                        "detected_label": self.detector.get_class_name(class_id),
+                        "frame_id": f"{frame_metadata.get('frame_id', 'unknown')}_crop_{crop_idx}",
+                    }
+                )
+                results.append((frame_numpy[y1:y2, x1:x2], crop_metadata))
         
-        logger.info(f"Parallel object detection completed: {len(all_frames)} frames -> {len(all_images_for_embedding)} items")
-        return all_images_for_embedding, all_metadata_for_embedding
+        return results
     
-    def _process_detection_batch(self, batch_frames: List[np.ndarray], batch_metadata: List[Dict[str, Any]]) -> Tuple[List[Image.Image], List[Dict[str, Any]]]:
+    def process_frame_stream(
+        self,
+        frames: Iterable[Tuple[np.ndarray, Dict[str, Any]]],
+        job: Optional[IngestionJobTracker] = None,
+    ) -> Dict[str, Any]:
         """
-        Process a batch of frames for object detection.
-        
+        Stream frames through the staged ingestion pipeline.
+
+        Frames are pulled lazily from ``frames`` by a decoder thread, expanded into full
+        frames and object crops by a detection pool, embedded in batches by an embedding
+        pool and written to VDMS by a single batched writer. Bounded queues between the
+        stages keep memory use independent of the number of frames.
+
         Args:
-            batch_frames: Batch of frame numpy arrays
-            batch_metadata: Batch of frame metadata
-            
+            frames: Iterable of (frame, metadata) pairs, consumed once
+            job: Checkpoints stored frames and publishes progress when given
+
         Returns:
-            Tuple of (images_list, metadata_list) for this batch
+            Dictionary with stored IDs, item counts and per-stage statistics
         """
-        batch_images = []
-        batch_metadata_results = []
-        
-        for frame_numpy, frame_metadata in zip(batch_frames, batch_metadata):
-            # Process frame with detection (returns full frame + detected crops)
-            frame_results = self._process_frame_with_detection(frame_numpy, frame_metadata)
-            
-            for image_pil, metadata in frame_results:
-                batch_images.append(image_pil)
-                batch_metadata_results.append(metadata)
-        
-        logger.debug(f"Detection batch processed: {len(batch_frames)} frames -> {len(batch_images)} items")
-        return batch_images, batch_metadata_results
-    
-    def process_frames_parallel(self, all_frames: List[np.ndarray], all_metadata: List[Dict[str, Any]]) -> Dict[str, Any]:
-        """Process frames in parallel for embedding generation with optional object detection and per-batch storage."""
-        logger.info(f"Processing {len(all_frames)} frames with {self.config['pipeline_count']} maximum parallel workers")
-        
-        if self.enable_object_detection:
-            logger.info(f"Object detection enabled with confidence threshold: {self.detection_confidence}")
-        
-        try:
-            # Create batches of frames for parallel processing
-            logger.info(f"About to create batches from {len(all_frames)} frames with batch_size={self.config['batch_size']}")
-            batches = self.create_frame_batches(all_frames, all_metadata)
-            detection_status = "with object detection" if self.enable_object_detection else "without object detection"
-            logger.info(f"Created {len(batches)} batches for parallel processing ({detection_status})")
-            
-            # Process batches in parallel - each batch will do optional object detection + embedding generation + immediate storage
-            total_embeddings_stored = 0
-            all_stored_ids = []
-            batch_processing_times: List[float] = []
-            detection_times: List[float] = []
-            embedding_times: List[float] = []
-            storage_times: List[float] = []
-            total_items_after_detection = 0
-            
-            logger.info(f"Starting parallel execution of {len(batches)} batches with {self.config['pipeline_count']} maximum workers")
-            
-            parallel_start_time = time.time()
-            with ThreadPoolExecutor(max_workers=self.config['pipeline_count']) as executor:
-                total_batches = len(batches)
-                future_to_index: Dict[Any, int] = {}
-                batch_futures = []
-                for batch_index, (batch_frames, batch_metadata) in enumerate(batches, start=1):
-                    future = executor.submit(
-                        self._process_single_batch,
-                        batch_frames,
-                        batch_metadata,
-                        batch_index,
-                        total_batches,
-                    )
-                    batch_futures.append(future)
-                    future_to_index[future] = batch_index
-                
-                logger.info(f"Submitted {len(batch_futures)} batch jobs to thread pool")
-                logger.info(f"True parallel processing enabled - batches will complete in any order as they finish")
-                
-                # Process completed batches as they finish (true parallel processing)
-                batch_counter = 0
-                timeout_per_batch = 300  # 5 minutes per batch maximum
-                for future in as_completed(batch_futures, timeout=timeout_per_batch * len(batch_futures)):
-                    batch_counter += 1
-                    try:
-                        batch_result = future.result()
-                        embeddings_count = batch_result['embeddings_count']
-                        stored_ids = batch_result['stored_ids']
-                        processing_time = batch_result['processing_time']
-                        batch_index = future_to_index.get(future, batch_counter)
-                        batch_detection_time = batch_result.get('detection_time', 0.0)
-                        batch_embedding_time = batch_result.get('embedding_time', 0.0)
-                        batch_storage_time = batch_result.get('storage_time', 0.0)
-                        batch_items_after_detection = batch_result.get('items_after_detection', 0)
-                        
-                        total_embeddings_stored += embeddings_count
-                        all_stored_ids.extend(stored_ids)
-                        batch_processing_times.append(processing_time)
-                        detection_times.append(batch_detection_time)
-                        embedding_times.append(batch_embedding_time)
-                        storage_times.append(batch_storage_time)
-                        total_items_after_detection += batch_items_after_detection
-                        
-                        logger.info(
-                            f"Batch {batch_index}/{len(batch_futures)} completed: {embeddings_count} embeddings stored"
-                        )
-                    except Exception as e:
-                        failed_index = future_to_index.get(future, batch_counter)
-                        logger.error(f"Batch {failed_index} failed: {e}")
-                        # Continue processing other batches
-            
-            parallel_time = time.time() - parallel_start_time
-            logger.info(f"Parallel processing completed: {total_embeddings_stored} embeddings generated and stored")
-            
-            detection_stats = self._summarize_stage_times(detection_times)
-            embedding_stats = self._summarize_stage_times(embedding_times)
-            storage_stats = self._summarize_stage_times(storage_times)
-            batch_time_stats = self._summarize_stage_times(batch_processing_times)
-
-            avg_batch_time = batch_time_stats.get("avg", 0.0)
-            max_batch_time = batch_time_stats.get("max", 0.0)
-
-            def _build_stage_summary(stats: Dict[str, float]) -> Dict[str, float]:
-                avg_time = stats.get("avg", 0.0)
-                return {
-                    "avg_s": avg_time,
-                    "max_s": stats.get("max", 0.0),
-                    "avg_pct_of_batch": (avg_time / avg_batch_time * 100.0) if avg_batch_time else 0.0,
-                }
-
-            stage_breakdown = {
-                "detection": _build_stage_summary(detection_stats),
-                "embedding": _build_stage_summary(embedding_stats),
-                "storage": _build_stage_summary(storage_stats),
-            }
+        if not self.supports_image_embeddings:
             logger.info(
-                "Performance: total parallel time %.3fs, avg batch time %.3fs, max batch time %.3fs",
-                parallel_time,
-                avg_batch_time,
-                max_batch_time,
+                "Embedding model %s does not support image/video embeddings; skipping frame stream",
+                self.master_sdk_client.model_id,
             )
-            
-            return {
-                'total_embeddings': total_embeddings_stored,
-                'stored_ids': all_stored_ids,
-                'processing_time': parallel_time,
-                'batches_processed': len(batches),
-                'avg_batch_time': avg_batch_time,
-                'max_batch_time': max_batch_time,
-                'stage_breakdown': stage_breakdown,
-                'batch_stats': {
-                    'avg_s': avg_batch_time,
-                    'max_s': max_batch_time,
-                    'count': batch_time_stats.get('count', 0),
-                },
-                'post_detection_items': total_items_after_detection,
-                'input_frames': len(all_frames)
-            }
-            
-        except Exception as e:
-            logger.error(f"Error in parallel processing: {e}")
             return {
+                'status': 'skipped_no_image_support',
                 'total_embeddings': 0,
                 'stored_ids': [],
-                'processing_time': 0,
-                'batches_processed': 0,
-                'avg_batch_time': 0.0,
-                'max_batch_time': 0.0,
-                'stage_breakdown': {
-                    'detection': {'avg_s': 0.0, 'max_s': 0.0, 'avg_pct_of_batch': 0.0},
-                    'embedding': {'avg_s': 0.0, 'max_s': 0.0, 'avg_pct_of_batch': 0.0},
-                    'storage': {'avg_s': 0.0, 'max_s': 0.0, 'avg_pct_of_batch': 0.0},
-                },
-                'batch_stats': {'avg_s': 0.0, 'max_s': 0.0, 'count': 0},
+                'processing_time': 0.0,
+                'stage_breakdown': {},
                 'post_detection_items': 0,
-                'input_frames': len(all_frames)
+                'input_frames': 0,
             }
-    
-    def create_frame_batches(self, frames: List[np.ndarray], metadata: List[Dict[str, Any]]) -> List[tuple]:
-        """Create batches of frames for parallel processing (including object detection)."""
-        batch_size = self.config['batch_size']
-        total_frames = len(frames)
-        
-        logger.info(f"Creating frame batches: {total_frames} frames, batch_size={batch_size}")
-        
-        batches = []
-        
-        for i in range(0, total_frames, batch_size):
-            batch_frames = frames[i:i + batch_size]
-            batch_metadata = metadata[i:i + batch_size]
-            batch_num = len(batches) + 1
-            
-            logger.debug(f"Batch {batch_num}: frames {i} to {min(i + batch_size - 1, total_frames - 1)} ({len(batch_frames)} frames)")
-            batches.append((batch_frames, batch_metadata))
-        
-        logger.info(f"Created {len(batches)} batches from {total_frames} frames (avg {total_frames/len(batches):.1f} frames/batch)")
-        return batches
-    
-    def _process_single_batch(
-        self,
-        batch_frames: List[np.ndarray],
-        batch_metadata: List[Dict],
-        batch_index: int,
-        total_batches: int,
-    ) -> Dict[str, Any]:
-        """Process a single batch of frames: object detection + embedding generation + immediate storage."""
-        batch_start_time = time.time()
+
+        if self.enable_object_detection:
+            logger.info(f"Object detection enabled with confidence threshold: {self.detection_confidence}")
+
+        detect_fn = self._process_detection_batch
+        store_fn = self.master_sdk_client.store_frame_embeddings
+        if job is not None:
+            detect_fn = job.wrap_detect(detect_fn)
+            store_fn = job.wrap_store(store_fn)
+
+        pipeline = StreamingIngestionPipeline(
+            detect_fn=detect_fn,
+            embed_fn=self.master_sdk_client.generate_embeddings_for_images,
+            store_fn=store_fn,
+            detection_workers=self.config['detection_workers'],
+            embedding_workers=self.config['embedding_workers'],
+            storage_workers=self.config['storage_workers'],
+            detection_batch_size=self.detector.batch_size if self.enable_object_detection and self.detector else 1,
+            embedding_batch_size=self.config['batch_size'],
+            storage_batch_size=self.config['storage_batch_size'],
+            queue_size=self.config['queue_size'],
+            progress_fn=job.record_stage_stats if job is not None else None,
+        )
+        logger.info(
+            "Starting streaming pipeline: 1 decoder -> %d detection -> %d embedding -> %d writer(s)",
+            pipeline.detection_workers,
+            pipeline.embedding_workers,
+            pipeline.storage_workers,
+        )
         try:
-            logger.info(
-                f"[Batch {batch_index}/{total_batches}] Processing {len(batch_frames)} frames "
-                f"(object detection: {self.enable_object_detection})"
-            )
+            result = pipeline.run(frames)
+        finally:
+            # Register new metadata properties once per video, including partially stored ones
+            self.master_sdk_client.flush_properties()
+        logger.info(
+            "Streaming pipeline completed in %.3fs: %d frames -> %d items -> %d embeddings stored",
+            result['processing_time'],
+            result['frames_decoded'],
+            result['post_detection_items'],
+            result['total_embeddings'],
+        )
 
-            if not self.supports_image_embeddings:
-                logger.info(
-                    "Embedding model %s does not support image/video embeddings; skipping batch %d",
-                    self.master_sdk_client.model_id,
-                    batch_index,
-                )
-                return {
-                    'status': 'skipped_no_image_support',
-                    'embeddings_count': 0,
-                    'stored_ids': [],
-                    'processing_time': time.time() - batch_start_time,
-                    'detection_time': 0.0,
-                    'embedding_time': 0.0,
-                    'storage_time': 0.0,
-                    'items_after_detection': 0,
-                    'input_frames': len(batch_frames)
-                }
-            
-            # Step 1: Process frames with object detection to expand the batch
-            logger.debug(f"Step 1: Starting object detection for {len(batch_frames)} frames")
-            all_images_for_embedding = []
-            all_metadata_for_embedding = []
-            
-            detection_start = time.time()
-            for i, (frame_numpy, frame_metadata) in enumerate(zip(batch_frames, batch_metadata)):
-                logger.debug(f"Processing frame {i+1}/{len(batch_frames)} for object detection")
-                # Process frame with detection (returns full frame + detected crops)
-                frame_results = self._process_frame_with_detection(frame_numpy, frame_metadata)
-                
-                for image_pil, metadata in frame_results:
-                    all_images_for_embedding.append(image_pil)
-                    all_metadata_for_embedding.append(metadata)
-            detection_time = time.time() - detection_start
-            
-            expansion_info = f"(including crops)" if self.enable_object_detection else "(frames only)"
-            logger.info(
-                f"[Batch {batch_index}/{total_batches}] Expanded from {len(batch_frames)} frames "
-                f"to {len(all_images_for_embedding)} items {expansion_info} in {detection_time:.3f}s"
-            )
-            items_after_detection = len(all_images_for_embedding)
-            # Step 2: Generate embeddings for all images in the expanded batch
-            logger.debug(f"Step 2: Starting embedding generation for {len(all_images_for_embedding)} images")
-            thread_sdk_client = self.master_sdk_client
-            
-            # Use parallel-safe embedding generation
-            # The multimodal embedding service now uses thread-safe infer_new_request
-            logger.debug(
-                f"[Batch {batch_index}/{total_batches}] Using parallel mode - no locking needed with infer_new_request"
-            )
-            embedding_start = time.time()
-            embeddings = thread_sdk_client.generate_embeddings_for_images(all_images_for_embedding)
-            embedding_time = time.time() - embedding_start
-            logger.debug(
-                f"[Batch {batch_index}/{total_batches}] Step 2 completed: Generated {len(embeddings)} "
-                f"embeddings in {embedding_time:.3f}s"
-            )
-            
-            # Step 3: Prepare valid embeddings and metadata for storage
-            logger.debug(f"Step 3: Validating embeddings")
-            valid_embeddings = []
-            valid_metadatas = []
-            for i, (image, metadata, embedding) in enumerate(zip(all_images_for_embedding, all_metadata_for_embedding, embeddings)):
-                if embedding is not None:
-                    valid_embeddings.append(embedding)
-                    valid_metadatas.append(metadata)
-                else:
-                    if self.supports_image_embeddings:
-                        logger.warning(f"Failed to generate embedding for image {metadata['frame_id']}")
-                    else:
-                        logger.debug(
-                            "Skipping embedding for %s because model does not support image modality", 
-                            metadata['frame_id']
-                        )
-            logger.debug(
-                f"[Batch {batch_index}/{total_batches}] Step 3 completed: {len(valid_embeddings)} valid "
-                f"embeddings out of {len(embeddings)}"
-            )
-            
-            # Step 4: Store embeddings immediately for this batch (prevents OutOfJournalSpace)
-            logger.debug(f"Step 4: Starting storage for {len(valid_embeddings)} embeddings")
-            storage_start = time.time()
-            stored_ids = []
-            if valid_embeddings:
-                logger.debug(
-                    f"[Batch {batch_index}/{total_batches}] Storing {len(valid_embeddings)} embeddings immediately"
-                )
-                stored_ids = thread_sdk_client.store_frame_embeddings(valid_embeddings, valid_metadatas)
-                logger.debug(
-                    f"[Batch {batch_index}/{total_batches}] Successfully stored {len(stored_ids)} embeddings"
-                )
-            storage_time = time.time() - storage_start
-            logger.debug(
-                f"[Batch {batch_index}/{total_batches}] Step 4 completed: Storage took {storage_time:.3f}s"
-            )
-            
-            batch_time = time.time() - batch_start_time
-            logger.info(
-                f"[Batch {batch_index}/{total_batches}] Completed: {len(valid_embeddings)} embeddings "
-                f"(detection: {detection_time:.3f}s, embedding: {embedding_time:.3f}s, "
-                f"storage: {storage_time:.3f}s, total: {batch_time:.3f}s)"
-            )
-            
-            return {
-                'embeddings_count': len(valid_embeddings),
-                'stored_ids': stored_ids,
-                'processing_time': batch_time,
-                'detection_time': detection_time,
-                'embedding_time': embedding_time,
-                'storage_time': storage_time,
-                'items_after_detection': items_after_detection,
-                'input_frames': len(batch_frames)
-            }
-            
-        except Exception as e:
-            logger.error(f"[Batch {batch_index}/{total_batches}] Error processing batch: {e}")
-            return {
-                'embeddings_count': 0,
-                'stored_ids': [],
-                'processing_time': time.time() - batch_start_time,
-                'detection_time': detection_time if 'detection_time' in locals() else 0.0,
-                'embedding_time': embedding_time if 'embedding_time' in locals() else 0.0,
-                'storage_time': storage_time if 'storage_time' in locals() else 0.0,
-                'items_after_detection': len(all_images_for_embedding) if 'all_images_for_embedding' in locals() else 0,
-                'input_frames': len(batch_frames)
-            }
-    
-    def _process_sequential_fallback(self, frames: List[np.ndarray], metadata: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Fallback to sequential processing with object detection support."""
-        logger.warning("Using sequential fallback processing")
-        embeddings = []
-        
-        # Get the appropriate SDK client based on mode
-        thread_sdk_client = self.master_sdk_client
-        
-        for frame_numpy, frame_metadata in zip(frames, metadata):
-            try:
-                # Process frame with detection (returns full frame + detected crops)
-                frame_results = self._process_frame_with_detection(frame_numpy, frame_metadata)
-                
-                for image_pil, metadata_item in frame_results:
-                    try:
-                        # Use parallel-safe embedding generation
-                        embedding = thread_sdk_client.generate_embedding_for_image(image_pil)
-                            
-                        if embedding:
-                            embeddings.append({
-                                'embedding': embedding,
-                                'metadata': metadata_item
-                            })
-                    except Exception as e:
-                        logger.error(f"Error generating embedding for {metadata_item.get('frame_id', 'unknown')}: {e}")
-                        continue
-                        
-            except Exception as e:
-                logger.error(f"Error in sequential processing: {e}")
-                continue
-        
-        return embeddings
+        return {
+            'total_embeddings': result['total_embeddings'],
+            'stored_ids': result['stored_ids'],
+            'processing_time': result['processing_time'],
+            'stage_breakdown': result['stage_stats'],
+            'post_detection_items': result['post_detection_items'],
+            'failed_items': result['failed_items'],
+            'input_frames': result['frames_decoded'],
+        }
 
 
 def generate_video_embedding_sdk(
@@ -920,10 +601,11 @@ def generate_video_embedding_sdk(
     metadata_dict: Dict[str, Any],
     frame_interval: int = 15,
     enable_object_detection: bool = False,
-    detection_confidence: float = 0.85
+    detection_confidence: float = 0.85,
+    job_id: Optional[str] = None,
 ) -> Dict[str, Any]:
     """
-    Generate video embeddings using SDK approach with parallel processing.
+    Generate video embeddings using SDK approach with the streaming ingestion pipeline.
     
     Args:
         video_content: Video content as bytes
@@ -931,6 +613,7 @@ def generate_video_embedding_sdk(
         frame_interval: Number of frames between extractions
         enable_object_detection: Whether to enable object detection (currently not implemented)
         detection_confidence: Confidence threshold (currently not used)
+        job_id: Ingestion job to checkpoint; frames already stored for this video are skipped
         
     Returns:
         Dictionary containing processing results and timing information
@@ -958,8 +641,6 @@ def generate_video_embedding_sdk(
                     'frame_extraction_time': 0.0,
                     'parallel_stage_time': 0.0,
                     'pipeline_wall_time': total_time,
-                    'avg_batch_time': 0.0,
-                    'max_batch_time': 0.0,
                     'stage_breakdown': {},
                 },
                 'frame_counts': {
@@ -967,7 +648,7 @@ def generate_video_embedding_sdk(
                     'post_detection_items': 0,
                     'stored_embeddings': 0,
                 },
-                'processing_mode': 'sdk_simple_pipeline_with_batch_storage',
+                'processing_mode': 'sdk_streaming_pipeline',
             }
         
         # Process video using simple pipeline approach
@@ -977,7 +658,8 @@ def generate_video_embedding_sdk(
             metadata_dict=metadata_dict,
             frame_interval=frame_interval,
             enable_object_detection=enable_object_detection,
-            detection_confidence=detection_confidence
+            detection_confidence=detection_confidence,
+            job_id=job_id,
         )
         
         total_time = time.time() - total_start_time
@@ -992,146 +674,105 @@ def generate_video_embedding_sdk(
         raise
 
 
+def _get_decode_size_limits(sdk_client: SDKVDMSClient, detector: Any) -> Tuple[Optional[int], Optional[int]]:
+    """
+    Return the (min_side, max_side) frame size limits needed by the embedding model and detector.
+
+    The embedding model resizes the shorter side of every image to its input size, and
+    YOLOX letterboxes the longer side to its input size, so decoding frames larger than
+    that only costs decode and conversion time.
+    """
+    if not settings.DOWNSCALE_FRAMES_ON_DECODE:
+        return None, None
+
+    model_handler = getattr(sdk_client, 'model_handler', None)
+    model_config = getattr(model_handler, 'model_config', None) or {}
+    image_size = model_config.get('image_size') or getattr(model_handler, 'image_size', None) or 224
+    min_side = int(image_size)
+
+    max_side = None
+    if detector is not None:
+        input_size = getattr(detector, 'input_size', None) or (640, 640)
+        max_side = int(max(input_size))
+
+    return min_side, max_side
+
+
+def _iter_video_frames(
+    sampler: VideoFrameSampler,
+    metadata_dict: Dict[str, Any],
+) -> Iterator[Tuple[np.ndarray, Dict[str, Any]]]:
+    """
+    Lazily decode sampled frames and build their metadata.
+
+    Frames are decoded batch by batch as the pipeline's decoder stage asks for them,
+    so only the frames currently in flight are held in memory.
+    """
+    fps = sampler.fps
+    total_frames = sampler.total_frames
+    video_duration_seconds = None
+    if fps and fps > 0:
+        try:
+            video_duration_seconds = float(total_frames) / float(fps)
+        except ZeroDivisionError:
+            video_duration_seconds = None
+
+    for frame_idx, frame_numpy in sampler:
+        # Create frame metadata with frame_id for tracking (including video URLs for search-ms compatibility)
+        timestamp = frame_idx / fps
+        frame_metadata = {
+            'frame_id': f"{metadata_dict.get('video_id', 'unknown')}_{frame_idx}",
+            'frame_number': frame_idx,
+            'timestamp': timestamp,
+            'frame_type': 'full_frame',
+            'video_id': metadata_dict.get('video_id', 'unknown'),
+            'filename': metadata_dict.get('filename', 'unknown'),
+            'bucket_name': metadata_dict.get('bucket_name', 'unknown'),
+            'tags': metadata_dict.get('tags', []),
+            'video_url': metadata_dict.get('video_url', ''),
+            'video_rel_url': metadata_dict.get('video_rel_url', '')
+        }
+
+        # Attach video-level metadata needed by search aggregation
+        if total_frames is not None:
+            frame_metadata['total_frames'] = int(total_frames)
+        if fps:
+            frame_metadata['fps'] = float(fps)
+        if video_duration_seconds is not None:
+            frame_metadata['video_duration'] = video_duration_seconds
+            frame_metadata['video_duration_seconds'] = video_duration_seconds
+        if sampler.scale != 1.0:
+            frame_metadata['decode_scale'] = sampler.scale
+
+        # DEBUG: Print first frame metadata to verify video URLs are included
+        if frame_idx == 0:
+            logger.info(f"DEBUG: First frame metadata sample: {frame_metadata}")
+            logger.info(f"DEBUG: Source metadata_dict video_url: '{metadata_dict.get('video_url', 'NOT_FOUND')}'")
+            logger.info(f"DEBUG: Source metadata_dict video_rel_url: '{metadata_dict.get('video_rel_url', 'NOT_FOUND')}'")
+
+        yield frame_numpy, frame_metadata
+
+
 def _process_video_from_memory_simple_pipeline(
     video_content: bytes,
     sdk_client: SDKVDMSClient,
     metadata_dict: Dict[str, Any],
     frame_interval: int,
     enable_object_detection: bool,
-    detection_confidence: float
+    detection_confidence: float,
+    job_id: Optional[str] = None,
 ) -> Dict[str, Any]:
     """
-    Process video from memory using simple parallel pipeline approach.
+    Process video from memory using the staged streaming pipeline.
     
-    This is the main implementation that extracts frames from video in memory,
-    generates embeddings in parallel, and stores them in bulk.
+    Frames are decoded lazily while earlier frames are still being detected,
+    embedded and stored, so decoding overlaps with inference and VDMS writes.
+    With a job, frames committed by earlier runs over the same video are not decoded.
     """
     method_start_time = time.time()
-    logger.info("Processing video using simple parallel pipeline")
+    logger.info("Processing video using streaming pipeline")
     
     try:
-        # Step 1: Extract frames from video in memory
-        frame_extraction_start = time.time()
-        
-        # Create temporary file for decord processing
-        with tempfile.NamedTemporaryFile(suffix='.mp4', delete=False) as temp_file:
-            temp_file.write(video_content)
-            temp_video_path = temp_file.name
-        
-        try:
-            # Use decord to process video with appropriate device context (use SDK device)
-            decord_ctx = _get_decord_context(sdk_client.device)
-            vr = decord.VideoReader(temp_video_path, ctx=decord_ctx)
-            fps = vr.get_avg_fps()
-            total_frames = len(vr)
-            video_duration_seconds = None
-            if fps and fps > 0:
-                try:
-                    video_duration_seconds = float(total_frames) / float(fps)
-                except ZeroDivisionError:
-                    video_duration_seconds = None
-            
-            logger.info(f"Video info: {total_frames} total frames, {fps:.2f} fps")
-            
-            # Extract frames at specified interval
-            frame_indices = list(range(0, total_frames, frame_interval))
-            logger.info(f"Extracting {len(frame_indices)} frames with interval {frame_interval}")
-            
-            frames = []
-            frames_metadata = []
-            
-            for i, frame_idx in enumerate(frame_indices):
-                try:
-                    # Get frame using decord
-                    frame_tensor = vr[frame_idx]
-                    
-                    # Convert to numpy array with robust tensor handling
-                    try:
-                        # Handle different tensor types from decord VideoReader
-                        if hasattr(frame_tensor, 'asnumpy'):
-                            # It's a decord NDArray - convert to numpy first
-                            frame_numpy = frame_tensor.asnumpy()
-                        elif hasattr(frame_tensor, 'numpy'):
-                            # It's a PyTorch tensor - convert to numpy first
-                            frame_numpy = frame_tensor.numpy()
-                        elif hasattr(frame_tensor, 'detach'):
-                            # It's a PyTorch tensor with gradients - detach first
-                            frame_numpy = frame_tensor.detach().numpy()
-                        elif isinstance(frame_tensor, np.ndarray):
-                            # It's already a numpy array
-                            frame_numpy = frame_tensor
-                        else:
-                            # Try generic conversion for any array-like object
-                            try:
-                                frame_numpy = np.array(frame_tensor)
-                            except Exception as conv_error:
-                                logger.error(f"Failed to convert tensor to numpy for frame {frame_idx}: {conv_error}")
-                                logger.error(f"Frame tensor type: {type(frame_tensor)}, available methods: {dir(frame_tensor)}")
-                                continue
-                        
-                        # Ensure the array is in the correct format (H, W, C) and convert to PIL
-                        if len(frame_numpy.shape) == 3 and frame_numpy.shape[-1] == 3:
-                            # Format is correct (H, W, C), convert directly to numpy array for batching
-                            # Ensure uint8 format for consistent processing
-                            frame_numpy = frame_numpy.astype(np.uint8)
-                            frames.append(frame_numpy)  # Store as numpy array for batch processing
-                        else:
-                            logger.error(f"Unexpected frame shape for frame {frame_idx}: {frame_numpy.shape}")
-                            continue
-                            
-                    except Exception as tensor_error:
-                        logger.error(f"Failed to convert frame tensor for frame {frame_idx}: {tensor_error}")
-                        logger.error(f"Frame tensor type: {type(frame_tensor)}, shape: {getattr(frame_tensor, 'shape', 'unknown')}")
-                        continue
-                    
-                    # Create frame metadata with frame_id for tracking (including video URLs for search-ms compatibility)
-                    timestamp = frame_idx / fps
-                    frame_metadata = {
-                        'frame_id': f"{metadata_dict.get('video_id', 'unknown')}_{frame_idx}",
-                        'frame_number': frame_idx,
-                        'timestamp': timestamp,
-                        'frame_type': 'full_frame',
-                        'video_id': metadata_dict.get('video_id', 'unknown'),
-                        'filename': metadata_dict.get('filename', 'unknown'),
-                        'bucket_name': metadata_dict.get('bucket_name', 'unknown'),
-                        'tags': metadata_dict.get('tags', []),
-                        'video_url': metadata_dict.get('video_url', ''),
-                        'video_rel_url': metadata_dict.get('video_rel_url', '')
-                    }
-
-                    # Attach video-level metadata needed by search aggregation
-                    if total_frames is not None:
-                        frame_metadata['total_frames'] = int(total_frames)
-                    if fps:
-                        frame_metadata['fps'] = float(fps)
-                    if video_duration_seconds is not None:
-                        frame_metadata['video_duration'] = video_duration_seconds
-                        frame_metadata['video_duration_seconds'] = video_duration_seconds
-                    frames_metadata.append(frame_metadata)
-                    
-                    # DEBUG: Print first frame metadata to verify video URLs are included
-                    if frame_idx == 0:
-                        logger.info(f"DEBUG: First frame metadata sample: {frame_metadata}")
-                        logger.info(f"DEBUG: Source metadata_dict video_url: '{metadata_dict.get('video_url', 'NOT_FOUND')}'")
-                        logger.info(f"DEBUG: Source metadata_dict video_rel_url: '{metadata_dict.get('video_rel_url', 'NOT_FOUND')}'") 
-                    
-                except Exception as e:
-                    logger.error(f"Error extracting frame {frame_idx}: {e}")
-                    continue
-            
-            frame_extraction_time = time.time() - frame_extraction_start
-            logger.info(f"Frame extraction completed in {frame_extraction_time:.3f}s: {len(frames)} frames")
-            
-        finally:
-            # Clean up temporary file
-            try:
-                os.unlink(temp_video_path)
-            except Exception as e:
-                logger.warning(f"Failed to clean up temp file: {e}")
-        
-        # Step 2: Generate embeddings in parallel with immediate per-batch storage
-        embedding_start_time = time.time()
-        
         # Log device consistency across all components
         logger.info(f"Device consistency: SDK={sdk_client.device}, Decord={sdk_client.device}, Object Detection will use={sdk_client.device}")
         
@@ -1140,92 +781,93 @@ def _process_video_from_memory_simple_pipeline(
             enable_object_detection=enable_object_detection, 
             detection_confidence=detection_confidence
         )
-        processing_result = pipeline_manager.process_frames_parallel(frames, frames_metadata)
         
-        parallel_stage_time = time.time() - embedding_start_time
-        total_embeddings = processing_result.get('total_embeddings', 0)
-        stored_ids = processing_result.get('stored_ids', [])
-        batches_processed = processing_result.get('batches_processed', 0)
+        detector = pipeline_manager.detector if pipeline_manager.enable_object_detection else None
+        job = None
+        if job_id and settings.ENABLE_INGESTION_CHECKPOINTS:
+            job = IngestionJobTracker(
+                get_job_store(),
+                job_id=job_id,
+                video_hash=compute_video_hash(video_content),
+                model_key=build_model_key(sdk_client.model_id, detector, detection_confidence),
+                bucket_name=metadata_dict.get('bucket_name', 'unknown'),
+                video_id=metadata_dict.get('video_id', 'unknown'),
+            )
 
-        stage_breakdown = processing_result.get('stage_breakdown', {}) or {}
-        detection_stats = stage_breakdown.get('detection', {})
-        embedding_stats = stage_breakdown.get('embedding', {})
-        storage_stats = stage_breakdown.get('storage', {})
-        batch_stats = processing_result.get('batch_stats', {}) or {}
-        post_detection_items = (
-            processing_result.get('post_detection_items')
-            or total_embeddings
-            or len(frames)
+        # Sample frames straight from the in-memory video, downscaled for the models that consume them
+        min_side, max_side = _get_decode_size_limits(sdk_client, detector)
+        sampler = VideoFrameSampler(
+            video_content,
+            frame_interval=frame_interval,
+            min_side=min_side,
+            max_side=max_side,
+            batch_size=settings.FRAME_DECODE_BATCH_SIZE,
+            ctx=_get_decord_context(sdk_client.device),
+            skip_frames=job.committed_frames if job is not None else None,
         )
+        skipped_frames = len(job.begin(sampler.sampled_indices)) if job is not None else 0
+        logger.info(f"Video info: {sampler.total_frames} total frames, {sampler.fps:.2f} fps")
+        logger.info(f"Streaming {len(sampler)} frames with interval {frame_interval}")
         
-        logger.info(
-            "Embedding generation pipeline completed in %.3fs: %d embeddings across %d batches",
-            parallel_stage_time,
-            total_embeddings,
-            batches_processed,
-        )
+        pipeline_start_time = time.time()
+        processing_result = pipeline_manager.process_frame_stream(_iter_video_frames(sampler, metadata_dict), job=job)
+        pipeline_time = time.time() - pipeline_start_time
+        
+        stored_ids = processing_result.get('stored_ids', [])
+        extracted_frames = processing_result.get('input_frames', 0)
+        post_detection_items = processing_result.get('post_detection_items', 0)
+        stage_breakdown = processing_result.get('stage_breakdown', {}) or {}
+        decode_stats = stage_breakdown.get('decode', {})
         
-        # Step 3: Return results (storage already completed per-batch)
         method_time = time.time() - method_start_time
         
         result = {
             'status': 'success',
             'stored_ids': stored_ids,
             'total_embeddings': len(stored_ids),
-            'total_frames_processed': len(frames),
+            'total_frames_processed': extracted_frames,
             'frame_interval': frame_interval,
             'timing': {
-                'frame_extraction_time': frame_extraction_time,
-                'parallel_stage_time': parallel_stage_time,
+                'frame_extraction_time': decode_stats.get('busy_s', 0.0),
+                'parallel_stage_time': pipeline_time,
                 'pipeline_wall_time': method_time,
-                'avg_batch_time': batch_stats.get('avg_s', 0.0),
-                'max_batch_time': batch_stats.get('max_s', 0.0),
                 'stage_breakdown': stage_breakdown,
             },
             'frame_counts': {
-                'extracted_frames': len(frames),
+                'extracted_frames': extracted_frames,
+                'skipped_frames': skipped_frames,
                 'post_detection_items': post_detection_items,
                 'stored_embeddings': len(stored_ids)
             },
-            'processing_mode': 'sdk_simple_pipeline_with_batch_storage'
+            'processing_mode': 'sdk_streaming_pipeline'
         }
         
-        logger.info("Simple pipeline processing completed successfully")
+        logger.info("Streaming pipeline processing completed successfully")
         logger.info(
-            "Frame flow summary: extracted=%d -> after_detection=%d -> stored=%d",
-            len(frames),
+            "Frame flow summary: skipped=%d | extracted=%d -> after_detection=%d -> stored=%d",
+            skipped_frames,
+            extracted_frames,
             post_detection_items,
             len(stored_ids),
         )
 
         def _format_stage(label: str, stats: Dict[str, float]) -> str:
-            avg_time = stats.get('avg_s', 0.0)
-            max_time = stats.get('max_s', 0.0)
-            pct = stats.get('avg_pct_of_batch', 0.0)
-            return f"{label}(avg={avg_time:.3f}s, max={max_time:.3f}s, ~{pct:.1f}% of batch)"
+            return (
+                f"{label}(busy={stats.get('busy_s', 0.0):.3f}s, "
+                f"{stats.get('throughput_per_s', 0.0):.1f} items/s, "
+                f"~{stats.get('utilization_pct', 0.0):.0f}% utilized)"
+            )
 
         logger.info(
-            "Stage timing snapshot: extraction=%.3fs | %s | %s | %s | parallel_batch_time_after_extraction=%.3fs | total_time=%.3fs",
-            frame_extraction_time,
-            _format_stage("detection", detection_stats),
-            _format_stage("embedding", embedding_stats),
-            _format_stage("storage", storage_stats),
-            parallel_stage_time,
+            "Stage timing snapshot: %s | pipeline_time=%.3fs | total_time=%.3fs",
+            " | ".join(_format_stage(name, stats) for name, stats in stage_breakdown.items()),
+            pipeline_time,
             method_time,
         )
-        if batch_stats.get('count'):
-            logger.info(
-                "Batch timing snapshot: avg=%.3fs, max=%.3fs across %d batches",
-                batch_stats.get('avg_s', 0.0),
-                batch_stats.get('max_s', 0.0),
-                batch_stats.get('count', 0),
-            )
         
         return result
         
     except Exception as e:
         method_time = time.time() - method_start_time
-        logger.error(f"Simple pipeline processing failed after {method_time:.3f}s: {e}")
+        logger.error(f"Streaming pipeline processing failed after {method_time:.3f}s: {e}")
         raise
-
-
@@ -13,6 +13,7 @@ from langchain_vdms.vectorstores import VDMS, VDMS_Client
 from langchain_core.embeddings import Embeddings
 
 from src.common import Strings, logger
+from src.core.utils.common_utils import tag_properties
 from src.core.utils.config_utils import read_config
 
 
@@ -194,6 +195,9 @@ class SimpleVDMSClient:
             else:
                 # Convert any other type to string
                 cleaned[key] = str(value)
+
+        # Make every tag searchable with an equality constraint
+        cleaned.update(tag_properties(metadata.get("tags")))
         
         return cleaned
 
@@ -3,10 +3,11 @@
 
 import pathlib
 import time
-from typing import List
+from typing import List, Optional
 
 from src.common import logger, settings
 from src.core.embedding.simple_client import SimpleVDMSClient
+from src.core.utils.common_utils import notify_index_updated
 from src.core.utils.metadata_utils import store_enhanced_video_metadata
 
 # Import SDK-based embedding helper for optimized processing
@@ -85,6 +86,7 @@ async def generate_video_embedding(
     enable_object_detection: bool = True,
     detection_confidence: float = 0.85,
     tags: List[str] = None,
+    job_id: Optional[str] = None,
 ) -> List[str]:
     """
     Video embedding generation with flag-based routing between API and SDK modes.
@@ -103,6 +105,7 @@ async def generate_video_embedding(
         enable_object_detection: Whether to enable object detection
         detection_confidence: Confidence threshold for object detection
         tags: Tags for the video
+        job_id: Ingestion job to checkpoint (SDK mode only)
 
     Returns:
         List of IDs of the created embeddings
@@ -114,7 +117,7 @@ async def generate_video_embedding(
         # Route based on processing mode flag
         if settings.EMBEDDING_PROCESSING_MODE.lower() == "sdk":
             logger.info("Using SDK mode for optimized performance")
-            return await _generate_video_embedding_sdk_mode(
+            ids = await _generate_video_embedding_sdk_mode(
                 bucket_name=bucket_name,
                 video_id=video_id,
                 filename=filename,
@@ -123,11 +126,12 @@ async def generate_video_embedding(
                 frame_interval=frame_interval,
                 enable_object_detection=enable_object_detection,
                 detection_confidence=detection_confidence,
-                tags=tags
+                tags=tags,
+                job_id=job_id,
             )
         else:
             logger.info("Using API mode (traditional HTTP calls)")
-            return await _generate_video_embedding_api_mode(
+            ids = await _generate_video_embedding_api_mode(
                 bucket_name=bucket_name,
                 video_id=video_id,
                 filename=filename,
@@ -139,6 +143,9 @@ async def generate_video_embedding(
                 tags=tags
             )
 
+        notify_index_updated()
+        return ids
+
     except Exception as ex:
         logger.error(f"Error in video embedding generation: {ex}")
         raise
@@ -154,6 +161,7 @@ async def generate_video_embedding_from_content(
     enable_object_detection: bool = True,
     detection_confidence: float = 0.85,
     tags: List[str] = None,
+    job_id: Optional[str] = None,
 ) -> List[str]:
     """
     Generate video embeddings directly from video content bytes (SDK mode only).
@@ -171,6 +179,7 @@ async def generate_video_embedding_from_content(
         enable_object_detection: Whether to enable object detection
         detection_confidence: Confidence threshold for object detection
         tags: Tags for the video
+        job_id: Ingestion job to checkpoint (SDK mode only)
 
     Returns:
         List of IDs of the created embeddings
@@ -208,10 +217,12 @@ async def generate_video_embedding_from_content(
             metadata_dict=metadata_dict,
             frame_interval=frame_interval,
             enable_object_detection=enable_object_detection,
-            detection_confidence=detection_confidence
+            detection_confidence=detection_confidence,
+            job_id=job_id,
         )
         
         logger.info(f"SDK processing completed: {results['total_frames_processed']} frames processed")
+        notify_index_updated()
         return results['stored_ids']
 
     except Exception as ex:
@@ -305,6 +316,7 @@ async def _generate_video_embedding_sdk_mode(
     enable_object_detection: bool = True,
     detection_confidence: float = 0.85,
     tags: List[str] = None,
+    job_id: Optional[str] = None,
 ) -> List[str]:
     """
     SDK-based video embedding generation (optimized approach).
@@ -350,7 +362,8 @@ async def _generate_video_embedding_sdk_mode(
         metadata_dict=metadata_dict,
         frame_interval=frame_interval,
         enable_object_detection=enable_object_detection,
-        detection_confidence=detection_confidence
+        detection_confidence=detection_confidence,
+        job_id=job_id,
     )
     
     logger.info(f"SDK processing completed: {results['total_frames_processed']} frames processed")
@@ -397,6 +410,7 @@ async def generate_text_embedding(
                 "Stored text embedding via SDK client, ID: %s",
                 ids[0] if ids else "<none>",
             )
+            notify_index_updated()
             return ids
 
         logger.info("Using multimodal embedding API for text")
@@ -406,6 +420,7 @@ async def generate_text_embedding(
             "Stored text embedding via multimodal API, ID: %s",
             ids[0] if ids else "<none>",
         )
+        notify_index_updated()
         return ids
 
     except Exception as ex:
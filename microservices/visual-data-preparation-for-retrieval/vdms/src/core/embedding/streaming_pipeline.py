@@ -0,0 +1,464 @@
+# Copyright (C) 2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Staged Streaming Pipeline for Video Ingestion
+
+Frames flow through four stages connected by bounded queues:
+
+    decoder thread -> detection pool -> embedding pool -> batched writers
+
+1. **Decode**: a single thread pulls (frame, metadata) pairs from a lazy frame iterator
+2. **Detect**: a pool of threads expands batches of frames into the full frames plus object crops
+3. **Embed**: a pool of threads groups images into batches and generates embeddings
+4. **Store**: writer threads accumulate embeddings and persist them in bulk
+
+Decoding, inference and vector DB I/O overlap, and because every queue is bounded the
+number of frames held in memory does not depend on the length of the video. A slow
+stage back-pressures the stages before it instead of letting work pile up. Every stage
+records its own item counts, busy time and throughput.
+"""
+
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from src.common import logger
+from src.core.embedding.vdms_bulk_writer import VDMSPartialWriteError
+
+# Marker passed down a queue when the upstream stage has no more items
+_END_OF_STREAM = object()
+
+# Seconds a blocked queue operation waits before re-checking for a pipeline abort
+_QUEUE_POLL_INTERVAL = 0.1
+
+FrameItem = Tuple[Any, Dict[str, Any]]
+DetectFn = Callable[[List[FrameItem]], List[FrameItem]]
+# Embeddings are float lists or 1-D float32 arrays; the pipeline passes them through untouched
+EmbedFn = Callable[[List[Any]], List[Optional[Any]]]
+StoreFn = Callable[[List[Any], List[Dict[str, Any]]], List[str]]
+ProgressFn = Callable[[Dict[str, Dict[str, float]]], None]
+
+
+class _PipelineAborted(Exception):
+    """Raised inside stage threads once another stage has failed."""
+
+
+@dataclass
+class StageStats:
+    """Throughput counters for one pipeline stage."""
+
+    name: str
+    workers: int = 1
+    items_in: int = 0
+    items_out: int = 0
+    failed_items: int = 0
+    calls: int = 0
+    busy_time: float = 0.0
+    max_call_time: float = 0.0
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def start(self) -> None:
+        with self._lock:
+            if self.started_at is None:
+                self.started_at = time.time()
+
+    def finish(self) -> None:
+        with self._lock:
+            self.finished_at = time.time()
+
+    def record(self, items_in: int, items_out: int, elapsed: float, failed: int = 0) -> None:
+        """Record one unit of work done by a worker of this stage."""
+        with self._lock:
+            self.items_in += items_in
+            self.items_out += items_out
+            self.failed_items += failed
+            self.calls += 1
+            self.busy_time += elapsed
+            self.max_call_time = max(self.max_call_time, elapsed)
+
+    @property
+    def wall_time(self) -> float:
+        if self.started_at is None:
+            return 0.0
+        return (self.finished_at or time.time()) - self.started_at
+
+    def summary(self) -> Dict[str, float]:
+        """Return the stage statistics as a plain dictionary for results and logs."""
+        wall_time = self.wall_time
+        return {
+            "workers": self.workers,
+            "items_in": self.items_in,
+            "items_out": self.items_out,
+            "failed_items": self.failed_items,
+            "calls": self.calls,
+            "busy_s": self.busy_time,
+            "avg_s": self.busy_time / self.calls if self.calls else 0.0,
+            "max_s": self.max_call_time,
+            "wall_s": wall_time,
+            "throughput_per_s": self.items_out / wall_time if wall_time else 0.0,
+            # Share of the stage's wall time its workers spent doing work rather than waiting
+            "utilization_pct": (self.busy_time / (wall_time * self.workers) * 100.0) if wall_time else 0.0,
+        }
+
+
+class StreamingIngestionPipeline:
+    """Run decode, detection, embedding and storage as concurrent stages with bounded queues."""
+
+    def __init__(
+        self,
+        detect_fn: DetectFn,
+        embed_fn: EmbedFn,
+        store_fn: StoreFn,
+        detection_workers: int = 1,
+        embedding_workers: int = 1,
+        storage_workers: int = 1,
+        detection_batch_size: int = 1,
+        embedding_batch_size: int = 32,
+        storage_batch_size: int = 200,
+        queue_size: int = 32,
+        progress_fn: Optional[ProgressFn] = None,
+    ) -> None:
+        """
+        Configure the pipeline stages.
+
+        Args:
+            detect_fn: Expands a batch of (frame, metadata) pairs into (image, metadata) items to embed
+            embed_fn: Generates an embedding (or None on failure) for every image of a batch
+            store_fn: Persists embeddings with their metadata and returns the stored IDs
+            detection_workers: Number of detection threads
+            embedding_workers: Number of embedding threads
+            storage_workers: Number of writer threads; store_fn must be thread-safe when above 1
+            detection_batch_size: Maximum number of frames passed to one detect_fn call
+            embedding_batch_size: Number of images embedded per call
+            storage_batch_size: Number of embeddings written per storage call
+            queue_size: Capacity of each queue between stages
+            progress_fn: Called with the current per-stage statistics after every stored batch
+        """
+        self.detect_fn = detect_fn
+        self.embed_fn = embed_fn
+        self.store_fn = store_fn
+        self.detection_workers = max(1, detection_workers)
+        self.embedding_workers = max(1, embedding_workers)
+        self.storage_workers = max(1, storage_workers)
+        self.detection_batch_size = max(1, detection_batch_size)
+        self.embedding_batch_size = max(1, embedding_batch_size)
+        self.storage_batch_size = max(1, storage_batch_size)
+        self.queue_size = max(1, queue_size)
+        self.progress_fn = progress_fn
+
+    def run(self, frames: Iterable[FrameItem]) -> Dict[str, Any]:
+        """
+        Push every frame through the pipeline and wait until all embeddings are stored.
+
+        Args:
+            frames: Lazy iterable of (frame, metadata) pairs; it is consumed by the decoder thread
+
+        Returns:
+            Dictionary with the stored IDs, item counts and per-stage statistics
+
+        Raises:
+            Exception: The first unexpected error raised by any stage
+        """
+        run = _PipelineRun(self)
+        return run.execute(frames)
+
+
+class _PipelineRun:
+    """State of a single pipeline execution."""
+
+    def __init__(self, pipeline: StreamingIngestionPipeline) -> None:
+        self.pipeline = pipeline
+        self.frame_queue: "queue.Queue[Any]" = queue.Queue(maxsize=pipeline.queue_size)
+        self.item_queue: "queue.Queue[Any]" = queue.Queue(maxsize=pipeline.queue_size)
+        self.write_queue: "queue.Queue[Any]" = queue.Queue(maxsize=pipeline.queue_size)
+        self.stats = {
+            "decode": StageStats("decode", workers=1),
+            "detection": StageStats("detection", workers=pipeline.detection_workers),
+            "embedding": StageStats("embedding", workers=pipeline.embedding_workers),
+            "storage": StageStats("storage", workers=pipeline.storage_workers),
+        }
+        self.stored_ids: List[str] = []
+        self._stored_ids_lock = threading.Lock()
+        self._abort = threading.Event()
+        self._error: Optional[BaseException] = None
+        self._error_lock = threading.Lock()
+        self._remaining = {
+            "detection": pipeline.detection_workers,
+            "embedding": pipeline.embedding_workers,
+            "storage": pipeline.storage_workers,
+        }
+        self._remaining_lock = threading.Lock()
+
+    def execute(self, frames: Iterable[FrameItem]) -> Dict[str, Any]:
+        start_time = time.time()
+        threads = [threading.Thread(target=self._guard, args=(self._decode, frames), name="ingest-decode", daemon=True)]
+        threads += [
+            threading.Thread(target=self._guard, args=(self._detect,), name=f"ingest-detect-{index}", daemon=True)
+            for index in range(self.pipeline.detection_workers)
+        ]
+        threads += [
+            threading.Thread(target=self._guard, args=(self._embed,), name=f"ingest-embed-{index}", daemon=True)
+            for index in range(self.pipeline.embedding_workers)
+        ]
+        threads += [
+            threading.Thread(target=self._guard, args=(self._store,), name=f"ingest-store-{index}", daemon=True)
+            for index in range(self.pipeline.storage_workers)
+        ]
+
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        if self._error is not None:
+            raise self._error
+
+        processing_time = time.time() - start_time
+        stage_stats = self._stage_summaries()
+        for name, summary in stage_stats.items():
+            logger.info(
+                "Stage %s: %d in -> %d out (%d failed), busy %.3fs over %.3fs wall with %d worker(s), "
+                "%.1f items/s, %.0f%% utilized",
+                name,
+                summary["items_in"],
+                summary["items_out"],
+                summary["failed_items"],
+                summary["busy_s"],
+                summary["wall_s"],
+                summary["workers"],
+                summary["throughput_per_s"],
+                summary["utilization_pct"],
+            )
+
+        return {
+            "stored_ids": self.stored_ids,
+            "total_embeddings": len(self.stored_ids),
+            "frames_decoded": self.stats["decode"].items_out,
+            "post_detection_items": self.stats["detection"].items_out,
+            "failed_items": sum(stats.failed_items for stats in self.stats.values()),
+            "processing_time": processing_time,
+            "stage_stats": stage_stats,
+        }
+
+    def _stage_summaries(self) -> Dict[str, Dict[str, float]]:
+        return {name: stats.summary() for name, stats in self.stats.items()}
+
+    # ------------------------------------------------------------------
+    # Queue helpers
+    # ------------------------------------------------------------------
+
+    def _guard(self, target: Callable[..., None], *args: Any) -> None:
+        """Run a stage function, turning unexpected errors into a pipeline abort."""
+        try:
+            target(*args)
+        except _PipelineAborted:
+            pass
+        except BaseException as exc:  # noqa: BLE001 - re-raised from run()
+            with self._error_lock:
+                if self._error is None:
+                    self._error = exc
+                    logger.error("Ingestion pipeline stage %s failed: %s", threading.current_thread().name, exc)
+            self._abort.set()
+
+    def _put(self, target_queue: "queue.Queue[Any]", item: Any) -> None:
+        while True:
+            if self._abort.is_set():
+                raise _PipelineAborted()
+            try:
+                target_queue.put(item, timeout=_QUEUE_POLL_INTERVAL)
+                return
+            except queue.Full:
+                continue
+
+    def _get(self, source_queue: "queue.Queue[Any]") -> Any:
+        while True:
+            if self._abort.is_set():
+                raise _PipelineAborted()
+            try:
+                return source_queue.get(timeout=_QUEUE_POLL_INTERVAL)
+            except queue.Empty:
+                continue
+
+    def _last_worker_done(self, stage: str) -> bool:
+        """Count a finished worker of a pool stage; True for the last one."""
+        with self._remaining_lock:
+            self._remaining[stage] -= 1
+            return self._remaining[stage] == 0
+
+    # ------------------------------------------------------------------
+    # Stages
+    # ------------------------------------------------------------------
+
+    def _decode(self, frames: Iterable[FrameItem]) -> None:
+        stats = self.stats["decode"]
+        stats.start()
+        iterator = iter(frames)
+        try:
+            while True:
+                decode_start = time.time()
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    break
+                stats.record(0, 1, time.time() - decode_start)
+                self._put(self.frame_queue, item)
+        finally:
+            close = getattr(iterator, "close", None)
+            if close is not None:
+                close()
+            stats.finish()
+
+        for _ in range(self.pipeline.detection_workers):
+            self._put(self.frame_queue, _END_OF_STREAM)
+
+    def _detect(self) -> None:
+        stats = self.stats["detection"]
+        stats.start()
+        end_of_stream = False
+        while not end_of_stream:
+            batch, end_of_stream = self._next_frame_batch()
+            if not batch:
+                continue
+            detect_start = time.time()
+            try:
+                results = self.pipeline.detect_fn(batch)
+            except Exception as exc:
+                logger.error(
+                    "Processing frames %s failed: %s",
+                    ", ".join(str(metadata.get("frame_id", "unknown")) for _, metadata in batch),
+                    exc,
+                )
+                stats.record(len(batch), 0, time.time() - detect_start, failed=len(batch))
+                continue
+            stats.record(len(batch), len(results), time.time() - detect_start)
+            for result in results:
+                self._put(self.item_queue, result)
+
+        if self._last_worker_done("detection"):
+            stats.finish()
+            for _ in range(self.pipeline.embedding_workers):
+                self._put(self.item_queue, _END_OF_STREAM)
+
+    def _next_frame_batch(self) -> Tuple[List[FrameItem], bool]:
+        """
+        Wait for one frame, then take whatever else is already queued up to the batch size.
+
+        Batches never wait for frames that have not been decoded yet, so a slow decoder
+        leads to smaller batches rather than idle detection workers.
+
+        Returns:
+            Tuple of (frames, whether the end of the stream was reached)
+        """
+        item = self._get(self.frame_queue)
+        if item is _END_OF_STREAM:
+            return [], True
+        batch = [item]
+        while len(batch) < self.pipeline.detection_batch_size:
+            try:
+                item = self.frame_queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is _END_OF_STREAM:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _embed(self) -> None:
+        stats = self.stats["embedding"]
+        stats.start()
+        batch: List[FrameItem] = []
+        while True:
+            item = self._get(self.item_queue)
+            if item is _END_OF_STREAM:
+                break
+            batch.append(item)
+            if len(batch) >= self.pipeline.embedding_batch_size:
+                self._embed_batch(batch, stats)
+                batch = []
+        if batch:
+            self._embed_batch(batch, stats)
+
+        if self._last_worker_done("embedding"):
+            stats.finish()
+            for _ in range(self.pipeline.storage_workers):
+                self._put(self.write_queue, _END_OF_STREAM)
+
+    def _embed_batch(self, batch: List[FrameItem], stats: StageStats) -> None:
+        images = [image for image, _ in batch]
+        embed_start = time.time()
+        try:
+            embeddings = self.pipeline.embed_fn(images)
+        except Exception as exc:
+            logger.error("Embedding generation failed for a batch of %d images: %s", len(batch), exc)
+            stats.record(len(batch), 0, time.time() - embed_start, failed=len(batch))
+            return
+
+        valid_embeddings = []
+        valid_metadatas = []
+        for (_, metadata), embedding in zip(batch, embeddings):
+            if embedding is not None:
+                valid_embeddings.append(embedding)
+                valid_metadatas.append(metadata)
+            else:
+                logger.warning("Failed to generate embedding for image %s", metadata.get("frame_id", "unknown"))
+        stats.record(
+            len(batch),
+            len(valid_embeddings),
+            time.time() - embed_start,
+            failed=len(batch) - len(valid_embeddings),
+        )
+        if valid_embeddings:
+            self._put(self.write_queue, (valid_embeddings, valid_metadatas))
+
+    def _store(self) -> None:
+        stats = self.stats["storage"]
+        stats.start()
+        pending_embeddings: List[Any] = []
+        pending_metadatas: List[Dict[str, Any]] = []
+        while True:
+            item = self._get(self.write_queue)
+            if item is _END_OF_STREAM:
+                break
+            embeddings, metadatas = item
+            pending_embeddings.extend(embeddings)
+            pending_metadatas.extend(metadatas)
+            if len(pending_embeddings) >= self.pipeline.storage_batch_size:
+                self._store_batch(pending_embeddings, pending_metadatas, stats)
+                pending_embeddings, pending_metadatas = [], []
+        if pending_embeddings:
+            self._store_batch(pending_embeddings, pending_metadatas, stats)
+
+        if self._last_worker_done("storage"):
+            stats.finish()
+
+    def _store_batch(self, embeddings: List[Any], metadatas: List[Dict[str, Any]], stats: StageStats) -> None:
+        store_start = time.time()
+        try:
+            ids = self.pipeline.store_fn(embeddings, metadatas)
+        except VDMSPartialWriteError as exc:
+            logger.error("Storing %d embeddings failed: %s", len(embeddings), exc)
+            stored = len(exc.stored_ids)
+            with self._stored_ids_lock:
+                self.stored_ids.extend(exc.stored_ids)
+            stats.record(len(embeddings), stored, time.time() - store_start, failed=len(embeddings) - stored)
+            return
+        except Exception as exc:
+            logger.error("Storing %d embeddings failed: %s", len(embeddings), exc)
+            stats.record(len(embeddings), 0, time.time() - store_start, failed=len(embeddings))
+            return
+        with self._stored_ids_lock:
+            self.stored_ids.extend(ids)
+            total_stored = len(self.stored_ids)
+        stats.record(len(embeddings), len(ids), time.time() - store_start)
+        logger.debug("Stored %d embeddings (%d total)", len(ids), total_stored)
+
+        if self.pipeline.progress_fn is not None:
+            try:
+                self.pipeline.progress_fn(self._stage_summaries())
+            except Exception as exc:
+                logger.warning("Reporting pipeline progress failed: %s", exc)
@@ -0,0 +1,298 @@
+# Copyright (C) 2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Bulk Writer for VDMS Descriptor Sets
+
+This module writes pre-computed embeddings straight to a VDMS descriptor set, bypassing
+the per-item conversions of the langchain-vdms `add_from` path:
+
+1. **Binary transport**: a batch of embeddings is sent as a single float32 blob taken
+   directly from a NumPy matrix, never as Python float lists
+2. **Adaptive batching**: the number of descriptors per `AddDescriptor` command grows
+   while VDMS answers within the target latency, shrinks when it gets slower and is
+   halved when VDMS runs out of journal space
+3. **Concurrent connections**: every writer thread borrows its own VDMS connection from a
+   small pool, so several batches can be in flight at once
+4. **Deferred property refresh**: property keys seen while writing are collected and
+   registered with the collection once per job instead of after every write
+
+Descriptors are written with the same properties (`langchain_id`, `content` and the
+metadata fields) as langchain-vdms, so they stay searchable through the vector store.
+"""
+
+import os
+import queue
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Sequence, Set
+
+import numpy as np
+from langchain_vdms.vectorstores import LANGCHAIN_ID_PROPERTY, TEXT_PROPERTY, VDMS_Client
+
+from src.common import logger
+
+# Substring of the VDMS error returned when a transaction does not fit in the journal
+_OUT_OF_JOURNAL_SPACE = "OutOfJournalSpace"
+
+# Seconds to wait for an idle connection before checking whether a new one may be opened
+_POOL_POLL_INTERVAL = 0.05
+
+
+def _new_ids(count: int) -> List[str]:
+    """Generate random UUID4 strings from one read of the system random source."""
+    random_bytes = os.urandom(16 * count)
+    return [str(uuid.UUID(bytes=random_bytes[i:i + 16], version=4)) for i in range(0, 16 * count, 16)]
+
+
+class VDMSWriteError(Exception):
+    """Raised when VDMS rejects a batch of descriptors."""
+
+
+class VDMSPartialWriteError(VDMSWriteError):
+    """Raised when a write fails after some of its batches were already stored."""
+
+    def __init__(self, message: str, stored_ids: List[str]) -> None:
+        """
+        Args:
+            message: Description of the failure
+            stored_ids: IDs of the descriptors stored before the failure, in input order
+        """
+        super().__init__(message)
+        self.stored_ids = stored_ids
+
+
+class _OutOfJournalSpace(VDMSWriteError):
+    """Raised when a batch is too large for the VDMS journal."""
+
+
+class AdaptiveBatchSizer:
+    """Choose how many descriptors go into one AddDescriptor command."""
+
+    def __init__(self, initial: int, minimum: int, maximum: int, target_latency: float) -> None:
+        """
+        Args:
+            initial: Batch size used for the first write
+            minimum: Smallest batch size ever used
+            maximum: Largest batch size ever used
+            target_latency: Seconds a single write should take
+        """
+        self.minimum = max(1, minimum)
+        self.maximum = max(self.minimum, maximum)
+        self.target_latency = target_latency
+        self._size = min(max(initial, self.minimum), self.maximum)
+        self._lock = threading.Lock()
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def record_write(self, count: int, latency: float) -> None:
+        """Grow after fast full-size writes and shrink after slow ones."""
+        with self._lock:
+            if latency > self.target_latency:
+                self._size = max(self.minimum, int(self._size * 0.7))
+            elif latency < self.target_latency / 2 and count >= self._size:
+                self._size = min(self.maximum, int(self._size * 1.5) + 1)
+
+    def record_out_of_journal_space(self) -> bool:
+        """Halve the batch size and never grow back to the failed size; False if already at the minimum."""
+        with self._lock:
+            if self._size <= self.minimum:
+                return False
+            self.maximum = max(self.minimum, self._size - 1)
+            self._size = max(self.minimum, self._size // 2)
+            logger.info("VDMS journal space exhausted; lowering write batch size to %d", self._size)
+            return True
+
+
+class VDMSBulkWriter:
+    """Write embeddings to a VDMS descriptor set over a pool of connections."""
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        collection_name: str,
+        dimensions: int,
+        connections: int = 2,
+        batch_size: int = 200,
+        min_batch_size: int = 16,
+        max_batch_size: int = 2000,
+        target_latency: float = 0.5,
+        client_factory: Callable[[str, int], Any] = VDMS_Client,
+    ) -> None:
+        """
+        Args:
+            host: VDMS host
+            port: VDMS port
+            collection_name: Descriptor set the embeddings are added to
+            dimensions: Embedding dimensions of the descriptor set
+            connections: Maximum number of VDMS connections used concurrently
+            batch_size: Initial number of descriptors per AddDescriptor command
+            min_batch_size: Lower bound for the adaptive batch size
+            max_batch_size: Upper bound for the adaptive batch size
+            target_latency: Seconds a single write should take
+            client_factory: Creates a connected VDMS client from (host, port)
+        """
+        self.host = host
+        self.port = int(port)
+        self.collection_name = collection_name
+        self.dimensions = dimensions
+        self.max_connections = max(1, connections)
+        self.sizer = AdaptiveBatchSizer(batch_size, min_batch_size, max_batch_size, target_latency)
+        self._client_factory = client_factory
+
+        self._idle_clients: "queue.Queue[Any]" = queue.Queue()
+        self._open_connections = 0
+        self._pool_lock = threading.Lock()
+
+        self._property_keys: Set[str] = set()
+        self._property_lock = threading.Lock()
+
+    def write(
+        self,
+        embeddings: Any,
+        texts: Sequence[str],
+        metadatas: Sequence[Dict[str, Any]],
+    ) -> List[str]:
+        """
+        Add embeddings with their texts and metadata to the descriptor set.
+
+        Args:
+            embeddings: (N, D) array, or a sequence of N vectors (lists or arrays)
+            texts: Text stored in the `content` property of each descriptor
+            metadatas: VDMS-compatible properties of each descriptor
+
+        Returns:
+            Generated IDs of the stored descriptors, in input order
+
+        Raises:
+            ValueError: If the inputs have mismatching sizes or dimensions
+            VDMSPartialWriteError: If VDMS rejects a batch after earlier batches were stored;
+                the leading inputs were stored under its `stored_ids`
+            VDMSWriteError: If VDMS rejects the first batch
+        """
+        vectors = np.ascontiguousarray(embeddings, dtype=np.float32)
+        if vectors.ndim != 2 or vectors.shape[0] != len(texts) or vectors.shape[0] != len(metadatas):
+            raise ValueError(
+                f"Expected {len(texts)} embeddings of {self.dimensions} dimensions, got array of shape {vectors.shape}"
+            )
+        if vectors.shape[1] != self.dimensions:
+            raise ValueError(f"Embedding dimensions {vectors.shape[1]} do not match collection ({self.dimensions})")
+
+        ids = _new_ids(len(vectors))
+        properties = []
+        for descriptor_id, text, metadata in zip(ids, texts, metadatas):
+            props = {LANGCHAIN_ID_PROPERTY: descriptor_id, **metadata}
+            if text:
+                props[TEXT_PROPERTY] = text
+            properties.append(props)
+
+        start = 0
+        try:
+            while start < len(vectors):
+                end = min(start + self.sizer.size, len(vectors))
+                try:
+                    self._add_descriptors(vectors[start:end], properties[start:end])
+                except _OutOfJournalSpace:
+                    if end - start > 1 and self.sizer.record_out_of_journal_space():
+                        continue
+                    raise
+                start = end
+        except Exception as exc:
+            if start == 0:
+                raise
+            # Batches are separate commands, so the earlier ones stay stored
+            raise VDMSPartialWriteError(
+                f"Stored {start} of {len(vectors)} descriptors before failing: {exc}", ids[:start]
+            ) from exc
+        finally:
+            with self._property_lock:
+                for props in properties[:start]:
+                    self._property_keys.update(props)
+        return ids
+
+    def take_property_keys(self) -> Set[str]:
+        """Return the property keys written since the last call and reset them."""
+        with self._property_lock:
+            keys, self._property_keys = self._property_keys, set()
+        return keys
+
+    def close(self) -> None:
+        """Disconnect all idle connections."""
+        while True:
+            try:
+                client = self._idle_clients.get_nowait()
+            except queue.Empty:
+                break
+            self._disconnect(client)
+
+    def _add_descriptors(self, vectors: np.ndarray, properties: List[Dict[str, Any]]) -> None:
+        entity: Dict[str, Any] = {"set": self.collection_name}
+        if len(properties) > 1:
+            entity["batch_properties"] = properties
+        else:
+            entity["properties"] = properties[0]
+
+        write_start = time.time()
+        with self._connection() as client:
+            result = client.query([{"AddDescriptor": entity}], [vectors.tobytes()])
+        latency = time.time() - write_start
+
+        if not isinstance(result, tuple):
+            raise VDMSWriteError(f"VDMS connection failed: {result}")
+        response = result[0]
+        status = response[0].get("AddDescriptor", {}).get("status") if response else None
+        if status == 0:
+            self.sizer.record_write(len(properties), latency)
+            logger.debug("Wrote %d descriptors in %.3fs", len(properties), latency)
+            return
+
+        info = response[0].get("info", "") if response else ""
+        if _OUT_OF_JOURNAL_SPACE in str(info) or _OUT_OF_JOURNAL_SPACE in str(response):
+            raise _OutOfJournalSpace(info)
+        raise VDMSWriteError(f"VDMS AddDescriptor failed for {len(properties)} descriptors: {response}")
+
+    @contextmanager
+    def _connection(self) -> Iterator[Any]:
+        """Borrow a connection, opening a new one while below the pool size."""
+        client = self._acquire()
+        try:
+            yield client
+        except Exception:
+            # The connection may be left mid-message; never hand it out again
+            self._disconnect(client)
+            with self._pool_lock:
+                self._open_connections -= 1
+            raise
+        self._idle_clients.put(client)
+
+    def _acquire(self) -> Any:
+        while True:
+            try:
+                return self._idle_clients.get(timeout=_POOL_POLL_INTERVAL)
+            except queue.Empty:
+                pass
+            with self._pool_lock:
+                if self._open_connections < self.max_connections:
+                    self._open_connections += 1
+                    break
+
+        try:
+            client = self._client_factory(host=self.host, port=self.port)
+        except Exception:
+            with self._pool_lock:
+                self._open_connections -= 1
+            raise
+        logger.debug("Opened VDMS writer connection %d/%d", self._open_connections, self.max_connections)
+        return client
+
+    @staticmethod
+    def _disconnect(client: Any) -> None:
+        try:
+            client.disconnect()
+        except Exception:
+            pass
@@ -5,9 +5,10 @@
 import os
 import logging
 import tarfile
+import threading
 import urllib.request
 import urllib.error
-from typing import List, Optional, Tuple, Union
+from typing import List, Optional, Sequence, Tuple, Union
 
 import cv2
 import numpy as np
@@ -15,7 +16,7 @@ from PIL import Image
 
 # Import VDMS local modules
 from ..utils.config_utils import get_config
-from .yolox_utils import preproc, multiclass_nms, demo_postprocess
+from .yolox_utils import preproc_batch, multiclass_nms_batch, demo_postprocess, decode_boxes, clip_boxes
 from .default_class_names import DEFAULT_COCO_CLASS_NAMES
 
 logger = logging.getLogger(__name__)
@@ -27,6 +28,8 @@ except ImportError:
     OPENVINO_AVAILABLE = False
     logger.warning("OpenVINO not available. Object detection will be disabled.")
 
+Detections = Tuple[List[np.ndarray], List[float], List[int]]
+
 class YOLOXDetector:
     """
     YOLOX object detector using OpenVINO inference.
@@ -57,6 +60,8 @@ class YOLOXDetector:
         self.confidence_threshold = self.detection_config.get('confidence_threshold', 0.5)
         self.nms_threshold = self.detection_config.get('nms_threshold', 0.45)
         self.input_size = tuple(self.detection_config.get('input_size', [640, 640]))
+        # Maximum number of frames stacked into one inference request
+        self.batch_size = max(1, int(self.detection_config.get('batch_size', 8)))
         
         # Model configuration - use persistent mount path
         self.model_dir = self.detection_config.get('model_dir', '/app/models/yolox')
@@ -107,20 +112,50 @@ class YOLOXDetector:
             # Initialize OpenVINO
             self.core = ov.Core()
             self.net = self.core.read_model(model=self.model_file)
-            self.exec_net = self.core.compile_model(self.net, self.device)
+            _, channels, self.h, self.w = self.net.inputs[0].shape
+            self.exec_net = self._compile_batched_model(channels)
             
             # Get input/output information
             self.input_tensor = self.exec_net.inputs[0]
             self.output_tensor = self.exec_net.outputs[0]
             
-            _, _, self.h, self.w = self.input_tensor.shape
+            # One in-flight request per stream the device can run in parallel
+            self.infer_queue = ov.AsyncInferQueue(self.exec_net)
+            self.infer_queue.set_callback(self._on_inference_done)
+            self._submit_lock = threading.Lock()
             
-            logger.info(f"Model loaded successfully: input_shape=({self.h}, {self.w})")
+            logger.info(
+                f"Model loaded successfully: input_shape=({self.h}, {self.w}), "
+                f"batch_size={self.batch_size}, infer_requests={len(self.infer_queue)}"
+            )
             
         except Exception as e:
             logger.error(f"Failed to initialize OpenVINO: {e}")
             raise
     
+    def _compile_batched_model(self, channels: int):
+        """
+        Compile the model with a batch dimension of up to ``batch_size`` frames.
+
+        The YOLOX IR ships with a static batch of 1. The batch dimension is reshaped to a
+        bounded dynamic range so partial batches need no padding; devices that cannot
+        compile the reshaped model fall back to one frame per inference request.
+        """
+        compile_config = {"PERFORMANCE_HINT": "THROUGHPUT"}
+        if self.batch_size > 1:
+            try:
+                self.net.reshape(
+                    {self.net.inputs[0]: ov.PartialShape([ov.Dimension(1, self.batch_size), channels, self.h, self.w])}
+                )
+                return self.core.compile_model(self.net, self.device, compile_config)
+            except Exception as e:
+                logger.warning(
+                    f"Batched detection is not supported on {self.device} ({e}); running one frame per inference"
+                )
+                self.batch_size = 1
+                self.net = self.core.read_model(model=self.model_file)
+        return self.core.compile_model(self.net, self.device, compile_config)
+    
     def _ensure_model_available(self):
         """Download YOLOX model if not available using pure Python methods."""
         if os.path.exists(self.model_file):
@@ -192,7 +227,7 @@ class YOLOXDetector:
             logger.error(f"Failed to download model: {e}")
             raise
     
-    def detect_objects(self, image: Union[np.ndarray, Image.Image]) -> Tuple[List[np.ndarray], List[float], List[int]]:
+    def detect_objects(self, image: Union[np.ndarray, Image.Image]) -> Detections:
         """
         Detect objects in an image.
         
@@ -202,52 +237,81 @@ class YOLOXDetector:
         Returns:
             Tuple of (bounding_boxes, confidence_scores, class_indices)
         """
-        # Convert PIL Image to numpy array if needed
-        if isinstance(image, Image.Image):
-            image = cv2.cvtColor(np.array(image), cv2.COLOR_RGB2BGR)
-        
-        # Preprocess image
-        processed_image, ratio = preproc(image, (self.h, self.w))
+        return self.detect_objects_batch([image])[0]
+
+    def detect_objects_batch(self, images: Sequence[Union[np.ndarray, Image.Image]]) -> List[Detections]:
+        """
+        Detect objects in a batch of images.
+
+        Images are letterboxed into N x 3 x H x W tensors of up to ``batch_size`` frames,
+        which are inferred concurrently through the asynchronous request queue. Box
+        decoding and score thresholding run over the whole batch at once.
+
+        Args:
+            images: Input images (numpy arrays or PIL Images), any mix of sizes
+
+        Returns:
+            One (bounding_boxes, confidence_scores, class_indices) tuple per image
+        """
+        if not images:
+            return []
+
+        frames = [
+            cv2.cvtColor(np.array(image), cv2.COLOR_RGB2BGR) if isinstance(image, Image.Image) else image
+            for image in images
+        ]
         
-        # Run inference
         try:
-            result = self.exec_net.infer_new_request({self.input_tensor: processed_image})
-            output = result[self.output_tensor]
+            batch, ratios = preproc_batch(frames, (self.h, self.w))
+            output = self._infer_batch(batch)
             
             # Post-process results
-            predictions = demo_postprocess(output, (self.h, self.w))[0]
-            
-            boxes = predictions[:, :4]
-            scores = predictions[:, 4, None] * predictions[:, 5:]
-            
-            # Convert center format to corner format
-            boxes_xyxy = np.ones_like(boxes)
-            boxes_xyxy[:, 0] = boxes[:, 0] - boxes[:, 2] / 2.0
-            boxes_xyxy[:, 1] = boxes[:, 1] - boxes[:, 3] / 2.0
-            boxes_xyxy[:, 2] = boxes[:, 0] + boxes[:, 2] / 2.0
-            boxes_xyxy[:, 3] = boxes[:, 1] + boxes[:, 3] / 2.0
-            boxes_xyxy /= ratio
+            predictions = demo_postprocess(output, (self.h, self.w))
+            boxes_xyxy, scores = decode_boxes(predictions, ratios)
             
             # Apply NMS
-            dets = multiclass_nms(
-                boxes_xyxy, 
-                scores, 
-                nms_thr=self.nms_threshold, 
+            dets_per_image = multiclass_nms_batch(
+                boxes_xyxy,
+                scores,
+                nms_thr=self.nms_threshold,
                 score_thr=self.confidence_threshold
             )
             
-            final_boxes, final_scores, final_cls_inds = [], [], []
-            if dets is not None:
-                # Convert bounding boxes to integers for compatibility with embedding service
-                final_boxes = np.round(dets[:, :4]).astype(int)
-                final_scores = dets[:, 4]
-                final_cls_inds = dets[:, 5].astype(int)
-            
-            return final_boxes, final_scores, final_cls_inds
-            
         except Exception as e:
-            logger.error(f"Detection failed: {e}")
-            return [], [], []
+            logger.error(f"Detection failed for a batch of {len(frames)} images: {e}")
+            return [([], [], []) for _ in frames]
+
+        results = []
+        for dets in dets_per_image:
+            if dets is None:
+                results.append(([], [], []))
+                continue
+            # Convert bounding boxes to integers for compatibility with embedding service
+            results.append((np.round(dets[:, :4]).astype(int), dets[:, 4], dets[:, 5].astype(int)))
+        return results
+
+    def _infer_batch(self, batch: np.ndarray) -> np.ndarray:
+        """Run a preprocessed batch through the request queue, ``batch_size`` frames per request."""
+        chunks = [batch[start:start + self.batch_size] for start in range(0, len(batch), self.batch_size)]
+        outputs: List[Optional[np.ndarray]] = [None] * len(chunks)
+        completed = threading.Semaphore(0)
+
+        with self._submit_lock:
+            for index, chunk in enumerate(chunks):
+                self.infer_queue.start_async({self.input_tensor: chunk}, (outputs, index, completed))
+
+        for _ in chunks:
+            completed.acquire()
+        return np.concatenate(outputs, axis=0)
+
+    @staticmethod
+    def _on_inference_done(request, userdata) -> None:
+        """Copy the output of a finished request before the queue reuses it."""
+        outputs, index, completed = userdata
+        try:
+            outputs[index] = request.get_output_tensor(0).data.copy()
+        finally:
+            completed.release()
 
     def detect(
         self,
@@ -287,7 +351,7 @@ class YOLOXDetector:
                     "bbox": box.tolist() if hasattr(box, "tolist") else list(map(int, box)),
                     "confidence": float(score),
                     "class_id": int(class_id),
-                    "class_name": self._get_class_name(int(class_id)),
+                    "class_name": self.get_class_name(int(class_id)),
                     "area": float((box[2] - box[0]) * (box[3] - box[1])),
                 }
             )
@@ -314,22 +378,11 @@ class YOLOXDetector:
             image_np = image
         
         # Detect objects
-        boxes, scores, class_ids = self.detect_objects(image_np)
+        boxes, _, _ = self.detect_objects(image_np)
         
         crops = []
-        for box, score, class_id in zip(boxes, scores, class_ids):
-            x1, y1, x2, y2 = map(int, box)
-            
-            # Ensure bounds are within image
-            x1 = max(0, x1)
-            y1 = max(0, y1)
-            x2 = min(image_np.shape[1], x2)
-            y2 = min(image_np.shape[0], y2)
-            
-            # Skip invalid boxes
-            if x1 >= x2 or y1 >= y2:
-                continue
-            
+        clipped_boxes, _ = clip_boxes(boxes, image_np.shape)
+        for x1, y1, x2, y2 in clipped_boxes:
             # Extract crop
             crop = image_np[y1:y2, x1:x2]
             
@@ -373,7 +426,7 @@ class YOLOXDetector:
         )
         return None
 
-    def _get_class_name(self, class_id: int) -> str:
+    def get_class_name(self, class_id: int) -> str:
         """Map a class index to a human-readable label."""
         if self.class_names and 0 <= class_id < len(self.class_names):
             return self.class_names[class_id]
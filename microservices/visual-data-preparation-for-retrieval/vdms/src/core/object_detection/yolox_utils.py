@@ -36,6 +36,30 @@ def preproc(img, input_size, swap=(2, 0, 1)):
 
     return padded_img, r
 
+def preproc_batch(images, input_size, swap=(2, 0, 1)):
+    """
+    Letterbox a batch of images into a single YOLOX input tensor.
+
+    Args:
+        images: Sequence of input images (H, W, 3 numpy arrays, any size)
+        input_size: Target input size (height, width)
+        swap: Channel swap configuration
+
+    Returns:
+        Tuple of (N x 3 x H x W float32 batch, array of per-image scale ratios)
+    """
+    batch = np.full((len(images), 3, input_size[0], input_size[1]), 114, dtype=np.float32)
+    ratios = np.empty(len(images), dtype=np.float32)
+
+    for index, img in enumerate(images):
+        r = min(input_size[0] / img.shape[0], input_size[1] / img.shape[1])
+        resized_h, resized_w = int(img.shape[0] * r), int(img.shape[1] * r)
+        resized_img = cv2.resize(img, (resized_w, resized_h), interpolation=cv2.INTER_LINEAR)
+        batch[index, :, :resized_h, :resized_w] = resized_img.transpose(swap)
+        ratios[index] = r
+
+    return batch, ratios
+
 def nms(boxes, scores, nms_thr):
     """Single class NMS implemented in Numpy."""
     x1 = boxes[:, 0]
@@ -118,6 +142,45 @@ def multiclass_nms_class_agnostic(boxes, scores, nms_thr, score_thr):
     return dets
 
 
+def multiclass_nms_batch(boxes, scores, nms_thr, score_thr):
+    """
+    Class-agnostic multiclass NMS over a batch of images.
+
+    Class selection and score thresholding run over the whole batch at once, so NMS
+    only has to visit the few candidate boxes left in each image.
+
+    Args:
+        boxes: (N, A, 4) boxes in corner format
+        scores: (N, A, C) per-class scores
+        nms_thr: IoU threshold for suppression
+        score_thr: Minimum class score
+
+    Returns:
+        List with one (K, 6) array of [x1, y1, x2, y2, score, class] per image, or None
+        for images without detections
+    """
+    cls_inds = scores.argmax(-1)
+    cls_scores = np.take_along_axis(scores, cls_inds[..., None], axis=-1)[..., 0]
+    valid_mask = cls_scores > score_thr
+
+    results = []
+    for index in range(boxes.shape[0]):
+        valid = valid_mask[index]
+        if not valid.any():
+            results.append(None)
+            continue
+        valid_boxes = boxes[index][valid]
+        valid_scores = cls_scores[index][valid]
+        valid_cls_inds = cls_inds[index][valid]
+        keep = nms(valid_boxes, valid_scores, nms_thr)
+        results.append(
+            np.concatenate(
+                [valid_boxes[keep], valid_scores[keep, None], valid_cls_inds[keep, None]], 1
+            )
+        )
+    return results
+
+
 def demo_postprocess(outputs, img_size, p6=False):
     """
     YOLOX postprocessing to decode outputs.
@@ -150,3 +213,47 @@ def demo_postprocess(outputs, img_size, p6=False):
     outputs[..., 2:4] = np.exp(outputs[..., 2:4]) * expanded_strides
 
     return outputs
+
+
+def decode_boxes(predictions, ratios):
+    """
+    Split decoded YOLOX predictions into corner boxes and class scores.
+
+    Args:
+        predictions: (N, A, 5 + C) output of demo_postprocess
+        ratios: Per-image scale ratios returned by preproc_batch
+
+    Returns:
+        Tuple of ((N, A, 4) boxes in source image coordinates, (N, A, C) class scores)
+    """
+    centers = predictions[..., :2]
+    half_sizes = predictions[..., 2:4] / 2.0
+    boxes_xyxy = np.concatenate([centers - half_sizes, centers + half_sizes], axis=-1)
+    boxes_xyxy /= np.asarray(ratios, dtype=boxes_xyxy.dtype).reshape(-1, 1, 1)
+
+    scores = predictions[..., 4:5] * predictions[..., 5:]
+    return boxes_xyxy, scores
+
+
+def clip_boxes(boxes, image_shape, min_size=1):
+    """
+    Clip integer corner boxes to an image and drop boxes that end up too small.
+
+    Args:
+        boxes: (K, 4) boxes as [x1, y1, x2, y2]
+        image_shape: Shape of the image the boxes belong to (H, W[, C])
+        min_size: Minimum width and height of a kept box in pixels
+
+    Returns:
+        Tuple of ((M, 4) clipped int boxes, indices of the kept boxes in ``boxes``)
+    """
+    boxes = np.asarray(boxes, dtype=int).reshape(-1, 4)
+    height, width = image_shape[:2]
+
+    clipped = boxes.copy()
+    clipped[:, 0::2] = np.clip(boxes[:, 0::2], 0, width)
+    clipped[:, 1::2] = np.clip(boxes[:, 1::2], 0, height)
+
+    sizes = clipped[:, 2:] - clipped[:, :2]
+    keep = np.flatnonzero((sizes >= min_size).all(axis=1))
+    return clipped[keep], keep
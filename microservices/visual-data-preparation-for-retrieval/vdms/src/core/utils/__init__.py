@@ -9,6 +9,7 @@ All utilities support both SDK mode (direct integration) and API mode (HTTP-base
 
 Sub-modules:
 - video_utils: Video processing and frame extraction utilities
+- frame_sampler: Sequential in-memory frame sampling for SDK mode ingestion
 - config_utils: Configuration loading and validation utilities
 - file_utils: File operations and temporary directory management
 - metadata_utils: Metadata generation and storage utilities  
@@ -42,6 +43,9 @@ from .config_utils import (
 
 # Common utilities  
 from .common_utils import (
+    TAG_PROPERTY_PREFIX,
+    tag_properties,
+    notify_index_updated,
     sanitize_input,
     get_minio_client,
     create_detector_instance
@@ -86,6 +90,9 @@ __all__ = [
     'clear_config_cache',
     
     # Common functions
+    'TAG_PROPERTY_PREFIX',
+    'tag_properties',
+    'notify_index_updated',
     'sanitize_input',
     'get_minio_client',
     'create_detector_instance',
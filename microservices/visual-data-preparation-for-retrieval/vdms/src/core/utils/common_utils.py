@@ -8,7 +8,10 @@ the VDMS DataPrep microservice.
 """
 
 import logging
+import threading
 from typing import NamedTuple, Optional, Tuple
+
+import requests
 from minio import Minio
 
 from src.common import DataPrepException, Strings, logger, settings
@@ -31,6 +34,47 @@ class FrameInfo(NamedTuple):
     detected_label: Optional[str] = None
 
 
+# Prefix of the per-tag properties stored with every frame. VDMS constraints compare whole
+# property values, so a tag inside the comma-separated "tags" string cannot be matched;
+# an indicator property per tag lets searches filter on tags with an equality constraint.
+TAG_PROPERTY_PREFIX = "tag_"
+
+
+def tag_properties(tags) -> dict:
+    """Build the indicator properties for the given tags.
+
+    Args:
+        tags: List of tags or comma-separated tags string
+
+    Returns:
+        Dictionary mapping the property of every tag to 1
+    """
+    if not tags:
+        return {}
+    if isinstance(tags, str):
+        tags = tags.split(",")
+    return {f"{TAG_PROPERTY_PREFIX}{tag.strip()}": 1 for tag in tags if str(tag).strip()}
+
+
+def notify_index_updated() -> None:
+    """Tell the search service that embeddings were added, without waiting for its answer.
+
+    Does nothing unless SEARCH_INDEX_NOTIFY_URL is set. Failures are logged and otherwise
+    ignored, since ingestion succeeded regardless.
+    """
+    url = settings.SEARCH_INDEX_NOTIFY_URL
+    if not url:
+        return
+
+    def _post():
+        try:
+            requests.post(url, timeout=5).raise_for_status()
+        except requests.RequestException as ex:
+            logger.warning(f"Could not notify search index update at {url}: {ex}")
+
+    threading.Thread(target=_post, name="index-notify", daemon=True).start()
+
+
 def sanitize_input(input: str) -> str | None:
     """Takes an string input and strips whitespaces. Returns None if
     string is empty else returns the string.
@@ -143,6 +143,7 @@ def get_config() -> dict:
             "confidence_threshold": processing_config["detection_confidence"],
             "nms_threshold": _get_config_value("NMS_THRESHOLD", ["object_detection", "nms_threshold"]) or 0.45,
             "input_size": _get_config_value("DETECTION_INPUT_SIZE", ["object_detection", "input_size"]) or [640, 640],
+            "batch_size": _get_config_value("DETECTION_BATCH_SIZE", ["object_detection", "batch_size"]) or 8,
             "model_dir": settings.DETECTION_MODEL_DIR,  # Environment variable takes highest priority
             "model_name": _get_config_value("DETECTION_MODEL_NAME", ["object_detection", "model_name"])  # No default - must be explicitly set
         }
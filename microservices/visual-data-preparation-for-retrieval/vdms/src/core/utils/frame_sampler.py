@@ -0,0 +1,192 @@
+# Copyright (C) 2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Frame Sampler Module
+
+This module provides interval-based frame sampling for SDK mode video ingestion.
+
+Frames are decoded directly from the in-memory video bytes (no temporary file) and
+in batches with decord's `get_batch`, which walks the stream sequentially and only
+seeks when the next sampled frame lies beyond the next keyframe. Random `vr[idx]`
+access instead seeks back to a keyframe for every sampled frame, which dominates
+ingestion time on long-GOP H.264. Frames can be downscaled by the decoder itself to
+the resolution the downstream models actually consume.
+
+Classes:
+- VideoFrameSampler: Iterate (frame_index, frame) pairs sampled at a fixed interval
+
+Functions:
+- compute_decode_size(): Choose the decode resolution for the downstream models
+
+Usage:
+    from src.core.utils.frame_sampler import VideoFrameSampler
+
+    sampler = VideoFrameSampler(video_content, frame_interval=15, min_side=224)
+    for frame_index, frame in sampler:
+        ...
+"""
+
+import io
+from typing import AbstractSet, Any, Iterator, List, Optional, Sequence, Tuple
+
+import decord
+import numpy as np
+
+from src.common import logger
+
+# Number of sampled frames decoded per get_batch call
+DEFAULT_DECODE_BATCH_SIZE = 16
+
+
+def compute_decode_size(
+    width: int,
+    height: int,
+    min_side: Optional[int] = None,
+    max_side: Optional[int] = None,
+) -> Tuple[int, int]:
+    """
+    Compute the resolution frames should be decoded at.
+
+    `min_side` keeps the shorter side at least that large (what an embedding model
+    resizing the shorter side needs) and `max_side` lets the longer side shrink to that
+    size (what a letterboxing detector needs). When both are given the larger of the two
+    resolutions is used, so neither consumer loses detail. Frames are never upscaled and
+    dimensions are rounded to even values, as required by most video scalers.
+
+    Args:
+        width: Source frame width
+        height: Source frame height
+        min_side: Minimum size of the shorter side
+        max_side: Target size of the longer side
+
+    Returns:
+        (width, height) to decode at; the source size if no downscaling applies
+    """
+    scales = []
+    if min_side:
+        scales.append(min_side / min(width, height))
+    if max_side:
+        scales.append(max_side / max(width, height))
+    if not scales:
+        return width, height
+
+    scale = max(scales)
+    if scale >= 1.0:
+        return width, height
+
+    def _even(value: float) -> int:
+        return max(2, int(round(value / 2.0)) * 2)
+
+    return _even(width * scale), _even(height * scale)
+
+
+class VideoFrameSampler:
+    """Decode every `frame_interval`-th frame of an in-memory video in sequential batches."""
+
+    def __init__(
+        self,
+        video_content: bytes,
+        frame_interval: int,
+        min_side: Optional[int] = None,
+        max_side: Optional[int] = None,
+        batch_size: int = DEFAULT_DECODE_BATCH_SIZE,
+        ctx: Optional[Any] = None,
+        skip_frames: Optional[AbstractSet[int]] = None,
+    ) -> None:
+        """
+        Open the video and choose the decode resolution.
+
+        Args:
+            video_content: Encoded video bytes
+            frame_interval: Number of frames between sampled frames
+            min_side: Minimum size of the shorter side after downscaling (see compute_decode_size)
+            max_side: Target size of the longer side after downscaling (see compute_decode_size)
+            batch_size: Number of sampled frames decoded per batch
+            ctx: decord context (defaults to CPU)
+            skip_frames: Sampled frame indices that are not decoded (e.g. already ingested)
+        """
+        self._video_content = video_content
+        self._ctx = ctx if ctx is not None else decord.cpu(0)
+        self.frame_interval = max(1, int(frame_interval))
+        self.batch_size = max(1, int(batch_size))
+        self.skip_frames = frozenset(skip_frames or ())
+
+        reader = decord.VideoReader(io.BytesIO(video_content), ctx=self._ctx)
+        self.fps: float = reader.get_avg_fps()
+        self.total_frames: int = len(reader)
+        self.source_height, self.source_width = reader[0].shape[:2] if self.total_frames else (0, 0)
+
+        if self.total_frames:
+            self.width, self.height = compute_decode_size(self.source_width, self.source_height, min_side, max_side)
+        else:
+            self.width, self.height = self.source_width, self.source_height
+
+        if (self.width, self.height) != (self.source_width, self.source_height):
+            # Let the decoder scale frames so full-resolution frames are never materialized
+            reader = decord.VideoReader(
+                io.BytesIO(video_content), ctx=self._ctx, width=self.width, height=self.height
+            )
+            logger.info(
+                "Decoding frames at %dx%d (source %dx%d)",
+                self.width,
+                self.height,
+                self.source_width,
+                self.source_height,
+            )
+        else:
+            reader.seek(0)
+        self._reader = reader
+
+    @property
+    def scale(self) -> float:
+        """Ratio between the decoded and the source frame size."""
+        return self.width / self.source_width if self.source_width else 1.0
+
+    @property
+    def sampled_indices(self) -> range:
+        """Indices of all frames at the sampling interval, including skipped ones."""
+        return range(0, self.total_frames, self.frame_interval)
+
+    @property
+    def frame_indices(self) -> Sequence[int]:
+        """Indices of the sampled frames that are decoded."""
+        if not self.skip_frames:
+            return self.sampled_indices
+        return [index for index in self.sampled_indices if index not in self.skip_frames]
+
+    def __len__(self) -> int:
+        return len(self.frame_indices)
+
+    def __iter__(self) -> Iterator[Tuple[int, np.ndarray]]:
+        """
+        Yield (frame_index, frame) pairs in order.
+
+        Frames are uint8 RGB arrays of shape (H, W, 3) at the decode resolution. Only one
+        batch of decoded frames is held at a time.
+        """
+        indices = self.frame_indices
+        for start in range(0, len(indices), self.batch_size):
+            batch_indices = list(indices[start:start + self.batch_size])
+            try:
+                frames = self._reader.get_batch(batch_indices).asnumpy()
+            except Exception as e:
+                logger.warning(
+                    "Batch decode of frames %d-%d failed (%s); decoding them one by one",
+                    batch_indices[0],
+                    batch_indices[-1],
+                    e,
+                )
+                yield from self._decode_individually(batch_indices)
+                continue
+
+            for frame_index, frame in zip(batch_indices, frames):
+                yield frame_index, frame
+
+    def _decode_individually(self, frame_indices: List[int]) -> Iterator[Tuple[int, np.ndarray]]:
+        """Decode frames one at a time, skipping frames that cannot be decoded."""
+        for frame_index in frame_indices:
+            try:
+                yield frame_index, self._reader[frame_index].asnumpy()
+            except Exception as e:
+                logger.error(f"Error extracting frame {frame_index}: {e}")
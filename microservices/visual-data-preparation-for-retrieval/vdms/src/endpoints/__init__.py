@@ -5,6 +5,7 @@ from .document_processing import process_document_router
 from .health import check_health_router
 from .video_management import delete_video_router, download_video_router, list_videos_router
 from .video_processing import (
+    ingestion_jobs_router,
     process_minio_video_router,
     upload_and_process_video_router,
 )
@@ -14,6 +15,7 @@ __all__ = [
     "process_document_router",
     "process_minio_video_router",
     "upload_and_process_video_router",
+    "ingestion_jobs_router",
     "list_videos_router",
     "download_video_router",
     "delete_video_router",
@@ -8,12 +8,23 @@ from fastapi import APIRouter, HTTPException, Path, Query
 
 from src.common import DataPrepException, Strings, logger
 from src.common.schema import DataPrepResponse
+from src.core.embedding.ingestion_jobs import get_job_store
 from src.core.utils.common_utils import get_minio_client
 from src.core.validation import validate_params
 
 router = APIRouter(tags=["Video Management APIs"])
 
 
+def _forget_ingestion_checkpoints(bucket_name: str, video_id: str) -> None:
+    """Let a video uploaded again under this ID be fully re-ingested."""
+    try:
+        frames = get_job_store().forget_video(bucket_name, video_id)
+        if frames:
+            logger.info(f"Dropped {frames} ingestion checkpoints of {bucket_name}/{video_id}")
+    except Exception as ex:
+        logger.error(f"Error dropping ingestion checkpoints of {bucket_name}/{video_id}: {ex}")
+
+
 @router.delete(
     "/videos/{bucket_name}/{video_id}",
     summary="Delete a video from Minio storage.",
@@ -78,6 +89,7 @@ async def delete_video(
 
             minio_client.delete_object(bucket_name, object_name)
             logger.info(f"Deleted video {object_name} from bucket {bucket_name}")
+            _forget_ingestion_checkpoints(bucket_name, video_id)
             return DataPrepResponse(message=f"Video {video_name} deleted successfully")
         else:
             # Delete all videos in the directory
@@ -92,6 +104,7 @@ async def delete_video(
                 minio_client.delete_object(bucket_name, obj.object_name)
 
             logger.info(f"Deleted all videos in directory {video_id} from bucket {bucket_name}")
+            _forget_ingestion_checkpoints(bucket_name, video_id)
             return DataPrepResponse(
                 message=f"All videos in directory {video_id} deleted successfully"
             )
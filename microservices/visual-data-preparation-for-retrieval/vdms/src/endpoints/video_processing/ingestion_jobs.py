@@ -0,0 +1,211 @@
+# Copyright (C) 2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+import datetime
+import pathlib
+import shutil
+from http import HTTPStatus
+from typing import Annotated, Optional
+
+from fastapi import APIRouter, HTTPException, Path, Query
+
+from src.common import DataPrepException, Strings, logger, settings
+from src.common.schema import (
+    IngestionJobInfo,
+    IngestionJobListResponse,
+    IngestionJobResponse,
+    IngestionJobStatusEnum,
+)
+from src.core.embedding import generate_video_embedding_from_content
+from src.core.embedding.ingestion_jobs import JOB_RUNNING, get_job_store
+from src.core.utils.config_utils import get_config, read_config
+from src.core.utils.video_utils import get_video_from_minio
+
+router = APIRouter(tags=["Video Processing APIs"])
+
+
+def _get_job_or_404(job_id: str) -> dict:
+    job = get_job_store().get_job(job_id)
+    if job is None:
+        raise DataPrepException(status_code=HTTPStatus.NOT_FOUND, msg=Strings.job_not_found)
+    return job
+
+
+@router.get(
+    "/videos/jobs",
+    summary="List video ingestion jobs.",
+    response_model_exclude_none=True,
+)
+async def list_ingestion_jobs(
+    status: Annotated[
+        Optional[IngestionJobStatusEnum],
+        Query(description="Only return jobs in this state"),
+    ] = None,
+    limit: Annotated[
+        int,
+        Query(ge=1, le=1000, description="Maximum number of jobs to return, most recent first"),
+    ] = 100,
+) -> IngestionJobListResponse:
+    """
+    ### List video ingestion jobs, most recently created first.
+
+    #### Query Params:
+    - **status (str, optional) :** Only return jobs in this state (running, completed, failed or interrupted)
+    - **limit (int, optional) :** Maximum number of jobs to return (default: 100)
+
+    #### Raises:
+    - **500 Internal Server Error :** When some internal error occurs at DataPrep API server.
+
+    Returns:
+    - **response (json) :** A response JSON containing the jobs with their progress.
+    """
+
+    try:
+        jobs = get_job_store().list_jobs(status=status.value if status else None, limit=limit)
+        return IngestionJobListResponse(jobs=[IngestionJobInfo(**job) for job in jobs])
+
+    except Exception as ex:
+        logger.error(f"Error listing ingestion jobs: {ex}")
+        raise HTTPException(status_code=HTTPStatus.INTERNAL_SERVER_ERROR, detail=Strings.server_error)
+
+
+@router.get(
+    "/videos/jobs/{job_id}",
+    summary="Get the progress of a video ingestion job.",
+    response_model_exclude_none=True,
+)
+async def get_ingestion_job(
+    job_id: Annotated[str, Path(description="ID of the ingestion job")],
+) -> IngestionJobResponse:
+    """
+    ### Get the progress of a video ingestion job.
+
+    Progress is checkpointed after every batch of embeddings written to VDMS. While a job is
+    running, the response reports the committed frames, per-stage timings and an estimate of
+    the remaining time.
+
+    #### Path Params:
+    - **job_id (str, required) :** ID of the ingestion job, as returned by the video processing APIs
+
+    #### Raises:
+    - **404 Not Found :** If no job exists with the given ID.
+    - **500 Internal Server Error :** When some internal error occurs at DataPrep API server.
+
+    Returns:
+    - **response (json) :** A response JSON containing the job with its progress.
+    """
+
+    try:
+        return IngestionJobResponse(job=IngestionJobInfo(**_get_job_or_404(job_id)))
+
+    except DataPrepException as ex:
+        logger.error(ex)
+        raise HTTPException(status_code=ex.status_code, detail=ex.message)
+
+    except Exception as ex:
+        logger.error(f"Error reading ingestion job {job_id}: {ex}")
+        raise HTTPException(status_code=HTTPStatus.INTERNAL_SERVER_ERROR, detail=Strings.server_error)
+
+
+@router.post(
+    "/videos/jobs/{job_id}/resume",
+    summary="Resume a video ingestion job from its last checkpoint.",
+    response_model_exclude_none=True,
+)
+async def resume_ingestion_job(
+    job_id: Annotated[str, Path(description="ID of the ingestion job")],
+) -> IngestionJobResponse:
+    """
+    ### Resume a failed or interrupted video ingestion job from its last checkpoint.
+
+    The video is read again from Minio and processed with the parameters of the original
+    request. Frames committed by earlier attempts are neither decoded nor embedded again,
+    so only the remaining frames are processed. Resuming a completed job retries the
+    frames whose embeddings failed.
+
+    #### Path Params:
+    - **job_id (str, required) :** ID of the ingestion job
+
+    #### Raises:
+    - **400 Bad Request :** If the service does not run in SDK processing mode.
+    - **404 Not Found :** If no job exists with the given ID or its video is no longer in Minio.
+    - **409 Conflict :** If the job is still running.
+    - **502 Bad Gateway :** When something unpleasant happens at Minio storage.
+    - **500 Internal Server Error :** When some internal error occurs at DataPrep API server.
+
+    Returns:
+    - **response (json) :** A response JSON containing the job with its final progress.
+    """
+
+    metadata_temp_dir: Optional[pathlib.Path] = None
+
+    try:
+        job = _get_job_or_404(job_id)
+        if job["status"] == JOB_RUNNING:
+            raise DataPrepException(status_code=HTTPStatus.CONFLICT, msg=Strings.job_already_running)
+        if settings.EMBEDDING_PROCESSING_MODE.lower() != "sdk":
+            raise DataPrepException(status_code=HTTPStatus.BAD_REQUEST, msg=Strings.job_resume_unsupported)
+
+        raw_config = read_config(settings.CONFIG_FILEPATH, type="yaml")
+
+        # Not able to read config file is a fatal error.
+        if raw_config is None:
+            raise Exception(Strings.config_error)
+
+        effective_config = get_config()
+        params = job["params"]
+
+        try:
+            video_data, filename = get_video_from_minio(job["bucket_name"], job["video_id"], job["filename"])
+        except DataPrepException:
+            raise
+        except Exception as ex:
+            logger.error(f"Error retrieving video from Minio: {ex}")
+            raise DataPrepException(status_code=HTTPStatus.BAD_GATEWAY, msg=Strings.minio_error)
+
+        request_timestamp = int(datetime.datetime.now().timestamp())
+        metadata_temp_dir = pathlib.Path(
+            raw_config.get("metadata_local_temp_dir", "/tmp/dataprep/metadata")
+        ) / f"{job['video_id']}_{request_timestamp}"
+        metadata_temp_dir.mkdir(parents=True, exist_ok=True)
+
+        job_store = get_job_store()
+        job_store.mark_running(job_id)
+        logger.info(f"Resuming ingestion job {job_id} for {job['bucket_name']}/{job['video_id']}")
+
+        with job_store.track(job_id):
+            await generate_video_embedding_from_content(
+                video_content=video_data.read(),
+                bucket_name=job["bucket_name"],
+                video_id=job["video_id"],
+                filename=filename,
+                metadata_temp_path=metadata_temp_dir,
+                frame_interval=params.get("frame_interval") or effective_config.get("frame_interval", 15),
+                enable_object_detection=params.get("enable_object_detection", settings.ENABLE_OBJECT_DETECTION),
+                detection_confidence=params.get("detection_confidence") or effective_config.get("detection_confidence", 0.85),
+                tags=params.get("tags") or [],
+                job_id=job_id,
+            )
+
+        return IngestionJobResponse(
+            message=Strings.embedding_success,
+            job=IngestionJobInfo(**job_store.get_job(job_id)),
+        )
+
+    except DataPrepException as ex:
+        logger.error(ex)
+        raise HTTPException(status_code=ex.status_code, detail=ex.message)
+
+    except ValueError as ex:
+        logger.error(ex)
+        raise HTTPException(status_code=HTTPStatus.BAD_REQUEST, detail=str(ex))
+
+    except Exception as ex:
+        logger.error(ex)
+        raise HTTPException(
+            status_code=HTTPStatus.INTERNAL_SERVER_ERROR, detail=Strings.server_error
+        )
+
+    finally:
+        if metadata_temp_dir and metadata_temp_dir.exists():
+            shutil.rmtree(metadata_temp_dir, ignore_errors=True)
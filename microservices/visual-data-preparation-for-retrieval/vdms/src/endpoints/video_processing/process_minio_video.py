@@ -10,8 +10,9 @@ from typing import Annotated, List
 from fastapi import APIRouter, Body, HTTPException
 
 from src.common import DataPrepException, Strings, logger, settings
-from src.common.schema import DataPrepResponse, VideoRequest
+from src.common.schema import VideoIngestionResponse, VideoRequest
 from src.core.embedding import generate_video_embedding
+from src.core.embedding.ingestion_jobs import get_job_store
 from src.core.utils.common_utils import get_minio_client
 from src.core.utils.video_utils import get_video_from_minio
 from src.core.utils.config_utils import get_config, read_config
@@ -81,7 +82,7 @@ def _validate_and_get_video_name(
 )
 async def process_minio_video(
     video_request: Annotated[VideoRequest, Body(description="Video processing parameters")],
-) -> DataPrepResponse:
+) -> VideoIngestionResponse:
     """
     ### Processes videos stored in Minio using frame-based processing with optional object detection.
 
@@ -94,6 +95,10 @@ async def process_minio_video(
     and 3 objects are detected per frame on average, this results in approximately 240 embeddings
     (60 frames + 180 object crops).**
 
+    The video is processed as an ingestion job. Its progress can be polled at `/videos/jobs/{job_id}`
+    and an interrupted job can be resumed from its last checkpoint with `/videos/jobs/{job_id}/resume`.
+    Frames of this video already stored with the same model and detection settings are skipped.
+
     #### Body Params:
     - **video_request (VideoRequest) :** Contains processing parameters:
        - **bucket_name (str) :** The bucket name where the video is stored (If not provided, a default bucket name will be used based on application config.)
@@ -111,7 +116,7 @@ async def process_minio_video(
     - **500 Internal Server Error :** When some internal error occurs at DataPrep API server.
 
     Returns:
-    - **response (json) :** A response JSON containing status and message.
+    - **response (json) :** A response JSON containing status, message and the ingestion job ID.
     """
 
     try:
@@ -191,21 +196,36 @@ async def process_minio_video(
             logger.error(f"Error retrieving video from Minio: {ex}")
             raise DataPrepException(status_code=HTTPStatus.BAD_GATEWAY, msg=Strings.minio_error)
 
-        # Process video metadata and generate frame-based embeddings
-        ids = await generate_video_embedding(
-            bucket_name=bucket_name,
-            video_id=video_id,
-            filename=filename,
-            temp_video_path=temp_video_path,
-            metadata_temp_path=metadata_temp_dir,
-            frame_interval=frame_interval,
-            enable_object_detection=enable_object_detection,
-            detection_confidence=detection_confidence,
-            tags=tags,
+        job_store = get_job_store()
+        job_id = job_store.create_job(
+            bucket_name,
+            video_id,
+            filename,
+            params={
+                "frame_interval": frame_interval,
+                "enable_object_detection": enable_object_detection,
+                "detection_confidence": detection_confidence,
+                "tags": tags,
+            },
         )
 
+        # Process video metadata and generate frame-based embeddings
+        with job_store.track(job_id):
+            ids = await generate_video_embedding(
+                bucket_name=bucket_name,
+                video_id=video_id,
+                filename=filename,
+                temp_video_path=temp_video_path,
+                metadata_temp_path=metadata_temp_dir,
+                frame_interval=frame_interval,
+                enable_object_detection=enable_object_detection,
+                detection_confidence=detection_confidence,
+                tags=tags,
+                job_id=job_id,
+            )
+
         # logger.debug(f"Frame-based embeddings created for videos: {ids}")
-        return DataPrepResponse(message=Strings.embedding_success)
+        return VideoIngestionResponse(message=Strings.embedding_success, job_id=job_id)
 
     except DataPrepException as ex:
         logger.error(ex)
@@ -11,8 +11,9 @@ from typing import Annotated, List, Optional
 from fastapi import APIRouter, File, HTTPException, Query, UploadFile
 
 from src.common import DataPrepException, Strings, logger, settings
-from src.common.schema import DataPrepResponse
+from src.common.schema import VideoIngestionResponse
 from src.core.embedding import generate_video_embedding, generate_video_embedding_from_content
+from src.core.embedding.ingestion_jobs import get_job_store
 from src.core.utils.common_utils import get_minio_client
 from src.core.utils.config_utils import read_config
 from src.core.validation import validate_params
@@ -54,7 +55,7 @@ async def upload_and_process_video(
             description="List of tags to be associated with the video. Useful for filtering the search.",
         ),
     ] = None,
-) -> DataPrepResponse:
+) -> VideoIngestionResponse:
     """
     ### Upload and process a video file for frame-based embedding generation.
 
@@ -70,6 +71,9 @@ async def upload_and_process_video(
     and suppose 3 objects are detected per frame on average, this results in approximately 240 embeddings
     (60 frames + 180 object crops).**
 
+    The video is processed as an ingestion job. Its progress can be polled at `/videos/jobs/{job_id}`
+    and an interrupted job can be resumed from its last checkpoint with `/videos/jobs/{job_id}/resume`.
+
     #### File Upload:
     - **file (UploadFile, required) :** Video file to upload (MP4 format only, max size 500MB)
 
@@ -87,7 +91,7 @@ async def upload_and_process_video(
     - **500 Internal Server Error :** When some internal error occurs at DataPrep API server.
 
     Returns:
-    - **response (json) :** A response JSON containing status and message.
+    - **response (json) :** A response JSON containing status, message and the ingestion job ID.
     """
 
     videos_temp_dir: Optional[pathlib.Path] = None
@@ -144,49 +148,65 @@ async def upload_and_process_video(
             logger.error(f"Error uploading video to Minio: {ex}")
             raise DataPrepException(status_code=HTTPStatus.BAD_GATEWAY, msg=Strings.minio_error)
 
+        job_store = get_job_store()
+        job_id = job_store.create_job(
+            bucket_name,
+            video_id,
+            filename,
+            params={
+                "frame_interval": frame_interval,
+                "enable_object_detection": enable_object_detection,
+                "detection_confidence": detection_confidence,
+                "tags": tags or [],
+            },
+        )
+
         # Choose processing approach based on embedding mode
-        if settings.EMBEDDING_PROCESSING_MODE.lower() == "sdk":
-            logger.info("Using SDK mode: processing video directly from memory for optimal performance")
+        with job_store.track(job_id):
+            if settings.EMBEDDING_PROCESSING_MODE.lower() == "sdk":
+                logger.info("Using SDK mode: processing video directly from memory for optimal performance")
             
-            # SDK mode: Process video content directly from memory (most efficient)
-            ids = await generate_video_embedding_from_content(
-                video_content=content,  # Use in-memory content directly
-                bucket_name=bucket_name,
-                video_id=video_id,
-                filename=filename,
-                metadata_temp_path=metadata_temp_dir,
-                frame_interval=frame_interval,
-                enable_object_detection=enable_object_detection,
-                detection_confidence=detection_confidence,
-                tags=tags or [],
-            )
-            logger.info(f"SDK mode: {len(ids)} embeddings created with optimized memory usage")
-        else:
-            logger.info("Using API mode: traditional file-based processing")
+                # SDK mode: Process video content directly from memory (most efficient)
+                ids = await generate_video_embedding_from_content(
+                    video_content=content,  # Use in-memory content directly
+                    bucket_name=bucket_name,
+                    video_id=video_id,
+                    filename=filename,
+                    metadata_temp_path=metadata_temp_dir,
+                    frame_interval=frame_interval,
+                    enable_object_detection=enable_object_detection,
+                    detection_confidence=detection_confidence,
+                    tags=tags or [],
+                    job_id=job_id,
+                )
+                logger.info(f"SDK mode: {len(ids)} embeddings created with optimized memory usage")
+            else:
+                logger.info("Using API mode: traditional file-based processing")
             
-            # Now save the uploaded file to a temporary location for processing
-            temp_video_path = videos_temp_dir / filename
-            with open(temp_video_path, "wb") as f:
-                f.write(content)
-            logger.debug(f"Successfully saved uploaded file {filename} to {temp_video_path}")
+                # Now save the uploaded file to a temporary location for processing
+                temp_video_path = videos_temp_dir / filename
+                with open(temp_video_path, "wb") as f:
+                    f.write(content)
+                logger.debug(f"Successfully saved uploaded file {filename} to {temp_video_path}")
             
-            # API mode: Use traditional file-based processing  
-            ids = await generate_video_embedding(
-                bucket_name=bucket_name,
-                video_id=video_id,
-                filename=filename,
-                temp_video_path=temp_video_path,
-                metadata_temp_path=metadata_temp_dir,
-                frame_interval=frame_interval,
-                enable_object_detection=enable_object_detection,
-                detection_confidence=detection_confidence,
-                tags=tags or [],
-            )
-            logger.info(f"API mode: {len(ids)} embeddings created using HTTP calls")
+                # API mode: Use traditional file-based processing  
+                ids = await generate_video_embedding(
+                    bucket_name=bucket_name,
+                    video_id=video_id,
+                    filename=filename,
+                    temp_video_path=temp_video_path,
+                    metadata_temp_path=metadata_temp_dir,
+                    frame_interval=frame_interval,
+                    enable_object_detection=enable_object_detection,
+                    detection_confidence=detection_confidence,
+                    tags=tags or [],
+                )
+                logger.info(f"API mode: {len(ids)} embeddings created using HTTP calls")
 
         logger.info(f"Frame-based embeddings created for video using {settings.EMBEDDING_PROCESSING_MODE} mode: {ids}")
-        return DataPrepResponse(
-            message=f"{Strings.embedding_success} (Mode: {settings.EMBEDDING_PROCESSING_MODE})"
+        return VideoIngestionResponse(
+            message=f"{Strings.embedding_success} (Mode: {settings.EMBEDDING_PROCESSING_MODE})",
+            job_id=job_id,
         )
 
     except DataPrepException as ex:
@@ -20,10 +20,12 @@ from langchain_vdms.vectorstores import VDMS_Utils
 from src.common import logger, settings
 from src.common.schema import DataPrepResponse, StatusEnum
 from src.core.embedding import _client_cache
+from src.core.embedding.ingestion_jobs import get_job_store
 from src.endpoints import (
     check_health_router,
     delete_video_router,
     download_video_router,
+    ingestion_jobs_router,
     list_videos_router,
     process_document_router,
     process_minio_video_router,
@@ -109,6 +111,12 @@ async def lifespan(app: FastAPI):
 
     await _run_startup_preloads()
 
+    try:
+        # Jobs still marked running were cut short by a restart; expose them as resumable
+        get_job_store().mark_interrupted_jobs()
+    except Exception as exc:  # pragma: no cover - best effort logging
+        logger.error(f"Error opening ingestion job store: {exc}")
+
     try:
         yield
     finally:
@@ -200,6 +208,7 @@ app.include_router(process_document_router)
 # Video processing endpoints
 app.include_router(process_minio_video_router)
 app.include_router(upload_and_process_video_router)
+app.include_router(ingestion_jobs_router)
 
 # Video management endpoints
 app.include_router(list_videos_router)
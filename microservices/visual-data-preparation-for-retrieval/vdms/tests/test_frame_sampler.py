@@ -0,0 +1,92 @@
+# Copyright (C) 2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+import numpy as np
+import pytest
+
+from src.core.utils import frame_sampler
+from src.core.utils.frame_sampler import VideoFrameSampler, compute_decode_size
+
+
+class FakeVideoReader:
+    """Minimal stand-in for decord.VideoReader over a synthetic video."""
+
+    instances = []
+
+    def __init__(self, source, ctx=None, width=-1, height=-1, total_frames=40, fail_batches=False):
+        self.width = 1280 if width == -1 else width
+        self.height = 720 if height == -1 else height
+        self.total_frames = total_frames
+        self.fail_batches = fail_batches
+        self.batches = []
+        FakeVideoReader.instances.append(self)
+
+    def __len__(self):
+        return self.total_frames
+
+    def __getitem__(self, index):
+        return _NDArray(np.full((self.height, self.width, 3), index % 256, dtype=np.uint8))
+
+    def get_avg_fps(self):
+        return 30.0
+
+    def seek(self, index):
+        pass
+
+    def get_batch(self, indices):
+        if self.fail_batches:
+            raise RuntimeError("decoder error")
+        self.batches.append(list(indices))
+        return _NDArray(np.stack([self[index].asnumpy() for index in indices]))
+
+
+class _NDArray:
+    def __init__(self, array):
+        self._array = array
+        self.shape = array.shape
+
+    def asnumpy(self):
+        return self._array
+
+
+@pytest.fixture
+def fake_reader(mocker):
+    FakeVideoReader.instances = []
+    mocker.patch.object(frame_sampler.decord, "VideoReader", FakeVideoReader)
+    return FakeVideoReader
+
+
+def test_compute_decode_size():
+    """Frames shrink to what the models need, keep the aspect ratio and are never upscaled."""
+    assert compute_decode_size(1920, 1080) == (1920, 1080)
+    assert compute_decode_size(1920, 1080, min_side=224) == (398, 224)
+    assert compute_decode_size(1920, 1080, max_side=640) == (640, 360)
+    # The detector needs the larger resolution, so it wins over the embedding model
+    assert compute_decode_size(1920, 1080, min_side=224, max_side=640) == (640, 360)
+    assert compute_decode_size(320, 240, min_side=384) == (320, 240)
+
+
+def test_sampler_decodes_sampled_frames_in_batches(fake_reader):
+    """Sampled frames are decoded in sequential batches at the downscaled resolution."""
+    sampler = VideoFrameSampler(b"video", frame_interval=5, max_side=640, batch_size=3)
+
+    frames = list(sampler)
+
+    assert [index for index, _ in frames] == list(range(0, 40, 5))
+    assert all(frame.shape == (360, 640, 3) for _, frame in frames)
+    assert sampler.scale == pytest.approx(0.5)
+    # The probe reader is replaced by one that lets the decoder scale the frames
+    assert fake_reader.instances[-1].batches == [[0, 5, 10], [15, 20, 25], [30, 35]]
+
+
+def test_sampler_falls_back_to_single_frame_decode(fake_reader, mocker):
+    """A failing batch is decoded frame by frame instead of dropping the whole batch."""
+    mocker.patch.object(
+        frame_sampler.decord,
+        "VideoReader",
+        lambda *args, **kwargs: FakeVideoReader(*args, fail_batches=True, **kwargs),
+    )
+    sampler = VideoFrameSampler(b"video", frame_interval=10, batch_size=4)
+
+    assert [index for index, _ in sampler] == [0, 10, 20, 30]
+    assert sampler.scale == 1.0
@@ -0,0 +1,239 @@
+# Copyright (C) 2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+from http import HTTPStatus
+
+import pytest
+
+from src.core.embedding import ingestion_jobs
+from src.core.embedding.ingestion_jobs import (
+    JOB_COMPLETED,
+    JOB_FAILED,
+    JOB_INTERRUPTED,
+    IngestionJobStore,
+    IngestionJobTracker,
+)
+from src.core.embedding.streaming_pipeline import StreamingIngestionPipeline
+from src.core.embedding.vdms_bulk_writer import VDMSPartialWriteError
+
+
+@pytest.fixture
+def job_store(tmp_path):
+    store = IngestionJobStore(str(tmp_path / "jobs.db"))
+    yield store
+    store.close()
+
+
+def make_frames(frame_numbers):
+    for frame_number in frame_numbers:
+        yield f"frame-{frame_number}", {"frame_id": f"video_{frame_number}", "frame_number": frame_number}
+
+
+def detect_with_crop(frames):
+    """Every frame produces itself plus one crop."""
+    items = []
+    for frame, metadata in frames:
+        items.append((frame, metadata))
+        items.append((f"{frame}-crop", {**metadata, "frame_id": f"{metadata['frame_id']}_crop_0"}))
+    return items
+
+
+def run_job(job_store, job_id, frame_numbers, store_fn, video_id="video"):
+    tracker = IngestionJobTracker(job_store, job_id, "hash", "model", "bucket", video_id)
+    skipped = tracker.begin(frame_numbers)
+    pipeline = StreamingIngestionPipeline(
+        detect_fn=tracker.wrap_detect(detect_with_crop),
+        embed_fn=lambda images: [[1.0] for _ in images],
+        store_fn=tracker.wrap_store(store_fn),
+        embedding_batch_size=2,
+        storage_batch_size=4,
+        progress_fn=tracker.record_stage_stats,
+    )
+    return skipped, pipeline.run(make_frames(f for f in frame_numbers if f not in skipped))
+
+
+def test_resumed_job_skips_committed_frames(job_store):
+    """Frames stored before a failure are not processed again when the job is resumed."""
+    job_id = job_store.create_job("bucket", "video", "video.mp4", {"frame_interval": 15})
+    frame_numbers = list(range(0, 150, 15))
+    stored = []
+
+    def failing_store(embeddings, metadatas):
+        if len(stored) >= 8:
+            raise RuntimeError("VDMS connection lost")
+        stored.extend(metadata["frame_id"] for metadata in metadatas)
+        return [metadata["frame_id"] for metadata in metadatas]
+
+    run_job(job_store, job_id, frame_numbers, failing_store)
+    committed = job_store.committed_frames("bucket", "video", "hash", "model")
+    assert len(committed) == 4
+    assert job_store.get_job(job_id)["frames_committed"] == 4
+
+    def store(embeddings, metadatas):
+        stored.extend(metadata["frame_id"] for metadata in metadatas)
+        return [metadata["frame_id"] for metadata in metadatas]
+
+    skipped, result = run_job(job_store, job_id, frame_numbers, store)
+
+    assert skipped == committed
+    assert result["frames_decoded"] == 6
+    # Every frame and crop ends up stored exactly once, with no checkpoint key left in the metadata
+    assert sorted(stored) == sorted(
+        frame_id for f in frame_numbers for frame_id in (f"video_{f}", f"video_{f}_crop_0")
+    )
+    assert job_store.committed_frames("bucket", "video", "hash", "model") == set(frame_numbers)
+
+    job = job_store.get_job(job_id)
+    assert job["attempts"] == 2
+    assert job["frames_skipped"] == 4
+    assert job["progress_pct"] == pytest.approx(100.0)
+    assert job["stage_stats"]["storage"]["items_out"] == 12
+
+
+def test_partially_stored_frame_only_stores_missing_items(job_store):
+    """A frame whose crop was stored before the crash only gets its remaining items written."""
+    job_id = job_store.create_job("bucket", "video", "video.mp4", {})
+    job_store.record_batch(job_id, "hash", "model", "bucket", "video", [(0, 1)], [])
+    stored = []
+
+    def store(embeddings, metadatas):
+        stored.extend(metadata["frame_id"] for metadata in metadatas)
+        return [metadata["frame_id"] for metadata in metadatas]
+
+    run_job(job_store, job_id, [0, 15], store)
+
+    assert sorted(stored) == ["video_0", "video_15", "video_15_crop_0"]
+    assert job_store.committed_frames("bucket", "video", "hash", "model") == {0, 15}
+    assert job_store.stored_items("bucket", "video", "hash", "model") == {}
+
+
+def test_same_video_under_new_id_is_fully_stored(job_store):
+    """Checkpoints of a video do not skip the frames of the same file uploaded under another ID."""
+    stored = []
+
+    def store(embeddings, metadatas):
+        stored.extend(metadata["frame_id"] for metadata in metadatas)
+        return [metadata["frame_id"] for metadata in metadatas]
+
+    first_id = job_store.create_job("bucket", "video", "video.mp4", {})
+    run_job(job_store, first_id, [0, 15], store)
+    second_id = job_store.create_job("bucket", "copy", "video.mp4", {})
+    skipped, result = run_job(job_store, second_id, [0, 15], store, video_id="copy")
+
+    assert skipped == set()
+    assert len(result["stored_ids"]) == 4
+    assert job_store.committed_frames("bucket", "copy", "hash", "model") == {0, 15}
+
+    assert job_store.forget_video("bucket", "copy") == 2
+    assert job_store.committed_frames("bucket", "copy", "hash", "model") == set()
+    assert job_store.committed_frames("bucket", "video", "hash", "model") == {0, 15}
+
+
+def test_job_store_migrates_checkpoints_keyed_without_video(tmp_path):
+    """Checkpoints of a database created before they were keyed by video are kept."""
+    import sqlite3
+
+    db_path = str(tmp_path / "jobs.db")
+    conn = sqlite3.connect(db_path)
+    conn.executescript(
+        """
+        CREATE TABLE frame_checkpoints (
+            video_hash TEXT NOT NULL, model_key TEXT NOT NULL, frame_number INTEGER NOT NULL,
+            bucket_name TEXT NOT NULL, video_id TEXT NOT NULL, job_id TEXT NOT NULL,
+            items INTEGER NOT NULL, committed_at REAL NOT NULL,
+            PRIMARY KEY (video_hash, model_key, frame_number)
+        );
+        CREATE TABLE stored_items (
+            video_hash TEXT NOT NULL, model_key TEXT NOT NULL, frame_number INTEGER NOT NULL,
+            item_index INTEGER NOT NULL, bucket_name TEXT NOT NULL, video_id TEXT NOT NULL,
+            PRIMARY KEY (video_hash, model_key, frame_number, item_index)
+        );
+        CREATE INDEX idx_checkpoints_video ON frame_checkpoints (bucket_name, video_id);
+        CREATE INDEX idx_items_video ON stored_items (bucket_name, video_id);
+        INSERT INTO frame_checkpoints VALUES ('hash', 'model', 0, 'bucket', 'video', 'job', 2, 0);
+        INSERT INTO stored_items VALUES ('hash', 'model', 15, 1, 'bucket', 'video');
+        """
+    )
+    conn.commit()
+    conn.close()
+
+    store = IngestionJobStore(db_path)
+    try:
+        assert store.committed_frames("bucket", "video", "hash", "model") == {0}
+        assert store.stored_items("bucket", "video", "hash", "model") == {15: {1}}
+        store.record_batch("job", "hash", "model", "bucket", "copy", [], [(0, 2)])
+        assert store.committed_frames("bucket", "copy", "hash", "model") == {0}
+    finally:
+        store.close()
+    # Reopening an up to date database keeps the checkpoints
+    store = IngestionJobStore(db_path)
+    assert store.committed_frames("bucket", "video", "hash", "model") == {0}
+    store.close()
+
+
+def test_partial_write_checkpoints_stored_items(job_store):
+    """Items stored before a write failed are checkpointed and not written again on resume."""
+    job_id = job_store.create_job("bucket", "video", "video.mp4", {})
+    stored = []
+
+    def partially_failing_store(embeddings, metadatas):
+        # The first three items of the batch reach VDMS before the connection drops
+        ids = [metadata["frame_id"] for metadata in metadatas[:3]]
+        stored.extend(ids)
+        raise VDMSPartialWriteError("connection reset", ids)
+
+    _, result = run_job(job_store, job_id, [0, 15], partially_failing_store)
+    assert result["stored_ids"] == ["video_0", "video_0_crop_0", "video_15"]
+    assert job_store.get_job(job_id)["embeddings_stored"] == 3
+
+    def store(embeddings, metadatas):
+        stored.extend(metadata["frame_id"] for metadata in metadatas)
+        return [metadata["frame_id"] for metadata in metadatas]
+
+    run_job(job_store, job_id, [0, 15], store)
+
+    assert sorted(stored) == ["video_0", "video_0_crop_0", "video_15", "video_15_crop_0"]
+
+
+def test_job_store_tracks_status_and_forgets_deleted_videos(job_store):
+    job_id = job_store.create_job("bucket", "video", "video.mp4", {"tags": ["a"]})
+    other_id = job_store.create_job("bucket", "other", "other.mp4", {})
+
+    with pytest.raises(RuntimeError):
+        with job_store.track(other_id):
+            raise RuntimeError("decoder crashed")
+    assert job_store.get_job(other_id)["status"] == JOB_FAILED
+    assert job_store.get_job(other_id)["error"] == "decoder crashed"
+
+    assert job_store.mark_interrupted_jobs() == 1
+    assert [job["job_id"] for job in job_store.list_jobs(status=JOB_INTERRUPTED)] == [job_id]
+
+    job_store.mark_running(job_id)
+    with job_store.track(job_id):
+        job_store.record_batch(job_id, "hash", "model", "bucket", "video", [], [(0, 2), (15, 2)])
+    assert job_store.get_job(job_id)["status"] == JOB_COMPLETED
+    assert job_store.get_job(job_id)["params"] == {"tags": ["a"]}
+
+    assert job_store.forget_video("bucket", "video") == 2
+    assert job_store.committed_frames("bucket", "video", "hash", "model") == set()
+
+
+def test_get_ingestion_job_endpoint(test_client, job_store, mocker):
+    mocker.patch.object(ingestion_jobs, "_job_store", job_store)
+    job_id = job_store.create_job("bucket", "video", "video.mp4", {"frame_interval": 15})
+    job_store.start_attempt(job_id, "hash", "model", total_frames=10, frames_skipped=5)
+
+    response = test_client.get(f"/videos/jobs/{job_id}")
+    assert response.status_code == HTTPStatus.OK
+    job = response.json()["job"]
+    assert job["status"] == "running"
+    assert job["progress_pct"] == pytest.approx(50.0)
+
+    response = test_client.get("/videos/jobs", params={"status": "running"})
+    assert [job["job_id"] for job in response.json()["jobs"]] == [job_id]
+
+    response = test_client.get("/videos/jobs/unknown")
+    assert response.status_code == HTTPStatus.NOT_FOUND
+
+    response = test_client.post(f"/videos/jobs/{job_id}/resume")
+    assert response.status_code == HTTPStatus.CONFLICT
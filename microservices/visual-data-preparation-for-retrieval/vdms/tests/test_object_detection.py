@@ -0,0 +1,66 @@
+# Copyright (C) 2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+import numpy as np
+
+from src.core.object_detection.yolox_utils import (
+    clip_boxes,
+    decode_boxes,
+    multiclass_nms,
+    multiclass_nms_batch,
+    preproc,
+    preproc_batch,
+)
+
+
+def test_preproc_batch_matches_single_image_preproc():
+    """Each slot of the batch holds the same letterboxed tensor as single-image preprocessing."""
+    rng = np.random.default_rng(0)
+    images = [rng.integers(0, 255, shape, dtype=np.uint8) for shape in [(48, 64, 3), (80, 40, 3), (32, 32, 3)]]
+
+    batch, ratios = preproc_batch(images, (32, 32))
+
+    assert batch.shape == (3, 3, 32, 32)
+    assert batch.dtype == np.float32
+    for index, image in enumerate(images):
+        expected, ratio = preproc(image, (32, 32))
+        np.testing.assert_array_equal(batch[index], expected[0])
+        assert ratios[index] == np.float32(ratio)
+
+
+def test_multiclass_nms_batch_matches_per_image_nms():
+    """Batched box decoding and NMS give the same detections as the per-image path."""
+    rng = np.random.default_rng(1)
+    predictions = rng.uniform(0, 1, size=(3, 50, 7)).astype(np.float32)
+    predictions[..., :2] *= 64
+    predictions[..., 2:4] *= 16
+    predictions[1, :, 4] = 0.0  # No object in the second image
+    ratios = np.array([0.5, 1.0, 2.0], dtype=np.float32)
+
+    boxes, scores = decode_boxes(predictions, ratios)
+    batched = multiclass_nms_batch(boxes, scores, nms_thr=0.45, score_thr=0.3)
+
+    assert batched[1] is None
+    for index in (0, 2):
+        single = predictions[index]
+        single_boxes = np.stack(
+            [
+                single[:, 0] - single[:, 2] / 2.0,
+                single[:, 1] - single[:, 3] / 2.0,
+                single[:, 0] + single[:, 2] / 2.0,
+                single[:, 1] + single[:, 3] / 2.0,
+            ],
+            axis=1,
+        ) / ratios[index]
+        expected = multiclass_nms(single_boxes, single[:, 4, None] * single[:, 5:], nms_thr=0.45, score_thr=0.3)
+        np.testing.assert_allclose(batched[index], expected, rtol=1e-5)
+
+
+def test_clip_boxes_drops_boxes_outside_or_too_small():
+    """Boxes are clipped to the image and boxes below the minimum size are dropped."""
+    boxes = np.array([[-5, -5, 30, 20], [90, 10, 120, 60], [10, 10, 15, 40], [200, 200, 250, 250]])
+
+    clipped, kept = clip_boxes(boxes, (50, 100, 3), min_size=10)
+
+    np.testing.assert_array_equal(kept, [0, 1])
+    np.testing.assert_array_equal(clipped, [[0, 0, 30, 20], [90, 10, 100, 50]])
@@ -0,0 +1,174 @@
+# Copyright (C) 2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+import threading
+import time
+
+import pytest
+
+from src.core.embedding.streaming_pipeline import StreamingIngestionPipeline
+
+
+def make_frames(count, produced=None):
+    """Yield (frame, metadata) pairs, optionally counting how many were decoded."""
+    for index in range(count):
+        if produced is not None:
+            produced.append(index)
+        yield f"frame-{index}", {"frame_id": f"video_{index}", "frame_number": index}
+
+
+def detect_with_crop(frames):
+    """Return every full frame plus one crop for every even frame."""
+    items = []
+    for frame, metadata in frames:
+        items.append((frame, metadata))
+        if metadata["frame_number"] % 2 == 0:
+            items.append((f"{frame}-crop", {**metadata, "frame_id": f"{metadata['frame_id']}_crop_0"}))
+    return items
+
+
+def embed(images):
+    return [[float(len(image))] for image in images]
+
+
+def test_streaming_pipeline_stores_all_items_in_batches():
+    """Every frame and crop is embedded and written by the single writer in bounded batches."""
+    store_calls = []
+
+    def store(embeddings, metadatas):
+        store_calls.append([metadata["frame_id"] for metadata in metadatas])
+        return [f"id-{metadata['frame_id']}" for metadata in metadatas]
+
+    pipeline = StreamingIngestionPipeline(
+        detect_fn=detect_with_crop,
+        embed_fn=embed,
+        store_fn=store,
+        detection_workers=3,
+        embedding_workers=2,
+        storage_workers=2,
+        embedding_batch_size=4,
+        storage_batch_size=10,
+        queue_size=4,
+    )
+    result = pipeline.run(make_frames(20))
+
+    assert result["frames_decoded"] == 20
+    assert result["post_detection_items"] == 30
+    assert result["total_embeddings"] == 30
+    assert sorted(result["stored_ids"]) == sorted(
+        f"id-{frame_id}" for call in store_calls for frame_id in call
+    )
+    assert len({frame_id for call in store_calls for frame_id in call}) == 30
+    # Batches grow up to the storage batch size; only each writer's final flush may be smaller
+    assert sum(len(call) < 10 for call in store_calls) <= 2
+
+    stats = result["stage_stats"]
+    assert set(stats) == {"decode", "detection", "embedding", "storage"}
+    assert stats["detection"]["items_in"] == 20
+    assert stats["detection"]["workers"] == 3
+    assert stats["embedding"]["items_out"] == 30
+    assert stats["storage"]["items_out"] == 30
+    assert stats["storage"]["workers"] == 2
+    assert all(stage["throughput_per_s"] >= 0 for stage in stats.values())
+
+
+def test_streaming_pipeline_bounds_frames_in_flight():
+    """A blocked writer back-pressures the decoder instead of letting frames pile up."""
+    produced = []
+    release = threading.Event()
+
+    def slow_store(embeddings, metadatas):
+        release.wait(timeout=10)
+        return [metadata["frame_id"] for metadata in metadatas]
+
+    pipeline = StreamingIngestionPipeline(
+        detect_fn=lambda frames: list(frames),
+        embed_fn=embed,
+        store_fn=slow_store,
+        embedding_batch_size=2,
+        storage_batch_size=2,
+        queue_size=2,
+    )
+    result_holder = {}
+    runner = threading.Thread(target=lambda: result_holder.update(pipeline.run(make_frames(200, produced))))
+    runner.start()
+
+    time.sleep(0.5)
+    in_flight = len(produced)
+    release.set()
+    runner.join(timeout=30)
+
+    assert in_flight < 20
+    assert result_holder["total_embeddings"] == 200
+
+
+def test_streaming_pipeline_skips_failed_embedding_batches():
+    """A failing embedding batch is counted and the remaining batches are still stored."""
+    calls = []
+
+    def flaky_embed(images):
+        calls.append(len(images))
+        if len(calls) == 1:
+            raise RuntimeError("inference request failed")
+        return [None if image.endswith("7") else [1.0] for image in images]
+
+    pipeline = StreamingIngestionPipeline(
+        detect_fn=lambda frames: list(frames),
+        embed_fn=flaky_embed,
+        store_fn=lambda embeddings, metadatas: [metadata["frame_id"] for metadata in metadatas],
+        embedding_batch_size=5,
+    )
+    result = pipeline.run(make_frames(10))
+
+    assert result["total_embeddings"] == 4
+    assert result["failed_items"] == 6
+
+
+def test_streaming_pipeline_propagates_decoder_errors():
+    """An error while decoding aborts all stages and is raised to the caller."""
+
+    def broken_frames():
+        yield from make_frames(3)
+        raise ValueError("corrupt video stream")
+
+    pipeline = StreamingIngestionPipeline(
+        detect_fn=lambda frames: list(frames),
+        embed_fn=embed,
+        store_fn=lambda embeddings, metadatas: [metadata["frame_id"] for metadata in metadatas],
+        detection_workers=2,
+        embedding_workers=2,
+    )
+
+    with pytest.raises(ValueError, match="corrupt video stream"):
+        pipeline.run(broken_frames())
+
+
+def test_streaming_pipeline_batches_queued_frames_for_detection():
+    """Detection workers take the frames already queued, up to the detection batch size."""
+    batch_sizes = []
+
+    def batched_detect(frames):
+        batch_sizes.append(len(frames))
+        return list(frames)
+
+    def slow_frames():
+        yield from make_frames(10)
+        # Frames decoded after a pause must not wait for a full batch
+        time.sleep(0.3)
+        yield from make_frames(1)
+
+    pipeline = StreamingIngestionPipeline(
+        detect_fn=batched_detect,
+        embed_fn=embed,
+        store_fn=lambda embeddings, metadatas: [metadata["frame_id"] for metadata in metadatas],
+        detection_batch_size=4,
+        queue_size=16,
+    )
+    result = pipeline.run(slow_frames())
+
+    assert result["post_detection_items"] == 11
+    assert max(batch_sizes) <= 4
+    assert batch_sizes[-1] == 1
+    stats = result["stage_stats"]["detection"]
+    assert stats["items_in"] == 11
+    assert stats["calls"] == len(batch_sizes)
@@ -3,8 +3,10 @@
 
 import cv2
 import pytest
+import requests
 
-from src.core.utils.common_utils import sanitize_input
+from src.core.utils import common_utils
+from src.core.utils.common_utils import notify_index_updated, sanitize_input
 from src.core.utils.video_utils import get_video_fps_and_frames
 from src.core.utils.metadata_utils import extract_enhanced_video_metadata
 
@@ -17,6 +19,51 @@ def test_sanitize_input():
     assert sanitize_input("  test  ") == "test"
 
 
+@pytest.fixture
+def notify_post(mocker):
+    """Run the notification thread synchronously and return the mocked requests.post."""
+
+    def run_thread(target, **kwargs):
+        thread = mocker.MagicMock()
+        thread.start.side_effect = target
+        return thread
+
+    mocker.patch.object(common_utils.threading, "Thread", side_effect=run_thread)
+    return mocker.patch.object(common_utils.requests, "post")
+
+
+def test_notify_index_updated(mocker, notify_post):
+    """Test that the search service is notified at SEARCH_INDEX_NOTIFY_URL."""
+    url = "http://video-search:8000/index-version"
+    mocker.patch.object(common_utils.settings, "SEARCH_INDEX_NOTIFY_URL", url)
+
+    notify_index_updated()
+
+    notify_post.assert_called_once_with(url, timeout=5)
+
+
+def test_notify_index_updated_disabled(mocker, notify_post):
+    """Test that nothing is sent when SEARCH_INDEX_NOTIFY_URL is not set."""
+    mocker.patch.object(common_utils.settings, "SEARCH_INDEX_NOTIFY_URL", "")
+
+    notify_index_updated()
+
+    notify_post.assert_not_called()
+    common_utils.threading.Thread.assert_not_called()
+
+
+def test_notify_index_updated_failure_is_logged(mocker, notify_post):
+    """Test that a failed notification is logged instead of failing the ingestion."""
+    mocker.patch.object(common_utils.settings, "SEARCH_INDEX_NOTIFY_URL", "http://video-search:8000/index-version")
+    notify_post.side_effect = requests.ConnectionError("connection refused")
+    warning = mocker.patch.object(common_utils.logger, "warning")
+
+    notify_index_updated()
+
+    warning.assert_called_once()
+    assert "connection refused" in warning.call_args.args[0]
+
+
 def test_get_video_fps_and_frames(mocker, tmp_path):
     """
     Test whether get_video_fps_and_frames can produce frames and fps properly
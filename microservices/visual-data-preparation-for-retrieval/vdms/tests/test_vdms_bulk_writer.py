@@ -0,0 +1,150 @@
+# Copyright (C) 2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from src.core.embedding.vdms_bulk_writer import VDMSBulkWriter, VDMSPartialWriteError, VDMSWriteError
+
+
+class FakeVDMSConnection:
+    """Records AddDescriptor queries and answers like a VDMS server."""
+
+    def __init__(self, server, host, port):
+        self.server = server
+        self.connected = True
+
+    def query(self, queries, blobs):
+        return self.server.handle(queries, blobs)
+
+    def disconnect(self):
+        self.connected = False
+
+
+class FakeVDMSServer:
+    def __init__(self, journal_limit=None, delay=0.0, fail_after=None):
+        self.journal_limit = journal_limit
+        self.delay = delay
+        self.fail_after = fail_after
+        self.writes = []
+        self.connections = []
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def connect(self, host, port):
+        connection = FakeVDMSConnection(self, host, port)
+        self.connections.append(connection)
+        return connection
+
+    def handle(self, queries, blobs):
+        entity = queries[0]["AddDescriptor"]
+        properties = entity.get("batch_properties") or [entity["properties"]]
+        if self.journal_limit is not None and len(properties) > self.journal_limit:
+            return [{"status": -1, "info": "OutOfJournalSpace"}], []
+        if self.fail_after is not None and len(self.writes) >= self.fail_after:
+            return [{"AddDescriptor": {"status": -1}, "info": "connection reset"}], []
+
+        with self._lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        time.sleep(self.delay)
+        with self._lock:
+            self.active -= 1
+            self.writes.append((properties, np.frombuffer(blobs[0], dtype=np.float32).reshape(len(properties), -1)))
+        return [{"AddDescriptor": {"status": 0}}], []
+
+
+def make_writer(server, **kwargs):
+    return VDMSBulkWriter(
+        host="vdms",
+        port=55555,
+        collection_name="frames",
+        dimensions=4,
+        client_factory=lambda host, port: server.connect(host, port),
+        **kwargs,
+    )
+
+
+def test_bulk_writer_sends_float32_blobs_with_langchain_properties():
+    """Embeddings travel as one float32 blob per batch with langchain-vdms compatible properties."""
+    server = FakeVDMSServer()
+    writer = make_writer(server, batch_size=3, min_batch_size=1)
+    embeddings = [np.arange(4, dtype=np.float32) + index for index in range(5)]
+
+    ids = writer.write(embeddings, [f"frame_{index}" for index in range(5)], [{"frame_number": i} for i in range(5)])
+
+    assert len(set(ids)) == 5
+    assert [len(properties) for properties, _ in server.writes] == [3, 2]
+    stored = np.concatenate([vectors for _, vectors in server.writes])
+    np.testing.assert_array_equal(stored, np.stack(embeddings))
+    first = server.writes[0][0][0]
+    assert first == {"langchain_id": ids[0], "frame_number": 0, "content": "frame_0"}
+    assert writer.take_property_keys() == {"langchain_id", "frame_number", "content"}
+    assert writer.take_property_keys() == set()
+
+
+def test_bulk_writer_halves_batches_when_journal_is_full():
+    """OutOfJournalSpace lowers the batch size and retries instead of failing the write."""
+    server = FakeVDMSServer(journal_limit=50)
+    writer = make_writer(server, batch_size=200, min_batch_size=8)
+
+    ids = writer.write(np.ones((120, 4)), ["frame"] * 120, [{}] * 120)
+
+    assert len(ids) == 120
+    assert all(len(properties) <= 50 for properties, _ in server.writes)
+    assert sum(len(properties) for properties, _ in server.writes) == 120
+    # Batches never grow back to a size the journal rejected
+    assert writer.sizer.maximum < 100
+
+
+def test_bulk_writer_rejects_mismatched_dimensions():
+    writer = make_writer(FakeVDMSServer())
+
+    with pytest.raises(ValueError, match="dimensions"):
+        writer.write(np.ones((2, 3)), ["a", "b"], [{}, {}])
+
+
+def test_bulk_writer_raises_when_batch_cannot_shrink_further():
+    server = FakeVDMSServer(journal_limit=0)
+    writer = make_writer(server, batch_size=4, min_batch_size=4)
+
+    with pytest.raises(VDMSWriteError):
+        writer.write(np.ones((4, 4)), ["frame"] * 4, [{}] * 4)
+
+
+def test_bulk_writer_reports_ids_stored_before_a_failed_batch():
+    """A batch failing after earlier ones were stored raises with the IDs of the stored descriptors."""
+    server = FakeVDMSServer(fail_after=2)
+    writer = make_writer(server, batch_size=2, min_batch_size=2, max_batch_size=2)
+
+    with pytest.raises(VDMSPartialWriteError) as error:
+        writer.write(np.ones((5, 4)), ["frame"] * 5, [{"frame_number": i} for i in range(5)])
+
+    stored = [props["langchain_id"] for properties, _ in server.writes for props in properties]
+    assert error.value.stored_ids == stored
+    assert len(stored) == 4
+    # Properties of the stored descriptors are still registered
+    assert writer.take_property_keys() == {"langchain_id", "frame_number", "content"}
+
+
+def test_bulk_writer_uses_concurrent_connections_up_to_pool_size():
+    """Concurrent writers each borrow a connection, never opening more than the pool size."""
+    server = FakeVDMSServer(delay=0.05)
+    writer = make_writer(server, connections=3)
+
+    threads = [
+        threading.Thread(target=writer.write, args=(np.ones((2, 4)), ["frame"] * 2, [{}] * 2))
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(server.writes) == 8
+    assert len(server.connections) <= 3
+    assert server.max_active > 1
@@ -1,18 +1,34 @@
 from .config import config
 from .document import load_file_document
 from .logger import logger
+from .vector_store import PersistentFAISS, document_name
 from langchain.retrievers import ContextualCompressionRetriever
-from langchain_community.vectorstores import FAISS
 from langchain_core.runnables import RunnablePassthrough
 from langchain_core.output_parsers import StrOutputParser
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 import os
 import importlib
-import pandas as pd
 
 vectorstore = None
 
+
+def vectorstore_options():
+    """
+    Returns the options of the persistent vectorstore from the configuration.
+
+    Returns:
+        dict: The keyword arguments used to create or load the vectorstore.
+    """
+
+    return {
+        "path": config._VECTORDB_PATH,
+        "ann_min_vectors": config._ANN_MIN_VECTORS,
+        "nprobe": config._ANN_NPROBE,
+        "save_interval": config._VECTORDB_SAVE_INTERVAL,
+    }
+
+
 # The RUN_TEST flag is used to bypass the model download and conversion steps during pytest unit testing.
 # If RUN_TEST is set to "True", the model download and conversion steps are skipped.
 # This flag is set in the conftest.py file before running the tests.
@@ -34,6 +50,9 @@ if os.getenv("RUN_TEST", "").lower() != "true":
 
     prompt = ChatPromptTemplate.from_template(template)
 
+    # Reload the documents ingested before the last restart
+    vectorstore = PersistentFAISS.load(embedding, **vectorstore_options())
+
 else:
     logger.info("Bypassing to mock these functions because RUN_TEST is set to 'True' to run pytest unit test.")
 
@@ -132,11 +151,11 @@ async def process_query(chain=None, query: str = ""):
 
 def create_faiss_vectordb(file_path: str = "", chunk_size=1000, chunk_overlap=200):
     """
-    Creates a FAISS vector database from a document file.
+    Creates embeddings of a document file in the persistent FAISS vector database.
     This function loads a document from the specified file path, splits it into chunks,
-    creates embeddings for the chunks, and stores them in a FAISS vector database. If a
-    global vectorstore already exists, it merges the new embeddings into the existing
-    vectorstore.
+    creates embeddings for the chunks, and stores them in the global vectorstore, replacing
+    the chunks stored before for a document of the same name. The vectorstore is created
+    on the first upload and saved to disk in the background.
 
     Args:
         file_path (str): The path to the document file. Defaults to an empty string.
@@ -160,11 +179,10 @@ def create_faiss_vectordb(file_path: str = "", chunk_size=1000, chunk_overlap=20
         logger.error("No text data from the document.")
         return False
 
-    doc_embedding = FAISS.from_documents(documents=splits, embedding=embedding)
-    if vectorstore == None:
-        vectorstore = doc_embedding
+    if vectorstore is None:
+        vectorstore = PersistentFAISS.from_chunks(splits, embedding, **vectorstore_options())
     else:
-        vectorstore.merge_from(doc_embedding)
+        vectorstore.replace_document(document_name(splits[0]), splits)
 
     return True
 
@@ -172,24 +190,18 @@ def create_faiss_vectordb(file_path: str = "", chunk_size=1000, chunk_overlap=20
 def get_document_from_vectordb():
     """
     Retrieve document names from the vector database.
-    This function accesses the global `vectorstore` object, extracts document
-    metadata, and returns a list of document names.
+    This function returns the names of the documents kept in the document index of
+    the global `vectorstore` object.
 
     Returns:
         []: Return empty list if the `vectorstore` is None.
         list: A list of document names extracted from the vector database.
     """
 
-    global vectorstore
-
     if vectorstore is None:
         return []
 
-    vstore = vectorstore.docstore._dict
-
-    docs = {vstore[key].metadata["source"].split("/")[-1] for key in vstore.keys()}
-
-    return list(docs)
+    return vectorstore.list_documents()
 
 
 def delete_embedding_from_vectordb(document: str = "", delete_all: bool = False):
@@ -204,34 +216,23 @@ def delete_embedding_from_vectordb(document: str = "", delete_all: bool = False)
         bool: True if the deletion process completes successfully.
     """
 
-    global vectorstore
-
     if vectorstore is None:
         return False
 
-    vstore = vectorstore.docstore._dict
-    data_rows = []
-
-    for key in vstore.keys():
-        doc_name = vstore[key].metadata["source"].split("/")[-1]
-        content = vstore[key].page_content
-        data_rows.append(
-            {
-                "chunk_id": key,
-                "document": doc_name,
-                "content": content,
-            }
-        )
-
-    vectordf = pd.DataFrame(data_rows)
-
     if delete_all:
         # delete all the embeddings in vectorstore
-        chunk_list = vectordf["chunk_id"].tolist()
+        vectorstore.clear()
     else:
-        # delete the specified document embeddings in vectorstore
-        chunk_list = vectordf.loc[vectordf["document"] == document]["chunk_id"].tolist()
-
-    vectorstore.delete(chunk_list)
+        # delete the specified document embeddings using the document to chunk id index
+        vectorstore.delete_document(document)
 
     return True
+
+
+def save_vectordb():
+    """
+    Saves the pending changes of the vector database to disk before the application stops.
+    """
+
+    if vectorstore is not None:
+        vectorstore.close()
@@ -39,6 +39,10 @@ class Settings(BaseSettings):
         _CACHE_DIR (str): Directory for model cache.
         _HF_DATASETS_CACHE (str): Directory for Hugging Face datasets cache.
         _TMP_FILE_PATH (str): Temporary file path for documents.
+        _VECTORDB_PATH (str): Directory the vectorstore is saved to, so it is reloaded after a restart.
+        _VECTORDB_SAVE_INTERVAL (float): Interval in seconds between saves of the vectorstore when it changed.
+        _ANN_MIN_VECTORS (int): Number of chunks from which the vectorstore is indexed with IVF instead of exhaustive search.
+        _ANN_NPROBE (int): Number of IVF lists searched for each query.
         _DEFAULT_MODEL_CONFIG (str): Path to the default model configuration YAML.
         _MODEL_CONFIG_PATH (str): Path to the user-provided model configuration YAML.
 
@@ -75,6 +79,10 @@ class Settings(BaseSettings):
     _CACHE_DIR: str = PrivateAttr("/tmp/model_cache")
     _HF_DATASETS_CACHE: str = PrivateAttr("/tmp/model_cache")
     _TMP_FILE_PATH: str = PrivateAttr("/tmp/chatqna/documents")
+    _VECTORDB_PATH: str = PrivateAttr("/tmp/chatqna/vectordb")
+    _VECTORDB_SAVE_INTERVAL: float = PrivateAttr(30)
+    _ANN_MIN_VECTORS: int = PrivateAttr(20000)
+    _ANN_NPROBE: int = PrivateAttr(16)
     _DEFAULT_MODEL_CONFIG: str = PrivateAttr("/tmp/model_config/default_model.yaml")
     _MODEL_CONFIG_PATH: str = PrivateAttr("/tmp/model_config/config.yaml")
 
@@ -16,7 +16,8 @@ from .chain import (
     delete_embedding_from_vectordb,
     get_retriever,
     build_chain,
-    process_query
+    process_query,
+    save_vectordb
 )
 from .document import validate_document, save_document
 
@@ -46,6 +47,15 @@ class ChatRequest(BaseModel):
     stream: bool = True
 
 
+@app.on_event("shutdown")
+def shutdown():
+    """
+    Saves the pending changes of the vector database when the application stops.
+    """
+
+    save_vectordb()
+
+
 # Conditionally include OpenVINO routes
 if config.MODEL_RUNTIME == "openvino":
     from .openvino_routes import router as openvino_router
@@ -0,0 +1,388 @@
+from .logger import logger
+from langchain_community.docstore.in_memory import InMemoryDocstore
+from langchain_community.vectorstores import FAISS
+from langchain_core.documents import Document
+from pathlib import Path
+from typing import Dict, List, Optional
+import faiss
+import numpy as np
+import os
+import pickle
+import shutil
+import threading
+import time
+import uuid
+
+INDEX_FILE = "index.faiss"
+DOCSTORE_FILE = "index.pkl"
+CURRENT_FILE = "CURRENT"
+GENERATION_PREFIX = "generation-"
+
+
+def document_name(doc: Document) -> str:
+    """
+    Returns the name of the document a chunk was split from.
+
+    Args:
+        doc (Document): A chunk of an ingested document.
+
+    Returns:
+        str: The file name of the source document.
+    """
+
+    return doc.metadata.get("source", "").split("/")[-1]
+
+
+def _write_file(file_path: str, data: bytes):
+    with open(file_path, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+class PersistentFAISS(FAISS):
+    """
+    FAISS vectorstore that is saved to disk and updated in place.
+
+    Every chunk gets a stable vector id, and the ids of the chunks of each document are kept
+    in a side index, so that a document is replaced or deleted without scanning the whole
+    docstore. The vectors are searched exhaustively until the collection reaches
+    `ann_min_vectors` chunks, after which the index is rebuilt in the background as an IVF
+    index and rebuilt again whenever the collection has grown four times larger than the
+    data the index was trained on.
+
+    The store is written to `path` by a background thread at most every `save_interval`
+    seconds when it changed. Each save goes to a new generation directory holding the
+    same `index.faiss` and `index.pkl` files as `FAISS.save_local`, and the `CURRENT` file
+    is replaced atomically to point to it, so a crash while saving keeps the previous copy.
+    """
+
+    def __init__(
+        self,
+        embedding_function,
+        index,
+        docstore,
+        index_to_docstore_id: Dict[int, str],
+        path: str,
+        ann_min_vectors: int = 20000,
+        nprobe: int = 16,
+        save_interval: float = 30,
+    ):
+        super().__init__(embedding_function, index, docstore, index_to_docstore_id)
+        self.path = path
+        self.ann_min_vectors = ann_min_vectors
+        self.nprobe = nprobe
+        self.save_interval = save_interval
+
+        # Searches and updates are serialized, as FAISS indexes are not safe to modify while searched
+        self._lock = threading.RLock()
+        self._save_lock = threading.Lock()
+        self._dirty = False
+        self._reindexing = False
+        self._next_id = max(index_to_docstore_id, default=-1) + 1
+        self._trained_size = index.ntotal if isinstance(index, faiss.IndexIVF) else 0
+
+        self.doc_chunks: Dict[str, List[int]] = {}
+        for vector_id, docstore_id in index_to_docstore_id.items():
+            name = document_name(docstore.search(docstore_id))
+            self.doc_chunks.setdefault(name, []).append(vector_id)
+
+        self._stop = threading.Event()
+        if save_interval > 0:
+            threading.Thread(target=self._autosave, name="vectorstore-save", daemon=True).start()
+
+    @staticmethod
+    def _flat_index(dimension: int):
+        return faiss.IndexIDMap2(faiss.IndexFlatL2(dimension))
+
+    @classmethod
+    def from_chunks(cls, documents: List[Document], embedding, **kwargs) -> "PersistentFAISS":
+        """
+        Creates a new vectorstore from the chunks of a document.
+
+        Args:
+            documents (List[Document]): The chunks to embed and store.
+            embedding: The embedding model used to embed the chunks and the queries.
+            **kwargs: The options of the vectorstore, including the `path` it is saved to.
+
+        Returns:
+            PersistentFAISS: The vectorstore holding the chunks.
+        """
+
+        vectors = embedding.embed_documents([doc.page_content for doc in documents])
+        store = cls(embedding, cls._flat_index(len(vectors[0])), InMemoryDocstore(), {}, **kwargs)
+        with store._lock:
+            store._add(documents, vectors)
+
+        return store
+
+    @classmethod
+    def load(cls, embedding, path: str, **kwargs) -> Optional["PersistentFAISS"]:
+        """
+        Loads the vectorstore last saved to a directory.
+
+        Args:
+            embedding: The embedding model used to embed the chunks and the queries.
+            path (str): The directory the vectorstore is saved to.
+            **kwargs: The options of the vectorstore.
+
+        Returns:
+            Optional[PersistentFAISS]: The vectorstore, or None if nothing was saved yet.
+        """
+
+        current = Path(path) / CURRENT_FILE
+        if not current.is_file():
+            return None
+
+        folder = Path(path) / current.read_text().strip()
+        index = faiss.read_index(str(folder / INDEX_FILE))
+        with open(folder / DOCSTORE_FILE, "rb") as f:
+            docstore, index_to_docstore_id = pickle.load(f)
+
+        if isinstance(index, faiss.IndexIVF):
+            index.nprobe = kwargs.get("nprobe", 16)
+
+        logger.info(f"Loaded {index.ntotal} embeddings from {folder}.")
+
+        return cls(embedding, index, docstore, index_to_docstore_id, path=path, **kwargs)
+
+    def _add(self, documents: List[Document], vectors) -> List[str]:
+        vector_ids = list(range(self._next_id, self._next_id + len(documents)))
+        self._next_id += len(documents)
+        docstore_ids = [str(uuid.uuid4()) for _ in documents]
+
+        self.docstore.add(dict(zip(docstore_ids, documents)))
+        self.index_to_docstore_id.update(zip(vector_ids, docstore_ids))
+        self.index.add_with_ids(
+            np.asarray(vectors, dtype=np.float32), np.asarray(vector_ids, dtype=np.int64)
+        )
+        for vector_id, doc in zip(vector_ids, documents):
+            self.doc_chunks.setdefault(document_name(doc), []).append(vector_id)
+
+        self._dirty = True
+        self._maybe_reindex()
+
+        return docstore_ids
+
+    def _remove(self, vector_ids: List[int]):
+        if not vector_ids:
+            return
+
+        ids = np.asarray(vector_ids, dtype=np.int64)
+        if isinstance(self.index, faiss.IndexIVF):
+            # The hashtable direct map removes an array of ids without scanning the inverted lists
+            self.index.remove_ids(faiss.IDSelectorArray(len(ids), faiss.swig_ptr(ids)))
+        else:
+            self.index.remove_ids(ids)
+
+        self.docstore.delete([self.index_to_docstore_id.pop(i) for i in vector_ids])
+        self._dirty = True
+
+    def add_texts(self, texts, metadatas=None, ids=None, **kwargs) -> List[str]:
+        texts = list(texts)
+        return self.add_embeddings(zip(texts, self._embed_documents(texts)), metadatas, ids)
+
+    def add_embeddings(self, text_embeddings, metadatas=None, ids=None, **kwargs) -> List[str]:
+        texts, vectors = zip(*text_embeddings)
+        metadatas = metadatas or [{} for _ in texts]
+        documents = [
+            Document(page_content=text, metadata=metadata)
+            for text, metadata in zip(texts, metadatas)
+        ]
+        with self._lock:
+            return self._add(documents, vectors)
+
+    def delete(self, ids: Optional[List[str]] = None, **kwargs) -> Optional[bool]:
+        """
+        Deletes chunks by their docstore ids.
+
+        Args:
+            ids (Optional[List[str]]): The docstore ids of the chunks, as returned when they were added.
+
+        Returns:
+            Optional[bool]: True once the chunks are deleted.
+
+        Raises:
+            ValueError: If no ids are given or some of them are not stored.
+        """
+
+        if ids is None:
+            raise ValueError("No ids provided to delete.")
+
+        with self._lock:
+            vector_ids = {
+                docstore_id: vector_id
+                for vector_id, docstore_id in self.index_to_docstore_id.items()
+            }
+            missing = set(ids).difference(vector_ids)
+            if missing:
+                raise ValueError(f"Some specified ids do not exist in the current store. Ids not found: {missing}")
+
+            removed = {vector_ids[docstore_id] for docstore_id in ids}
+            for name in list(self.doc_chunks):
+                chunks = [i for i in self.doc_chunks[name] if i not in removed]
+                if chunks:
+                    self.doc_chunks[name] = chunks
+                else:
+                    del self.doc_chunks[name]
+            self._remove(list(removed))
+
+        return True
+
+    def replace_document(self, name: str, documents: List[Document]):
+        """
+        Stores the chunks of a document, replacing the chunks stored for it before.
+
+        Args:
+            name (str): The name of the document.
+            documents (List[Document]): The chunks of the document.
+        """
+
+        vectors = self._embed_documents([doc.page_content for doc in documents])
+        with self._lock:
+            self._remove(self.doc_chunks.pop(name, []))
+            self._add(documents, vectors)
+
+    def delete_document(self, name: str) -> bool:
+        """
+        Deletes the chunks of a document.
+
+        Args:
+            name (str): The name of the document.
+
+        Returns:
+            bool: True if chunks of the document were stored.
+        """
+
+        with self._lock:
+            vector_ids = self.doc_chunks.pop(name, None)
+            self._remove(vector_ids)
+
+        return bool(vector_ids)
+
+    def clear(self):
+        """Deletes all the chunks."""
+
+        with self._lock:
+            self.index = self._flat_index(self.index.d)
+            self.docstore = InMemoryDocstore()
+            self.index_to_docstore_id = {}
+            self.doc_chunks = {}
+            self._trained_size = 0
+            self._dirty = True
+
+    def list_documents(self) -> List[str]:
+        """
+        Returns the names of the documents stored.
+
+        Returns:
+            List[str]: The names of the documents.
+        """
+
+        with self._lock:
+            return list(self.doc_chunks)
+
+    def similarity_search_with_score_by_vector(self, *args, **kwargs):
+        with self._lock:
+            return super().similarity_search_with_score_by_vector(*args, **kwargs)
+
+    def max_marginal_relevance_search_with_score_by_vector(self, *args, **kwargs):
+        with self._lock:
+            return super().max_marginal_relevance_search_with_score_by_vector(*args, **kwargs)
+
+    def _maybe_reindex(self):
+        ntotal = self.index.ntotal
+        if self._reindexing:
+            return
+        if isinstance(self.index, faiss.IndexIVF):
+            if ntotal < 4 * self._trained_size:
+                return
+        elif ntotal < self.ann_min_vectors:
+            return
+
+        self._reindexing = True
+        threading.Thread(target=self._reindex, name="vectorstore-reindex", daemon=True).start()
+
+    def _reindex(self):
+        try:
+            with self._lock:
+                ids = np.fromiter(self.index_to_docstore_id, dtype=np.int64)
+                vectors = self.index.reconstruct_batch(ids)
+                dimension = self.index.d
+
+            # The new index is trained and filled without blocking searches and updates
+            nlist = max(1, int(np.sqrt(len(ids))))
+            quantizer = faiss.IndexFlatL2(dimension)
+            index = faiss.IndexIVFFlat(quantizer, dimension, nlist, faiss.METRIC_L2)
+            sample = np.random.default_rng().choice(len(ids), min(len(ids), nlist * 256), replace=False)
+            index.train(vectors[sample])
+            index.set_direct_map_type(faiss.DirectMap.Hashtable)
+            index.nprobe = self.nprobe
+            index.add_with_ids(vectors, ids)
+
+            with self._lock:
+                # Apply the updates made while the new index was built
+                snapshot = set(ids.tolist())
+                current = set(self.index_to_docstore_id)
+                removed = np.fromiter(snapshot - current, dtype=np.int64)
+                if len(removed):
+                    index.remove_ids(faiss.IDSelectorArray(len(removed), faiss.swig_ptr(removed)))
+                added = np.fromiter(current - snapshot, dtype=np.int64)
+                if len(added):
+                    index.add_with_ids(self.index.reconstruct_batch(added), added)
+
+                self.index = index
+                self._trained_size = len(ids)
+                self._dirty = True
+
+            logger.info(f"Rebuilt vectorstore index as IVF with {nlist} lists over {len(ids)} embeddings.")
+
+        except Exception:
+            logger.exception("Error rebuilding vectorstore index.")
+
+        finally:
+            self._reindexing = False
+
+    def save(self):
+        """Saves the vectorstore to disk if it changed since it was last saved."""
+
+        with self._save_lock:
+            with self._lock:
+                if not self._dirty:
+                    return
+                index_data = faiss.serialize_index(self.index)
+                state = pickle.dumps((self.docstore, self.index_to_docstore_id))
+                self._dirty = False
+
+            try:
+                generation = f"{GENERATION_PREFIX}{time.time_ns()}"
+                folder = Path(self.path) / generation
+                folder.mkdir(parents=True)
+                _write_file(str(folder / INDEX_FILE), index_data.tobytes())
+                _write_file(str(folder / DOCSTORE_FILE), state)
+
+                current = Path(self.path) / CURRENT_FILE
+                _write_file(f"{current}.tmp", generation.encode())
+                os.replace(f"{current}.tmp", current)
+
+            except Exception:
+                with self._lock:
+                    self._dirty = True
+                raise
+
+            for entry in Path(self.path).iterdir():
+                if entry.name.startswith(GENERATION_PREFIX) and entry.name != generation:
+                    shutil.rmtree(entry, ignore_errors=True)
+
+    def _autosave(self):
+        while not self._stop.wait(self.save_interval):
+            try:
+                self.save()
+            except Exception:
+                logger.exception("Error saving vectorstore.")
+
+    def close(self):
+        """Stops saving the vectorstore periodically and saves the pending changes."""
+
+        self._stop.set()
+        self.save()
@@ -0,0 +1,149 @@
+import time
+
+import faiss
+import numpy as np
+import pytest
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+
+
+DIMENSION = 8
+
+
+class FakeEmbeddings(Embeddings):
+    """Embeds a text as a random vector seeded by its content, so equal texts get equal vectors."""
+
+    def embed_documents(self, texts):
+        return [self.embed_query(text) for text in texts]
+
+    def embed_query(self, text):
+        seed = sum(text.encode()) * 31 + len(text)
+        return np.random.default_rng(seed).random(DIMENSION).tolist()
+
+
+def chunks(name, count, prefix="chunk"):
+    return [
+        Document(page_content=f"{prefix} {i} of {name}", metadata={"source": f"/docs/{name}"})
+        for i in range(count)
+    ]
+
+
+@pytest.fixture
+def new_store(tmp_path):
+    from app.vector_store import PersistentFAISS
+
+    stores = []
+
+    def create(documents, **kwargs):
+        options = {"path": str(tmp_path), "save_interval": 0, **kwargs}
+        store = PersistentFAISS.from_chunks(documents, FakeEmbeddings(), **options)
+        stores.append(store)
+        return store
+
+    yield create
+
+    for store in stores:
+        store._stop.set()
+
+
+def stored_texts(store):
+    return sorted(doc.page_content for doc in store.docstore._dict.values())
+
+
+def test_replace_and_delete_document(new_store):
+    """
+    Tests that replacing a document swaps its chunks and that deleting it removes them,
+    leaving the chunks of the other documents searchable.
+    """
+
+    store = new_store(chunks("a.txt", 3) + chunks("b.txt", 2))
+    assert sorted(store.list_documents()) == ["a.txt", "b.txt"]
+    assert store.index.ntotal == 5
+
+    store.replace_document("a.txt", chunks("a.txt", 1, prefix="new"))
+    assert store.index.ntotal == 3
+    assert "new 0 of a.txt" in stored_texts(store)
+    assert "chunk 0 of a.txt" not in stored_texts(store)
+
+    assert store.delete_document("a.txt") is True
+    assert store.delete_document("a.txt") is False
+    assert store.list_documents() == ["b.txt"]
+    assert store.index.ntotal == 2
+
+    result = store.similarity_search("chunk 1 of b.txt", k=1)
+    assert result[0].page_content == "chunk 1 of b.txt"
+
+
+def test_delete_by_docstore_ids(new_store):
+    """
+    Tests that chunks are deleted by the docstore ids returned when they were added,
+    and that the document index drops documents left without chunks.
+    """
+
+    store = new_store(chunks("a.txt", 2))
+    ids = store.add_texts(["x", "y"], metadatas=[{"source": "b.txt"}, {"source": "c.txt"}])
+
+    assert store.delete([ids[0]]) is True
+    assert sorted(store.list_documents()) == ["a.txt", "c.txt"]
+    assert store.index.ntotal == 3
+    assert "x" not in stored_texts(store)
+
+    with pytest.raises(ValueError):
+        store.delete([ids[0]])
+    with pytest.raises(ValueError):
+        store.delete()
+    assert store.index.ntotal == 3
+
+
+def test_rebuilds_index_as_ivf(new_store):
+    """
+    Tests that the index is rebuilt as an IVF index once the collection reaches
+    `ann_min_vectors` chunks, and that updates keep working on the rebuilt index.
+    """
+
+    store = new_store(chunks("a.txt", 40) + chunks("b.txt", 40), ann_min_vectors=64, nprobe=64)
+
+    deadline = time.monotonic() + 30
+    while store._reindexing or not isinstance(store.index, faiss.IndexIVF):
+        assert time.monotonic() < deadline, "index was not rebuilt"
+        time.sleep(0.05)
+
+    assert store.index.ntotal == 80
+    assert store.delete_document("a.txt") is True
+    assert store.index.ntotal == 40
+
+    result = store.similarity_search("chunk 7 of b.txt", k=1)
+    assert result[0].page_content == "chunk 7 of b.txt"
+
+
+def test_save_and_load_generations(new_store, tmp_path):
+    """
+    Tests that each save writes a new generation directory that CURRENT points to,
+    removes the previous generation and is loaded back with its documents.
+    """
+
+    from app.vector_store import CURRENT_FILE, GENERATION_PREFIX, PersistentFAISS
+
+    assert PersistentFAISS.load(FakeEmbeddings(), str(tmp_path)) is None
+
+    store = new_store(chunks("a.txt", 2) + chunks("b.txt", 2))
+    store.save()
+    first = (tmp_path / CURRENT_FILE).read_text()
+
+    store.delete_document("a.txt")
+    store.save()
+    second = (tmp_path / CURRENT_FILE).read_text()
+
+    generations = [p.name for p in tmp_path.iterdir() if p.name.startswith(GENERATION_PREFIX)]
+    assert second != first
+    assert generations == [second]
+
+    loaded = PersistentFAISS.load(FakeEmbeddings(), str(tmp_path), save_interval=0)
+    assert loaded.list_documents() == ["b.txt"]
+    assert loaded.index.ntotal == 2
+    assert stored_texts(loaded) == stored_texts(store)
+
+    # Vector ids keep growing after a reload, so new chunks do not reuse the ids of stored ones
+    loaded.replace_document("c.txt", chunks("c.txt", 1))
+    assert loaded.index.ntotal == 3
+    assert sorted(loaded.list_documents()) == ["b.txt", "c.txt"]
@@ -9,6 +9,7 @@ from langchain_postgres.vectorstores import PGVector as EGAIVectorDB
 from langchain_core.output_parsers import StrOutputParser
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.runnables import (
+    ConfigurableField,
     RunnableParallel,
     RunnablePassthrough,
     RunnableLambda,
@@ -17,6 +18,8 @@ from langchain_core.vectorstores import VectorStoreRetriever as EGAIVectorStoreR
 from langchain_openai import ChatOpenAI as EGAIModelServing
 from langchain_openai import OpenAIEmbeddings as EGAIEmbeddings
 from .custom_reranker import CustomReranker
+from .http_clients import async_http_client, sync_http_client, timeout
+from .semantic_cache import SEMANTIC_CACHE_ENABLED, semantic_cache
 import logging
 from opentelemetry import trace
 from opentelemetry.sdk.trace import TracerProvider
@@ -69,7 +72,11 @@ try:
     embedder = EGAIEmbeddings(
         openai_api_key="EMPTY",
         openai_api_base="{}".format(EMBEDDING_ENDPOINT_URL),
-        model=MODEL_NAME
+        model=MODEL_NAME,
+        # The OpenAI SDK applies its own default timeout to every request unless one is passed
+        timeout=timeout,
+        http_client=sync_http_client,
+        http_async_client=async_http_client,
     )
     logging.info(
         f"Embeddings initialized with endpoint configured in EMBEDDING_ENDPOINT_URL"
@@ -137,7 +144,8 @@ async def context_retriever_fn(chain_inputs: dict):
     Retrieve relevant documents for a given question and conversation history.
 
     Args:
-        chain_inputs (dict): Dictionary with "question" and "history" keys.
+        chain_inputs (dict): Dictionary with "question" and "history" keys, and the
+            "question_embedding" key when the semantic cache is enabled.
 
     Returns:
         list: List of relevant Document objects (may be empty if no question or no results).
@@ -153,6 +161,20 @@ async def context_retriever_fn(chain_inputs: dict):
     if not question:
         return {}  # to keep shape consistent
 
+    # With the semantic cache, the question was embedded once already and retrieval results are cached
+    question_embedding = chain_inputs.get("question_embedding")
+    if question_embedding is not None:
+        retrieved_docs = semantic_cache.retrieval.get(question_embedding)
+        if retrieved_docs is None:
+            cache_version = semantic_cache.version
+            retrieved_docs = await knowledge_base.amax_marginal_relevance_search_by_vector(
+                question_embedding, k=FETCH_K, fetch_k=FETCH_K * 3
+            )
+            # Results of a search that overlapped a document update are not cached
+            if cache_version == semantic_cache.version:
+                semantic_cache.retrieval.put(question_embedding, retrieved_docs)
+        return retrieved_docs
+
     retrieved_docs = await retriever.aget_relevant_documents(question)
     return retrieved_docs     # context: list[Document]
 
@@ -180,11 +202,84 @@ def format_docs(docs):
     
     return "\n\n".join(formatted_docs)
 
+def build_model():
+    """
+    Create the LLM client shared by all requests. The maximum number of tokens is a
+    configurable field, set per request through the chain config.
+
+    Returns:
+        Runnable: The chat model client, using the shared HTTP connection pools.
+    """
+    if LLM_BACKEND in ["vllm", "unknown"]:
+        # max_tokens is not sent to these backends, answers end at the stop sequence
+        return EGAIModelServing(
+            openai_api_key="EMPTY",
+            openai_api_base="{}".format(ENDPOINT_URL),
+            model_name=LLM_MODEL,
+            top_p=0.99,
+            temperature=0.01,
+            streaming=True,
+            callbacks=callbacks,
+            stop=["\n\n"],
+            timeout=timeout,
+            http_client=sync_http_client,
+            http_async_client=async_http_client,
+        )
+
+    seed_value = int(os.getenv("SEED", 42))
+    return EGAIModelServing(
+        openai_api_key="EMPTY",
+        openai_api_base="{}".format(ENDPOINT_URL),
+        model_name=LLM_MODEL,
+        top_p=0.99,
+        temperature=0.01,
+        streaming=True,
+        callbacks=callbacks,
+        seed=seed_value,
+        timeout=timeout,
+        http_client=sync_http_client,
+        http_async_client=async_http_client,
+    ).configurable_fields(
+        max_tokens=ConfigurableField(id="max_tokens", name="Maximum number of tokens of the answer")
+    )
+
+
+def build_chain():
+    """
+    Build the RAG chain once, so requests don't pay for creating the LLM client,
+    the reranker and the chain.
+
+    Returns:
+        Runnable: The chain taking a dict with "question" and "history" keys.
+    """
+    context_retriever = RunnableLambda(context_retriever_fn) # it passes all chain_input dict to context_retriever fn
+
+    re_ranker = CustomReranker(reranking_endpoint=RERANKER_ENDPOINT)
+    # The async variant is used by astream, so reranking does not block the event loop
+    re_ranker_lambda = RunnableLambda(re_ranker.rerank, afunc=re_ranker.arerank)
+
+    # RAG Chain
+    return (
+        RunnableParallel({
+            "context": context_retriever,  # context retrieved from vector store
+            "question": lambda x: x["question"],  # passes through the question
+            "history": lambda x: x["history"]  # passes through the history
+        })
+        | re_ranker_lambda
+        | {"context": (lambda x: format_docs(x["context"])), "question": lambda x: x["question"], "history": lambda x: x["history"]}
+        | prompt
+        | build_model()
+        | StrOutputParser()
+    )
+
+
+chain = build_chain()
+
 async def process_chunks(conversation_messages, max_tokens):
     """
     Process a list of conversation messages and stream the LLM-generated answer.
 
-    This function builds the retrieval-augmented generation (RAG) chain, including context retrieval,
+    This function runs the retrieval-augmented generation (RAG) chain, including context retrieval,
     reranking, prompt formatting, and LLM inference. It streams the output as server-sent events.
 
     Args:
@@ -218,57 +313,34 @@ async def process_chunks(conversation_messages, max_tokens):
     if not question_text or not question_text.strip():
         raise ValueError("Question text cannot be empty")
 
-    context_retriever = RunnableLambda(context_retriever_fn) # it passes all chain_input dict to context_retriever fn
-
-    if LLM_BACKEND in ["vllm", "unknown"]:
-        seed_value = None
-        model = EGAIModelServing(
-            openai_api_key="EMPTY",
-            openai_api_base="{}".format(ENDPOINT_URL),
-            model_name=LLM_MODEL,
-            top_p=0.99,
-            temperature=0.01,
-            streaming=True,
-            callbacks=callbacks,
-            stop=["\n\n"],
-        )
-    else:
-        seed_value = int(os.getenv("SEED", 42))
-        model = EGAIModelServing(
-            openai_api_key="EMPTY",
-            openai_api_base="{}".format(ENDPOINT_URL),
-            model_name=LLM_MODEL,
-            top_p=0.99,
-            temperature=0.01,
-            streaming=True,
-            callbacks=callbacks,
-            seed=seed_value,
-            max_tokens=max_tokens
-        )
-
-    re_ranker = CustomReranker(reranking_endpoint=RERANKER_ENDPOINT)
-    re_ranker_lambda = RunnableLambda(re_ranker.rerank)
-
-    # RAG Chain
-    chain = (
-        RunnableParallel({
-            "context": context_retriever,  # context retrieved from vector store
-            "question": lambda x: x["question"],  # passes through the question
-            "history": lambda x: x["history"]  # passes through the history
-        })
-        | re_ranker_lambda
-        | {"context": (lambda x: format_docs(x["context"])), "question": lambda x: x["question"], "history": lambda x: x["history"]}
-        | prompt
-        | model
-        | StrOutputParser()
-    )
-
     # Run the chain with all inputs
     chain_input = {
         "history": history, # chain will call context_retriever internally, no need to add it.
         "question": question_text
     }
 
-    async for log in chain.astream(chain_input):
+    # max_tokens is set per request on the chain built once at startup
+    chain_config = {"configurable": {"max_tokens": max_tokens}}
+
+    if not SEMANTIC_CACHE_ENABLED:
+        async for log in chain.astream(chain_input, config=chain_config):
+            yield f"data: {log}\n\n"
+        return
+
+    # Replay the answer of a similar earlier question with the same history
+    cache_version = semantic_cache.version
+    question_embedding = await embedder.aembed_query(question_text)
+    cached_chunks = semantic_cache.lookup(question_embedding, history, max_tokens)
+    if cached_chunks is not None:
+        for log in cached_chunks:
+            yield f"data: {log}\n\n"
+        return
+
+    chunks = []
+    async for log in chain.astream({**chain_input, "question_embedding": question_embedding}, config=chain_config):
+        chunks.append(log)
         yield f"data: {log}\n\n"
 
+    # Only complete answers are cached
+    semantic_cache.store(question_embedding, history, max_tokens, chunks, cache_version)
+
@@ -2,16 +2,30 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import logging
-from typing import Any, Dict
+import os
+from typing import Any, Dict, List, Optional
 
-import requests
+import httpx
+
+from .http_clients import async_http_client, sync_http_client
 
 logging.basicConfig(level=logging.INFO)
 
+RERANKER_TIMEOUT = float(os.getenv("RERANKER_TIMEOUT", "10"))
+
 
 class CustomReranker:
-    def __init__(self, reranking_endpoint: str):
+    def __init__(
+        self,
+        reranking_endpoint: str,
+        async_client: Optional[httpx.AsyncClient] = None,
+        client: Optional[httpx.Client] = None,
+        timeout: float = RERANKER_TIMEOUT,
+    ):
         self._reranking_endpoint = reranking_endpoint
+        self._async_client = async_client or async_http_client
+        self._client = client or sync_http_client
+        self._timeout = timeout
         logging.info(
             f"Initialized CustomReranker with reranking_endpoint: {self._reranking_endpoint}"
         )
@@ -37,34 +51,51 @@ class CustomReranker:
         else:
             return retrieved_docs
 
-    def rerank_tei(self, retrieved_docs: Dict[str, Any]) -> Dict[str, Any]:
-        texts = [d.page_content for d in retrieved_docs["context"]]
+    async def arerank(self, retrieved_docs: Dict[str, Any]) -> Dict[str, Any]:
+        self.validate_retrieved_docs(retrieved_docs=retrieved_docs)
+        if len(retrieved_docs["context"]) > 0:
+            return await self.arerank_tei(retrieved_docs=retrieved_docs)
+        else:
+            return retrieved_docs
 
-        request_body = {
+    def _request_body(self, retrieved_docs: Dict[str, Any]) -> Dict[str, Any]:
+        return {
             "query": retrieved_docs["question"],
-            "texts": texts,
+            "texts": [d.page_content for d in retrieved_docs["context"]],
             "raw_scores": False,
         }
 
-        response = requests.post(
+    def _reranked_docs(self, retrieved_docs: Dict[str, Any], response: httpx.Response) -> Dict[str, Any]:
+        if response.status_code != 200:
+            raise Exception(f"Error: {response.status_code}, {response.text}")
+
+        res: List[Dict[str, Any]] = response.json()
+        # Sort by score descending, pick top 3 or all if less than 3
+        sorted_results = sorted(res, key=lambda x: x["score"], reverse=True)
+        top_k = min(3, len(sorted_results))
+        reranked_context = [
+            retrieved_docs["context"][item["index"]] for item in sorted_results[:top_k]
+        ]
+        logging.info(f"Reranked context for question '{retrieved_docs['question']}': {reranked_context}")
+
+        return {
+            "question": retrieved_docs["question"],
+            "context": reranked_context,
+            "history": retrieved_docs.get("history", "")
+        }
+
+    def rerank_tei(self, retrieved_docs: Dict[str, Any]) -> Dict[str, Any]:
+        response = self._client.post(
             url=f"{self.reranking_endpoint}",
-            json=request_body,
-            headers={"Content-Type": "application/json"},
+            json=self._request_body(retrieved_docs),
+            timeout=self._timeout,
         )
-        if response.status_code == 200:
-            res = response.json()
-            # Sort by score descending, pick top 3 or all if less than 3
-            sorted_results = sorted(res, key=lambda x: x["score"], reverse=True)
-            top_k = min(3, len(sorted_results))
-            reranked_context = [
-                retrieved_docs["context"][item["index"]] for item in sorted_results[:top_k]
-            ]
-            logging.info(f"Reranked context for question '{retrieved_docs['question']}': {reranked_context}")
-
-            return {
-                "question": retrieved_docs["question"],
-                "context": reranked_context,
-                "history": retrieved_docs.get("history", "")
-            }
-        else:
-            raise Exception(f"Error: {response.status_code}, {response.text}")
+        return self._reranked_docs(retrieved_docs, response)
+
+    async def arerank_tei(self, retrieved_docs: Dict[str, Any]) -> Dict[str, Any]:
+        response = await self._async_client.post(
+            url=f"{self.reranking_endpoint}",
+            json=self._request_body(retrieved_docs),
+            timeout=self._timeout,
+        )
+        return self._reranked_docs(retrieved_docs, response)
@@ -0,0 +1,39 @@
+# Copyright (C) 2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+import importlib.util
+import logging
+import os
+
+import httpx
+
+# Connection pools shared by the LLM, embedding and reranker clients, so that every chat
+# request reuses open keep-alive connections instead of opening its own
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "200"))
+HTTP_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", "100"))
+HTTP_KEEPALIVE_EXPIRY = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "60"))
+HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "5"))
+# Applies between two received chunks, so long streamed answers are not cut off
+HTTP_READ_TIMEOUT = float(os.getenv("HTTP_READ_TIMEOUT", "120"))
+
+# HTTP/2 is negotiated with TLS endpoints only and requires the h2 package
+HTTP2_ENABLED = os.getenv("HTTP2_ENABLED", "true").lower() == "true"
+if HTTP2_ENABLED and importlib.util.find_spec("h2") is None:
+    logging.info("HTTP/2 disabled: the h2 package is not installed")
+    HTTP2_ENABLED = False
+
+limits = httpx.Limits(
+    max_connections=HTTP_MAX_CONNECTIONS,
+    max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS,
+    keepalive_expiry=HTTP_KEEPALIVE_EXPIRY,
+)
+timeout = httpx.Timeout(HTTP_READ_TIMEOUT, connect=HTTP_CONNECT_TIMEOUT)
+
+async_http_client = httpx.AsyncClient(limits=limits, timeout=timeout, http2=HTTP2_ENABLED)
+sync_http_client = httpx.Client(limits=limits, timeout=timeout, http2=HTTP2_ENABLED)
+
+
+async def close_http_clients():
+    """Closes the shared connection pools when the application shuts down."""
+    await async_http_client.aclose()
+    sync_http_client.close()
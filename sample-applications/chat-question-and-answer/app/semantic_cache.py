@@ -0,0 +1,174 @@
+# Copyright (C) 2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+import hashlib
+import logging
+import os
+import struct
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+SEMANTIC_CACHE_ENABLED = os.getenv("SEMANTIC_CACHE_ENABLED", "false").lower() == "true"
+# Minimum cosine similarity between two questions for the cached answer to be reused
+SEMANTIC_CACHE_THRESHOLD = float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.95"))
+SEMANTIC_CACHE_SIZE = int(os.getenv("SEMANTIC_CACHE_SIZE", "512"))
+RETRIEVAL_CACHE_SIZE = int(os.getenv("RETRIEVAL_CACHE_SIZE", "1024"))
+# Entries expire even without invalidation, in case a document update was not notified
+SEMANTIC_CACHE_TTL = float(os.getenv("SEMANTIC_CACHE_TTL", "3600"))
+
+
+def embedding_key(embedding: List[float]) -> str:
+    return hashlib.blake2b(struct.pack(f"{len(embedding)}d", *embedding), digest_size=16).hexdigest()
+
+
+def history_key(history: str) -> str:
+    return hashlib.blake2b(history.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class CacheStats:
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+
+    def record(self, hit: bool):
+        if hit:
+            self.hits += 1
+        else:
+            self.misses += 1
+
+    def as_dict(self, size: int, max_size: int) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "size": size,
+            "max_size": max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+class RetrievalCache:
+    """LRU cache of the documents retrieved for a question embedding."""
+
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max(0, max_size)
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[float, list]]" = OrderedDict()
+        self.stats = CacheStats()
+
+    def get(self, embedding: List[float]) -> Optional[list]:
+        key = embedding_key(embedding)
+        entry = self._entries.get(key)
+        if entry is not None and time.monotonic() - entry[0] > self.ttl:
+            del self._entries[key]
+            entry = None
+
+        self.stats.record(entry is not None)
+        if entry is None:
+            return None
+        self._entries.move_to_end(key)
+        return entry[1]
+
+    def put(self, embedding: List[float], docs: list):
+        if self.max_size == 0:
+            return
+        key = embedding_key(embedding)
+        self._entries[key] = (time.monotonic(), docs)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class SemanticCache:
+    """
+    LRU cache of streamed answers, looked up by the similarity of the question.
+
+    An answer is reused for a new question when the conversation history and the maximum
+    number of tokens are the same and the cosine similarity of the question embeddings is at
+    least the threshold. Both caches are cleared when the documents of the collection change,
+    and answers generated while the documents changed are not stored.
+    """
+
+    def __init__(self, max_size: int, threshold: float, ttl: float, retrieval_cache_size: int):
+        self.max_size = max(0, max_size)
+        self.threshold = threshold
+        self.ttl = ttl
+        self.version = 0
+        # key -> (created, context key, normalized question embedding, answer chunks)
+        self._entries: "OrderedDict[int, Tuple[float, tuple, np.ndarray, List[str]]]" = OrderedDict()
+        self._next_id = 0
+        self.stats = CacheStats()
+        self.retrieval = RetrievalCache(retrieval_cache_size, ttl)
+
+    @staticmethod
+    def _normalize(embedding: List[float]) -> np.ndarray:
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else vector
+
+    def lookup(self, embedding: List[float], history: str, max_tokens: int) -> Optional[List[str]]:
+        """Returns the answer chunks cached for the most similar question, if it is similar enough."""
+        context = (history_key(history), max_tokens)
+        now = time.monotonic()
+
+        expired = [key for key, entry in self._entries.items() if now - entry[0] > self.ttl]
+        for key in expired:
+            del self._entries[key]
+
+        candidates = [key for key, entry in self._entries.items() if entry[1] == context]
+        best_key = None
+        if candidates:
+            matrix = np.stack([self._entries[key][2] for key in candidates])
+            similarities = matrix @ self._normalize(embedding)
+            best = int(np.argmax(similarities))
+            if similarities[best] >= self.threshold:
+                best_key = candidates[best]
+
+        self.stats.record(best_key is not None)
+        if best_key is None:
+            return None
+        self._entries.move_to_end(best_key)
+        return self._entries[best_key][3]
+
+    def store(self, embedding: List[float], history: str, max_tokens: int, chunks: List[str], version: int):
+        """Caches an answer, unless the documents changed since it was started at `version`."""
+        if self.max_size == 0 or version != self.version:
+            return
+        self._entries[self._next_id] = (
+            time.monotonic(), (history_key(history), max_tokens), self._normalize(embedding), chunks
+        )
+        self._next_id += 1
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, reason: str = ""):
+        self.version += 1
+        self._entries.clear()
+        self.retrieval.clear()
+        logging.info(f"Semantic cache invalidated{f' ({reason})' if reason else ''}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": SEMANTIC_CACHE_ENABLED,
+            "threshold": self.threshold,
+            "version": self.version,
+            "answers": self.stats.as_dict(len(self._entries), self.max_size),
+            "retrieval": self.retrieval.stats.as_dict(len(self.retrieval), self.retrieval.max_size),
+        }
+
+
+semantic_cache = SemanticCache(
+    max_size=SEMANTIC_CACHE_SIZE if SEMANTIC_CACHE_ENABLED else 0,
+    threshold=SEMANTIC_CACHE_THRESHOLD,
+    ttl=SEMANTIC_CACHE_TTL,
+    retrieval_cache_size=RETRIEVAL_CACHE_SIZE if SEMANTIC_CACHE_ENABLED else 0,
+)
@@ -10,6 +10,8 @@ from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 from fastapi.responses import StreamingResponse
 from .chain import process_chunks
+from .http_clients import close_http_clients
+from .semantic_cache import semantic_cache
 import httpx
 from typing import List
 from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
@@ -27,6 +29,10 @@ app.add_middleware(
     allow_headers=os.getenv("CORS_ALLOW_HEADERS", "*").split(","),
 )
 
+@app.on_event("shutdown")
+async def shutdown_http_clients():
+    await close_http_clients()
+
 # health check LLM model server
 async def check_server_health(host, server_type):
     if host.startswith(("vllm", "text", "tei")):
@@ -103,6 +109,28 @@ async def get_llm_model():
         raise HTTPException(status_code=503, detail="LLM_MODEL is not set")
     return {"status": "success", "llm_model": llm_model}
 
+@app.get("/cache/stats")
+async def get_cache_stats():
+    """
+    Endpoint to get the hit and miss counts of the semantic answer cache and the retrieval cache.
+
+    Returns:
+        The statistics of both caches.
+    """
+    return semantic_cache.get_stats()
+
+@app.post("/cache/invalidate")
+async def invalidate_cache():
+    """
+    Endpoint to clear the cached answers and retrieval results, called by the document
+    ingestion service when documents are ingested or deleted.
+
+    Returns:
+        The new cache version.
+    """
+    semantic_cache.invalidate("documents changed")
+    return {"status": "success", "version": semantic_cache.version}
+
 @app.post("/chat", response_class=StreamingResponse)
 async def query_chain(payload: QuestionRequest):
     """
@@ -0,0 +1,138 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+from langchain_core.documents import Document
+
+from app import chain
+from app.custom_reranker import CustomReranker
+from app.http_clients import HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT
+
+
+class Message:
+    def __init__(self, role, content):
+        self.role = role
+        self.content = content
+
+
+def completion_stream(text):
+    chunk = {
+        "id": "chatcmpl-1",
+        "object": "chat.completion.chunk",
+        "created": 0,
+        "model": "test-model",
+        "choices": [{"index": 0, "delta": {"role": "assistant", "content": text}, "finish_reason": "stop"}],
+    }
+    return f"data: {json.dumps(chunk)}\n\ndata: [DONE]\n\n"
+
+
+@pytest.fixture
+def llm_requests(mocker):
+    """Builds the model on a mock transport and records the completion requests it sends."""
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(
+            200, text=completion_stream("answer"), headers={"content-type": "text/event-stream"}
+        )
+
+    mocker.patch.object(chain, "LLM_BACKEND", "ovms")
+    mocker.patch.object(chain, "callbacks", [])
+    mocker.patch.object(chain, "sync_http_client", httpx.Client(transport=httpx.MockTransport(handler)))
+    return requests
+
+
+def test_max_tokens_is_set_per_request(llm_requests):
+    model = chain.build_model()
+
+    assert model.invoke("hi", config={"configurable": {"max_tokens": 42}}).content == "answer"
+    assert model.invoke("hi", config={"configurable": {"max_tokens": 7}}).content == "answer"
+    model.invoke("hi")
+
+    # langchain-openai sends max_tokens as max_completion_tokens
+    bodies = [json.loads(request.content) for request in llm_requests]
+    assert [body.get("max_completion_tokens") for body in bodies] == [42, 7, None]
+
+
+def test_llm_requests_use_http_timeouts(llm_requests):
+    chain.build_model().invoke("hi", config={"configurable": {"max_tokens": 10}})
+
+    request_timeout = llm_requests[0].extensions["timeout"]
+    assert request_timeout["read"] == HTTP_READ_TIMEOUT
+    assert request_timeout["connect"] == HTTP_CONNECT_TIMEOUT
+
+
+def test_process_chunks_passes_max_tokens(mocker):
+    configs = []
+
+    async def astream(chain_input, config):
+        configs.append(config)
+        yield "an"
+        yield "swer"
+
+    mocker.patch.object(chain, "SEMANTIC_CACHE_ENABLED", False)
+    mocker.patch.object(chain, "chain", mocker.Mock(astream=astream))
+
+    async def collect():
+        messages = [Message("user", "Hello"), Message("assistant", "Hi"), Message("user", "What is AI?")]
+        return [event async for event in chain.process_chunks(messages, 64)]
+
+    assert asyncio.run(collect()) == ["data: an\n\n", "data: swer\n\n"]
+    assert configs == [{"configurable": {"max_tokens": 64}}]
+
+
+def rerank_response(request):
+    body = json.loads(request.content)
+    scores = {"low": 0.1, "mid": 0.5, "high": 0.9, "top": 0.95}
+    results = [{"index": i, "score": scores[text]} for i, text in enumerate(body["texts"])]
+    return httpx.Response(200, json=results)
+
+
+def retrieved(*texts):
+    return {
+        "question": "What is AI?",
+        "context": [Document(page_content=text) for text in texts],
+        "history": "user: Hello",
+    }
+
+
+def test_reranker_orders_by_score():
+    reranker = CustomReranker(
+        "http://reranker/rerank", client=httpx.Client(transport=httpx.MockTransport(rerank_response))
+    )
+
+    result = reranker.rerank(retrieved("low", "high", "mid", "top"))
+
+    assert [doc.page_content for doc in result["context"]] == ["top", "high", "mid"]
+    assert result["question"] == "What is AI?"
+    assert result["history"] == "user: Hello"
+
+
+def test_async_reranker_orders_by_score():
+    reranker = CustomReranker(
+        "http://reranker/rerank",
+        async_client=httpx.AsyncClient(transport=httpx.MockTransport(rerank_response)),
+    )
+
+    result = asyncio.run(reranker.arerank(retrieved("mid", "low")))
+
+    assert [doc.page_content for doc in result["context"]] == ["mid", "low"]
+
+
+def test_reranker_errors_and_empty_context():
+    reranker = CustomReranker(
+        "http://reranker/rerank",
+        client=httpx.Client(transport=httpx.MockTransport(lambda request: httpx.Response(503, text="busy"))),
+    )
+
+    with pytest.raises(Exception, match="503"):
+        reranker.rerank(retrieved("low"))
+
+    # Nothing to rerank, the reranker is not called
+    empty = retrieved()
+    assert reranker.rerank(empty) is empty
+
+    with pytest.raises(ValueError):
+        reranker.rerank({"context": []})
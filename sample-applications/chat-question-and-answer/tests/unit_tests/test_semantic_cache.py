@@ -0,0 +1,126 @@
+import asyncio
+import math
+
+import pytest
+
+from app import chain
+from app.semantic_cache import SemanticCache
+
+
+def unit(angle):
+    """A 2-d embedding at `angle` radians, whose cosine similarity to unit(0) is cos(angle)."""
+    return [math.cos(angle), math.sin(angle)]
+
+
+class Message:
+    def __init__(self, role, content):
+        self.role = role
+        self.content = content
+
+
+@pytest.fixture
+def cache():
+    return SemanticCache(max_size=4, threshold=0.95, ttl=3600, retrieval_cache_size=4)
+
+
+def test_lookup_hit_above_threshold(cache):
+    cache.store(unit(0), "", 100, ["cached ", "answer"], cache.version)
+
+    # cos(0.3) = 0.955
+    assert cache.lookup(unit(0.3), "", 100) == ["cached ", "answer"]
+    # cos(0.4) = 0.921
+    assert cache.lookup(unit(0.4), "", 100) is None
+    assert cache.get_stats()["answers"]["hits"] == 1
+    assert cache.get_stats()["answers"]["misses"] == 1
+
+
+def test_lookup_returns_most_similar_answer(cache):
+    cache.store(unit(0.2), "", 100, ["first"], cache.version)
+    cache.store(unit(0.05), "", 100, ["second"], cache.version)
+
+    assert cache.lookup(unit(0), "", 100) == ["second"]
+
+
+def test_lookup_isolated_by_history_and_max_tokens(cache):
+    cache.store(unit(0), "user: Hello", 100, ["answer"], cache.version)
+
+    assert cache.lookup(unit(0), "user: Hello", 100) == ["answer"]
+    assert cache.lookup(unit(0), "user: Goodbye", 100) is None
+    assert cache.lookup(unit(0), "", 100) is None
+    assert cache.lookup(unit(0), "user: Hello", 50) is None
+
+
+def test_invalidate_clears_both_caches(cache):
+    cache.store(unit(0), "", 100, ["answer"], cache.version)
+    cache.retrieval.put(unit(0), ["doc"])
+
+    cache.invalidate("documents changed")
+
+    assert cache.version == 1
+    assert cache.lookup(unit(0), "", 100) is None
+    assert cache.retrieval.get(unit(0)) is None
+
+
+def test_store_skips_answers_started_before_invalidation(cache):
+    version = cache.version
+    cache.invalidate()
+
+    cache.store(unit(0), "", 100, ["stale answer"], version)
+
+    assert cache.lookup(unit(0), "", 100) is None
+
+
+def test_lru_eviction(cache):
+    for i in range(5):
+        cache.store(unit(i), "", 100, [f"answer {i}"], cache.version)
+
+    assert cache.lookup(unit(0), "", 100) is None
+    assert cache.lookup(unit(4), "", 100) == ["answer 4"]
+
+
+def test_disabled_cache_stores_nothing():
+    cache = SemanticCache(max_size=0, threshold=0.95, ttl=3600, retrieval_cache_size=0)
+    cache.store(unit(0), "", 100, ["answer"], cache.version)
+    cache.retrieval.put(unit(0), ["doc"])
+
+    assert cache.lookup(unit(0), "", 100) is None
+    assert cache.retrieval.get(unit(0)) is None
+
+
+def test_process_chunks_replays_cached_answer(mocker, cache):
+    calls = []
+
+    async def astream(chain_input, config):
+        calls.append(chain_input)
+        for chunk in ["generated ", "answer"]:
+            yield chunk
+
+    async def aembed_query(question):
+        return unit(0.3) if question == "What is AI ?" else unit(0)
+
+    mocker.patch.object(chain, "SEMANTIC_CACHE_ENABLED", True)
+    mocker.patch.object(chain, "semantic_cache", cache)
+    mocker.patch.object(chain, "chain", mocker.Mock(astream=astream))
+    mocker.patch.object(chain, "embedder", mocker.Mock(aembed_query=aembed_query))
+
+    async def ask(question):
+        return [event async for event in chain.process_chunks([Message("user", question)], 100)]
+
+    first = asyncio.run(ask("What is AI?"))
+    second = asyncio.run(ask("What is AI ?"))
+
+    assert first == second == ["data: generated \n\n", "data: answer\n\n"]
+    assert len(calls) == 1
+    assert calls[0]["question_embedding"] == unit(0)
+
+
+def test_invalidate_endpoint(test_client, mocker, cache):
+    mocker.patch("app.server.semantic_cache", cache)
+    cache.store(unit(0), "", 100, ["answer"], cache.version)
+
+    response = test_client.post("/cache/invalidate")
+
+    assert response.status_code == 200
+    assert response.json() == {"status": "success", "version": 1}
+    assert cache.lookup(unit(0), "", 100) is None
+    assert test_client.get("/cache/stats").json()["version"] == 1
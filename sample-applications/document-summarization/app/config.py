@@ -26,5 +26,10 @@ class Settings(BaseSettings):
     GRADIO_PORT: str
     API_URL: str
     CHUNK_SIZE: int
+    CHUNK_OVERLAP: int = 64
+    # Token budget of the LLM, used to decide when chunk summaries must be reduced again
+    CONTEXT_WINDOW: int = 8192
+    SUMMARY_MAX_TOKENS: int = 1024
+    SUMMARY_CONCURRENCY: int = 4
 
     model_config = SettingsConfigDict(env_file=enviornment_file ,extra="ignore")
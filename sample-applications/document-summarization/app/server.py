@@ -2,6 +2,7 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import os
+import json
 import uvicorn
 import shutil
 import logging
@@ -13,18 +14,17 @@ from openai import OpenAI
 from fastapi import FastAPI, File, UploadFile
 from fastapi.responses import JSONResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
-from app.simple_summary_pack.llama_index.packs.simple_summary import SimpleSummaryPack
 from llama_index.core import SimpleDirectoryReader
 from llama_index.llms.openai_like import OpenAILike
 from llama_index.core.base.llms.types import CompletionResponse, CompletionResponseGen
 from llama_index.core.llms.callbacks import llm_completion_callback
 from app.config import Settings
+from app.summarizer import MapReduceSummarizer
 from opentelemetry import trace
 from opentelemetry.sdk.trace import TracerProvider
 from opentelemetry.sdk.trace.export import BatchSpanProcessor
 from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
 from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
-from llama_index.core.schema import Document as LlamaDocument
 
 
 tmp_docs_dir = os.path.join(tempfile.gettempdir(), "docs")
@@ -82,7 +82,17 @@ model = OpenAILike(
     is_function_calling_model=False,
     timeout=120,  # Increase timeout to 120 seconds
     max_retries=2,  # Limit number of retries
-    api_key="not-needed"  # Some implementations require a non-empty API key
+    api_key="not-needed",  # Some implementations require a non-empty API key
+    context_window=config.CONTEXT_WINDOW,
+)
+
+summarizer = MapReduceSummarizer(
+    model,
+    context_window=config.CONTEXT_WINDOW,
+    chunk_size=config.CHUNK_SIZE or 1024,
+    chunk_overlap=config.CHUNK_OVERLAP,
+    concurrency=config.SUMMARY_CONCURRENCY,
+    output_tokens=config.SUMMARY_MAX_TOKENS,
 )
 
 
@@ -109,6 +119,16 @@ def save_uploaded_file(uploaded_file: UploadFile, destination: str):
         raise
 
 
+def ensure_directory_exists(directory: str):
+    """
+    Create the specified directory if it does not exist yet.
+
+    Args:
+        directory (str): The path to the directory to be created.
+    """
+    os.makedirs(directory, exist_ok=True)
+
+
 def clean_directory(directory: str):
     """
     Remove all files and directories within the specified directory.
@@ -132,22 +152,21 @@ def is_file_supported(file):
     return file_extension in config.SUPPORTED_FILE_EXTENSIONS
 
 
-def chunk_text_file(file_path, max_chars=2000):
-    """Chunk a TXT file by full lines (no mid-line splits)."""
-    with open(file_path, "r", encoding="utf-8") as f:
-        lines = f.readlines()
+async def summary_text(events):
+    """Yield the text of the summary events, dropping the progress events."""
+    async for event in events:
+        if event["type"] == "summary":
+            yield event["text"]
 
-    chunks, current_chunk = [], ""
-    for line in lines:
-        if len(current_chunk) + len(line) > max_chars:
-            chunks.append(current_chunk.strip())
-            current_chunk = line
-        else:
-            current_chunk += line
-    if current_chunk:
-        chunks.append(current_chunk.strip())
 
-    return [LlamaDocument(text=chunk, metadata={"file_path": file_path}) for chunk in chunks]
+async def progress_events(events):
+    """Format the summarization events as server-sent events."""
+    try:
+        async for event in events:
+            yield f"data: {json.dumps(event)}\n\n"
+    except Exception as e:
+        logger.error(f"Error in processing: {str(e)}")
+        yield f"data: {json.dumps({'type': 'error', 'message': f'Error processing document: {str(e)}'})}\n\n"
 
 
 @app.get("/version")
@@ -156,15 +175,18 @@ def get_version():
 
 
 @app.post("/summarize/")
-async def stream_data_endpoint(file: UploadFile = File(...), query: str = "Summarize the document"):
+async def stream_data_endpoint(file: UploadFile = File(...), query: str = "Summarize the document", progress: bool = False):
     """
     Endpoint to summarize a document.
     This endpoint accepts a file upload and a query string. It saves the uploaded file to the "docs" directory,
-    loads the documents from the directory, and generates a summary using the SimpleSummaryPack. After processing,
-    it cleans up the "docs" directory by removing all files.
+    loads the documents from the directory, splits them into chunks that fit the token budget of the model and
+    summarizes the chunks concurrently before streaming a final summary. After loading the file, it cleans up the
+    "docs" directory by removing all files.
     Args:
         file (UploadFile): The file to be uploaded and summarized.
         query (str): The query string for summarizing the document. Defaults to "Summarize the document".
+        progress (bool): Stream JSON progress events while the chunks are summarized, followed by the summary
+            events, instead of the summary text only. Defaults to False.
     Returns:
         str: The summary of the document.
     """
@@ -180,7 +202,7 @@ async def stream_data_endpoint(file: UploadFile = File(...), query: str = "Summa
             )
         
         # Create a safe subdirectory inside the system temp dir
-        os.makedirs(tmp_docs_dir, exist_ok=True)
+        ensure_directory_exists(tmp_docs_dir)
 
         file_location = os.path.join(tmp_docs_dir, file.filename)
 
@@ -194,75 +216,35 @@ async def stream_data_endpoint(file: UploadFile = File(...), query: str = "Summa
         file_size = os.path.getsize(file_location)
         logger.info(f"File saved at {file_location} with size {file_size} bytes")
 
-        # 🔹 Load documents (with TXT chunking support)
         try:
             logger.info("Loading documents")
-            if file.filename.endswith(".txt"):
-                logger.info("Chunking TXT file before summarization")
-                documents = chunk_text_file(file_location, max_chars=2000)
-            else:
-                documents = SimpleDirectoryReader(input_files=[file_location]).load_data()
-
-            # Assign doc_ids for traceability
-            doc_ids = []
-            for i, doc in enumerate(documents):
-                doc_id = f"{file.filename}_part{i}"
-                doc.doc_id = doc_id
-                doc_ids.append(doc_id)
-
+            documents = SimpleDirectoryReader(input_files=[file_location]).load_data()
             logger.info(f"Loaded {len(documents)} document(s) from {file_location}")
         except Exception as e:
             logger.error(f"Error loading documents: {str(e)}")
             return JSONResponse(status_code=500, content={"message": f"Failed to load document: {str(e)}"})
 
+        events = summarizer.summarize(documents, query)
+        if progress:
+            return StreamingResponse(progress_events(events), media_type="text/event-stream")
+
         try:
-            logger.info("Initializing SimpleSummaryPack")
-            simple_summary_pack = SimpleSummaryPack(
-                documents,
-                query=query,
-                verbose=True,
-                llm=model,
-            )
-            logger.info("Running SimpleSummaryPack for all chunks")
-            all_summaries = []
-            for doc_id in doc_ids:
-                try:
-                    summary = simple_summary_pack.run(doc_id)
-                    # If run returns a generator/stream, join to string
-                    if hasattr(summary, '__iter__') and not isinstance(summary, str):
-                        summary = '\n'.join([s for s in summary])
-                    all_summaries.append(summary)
-                except Exception as e:
-                    logger.error(f"Error summarizing chunk {doc_id}: {str(e)}")
-            combined_summary = '\n\n'.join(all_summaries)
-            logger.info("Successfully generated combined summary")
-
-            # Second LLM call: distill a concise summary from chunk summaries
-            logger.info("Running final LLM call to distill a concise summary from chunk summaries")
-            final_doc = LlamaDocument(text=combined_summary, metadata={"file_path": file_location})
-            final_doc.doc_id = f"{file.filename}_final"
-            final_summary_pack = SimpleSummaryPack(
-                [final_doc],
-                query=query,
-                verbose=True,
-                llm=model,
-            )
-            final_doc_id = final_doc.doc_id
-            try:
-                final_summary = final_summary_pack.run(final_doc_id)
-            except Exception as e:
-                logger.error(f"Error generating final summary: {str(e)}")
-                # fallback: yield the combined summary as a single chunk
-                def fallback_gen():
-                    yield combined_summary
-                final_summary = fallback_gen()
-            logger.info("Successfully generated distilled summary")
-            return StreamingResponse(final_summary, media_type="text/event-stream")
+            # Summarize the chunks before responding, so that a failure is still reported with an error status
+            summary = summary_text(events)
+            first_chunk = await anext(summary, "")
         except Exception as e:
             logger.error(f"Error in processing: {str(e)}")
             logger.error(traceback.format_exc())
             return JSONResponse(status_code=500, content={"message": f"Error processing document: {str(e)}"})
 
+        async def stream_summary():
+            yield first_chunk
+            async for chunk in summary:
+                yield chunk
+            logger.info("Successfully generated summary")
+
+        return StreamingResponse(stream_summary(), media_type="text/event-stream")
+
     except Exception as e:
         logger.error(f"Unexpected error: {str(e)}")
         logger.error(traceback.format_exc())
@@ -1,6 +0,0 @@
-# Copyright (C) 2025 Intel Corporation
-# SPDX-License-Identifier: Apache-2.0
-
-from app.simple_summary_pack.llama_index.packs.simple_summary.base import SimpleSummaryPack
-
-__all__ = ["SimpleSummaryPack"]
@@ -0,0 +1,179 @@
+# Copyright (C) 2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+import asyncio
+import logging
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from llama_index.core.llms import LLM
+from llama_index.core.node_parser import SentenceSplitter
+from llama_index.core.prompts.default_prompts import DEFAULT_TREE_SUMMARIZE_PROMPT
+from llama_index.core.schema import Document
+from llama_index.core.utils import get_tokenizer
+
+logger = logging.getLogger(__name__)
+
+# Number of reduction levels after which the summaries are distilled even if they do not fit
+MAX_REDUCE_LEVELS = 8
+
+# Fraction of the context window left unused. Tokens are counted with the tiktoken tokenizer of
+# llama_index rather than the tokenizer of the served model, which may need more tokens for the
+# same text (notably for non-English text).
+TOKENIZER_HEADROOM = 0.2
+
+
+class MapReduceSummarizer:
+    """
+    Summarizes a document with concurrent calls to the LLM.
+
+    The document is split into chunks that fit the token budget of the model. Each chunk is
+    summarized independently (map), with at most `concurrency` requests in flight. While the
+    chunk summaries do not fit the context window together, they are grouped into batches that
+    do and each batch is summarized again (reduce). The final summary is then streamed from a
+    last call over the remaining summaries. A document that fits the context window as a whole
+    is summarized by a single streamed call.
+
+    Summarization is reported as a stream of events:
+        {"type": "progress", "phase": "map" | "reduce" | "final", "completed": int, "total": int}
+        {"type": "summary", "text": str}
+    """
+
+    def __init__(
+        self,
+        llm: LLM,
+        context_window: int,
+        chunk_size: int,
+        chunk_overlap: int,
+        concurrency: int,
+        output_tokens: int,
+    ):
+        self.llm = llm
+        self.concurrency = max(1, concurrency)
+        self.tokenizer = get_tokenizer()
+
+        # Tokens left for the text once the prompt and the generated summary are accounted for
+        prompt_tokens = self.count_tokens(DEFAULT_TREE_SUMMARIZE_PROMPT.format(context_str="", query_str=""))
+        usable_window = int(context_window * (1 - TOKENIZER_HEADROOM))
+        self.budget = max(1, usable_window - output_tokens - prompt_tokens)
+        chunk_size = min(chunk_size, self.budget)
+        self.splitter = SentenceSplitter(
+            chunk_size=chunk_size,
+            chunk_overlap=min(chunk_overlap, chunk_size // 2),
+            tokenizer=self.tokenizer,
+        )
+
+    def count_tokens(self, text: str) -> int:
+        return len(self.tokenizer(text))
+
+    def split(self, documents: List[Document]) -> List[str]:
+        """
+        Splits documents into chunks of at most the chunk size in tokens.
+
+        Args:
+            documents (List[Document]): The documents loaded from the uploaded file.
+
+        Returns:
+            List[str]: The text of the chunks, in document order.
+        """
+        nodes = self.splitter.get_nodes_from_documents(documents)
+        return [node.get_content() for node in nodes if node.get_content().strip()]
+
+    def group(self, texts: List[str]) -> List[List[str]]:
+        """Packs consecutive texts into groups whose joined text fits the token budget."""
+        groups, current, current_tokens = [], [], 0
+        for text in texts:
+            tokens = self.count_tokens(text)
+            if current and current_tokens + tokens > self.budget:
+                groups.append(current)
+                current, current_tokens = [], 0
+            current.append(text)
+            current_tokens += tokens
+        if current:
+            groups.append(current)
+        return groups
+
+    def _prompt(self, texts: List[str], query: str) -> str:
+        return DEFAULT_TREE_SUMMARIZE_PROMPT.format(context_str="\n\n".join(texts), query_str=query)
+
+    async def _summarize(self, texts: List[str], query: str, semaphore: asyncio.Semaphore) -> Optional[str]:
+        async with semaphore:
+            try:
+                response = await self.llm.acomplete(self._prompt(texts, query))
+                return response.text
+            except Exception as e:
+                logger.error(f"Error summarizing {len(texts)} part(s): {str(e)}")
+                return None
+
+    async def _summarize_all(
+        self, groups: List[List[str]], query: str, phase: str, summaries: List[str]
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Summarizes every group concurrently, yielding a progress event as each one completes."""
+        semaphore = asyncio.Semaphore(self.concurrency)
+        results: List[Optional[str]] = [None] * len(groups)
+
+        async def summarize(index: int):
+            results[index] = await self._summarize(groups[index], query, semaphore)
+
+        tasks = [asyncio.create_task(summarize(index)) for index in range(len(groups))]
+        try:
+            for completed, task in enumerate(asyncio.as_completed(tasks), start=1):
+                await task
+                yield {"type": "progress", "phase": phase, "completed": completed, "total": len(groups)}
+        finally:
+            # Stop summarizing if the client went away
+            for task in tasks:
+                task.cancel()
+
+        summaries.extend(result for result in results if result)
+
+    async def summarize(self, documents: List[Document], query: str) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Summarizes documents and yields the progress and summary events.
+
+        Args:
+            documents (List[Document]): The documents loaded from the uploaded file.
+            query (str): The query guiding the summarization.
+
+        Yields:
+            Dict[str, Any]: The progress events, followed by the chunks of the streamed summary.
+
+        Raises:
+            RuntimeError: If the document has no text or none of its chunks could be summarized.
+        """
+        chunks = self.split(documents)
+        if not chunks:
+            raise RuntimeError("No text found in the document.")
+        logger.info(f"Split document into {len(chunks)} chunk(s) of at most {self.splitter.chunk_size} tokens")
+
+        summaries = chunks
+        level = 0
+        while len(summaries) > 1 and self.count_tokens("\n\n".join(summaries)) > self.budget:
+            if level >= MAX_REDUCE_LEVELS:
+                logger.warning(f"Summaries still exceed the context window after {level} levels")
+                break
+            phase = "map" if level == 0 else "reduce"
+            groups = [[chunk] for chunk in summaries] if level == 0 else self.group(summaries)
+
+            yield {"type": "progress", "phase": phase, "completed": 0, "total": len(groups)}
+            summaries = []
+            async for event in self._summarize_all(groups, query, phase, summaries):
+                yield event
+
+            if not summaries:
+                raise RuntimeError("None of the parts of the document could be summarized.")
+            logger.info(f"Summarized {len(groups)} part(s) into {len(summaries)} summaries ({phase})")
+            level += 1
+
+        yield {"type": "progress", "phase": "final", "completed": 0, "total": 1}
+        streamed = False
+        try:
+            async for response in await self.llm.astream_complete(self._prompt(summaries, query)):
+                if response.delta:
+                    streamed = True
+                    yield {"type": "summary", "text": response.delta}
+        except Exception as e:
+            if streamed or level == 0:
+                raise
+            # fallback: return the combined summaries as the summary
+            logger.error(f"Error generating final summary: {str(e)}")
+            yield {"type": "summary", "text": "\n\n".join(summaries)}
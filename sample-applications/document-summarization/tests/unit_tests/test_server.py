@@ -1,7 +1,12 @@
 ﻿import io
+import json
+import asyncio
 import pytest
+from llama_index.core.base.llms.types import CompletionResponse
+from llama_index.core.schema import Document
 from fastapi.testclient import TestClient
-from app.server import app, is_file_supported, ensure_directory_exists, clean_directory
+from app.server import app, is_file_supported, ensure_directory_exists, clean_directory, summarizer
+from app.summarizer import MapReduceSummarizer
 
 
 client = TestClient(app)
@@ -44,13 +49,31 @@ def test_summarize_missing_file():
     response = client.post("/summarize/", data={"query": "Summarize the document"})
     assert response.status_code == 422  # Unprocessable Entity (missing required file)
 
+class FakeLLM:
+    """Stands in for the LLM endpoint, answering every prompt with the same summary."""
+
+    def __init__(self, summary):
+        self.summary = summary
+        self.prompts = []
+
+    async def acomplete(self, prompt):
+        self.prompts.append(prompt)
+        return CompletionResponse(text=self.summary)
+
+    async def astream_complete(self, prompt):
+        self.prompts.append(prompt)
+
+        async def gen():
+            for word in self.summary.split(" "):
+                yield CompletionResponse(text="", delta=word + " ")
+
+        return gen()
+
+
 def test_summarize_supported_file(mocker):
     # Mock the summarization logic to avoid actual model inference
     mock_summary = "This is a summary."
-    mocker.patch(
-    "app.server.SimpleSummaryPack",
-    autospec=True,
-    return_value=mocker.Mock(run=lambda filename: iter(mock_summary)))
+    mocker.patch.object(summarizer, "llm", FakeLLM(mock_summary))
 
     file_content = b"Sample document content."
     response = client.post(
@@ -59,4 +82,57 @@ def test_summarize_supported_file(mocker):
         data={"query": "Summarize the document"},
     )
     assert response.status_code == 200
-    assert mock_summary in response.text or mock_summary in response.json().get("summary", "")
\ No newline at end of file
+    assert mock_summary in response.text or mock_summary in response.json().get("summary", "")
+
+def test_summarize_progress_events(mocker):
+    mock_summary = "This is a summary."
+    # A small context window splits the document into several chunks
+    mocker.patch(
+        "app.server.summarizer",
+        MapReduceSummarizer(
+            FakeLLM(mock_summary), context_window=400, chunk_size=1024, chunk_overlap=0, concurrency=2, output_tokens=200
+        ),
+    )
+
+    file_content = ("A sentence of the sample document. " * 40).encode()
+    response = client.post(
+        "/summarize/?progress=true",
+        files={"file": ("test.txt", io.BytesIO(file_content), "text/plain")},
+    )
+    assert response.status_code == 200
+
+    events = [json.loads(line[len("data: "):]) for line in response.text.splitlines() if line.startswith("data: ")]
+    progress = [event for event in events if event["type"] == "progress"]
+    assert progress[0]["phase"] == "map" and progress[0]["completed"] == 0
+    assert progress[-1]["phase"] == "final"
+    map_events = [event for event in progress if event["phase"] == "map"]
+    assert map_events[-1]["completed"] == map_events[-1]["total"] > 1
+    assert "".join(event["text"] for event in events if event["type"] == "summary").strip() == mock_summary
+
+def test_summarizer_reduces_until_summaries_fit():
+    llm = FakeLLM("word " * 30)
+    summarizer = MapReduceSummarizer(
+        llm, context_window=400, chunk_size=1024, chunk_overlap=0, concurrency=2, output_tokens=200
+    )
+    documents = [Document(text="A sentence of the sample document. " * 200)]
+
+    async def collect():
+        return [event async for event in summarizer.summarize(documents, "Summarize the document")]
+
+    events = asyncio.run(collect())
+    phases = [event["phase"] for event in events if event["type"] == "progress"]
+    assert phases[0] == "map"
+    assert "reduce" in phases
+    assert phases[-1] == "final"
+    # Every prompt leaves room for the summary in the context window
+    for prompt in llm.prompts:
+        assert summarizer.count_tokens(prompt) <= 400 - 200
+
+def test_summarizer_budget_leaves_tokenizer_headroom():
+    summarizer = MapReduceSummarizer(
+        FakeLLM(""), context_window=8192, chunk_size=4096, chunk_overlap=64, concurrency=1, output_tokens=1024
+    )
+
+    # Token counts are estimated, so a fifth of the context window is kept free
+    assert summarizer.budget < 8192 * 0.8 - 1024
+    assert summarizer.splitter.chunk_size == 4096
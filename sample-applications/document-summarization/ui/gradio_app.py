@@ -3,6 +3,7 @@
 
 import os
 import sys
+import json
 import logging
 import traceback
 import tempfile
@@ -25,23 +26,26 @@ API_URL = config.API_URL
 def summarize_document(file_obj, custom_query=None):
     """
     Function to summarize a document by sending it to the FastAPI backend.
+    The progress of the summarization is shown until the summary is streamed.
     
     Args:
         file_obj: The uploaded file object from Gradio
         custom_query (str, optional): Custom query for summarization. Defaults to None.
         
-    Returns:
-        str: The summary of the document
+    Yields:
+        str: The progress of the summarization, then the summary of the document
     """
     if file_obj is None:
-        return f"Error: Please upload a file of type: {', '.join(config.SUPPORTED_FILE_EXTENSIONS)}."
+        yield f"Error: Please upload a file of type: {', '.join(config.SUPPORTED_FILE_EXTENSIONS)}."
+        return
         
     logger.info(f"Received file: {getattr(file_obj, 'name', 'unknown')}")
     
     # Check file extension
     file_extension = os.path.splitext(file_obj.name)[1].lower()
     if file_extension not in config.SUPPORTED_FILE_EXTENSIONS:
-        return f"Error: Only {', '.join(config.SUPPORTED_FILE_EXTENSIONS)} files are allowed."
+        yield f"Error: Only {', '.join(config.SUPPORTED_FILE_EXTENSIONS)} files are allowed."
+        return
     
     # Define the API endpoint
     docsum_endpoint = f"{API_URL}/summarize/"
@@ -61,21 +65,38 @@ def summarize_document(file_obj, custom_query=None):
         logger.info(f"Sending request to {docsum_endpoint} with query: {query}")
         
         # Send the request to the API
-        response = requests.post(docsum_endpoint, files=files, data=data)
+        response = requests.post(docsum_endpoint, files=files, data=data, params={"progress": "true"}, stream=True)
         
         # Check if the request was successful
-        if response.status_code == 200:
-            logger.info("Successfully received summary from API")
-            return response.text
-        else:
+        if response.status_code != 200:
             logger.error(f"Error from API: Status code {response.status_code}")
             error_message = response.json().get("message", "Unknown error")
-            return f"Error: {error_message}"
+            yield f"Error: {error_message}"
+            return
+
+        summary = ""
+        for line in response.iter_lines(decode_unicode=True):
+            if not line or not line.startswith("data: "):
+                continue
+            event = json.loads(line[len("data: "):])
+            if event["type"] == "progress":
+                if event["phase"] == "final":
+                    yield "Writing the summary..."
+                else:
+                    step = "Summarizing document parts" if event["phase"] == "map" else "Combining summaries"
+                    yield f"{step}: {event['completed']} of {event['total']} done..."
+            elif event["type"] == "summary":
+                summary += event["text"]
+                yield summary
+            elif event["type"] == "error":
+                yield f"Error: {event['message']}"
+                return
+        logger.info("Successfully received summary from API")
             
     except Exception as e:
         logger.error(f"Error sending request to API: {str(e)}")
         logger.error(traceback.format_exc())
-        return f"Error: {str(e)}"
+        yield f"Error: {str(e)}"
 
 def create_ui():
     """Create and return the Gradio interface"""
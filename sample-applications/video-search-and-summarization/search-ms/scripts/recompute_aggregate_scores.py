@@ -21,7 +21,13 @@ Scenario 2 - Validating code changes:
 python scripts/recompute_affregate_scores.py score.json
 
 
-Scenario 3 - Understanding contextual boost:
+Scenario 3 - Checking the columnar aggregation:
+# Re-aggregate the frames of every segment with the columnar engine used by the service and
+# compare its ranking and scores with the per-segment reference functions
+python scripts/recompute_aggregate_scores.py score.json --verify
+
+
+Scenario 4 - Understanding contextual boost:
 # Try different sigma/boost settings and observe the impact on segments near the global peak
 export AGGREGATION_CONTEXT_SIGMA_SECONDS=20.0
 python scripts/recompute_affregate_scores.py score.json
@@ -156,10 +162,13 @@ PROJECT_ROOT = Path(__file__).resolve().parents[1]
 if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
-with patch("langchain_community.vectorstores.vdms.VDMS_Client") as mock_vdms_client:
+with patch("langchain_vdms.vectorstores.VDMS_Client") as mock_vdms_client:
     mock_vdms_client.return_value = Mock()
     from src.vdms_retriever.retriever import (
+        aggregate_frame_results_to_videos,
+        apply_temporal_overlap_filtering,
         calculate_segment_score,
+        create_temporal_segments,
         get_aggregation_config,
     )
 
@@ -247,6 +256,87 @@ def recompute_scores(segments: List[Dict[str, Any]], config: Dict[str, Any]):
     return scored_segments
 
 
+def flatten_frames(segments: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Turn pre-aggregated segments back into frame matches, in segment order."""
+    return [
+        {
+            "video_id": segment.get("video_id"),
+            "video_duration": segment.get("video_duration"),
+            **frame,
+        }
+        for segment in segments
+        for frame in segment.get("frames", [])
+    ]
+
+
+def reference_ranking(frames: List[Dict[str, Any]], config: Dict[str, Any], max_results: int):
+    """Rank frame matches with the per-segment functions, as aggregation did before the columnar engine."""
+    global_best_frame: Dict[str, Any] | None = None
+    for frame in frames:
+        score = frame.get("relevance_score")
+        if score is not None and (
+            global_best_frame is None or score > global_best_frame["relevance_score"]
+        ):
+            global_best_frame = {
+                "video_id": frame.get("video_id"),
+                "timestamp": frame.get("timestamp", 0),
+                "relevance_score": score,
+            }
+    global_max_score = global_best_frame["relevance_score"] if global_best_frame else 0.1
+
+    segment_duration = config["segment_duration_seconds"]
+    scored_segments = []
+    for segment in create_temporal_segments(frames, segment_duration, config):
+        score_data = calculate_segment_score(segment, global_max_score, global_best_frame, config)
+        scored_segments.append({**segment, "score_breakdown": score_data, "final_score": score_data["score"]})
+
+    raw_scores = [segment["final_score"] for segment in scored_segments]
+    min_score = min(raw_scores)
+    score_range = max(raw_scores) - min_score
+    for segment in scored_segments:
+        raw_score = segment["final_score"]
+        segment["score_breakdown"]["raw_score"] = raw_score
+        segment["final_score"] = (raw_score - min_score) / score_range if score_range > 0 else 1.0
+        segment["score_breakdown"]["score"] = segment["final_score"]
+
+    if config["filtering"]["overlap_filter_enabled"]:
+        scored_segments = apply_temporal_overlap_filtering(
+            scored_segments, config["min_temporal_gap_seconds"]
+        )
+    return sorted(scored_segments, key=lambda x: x["final_score"], reverse=True)[:max_results]
+
+
+def verify_columnar(segments: List[Dict[str, Any]], config: Dict[str, Any]) -> int:
+    """Compare the columnar aggregation with the reference functions; returns the number of mismatches."""
+    frames = flatten_frames(segments)
+    max_results = len(frames)
+    expected = reference_ranking(frames, config, max_results)
+    actual, _ = aggregate_frame_results_to_videos(frames, max_results=max_results)
+
+    mismatches = 0
+    if len(expected) != len(actual):
+        print(f"Segment count differs: reference={len(expected)} columnar={len(actual)}")
+        mismatches += 1
+
+    for rank, (ref, result) in enumerate(zip(expected, actual), start=1):
+        ref_key = (ref["video_id"], ref["segment_start"], ref["segment_end"])
+        key = (result["video_id"], result["segment_start"], result["segment_end"])
+        if ref_key != key:
+            print(f"#{rank:02d} segment differs: reference={ref_key} columnar={key}")
+            mismatches += 1
+            continue
+        differing = sorted(
+            name
+            for name in ref["score_breakdown"].keys() | result["score_breakdown"].keys()
+            if ref["score_breakdown"].get(name) != result["score_breakdown"].get(name)
+        )
+        if ref["final_score"] != result["relevance_score"] or differing:
+            print(f"#{rank:02d} {key} scores differ: {differing or ['score']}")
+            mismatches += 1
+
+    return mismatches
+
+
 def main() -> None:
     parser = argparse.ArgumentParser(
         description="Re-score aggregated segments with qualitative scoring"
@@ -263,6 +353,11 @@ def main() -> None:
         default=15,
         help="Number of top-ranked segments to display (default: 15)",
     )
+    parser.add_argument(
+        "--verify",
+        action="store_true",
+        help="Check that the columnar aggregation ranks the frames like the reference functions",
+    )
     args = parser.parse_args()
 
     dataset_path = Path(args.path)
@@ -271,6 +366,16 @@ def main() -> None:
 
     config = get_aggregation_config()
     segments = load_segments(dataset_path)
+
+    if args.verify:
+        if not segments:
+            raise SystemExit(f"No segments found in {dataset_path}")
+        mismatches = verify_columnar(segments, config)
+        if mismatches:
+            raise SystemExit(f"{mismatches} ranking mismatches between columnar and reference aggregation")
+        print(f"Columnar aggregation matches the reference for {len(segments)} segments")
+        return
+
     scored = recompute_scores(segments, config)
 
     print(f"Loaded {len(segments)} segments from {dataset_path}")
@@ -17,6 +17,7 @@ from src.utils.directory_watcher import (
     get_last_updated,
     start_watcher,
 )
+from src.utils.query_cache import index_version, query_cache
 from pydantic import BaseModel
 
 app = FastAPI()
@@ -42,6 +43,9 @@ class QueryRequest(BaseModel):
     query_id: str
     query: str
     tags: Optional[list[str]] = None
+    video_ids: Optional[list[str]] = None
+    start_time: Optional[float] = None  # seconds into the video
+    end_time: Optional[float] = None  # seconds into the video
 
 
 def format_aggregated_results(aggregated_videos: list[dict]) -> list[dict]:
@@ -109,7 +113,12 @@ async def query_endpoint(request: list[QueryRequest]):
     try:
         from src.vdms_retriever.retriever import (
             get_vectordb,
+            get_embeddings,
+            get_search_executor,
+            build_search_filters,
+            search_frames,
             aggregate_frame_results_to_videos,
+            get_aggregation_config,
         )
 
         api_start = time.perf_counter()
@@ -118,7 +127,11 @@ async def query_endpoint(request: list[QueryRequest]):
             f"Received request: {json.dumps([req.dict() for req in request], indent=2)}"
         )
 
-        db: VDMS = get_vectordb()
+        # Embedding requests and vector searches block, so they run on the search worker pool
+        loop = asyncio.get_running_loop()
+        executor = get_search_executor()
+
+        db: VDMS = await loop.run_in_executor(executor, get_vectordb)
         if not db:
             logger.error(
                 "VectorDB could not be initialized. Please verify the connection."
@@ -127,6 +140,29 @@ async def query_endpoint(request: list[QueryRequest]):
                 status_code=500, detail="Some error ocurred at the DataPrep Service."
             )
 
+        # Embed every distinct query text once for the whole request, reusing cached embeddings
+        embed_start = time.perf_counter()
+        unique_queries = list(dict.fromkeys(query_request.query for query_request in request))
+        embedding_by_query = {}
+        for query in unique_queries:
+            cached_embedding = query_cache.get_embedding(query)
+            if cached_embedding is not None:
+                embedding_by_query[query] = cached_embedding
+        queries_to_embed = [query for query in unique_queries if query not in embedding_by_query]
+        if queries_to_embed:
+            query_embeddings = await loop.run_in_executor(
+                executor, get_embeddings().embed_documents, queries_to_embed
+            )
+            for query, embedding in zip(queries_to_embed, query_embeddings):
+                query_cache.put_embedding(query, embedding)
+                embedding_by_query[query] = embedding
+        logger.info(
+            f"Embedded {len(queries_to_embed)} distinct queries ({len(unique_queries) - len(queries_to_embed)} cached) for {len(request)} requests in {(time.perf_counter() - embed_start) * 1000:.2f} ms"
+        )
+        aggregation_enabled = getattr(settings, "AGGREGATION_ENABLED", True)
+        max_results = getattr(settings, "AGGREGATION_MAX_RESULTS", 20)
+        aggregation_config = {**get_aggregation_config(), "max_results": max_results}
+
         async def process_query(query_request):
             """Process a single query request with frame-to-video aggregation."""
 
@@ -142,16 +178,48 @@ async def query_endpoint(request: list[QueryRequest]):
             )  # Get more frame results before aggregation
             logger.debug(f"Searching with initial_k={initial_k}")
 
+            # Tag, video and time filters are applied by VDMS, before the top-k cut
+            search_filters = build_search_filters(
+                tags=query_request.tags,
+                video_ids=query_request.video_ids,
+                start_time=query_request.start_time,
+                end_time=query_request.end_time,
+            )
+            logger.debug(f"Search constraints: {search_filters}")
+
+            # Results only depend on the embedding, filters and aggregation settings until the index changes
+            cache_key = None
+            if aggregation_enabled:
+                cache_key = query_cache.result_key(
+                    index_version.value,
+                    embedding_by_query[query_request.query],
+                    # Tags are also matched below when they are not pushed down to VDMS
+                    [search_filters, sorted(query_request.tags or [])],
+                    initial_k,
+                    aggregation_config,
+                )
+                cached_result = query_cache.get_result(cache_key)
+                if cached_result is not None:
+                    logger.info(
+                        f"Returning {len(cached_result['results'])} cached results for query {query_request.query_id} in {(time.perf_counter() - query_start) * 1000:.2f} ms"
+                    )
+                    return {
+                        "query_id": query_request.query_id,
+                        "results": cached_result["results"],
+                        "aggregation_stats": {**cached_result["aggregation_stats"], "cache_hit": True},
+                    }
+
             vdms_start = time.perf_counter()
-            docs_with_score: List[Tuple[Any, float]] = db.similarity_search_with_score(
-                query_request.query,
-                k=initial_k,
-                fetch_k=initial_k + 1,  # ensure fetch_k > k for langchain_vdms
-                # normalize_distance=True
+            docs_with_score: List[Tuple[Any, float]] = await loop.run_in_executor(
+                executor,
+                search_frames,
+                embedding_by_query[query_request.query],
+                initial_k,
+                search_filters,
             )
             vdms_duration_ms = (time.perf_counter() - vdms_start) * 1000
             logger.info(
-                f"VDMS similarity search (embedding + retrieval) completed in {vdms_duration_ms:.2f} ms with {len(docs_with_score)} results"
+                f"VDMS similarity search completed in {vdms_duration_ms:.2f} ms with {len(docs_with_score)} results"
             )
 
             logger.info(f"Raw search returned {len(docs_with_score)} results")
@@ -162,7 +230,8 @@ async def query_endpoint(request: list[QueryRequest]):
             for res, score in docs_with_score:
                 res.metadata["relevance_score"] = score
 
-                # Filter by tags if specified
+                # Filter by tags if specified. Tags are pushed down to VDMS, this check only
+                # matters when pushdown is disabled
                 if query_request.tags:
                     result_tags: list = []
                     if res.metadata.get("tags"):
@@ -189,10 +258,9 @@ async def query_endpoint(request: list[QueryRequest]):
             logger.info(f"After tag filtering: {len(frame_results)} results")
 
             # Apply frame-to-video aggregation if enabled
-            if getattr(settings, "AGGREGATION_ENABLED", True) and frame_results:
+            if aggregation_enabled and frame_results:
                 try:
                     logger.debug("Starting aggregation process")
-                    max_results = getattr(settings, "AGGREGATION_MAX_RESULTS", 20)
                     aggregation_start = time.perf_counter()
                     aggregated_videos, aggregation_stats = (
                         aggregate_frame_results_to_videos(
@@ -219,6 +287,10 @@ async def query_endpoint(request: list[QueryRequest]):
                         "results": converted_results,
                         "aggregation_stats": aggregation_stats,
                     }
+                    query_cache.put_result(
+                        cache_key,
+                        {"results": converted_results, "aggregation_stats": aggregation_stats},
+                    )
 
                     logger.info(
                         f"Returning {len(converted_results)} aggregated results for query {query_request.query_id}"
@@ -368,10 +440,20 @@ async def watcher_last_updated():
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.post("/index-version")
+async def bump_index_version():
+    """Signal that videos were added to or removed from the index, dropping cached search results."""
+    return {"index_version": index_version.bump("index updated")}
+
+
 @app.get("/health")
 async def health_check():
     """Simple health check endpoint to verify the service is running."""
-    return {"status": "ok", "timestamp": datetime.now().isoformat()}
+    return {
+        "status": "ok",
+        "timestamp": datetime.now().isoformat(),
+        "query_cache": query_cache.stats(),
+    }
 
 
 @app.get("/initial-upload-status")
@@ -68,6 +68,11 @@ class Settings(BaseSettings):
     AGGREGATION_MAX_RESULTS: int = Field(default=20, env="AGGREGATION_MAX_RESULTS")
     AGGREGATION_INITIAL_K: int = Field(default=1000, env="AGGREGATION_INITIAL_K")
     AGGREGATION_ENABLED: bool = Field(default=True, env="AGGREGATION_ENABLED")
+    SEARCH_WORKERS: int = Field(default=8, env="SEARCH_WORKERS")
+    SEARCH_TAG_PUSHDOWN: bool = Field(default=False, env="SEARCH_TAG_PUSHDOWN")
+    QUERY_CACHE_ENABLED: bool = Field(default=True, env="QUERY_CACHE_ENABLED")
+    QUERY_EMBEDDING_CACHE_SIZE: int = Field(default=1024, env="QUERY_EMBEDDING_CACHE_SIZE")
+    QUERY_RESULT_CACHE_SIZE: int = Field(default=256, env="QUERY_RESULT_CACHE_SIZE")
     AGGREGATION_CONTEXT_SEEK_OFFSET_SECONDS: float = Field(
         default=0.0, env="AGGREGATION_CONTEXT_SEEK_OFFSET_SECONDS"
     )
@@ -8,6 +8,7 @@ from watchdog.observers import Observer
 from watchdog.events import FileSystemEventHandler
 from threading import Timer, Thread, Lock
 from src.utils.common import settings, logger
+from src.utils.query_cache import index_version
 from src.utils.utils import upload_videos_to_dataprep
 
 initial_upload_status = {"total": 0, "completed": 0, "pending": 0}
@@ -54,6 +55,7 @@ class DebouncedHandler(FileSystemEventHandler):
                     initial_upload_status["total"] += len(self.file_paths)
                     initial_upload_status["pending"] += len(self.file_paths)
                     self.action(self.file_paths)
+                    index_version.bump(f"{len(self.file_paths)} watched videos uploaded")
                     initial_upload_status["completed"] += len(self.file_paths)
                     initial_upload_status["pending"] -= len(self.file_paths)
                     self.file_paths.clear()
@@ -99,6 +101,7 @@ def upload_initial_videos(path):
         try:
             logger.debug(f"Uploading batch of {len(batch)} videos: {batch}")
             success = upload_videos_to_dataprep(batch)
+            index_version.bump(f"initial upload of {len(batch)} videos")
             if success:
                 initial_upload_status["completed"] += len(batch)
                 initial_upload_status["pending"] -= len(batch)
@@ -0,0 +1,147 @@
+# Copyright (C) 2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+import hashlib
+import json
+import struct
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional
+
+from src.utils.common import logger, settings
+
+
+class LRUCache:
+    """Thread-safe, size-bounded LRU cache that counts hits and misses."""
+
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = max(0, int(maxsize))
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, key: Hashable, value: Any) -> None:
+        if self.maxsize == 0:
+            return
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+
+class IndexVersion:
+    """Counter bumped whenever videos are added to or removed from the search index."""
+
+    def __init__(self) -> None:
+        self._value = 0
+        self._lock = threading.Lock()
+        self._listeners = []
+
+    @property
+    def value(self) -> int:
+        return self._value
+
+    def add_listener(self, listener) -> None:
+        self._listeners.append(listener)
+
+    def bump(self, reason: str = "") -> int:
+        with self._lock:
+            self._value += 1
+            value = self._value
+        logger.info(f"Search index version bumped to {value}{f' ({reason})' if reason else ''}")
+        for listener in self._listeners:
+            listener(value)
+        return value
+
+
+index_version = IndexVersion()
+
+
+def _embedding_key(embedding: List[float]) -> str:
+    return hashlib.blake2b(struct.pack(f"{len(embedding)}d", *embedding), digest_size=16).hexdigest()
+
+
+class QueryCache:
+    """
+    Two-level cache of the search pipeline.
+
+    - query text -> embedding, which does not depend on the indexed videos
+    - (embedding, filters, k, aggregation config) -> aggregated results, keyed on the
+      index version so results computed before videos were added or removed are never
+      served again; the entries of older versions are dropped when the version changes.
+    """
+
+    def __init__(self, embedding_cache_size: int, result_cache_size: int) -> None:
+        self.embeddings = LRUCache(embedding_cache_size)
+        self.results = LRUCache(result_cache_size)
+        index_version.add_listener(lambda _: self.results.clear())
+
+    def get_embedding(self, query: str) -> Optional[List[float]]:
+        return self.embeddings.get((settings.EMBEDDINGS_MODEL_NAME, query))
+
+    def put_embedding(self, query: str, embedding: List[float]) -> None:
+        self.embeddings.put((settings.EMBEDDINGS_MODEL_NAME, query), embedding)
+
+    @staticmethod
+    def result_key(
+        version: int,
+        embedding: List[float],
+        filters: Any,
+        k: int,
+        aggregation_config: Dict[str, Any],
+    ) -> tuple:
+        """Build the result cache key; take the version before searching so a concurrent bump wins."""
+        return (
+            version,
+            _embedding_key(embedding),
+            json.dumps(filters, sort_keys=True, default=str),
+            k,
+            json.dumps(aggregation_config, sort_keys=True, default=str),
+        )
+
+    def get_result(self, key: tuple) -> Optional[Dict[str, Any]]:
+        return self.results.get(key)
+
+    def put_result(self, key: tuple, result: Dict[str, Any]) -> None:
+        if key[0] == index_version.value:
+            self.results.put(key, result)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": settings.QUERY_CACHE_ENABLED,
+            "index_version": index_version.value,
+            "embeddings": self.embeddings.stats(),
+            "results": self.results.stats(),
+        }
+
+
+query_cache = QueryCache(
+    embedding_cache_size=settings.QUERY_EMBEDDING_CACHE_SIZE if settings.QUERY_CACHE_ENABLED else 0,
+    result_cache_size=settings.QUERY_RESULT_CACHE_SIZE if settings.QUERY_CACHE_ENABLED else 0,
+)
@@ -0,0 +1,306 @@
+# Copyright (C) 2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Columnar frame-to-video aggregation.
+
+Frame matches are read once into NumPy columns (video-id codes, timestamps, scores) and
+all segment statistics are computed on arrays: frames are grouped into temporal segments
+by sorting on (segment, original position), and segment scores, contextual boosts,
+normalization, overlap filtering and ranking work on one value per segment.
+
+The results are identical to the per-segment functions in ``retriever.py``
+(``create_temporal_segments``, ``calculate_segment_score`` and
+``apply_temporal_overlap_filtering``):
+
+- segments keep the order in which their first frame appears, which breaks score ties;
+- sums are accumulated frame by frame in the same order as Python's ``sum``;
+- the contextual weight is computed with ``math`` rather than numpy's SIMD ``power``/``exp``.
+"""
+
+import math
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+# Score used by calculate_segment_score for frames without a relevance score
+_MISSING_QUALITY_SCORE = 0.1
+
+
+@dataclass
+class FrameColumns:
+    """Columns of the frame matches of one query, in result order."""
+
+    frames: List[Any]
+    metadatas: List[Dict[str, Any]]
+    video_ids: List[str]  # video id of every video code
+    video_codes: np.ndarray
+    timestamps: np.ndarray  # 0 where the frame has no timestamp
+    has_timestamp: np.ndarray
+    scores: np.ndarray  # 0 where the frame has no relevance score
+    has_score: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.frames)
+
+
+@dataclass
+class SegmentColumns:
+    """Per-segment statistics, indexed by segment in creation order."""
+
+    video_codes: np.ndarray
+    segment_ids: np.ndarray
+    frame_order: np.ndarray  # frame indices grouped by segment, in result order within a segment
+    offsets: np.ndarray  # start of every segment in frame_order
+    frame_counts: np.ndarray
+    max_scores: np.ndarray
+    avg_scores: np.ndarray
+    top_n_counts: np.ndarray
+    top_n_avg_scores: np.ndarray
+    quality_scores: np.ndarray
+    best_frames: np.ndarray  # frame index of the best frame, -1 when no frame scores above -1
+    context_weights: np.ndarray
+    raw_scores: np.ndarray
+    scores: np.ndarray  # raw scores normalized to [0, 1]
+
+    def __len__(self) -> int:
+        return len(self.segment_ids)
+
+    def frame_indices(self, segment: int) -> np.ndarray:
+        start = self.offsets[segment]
+        return self.frame_order[start:start + self.frame_counts[segment]]
+
+
+def build_frame_columns(frame_results: List[Any]) -> FrameColumns:
+    """Read video ids, timestamps and scores of the frame matches into columns."""
+    count = len(frame_results)
+    metadatas: List[Dict[str, Any]] = [None] * count
+    codes: List[int] = [0] * count
+    timestamps: List[float] = [0.0] * count
+    has_timestamp: List[bool] = [True] * count
+    scores: List[float] = [0.0] * count
+    has_score: List[bool] = [True] * count
+    video_codes: Dict[str, int] = {}
+
+    for index, frame in enumerate(frame_results):
+        metadata = frame.metadata if hasattr(frame, "metadata") else frame
+        metadatas[index] = metadata
+
+        video_id = metadata.get("video_id", "unknown")
+        code = video_codes.get(video_id)
+        if code is None:
+            code = video_codes[video_id] = len(video_codes)
+        codes[index] = code
+
+        timestamp = metadata.get("timestamp")
+        if timestamp is None:
+            has_timestamp[index] = False
+        else:
+            timestamps[index] = timestamp
+
+        score = metadata.get("relevance_score")
+        if score is None:
+            has_score[index] = False
+        else:
+            scores[index] = score
+
+    return FrameColumns(
+        frames=frame_results,
+        metadatas=metadatas,
+        video_ids=list(video_codes),
+        video_codes=np.array(codes, dtype=np.int64),
+        timestamps=np.array(timestamps, dtype=np.float64),
+        has_timestamp=np.array(has_timestamp, dtype=bool),
+        scores=np.array(scores, dtype=np.float64),
+        has_score=np.array(has_score, dtype=bool),
+    )
+
+
+def find_global_best_frame(columns: FrameColumns) -> Optional[int]:
+    """Index of the first frame with the highest relevance score, None when no frame has a score."""
+    if not columns.has_score.any():
+        return None
+    scores = np.where(columns.has_score, columns.scores, -np.inf)
+    return int(np.argmax(scores))
+
+
+def _sequential_segment_sums(values: np.ndarray, offsets: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    """
+    Sum the first counts[i] values of every segment, adding them one by one in order.
+
+    NumPy reductions use pairwise summation, which rounds differently from Python's sum
+    for more than a few terms; accumulating position by position keeps the sums equal.
+    """
+    sums = np.zeros(len(offsets), dtype=np.float64)
+    max_count = int(counts.max()) if len(counts) else 0
+    for position in range(max_count):
+        active = counts > position
+        sums[active] += values[offsets[active] + position]
+    return sums
+
+
+def _first_index_per_segment(mask: np.ndarray, segment_of: np.ndarray, segment_count: int) -> np.ndarray:
+    """Position of the first True in every segment of a grouped mask, -1 if there is none."""
+    first = np.full(segment_count, -1, dtype=np.int64)
+    positions = np.flatnonzero(mask)
+    if len(positions):
+        segments, index = np.unique(segment_of[positions], return_index=True)
+        first[segments] = positions[index]
+    return first
+
+
+def score_segments(
+    columns: FrameColumns,
+    segment_duration: float,
+    aggregation_config: Dict[str, Any],
+    global_best_frame: Optional[int],
+) -> SegmentColumns:
+    """Group frames into temporal segments and compute the score of every segment."""
+    frame_count = len(columns)
+
+    # Group by (video, segment); np.unique sorts the keys, so segments are renumbered by
+    # the position of their first frame to keep their creation order
+    segment_ids = np.floor_divide(columns.timestamps, segment_duration).astype(np.int64)
+    keys = np.stack([columns.video_codes, segment_ids], axis=1)
+    _, first_frames, inverse = np.unique(keys, axis=0, return_index=True, return_inverse=True)
+    inverse = inverse.reshape(-1)
+    creation_rank = np.empty(len(first_frames), dtype=np.int64)
+    creation_rank[np.argsort(first_frames, kind="stable")] = np.arange(len(first_frames))
+    segment_of_frame = creation_rank[inverse]
+    segment_count = len(first_frames)
+
+    frame_positions = np.arange(frame_count)
+    frame_order = np.lexsort((frame_positions, segment_of_frame))
+    frame_counts = np.bincount(segment_of_frame, minlength=segment_count)
+    offsets = np.zeros(segment_count, dtype=np.int64)
+    np.cumsum(frame_counts[:-1], out=offsets[1:])
+    first_of_segment = frame_order[offsets]
+
+    # Qualitative score: best frame and top-N average
+    scoring_cfg = aggregation_config.get("scoring", {})
+    qualitative_cfg = scoring_cfg.get("qualitative_weights", {})
+    top_ratio = float(qualitative_cfg.get("top_ratio", 0.35) or 0.35)
+    top_min_count = int(qualitative_cfg.get("top_min_count", 2) or 2)
+    top_max_count = int(qualitative_cfg.get("top_max_count", 6) or 6)
+    max_weight = float(qualitative_cfg.get("max_component", 0.65))
+    top_weight = float(qualitative_cfg.get("top_component", 0.35))
+    weight_total = max(max_weight + top_weight, 1e-6)
+    max_weight /= weight_total
+    top_weight /= weight_total
+
+    quality_values = np.where(columns.has_score, columns.scores, _MISSING_QUALITY_SCORE)
+    grouped_scores = quality_values[frame_order]
+    max_scores = np.maximum.reduceat(grouped_scores, offsets) if segment_count else np.zeros(0)
+    avg_scores = _sequential_segment_sums(grouped_scores, offsets, frame_counts) / frame_counts
+
+    top_n_counts = np.maximum(top_min_count, np.ceil(frame_counts * top_ratio).astype(np.int64))
+    if top_max_count > 0:
+        top_n_counts = np.minimum(top_n_counts, top_max_count)
+    top_n_counts = np.minimum(top_n_counts, frame_counts)
+    descending = np.lexsort((-quality_values, segment_of_frame))
+    top_sums = _sequential_segment_sums(quality_values[descending], offsets, top_n_counts)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        top_n_avg_scores = np.where(top_n_counts > 0, top_sums / top_n_counts, max_scores)
+
+    quality_scores = (max_scores * max_weight) + (top_n_avg_scores * top_weight)
+
+    # Best frame of every segment: the first one with the highest score above -1
+    best_values = columns.scores[frame_order]
+    grouped_segments = segment_of_frame[frame_order]
+    best_of_segment = np.maximum.reduceat(best_values, offsets) if segment_count else np.zeros(0)
+    is_best = (best_values == best_of_segment[grouped_segments]) & (best_of_segment[grouped_segments] > -1.0)
+    best_positions = _first_index_per_segment(is_best, grouped_segments, segment_count)
+    best_frames = np.where(best_positions >= 0, frame_order[np.maximum(best_positions, 0)], -1)
+
+    # Contextual boost by proximity of the best frame to the global peak
+    contextual_cfg = scoring_cfg.get("contextual", {})
+    sigma_seconds = float(contextual_cfg.get("sigma_seconds", 40.0) or 40.0)
+    boost_strength = float(contextual_cfg.get("boost_strength", 0.5))
+
+    context_weights = np.zeros(segment_count, dtype=np.float64)
+    peak_timestamp = None
+    if global_best_frame is not None:
+        peak_timestamp = columns.metadatas[global_best_frame].get("timestamp", 0)
+    if peak_timestamp is not None and sigma_seconds > 0 and segment_count:
+        has_best = best_frames >= 0
+        has_best[has_best] = columns.has_timestamp[best_frames[has_best]]
+        distances = np.abs(columns.timestamps[best_frames[has_best]] - float(peak_timestamp))
+        # numpy's SIMD pow/exp may round differently from libm, which calculate_segment_score uses
+        context_weights[has_best] = [
+            math.exp(-((distance / sigma_seconds) ** 2)) for distance in distances.tolist()
+        ]
+
+    raw_scores = quality_scores * (1.0 + boost_strength * context_weights)
+
+    # Normalize to [0, 1]
+    if segment_count:
+        min_score = raw_scores.min()
+        score_range = raw_scores.max() - min_score
+        if score_range > 0:
+            scores = (raw_scores - min_score) / score_range
+        else:
+            scores = np.ones(segment_count, dtype=np.float64)
+    else:
+        scores = np.zeros(0, dtype=np.float64)
+
+    return SegmentColumns(
+        video_codes=columns.video_codes[first_of_segment],
+        segment_ids=segment_ids[first_of_segment],
+        frame_order=frame_order,
+        offsets=offsets,
+        frame_counts=frame_counts,
+        max_scores=max_scores,
+        avg_scores=avg_scores,
+        top_n_counts=top_n_counts,
+        top_n_avg_scores=top_n_avg_scores,
+        quality_scores=quality_scores,
+        best_frames=best_frames,
+        context_weights=context_weights,
+        raw_scores=raw_scores,
+        scores=scores,
+    )
+
+
+def rank_segments(
+    segments: SegmentColumns,
+    segment_duration: float,
+    min_gap_seconds: Optional[float] = None,
+) -> np.ndarray:
+    """
+    Rank segments by score, dropping segments that overlap a better one of the same video.
+
+    Args:
+        segments: Scored segments
+        segment_duration: Duration in seconds of every segment
+        min_gap_seconds: Minimum gap between kept segments of a video, None disables filtering
+
+    Returns:
+        Indices of the kept segments, best first; ties keep the segment creation order
+    """
+    ranking = np.lexsort((np.arange(len(segments)), -segments.scores))
+    if min_gap_seconds is None:
+        return ranking
+
+    # Segments of a video never share a segment id, and aligned segments of equal length
+    # are always separated when no gap is required
+    if min_gap_seconds <= 0:
+        return ranking
+
+    starts = segments.segment_ids * segment_duration
+    ends = (segments.segment_ids + 1) * segment_duration
+
+    keep = np.zeros(len(ranking), dtype=bool)
+    kept_by_video: Dict[int, List[int]] = {}
+    for position, segment in enumerate(ranking):
+        kept = kept_by_video.setdefault(int(segments.video_codes[segment]), [])
+        if kept:
+            kept_index = np.array(kept)
+            separated = (ends[segment] + min_gap_seconds <= starts[kept_index]) | (
+                ends[kept_index] + min_gap_seconds <= starts[segment]
+            )
+            if not separated.all():
+                continue
+        kept.append(segment)
+        keep[position] = True
+    return ranking[keep]
@@ -1,16 +1,38 @@
 # Copyright (C) 2025 Intel Corporation
 # SPDX-License-Identifier: Apache-2.0
 
+import itertools
+import logging
 import math
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Any, Tuple, Optional
 from langchain_vdms.vectorstores import VDMS, VDMS_Client
 
 from src.utils.common import settings, logger
+from src.vdms_retriever.columnar_aggregation import (
+    FrameColumns,
+    SegmentColumns,
+    build_frame_columns,
+    find_global_best_frame,
+    rank_segments,
+    score_segments,
+)
 from src.vdms_retriever.embedding_wrapper import EmbeddingAPI
 
 DEBUG = False
-client = VDMS_Client(settings.VDMS_VDB_HOST, settings.VDMS_VDB_PORT)
+
+# Prefix of the per-tag indicator properties written by the VDMS dataprep service. VDMS
+# constraints compare whole values, so tags are matched on these instead of the
+# comma-separated "tags" property.
+TAG_PROPERTY_PREFIX = "tag_"
+
+# A VDMS connection serves one request at a time, so every search worker owns its own
+_thread_local = threading.local()
+_embeddings: Optional[EmbeddingAPI] = None
+_search_executor: Optional[ThreadPoolExecutor] = None
+_init_lock = threading.Lock()
 
 
 # Frame-to-Video Aggregation Configuration
@@ -48,6 +70,31 @@ def get_aggregation_config():
     }
 
 
+def _frame_metadata(frame: Any) -> Dict[str, Any]:
+    return frame.metadata if hasattr(frame, 'metadata') else frame
+
+
+def _frame_video_duration(metadata: Dict[str, Any], baseline_duration: float) -> float:
+    """Duration of the frame's video from its metadata, falling back to the baseline duration."""
+    raw_duration = metadata.get("video_duration") or metadata.get("video_duration_seconds")
+    if raw_duration is not None:
+        try:
+            raw_duration = float(raw_duration)
+        except (TypeError, ValueError):
+            raw_duration = None
+    if raw_duration is None:
+        fps_value = metadata.get("fps")
+        total_frames_value = metadata.get("total_frames")
+        try:
+            if fps_value and total_frames_value:
+                raw_duration = float(total_frames_value) / float(fps_value)
+        except (TypeError, ValueError, ZeroDivisionError):
+            raw_duration = None
+    if raw_duration is None or raw_duration <= 0:
+        raw_duration = baseline_duration
+    return raw_duration
+
+
 def create_temporal_segments(
     frame_matches: List[Dict],
     segment_duration: int = 8,
@@ -81,22 +128,7 @@ def create_temporal_segments(
         timestamp = metadata.get("timestamp", 0)
         relevance_score = metadata.get("relevance_score", 0)
 
-        raw_duration = metadata.get("video_duration") or metadata.get("video_duration_seconds")
-        if raw_duration is not None:
-            try:
-                raw_duration = float(raw_duration)
-            except (TypeError, ValueError):
-                raw_duration = None
-        if raw_duration is None:
-            fps_value = metadata.get("fps")
-            total_frames_value = metadata.get("total_frames")
-            try:
-                if fps_value and total_frames_value:
-                    raw_duration = float(total_frames_value) / float(fps_value)
-            except (TypeError, ValueError, ZeroDivisionError):
-                raw_duration = None
-        if raw_duration is None or raw_duration <= 0:
-            raw_duration = baseline_duration
+        raw_duration = _frame_video_duration(metadata, baseline_duration)
         
         segment_id = int(timestamp // segment_duration)
         key = f"{video_id}_seg_{segment_id}"
@@ -337,12 +369,45 @@ def apply_temporal_overlap_filtering(segments: List[Dict], min_gap_seconds: int
     return filtered_segments
 
 
+def _segment_score_breakdown(
+    segments: SegmentColumns,
+    index: int,
+    columns: FrameColumns,
+    peak_timestamp: Any,
+    aggregation_config: Dict[str, Any],
+) -> Dict[str, Any]:
+    """Score breakdown of a segment, with the keys and value types of calculate_segment_score."""
+    contextual_cfg = aggregation_config.get("scoring", {}).get("contextual", {})
+    best_frame = int(segments.best_frames[index])
+    segment_best_timestamp = columns.metadatas[best_frame].get("timestamp") if best_frame >= 0 else None
+    return {
+        "score": float(segments.scores[index]),
+        "max_frame_score": float(segments.max_scores[index]),
+        "top_n_avg_score": float(segments.top_n_avg_scores[index]),
+        "top_n_frame_count": int(segments.top_n_counts[index]),
+        "avg_frame_score": float(segments.avg_scores[index]),
+        "quality_score": float(segments.quality_scores[index]),
+        "frame_count": int(segments.frame_counts[index]),
+        "contextual_weight": float(segments.context_weights[index]),
+        "contextual_boost_factor": float(contextual_cfg.get("boost_strength", 0.5)),
+        "contextual_sigma_seconds": float(contextual_cfg.get("sigma_seconds", 40.0) or 40.0),
+        "segment_best_timestamp": segment_best_timestamp,
+        "global_peak_timestamp": peak_timestamp,
+        "raw_score": float(segments.raw_scores[index]),
+    }
+
+
 def aggregate_frame_results_to_videos(frame_results: List[Any], max_results: int = 20) -> Tuple[List[Dict], Dict[str, float]]:
     """
     Complete aggregation pipeline for frame-to-video conversion.
     
     This is the main function that implements the temporal segment clustering strategy
     to convert individual frame search results into meaningful video segment results.
+    Frames are aggregated on NumPy columns (see ``columnar_aggregation``); only the
+    returned segments are turned back into dictionaries. The ranking and scores are the
+    same as those of ``create_temporal_segments``, ``calculate_segment_score`` and
+    ``apply_temporal_overlap_filtering``, which ``scripts/recompute_aggregate_scores.py
+    --verify`` checks against stored results.
     
     Args:
         frame_results: List of frame-level search results from VDMS
@@ -367,189 +432,76 @@ def aggregate_frame_results_to_videos(frame_results: List[Any], max_results: int
             "formatting_time_ms": 0.0,
         }
     
-    logger.debug(f"Starting aggregation of {len(frame_results)} frame results")
+    debug_enabled = logger.isEnabledFor(logging.DEBUG)
+    if debug_enabled:
+        logger.debug(f"Starting aggregation of {len(frame_results)} frame results")
 
-    # Calculate global maximum relevance score across all frames for contextual comparisons
-    global_scores: List[float] = []
-    frame_info_for_debug = []
-    global_best_frame_metadata: Optional[Dict[str, Any]] = None
-    for frame in frame_results:
-        frame_metadata = frame.metadata if hasattr(frame, 'metadata') else frame
-        score = frame_metadata.get('relevance_score') if isinstance(frame_metadata, dict) else None
-        if score is not None:
-            global_scores.append(score)
-            # Collect debug info
-            video_id = frame_metadata.get('video_id', 'unknown')
-            timestamp = frame_metadata.get('timestamp', 0)
-            frame_info_for_debug.append((video_id[:8] + "...", timestamp, score))
-
-            if (
-                global_best_frame_metadata is None
-                or score > global_best_frame_metadata.get('relevance_score', float('-inf'))
-            ):
-                global_best_frame_metadata = {
-                    "video_id": frame_metadata.get('video_id'),
-                    "timestamp": timestamp,
-                    "relevance_score": score,
-                }
-
-    if global_best_frame_metadata is not None:
-        global_max_score = global_best_frame_metadata.get('relevance_score', 0.1)
-    else:
-        global_max_score = max(global_scores) if global_scores else 0.1
-    
-    # Debug log initial frame distribution
-    logger.debug(f"=== FRAME DISTRIBUTION DEBUG ===")
-    logger.debug(f"Global max score: {global_max_score:.4f}")
-    logger.debug(f"Top 10 frame scores: {sorted(global_scores, reverse=True)[:10]}")
-    
-    # Group frames by video for debug
-    video_frame_counts = {}
-    for video_id, timestamp, score in frame_info_for_debug:
-        if video_id not in video_frame_counts:
-            video_frame_counts[video_id] = []
-        video_frame_counts[video_id].append((timestamp, score))
-    
-    for video_id, frames in video_frame_counts.items():
-        logger.debug(f"Video {video_id}: {len(frames)} frames, timestamps: {[f'{t}s' for t, _ in sorted(frames)[:5]]}{'...' if len(frames) > 5 else ''}")
-    
-    # Step 1: Create temporal segments
+    # Step 1: Read frames into columns and find the global peak for the contextual boost
     segment_duration = config["segment_duration_seconds"]
     segmentation_start = time.perf_counter()
-    segments = create_temporal_segments(frame_results, segment_duration, config)
+    columns = build_frame_columns(frame_results)
+    global_best_frame = find_global_best_frame(columns)
+    peak_timestamp = None
+    if global_best_frame is not None:
+        peak_timestamp = columns.metadatas[global_best_frame].get("timestamp", 0)
     segmentation_time_ms = (time.perf_counter() - segmentation_start) * 1000
-    logger.debug(f"Created {len(segments)} temporal segments")
-    
-    # Step 2: Score all segments with length normalization
+
+    # Step 2: Group frames into temporal segments, score and normalize them
     scoring_start = time.perf_counter()
-    scored_segments = []
-    seek_offset = float(config["scoring"].get("context_seek_offset_seconds", 0.0))
+    segments = score_segments(columns, segment_duration, config, global_best_frame)
+    scoring_time_ms = (time.perf_counter() - scoring_start) * 1000
 
-    logger.debug(f"=== SCORING DEBUG: Scoring {len(segments)} segments ===")
-    
-    for segment in segments:
-        # Extract frame scores for logging
-        frame_scores = []
-        for frame in segment["frames"]:
-            frame_metadata = frame.metadata if hasattr(frame, 'metadata') else frame
-            timestamp = frame_metadata.get("timestamp", 0)
-            score = frame_metadata.get('relevance_score', 0)
-            frame_scores.append((timestamp, score))
-        
-        score_data = calculate_segment_score(
-            segment,
-            global_max_score,
-            global_best_frame_metadata,
-            config,
+    if debug_enabled:
+        logger.debug(
+            "Created %d temporal segments from %d videos, global max score: %s, raw score range [%.4f, %.4f]",
+            len(segments),
+            len(columns.video_ids),
+            f"{columns.scores[global_best_frame]:.4f}" if global_best_frame is not None else "N/A",
+            float(segments.raw_scores.min()),
+            float(segments.raw_scores.max()),
         )
+
+    # Step 3: Rank segments, filtering temporal overlaps
+    filtering_start = time.perf_counter()
+    min_gap = config["min_temporal_gap_seconds"] if config["filtering"]["overlap_filter_enabled"] else None
+    ranking = rank_segments(segments, segment_duration, min_gap)
+    final_indices = ranking[:max_results].tolist()
+    filtering_time_ms = (time.perf_counter() - filtering_start) * 1000
+    
+    # Step 4: Build the returned segments
+    formatting_start = time.perf_counter()
+    length_cfg = config.get("length_normalization", {})
+    baseline_duration = float(length_cfg.get("baseline_duration_seconds", 30) or 30)
+    seek_offset = float(config["scoring"].get("context_seek_offset_seconds", 0.0))
+
+    formatted_results = []
+    for index in final_indices:
+        frames = [frame_results[i] for i in segments.frame_indices(index).tolist()]
+        segment_id = int(segments.segment_ids[index])
+        segment = {
+            "video_id": columns.video_ids[segments.video_codes[index]],
+            "segment_start": segment_id * segment_duration,
+            "segment_end": (segment_id + 1) * segment_duration,
+            "frames": frames,
+            "video_duration": _frame_video_duration(_frame_metadata(frames[0]), baseline_duration),
+        }
         seek_data = determine_seek_point(segment, context_offset=seek_offset)
-        
+
         # Get best frame for metadata
         best_frame = None
         best_score = -1
-        for frame in segment["frames"]:
-            frame_metadata = frame.metadata if hasattr(frame, 'metadata') else frame
+        frame_scores = []
+        for frame in frames:
+            frame_metadata = _frame_metadata(frame)
             score = frame_metadata.get('relevance_score', 0)
+            frame_scores.append((frame_metadata.get("timestamp", 0), score))
             if score > best_score:
                 best_score = score
                 best_frame = frame
         
-        best_frame_metadata = best_frame.metadata if (best_frame and hasattr(best_frame, 'metadata')) else best_frame
-        if not best_frame_metadata:
-            best_frame_metadata = {}
-        
-        # Debug log for this segment
-        segment_key = f"{segment['video_id'][:8]}..._[{segment['segment_start']}-{segment['segment_end']}s]"
-        logger.debug(f"Segment {segment_key}:")
-        logger.debug(f"  Frame scores: {[(f'{ts}s', f'{sc:.4f}') for ts, sc in sorted(frame_scores)]}")
-        logger.debug(
-            "  Score breakdown: max=%.4f, top_n_avg=%.4f (count=%d), "
-            "base_quality=%.4f, context_weight=%.3f, final=%.4f",
-            score_data['max_frame_score'],
-            score_data['top_n_avg_score'],
-            score_data['top_n_frame_count'],
-            score_data['quality_score'],
-            score_data['contextual_weight'],
-            score_data['score'],
-        )
-        contextual_weight = score_data.get('contextual_weight')
-        boost_factor = score_data.get('contextual_boost_factor')
-        logger.debug(
-            "  Final score: %.4f (context_weight=%s, boost=%.2f)",
-            score_data['score'],
-            f"{contextual_weight:.3f}" if contextual_weight is not None else "N/A",
-            boost_factor if boost_factor is not None else 0.0,
-        )
-        
-        # Store frame scores for API response
-        formatted_frame_scores = [(f'{ts}s', f'{sc:.4f}') for ts, sc in sorted(frame_scores)]
-        
-        scored_segments.append({
-            **segment,
-            "score_breakdown": score_data,
-            "seek_info": seek_data,
-            "final_score": score_data["score"],
-            "best_frame_metadata": best_frame_metadata,
-            "frame_scores": formatted_frame_scores
-        })
-    
-    scoring_time_ms = (time.perf_counter() - scoring_start) * 1000
-    logger.debug(f"Scored {len(scored_segments)} segments")
-    
-    # Step 2.5: Normalize scores to [0, 1] range
-    if scored_segments:
-        raw_scores = [seg["final_score"] for seg in scored_segments]
-        min_score = min(raw_scores)
-        max_score = max(raw_scores)
-        score_range = max_score - min_score
-        
-        if score_range > 0:
-            for seg in scored_segments:
-                raw_score = seg["final_score"]
-                normalized_score = (raw_score - min_score) / score_range
-                seg["score_breakdown"]["raw_score"] = raw_score
-                seg["score_breakdown"]["score"] = normalized_score
-                seg["final_score"] = normalized_score
-            logger.debug(f"Normalized scores: range [{min_score:.4f}, {max_score:.4f}] → [0.0, 1.0]")
-        else:
-            # All scores identical, set to 1.0
-            for seg in scored_segments:
-                seg["score_breakdown"]["raw_score"] = seg["final_score"]
-                seg["score_breakdown"]["score"] = 1.0
-                seg["final_score"] = 1.0
-            logger.debug(f"All scores identical ({max_score:.4f}), normalized to 1.0")
-    
-    # Step 3: Apply temporal overlap filtering
-    filtering_start = time.perf_counter()
-    if config["filtering"]["overlap_filter_enabled"]:
-        min_gap = config["min_temporal_gap_seconds"]
-        filtered_segments = apply_temporal_overlap_filtering(scored_segments, min_gap)
-        logger.debug(f"After temporal filtering: {len(filtered_segments)} segments")
-    else:
-        filtered_segments = scored_segments
-    filtering_time_ms = (time.perf_counter() - filtering_start) * 1000
-    
-    # Step 4: Final ranking and top-K selection
-    final_results = sorted(
-        filtered_segments, 
-        key=lambda x: x["final_score"], 
-        reverse=True
-    )[:max_results]
-    
-    # Debug log final ranking
-    logger.debug(f"=== FINAL RANKING DEBUG: Top {len(final_results)} results ===")
-    for i, result in enumerate(final_results[:10]):  # Show top 10
-        segment_key = f"{result['video_id'][:8]}..._[{result['segment_start']}-{result['segment_end']}s]"
-        logger.debug(f"Rank #{i+1}: {segment_key} → Final Score: {result['final_score']:.4f}")
-    
-    if len(final_results) > 10:
-        logger.debug(f"... and {len(final_results) - 10} more results")
-    
-    # Step 5: Format results for API response
-    formatting_start = time.perf_counter()
-    formatted_results = []
-    for result in final_results:
-        best_frame_meta = result.get("best_frame_metadata", {})
+        best_frame_meta = best_frame.metadata if (best_frame and hasattr(best_frame, 'metadata')) else best_frame
+        if not best_frame_meta:
+            best_frame_meta = {}
         
         # Extract video URLs from any frame metadata (all frames in same video have same URLs)
         video_url = ""
@@ -561,41 +513,47 @@ def aggregate_frame_results_to_videos(frame_results: List[Any], max_results: int
             video_rel_url = best_frame_meta.get("video_rel_url", "")
         else:
             # Fallback: get URLs from any frame in the segment
-            frames = result.get("frames", [])
             for frame in frames:
-                frame_metadata = frame.metadata if hasattr(frame, 'metadata') else frame
+                frame_metadata = _frame_metadata(frame)
                 if frame_metadata.get("video_url"):
                     video_url = frame_metadata.get("video_url", "")
                     video_rel_url = frame_metadata.get("video_rel_url", "")
                     break
         
+        final_score = float(segments.scores[index])
         formatted_result = {
-            "video_id": result["video_id"],
+            "video_id": segment["video_id"],
             "video_url": video_url,
             "video_rel_url": video_rel_url,
-            "video_duration": result.get("video_duration"),
-            "seek_timestamp": result["seek_info"]["seek_timestamp"],
-            "segment_start": result["segment_start"],
-            "segment_end": result["segment_end"],
-            "relevance_score": result["final_score"],
-            "score_breakdown": result["score_breakdown"],
+            "video_duration": segment["video_duration"],
+            "seek_timestamp": seek_data["seek_timestamp"],
+            "segment_start": segment["segment_start"],
+            "segment_end": segment["segment_end"],
+            "relevance_score": final_score,
+            "score_breakdown": _segment_score_breakdown(segments, index, columns, peak_timestamp, config),
             "best_frame_info": {
-                "timestamp": result["seek_info"]["best_frame_timestamp"],
+                "timestamp": seek_data["best_frame_timestamp"],
                 "frame_number": best_frame_meta.get("frame_number", 0),
                 "frame_type": best_frame_meta.get("frame_type", "full_frame"),
                 "detection_confidence": best_frame_meta.get("detection_confidence"),
                 "detected_label": best_frame_meta.get("detected_label")
             },
             "video_metadata": {
-                "duration": result["video_duration"],
+                "duration": segment["video_duration"],
                 "fps": best_frame_meta.get("fps", 30),
                 "tags": best_frame_meta.get("tags", "").split(",") if best_frame_meta.get("tags") else [],
                 "upload_timestamp": best_frame_meta.get("date_time", {}).get("_date", ""),
                 "bucket_name": best_frame_meta.get("bucket_name", "")
             },
-            "frame_scores": result.get("frame_scores", [])
+            "frame_scores": [(f'{ts}s', f'{sc:.4f}') for ts, sc in sorted(frame_scores)]
         }
         formatted_results.append(formatted_result)
+
+        if debug_enabled and len(formatted_results) <= 10:
+            logger.debug(
+                f"Rank #{len(formatted_results)}: {segment['video_id'][:8]}..._"
+                f"[{segment['segment_start']}-{segment['segment_end']}s] → Final Score: {final_score:.4f}"
+            )
     
     formatting_time_ms = (time.perf_counter() - formatting_start) * 1000
     processing_time = (time.perf_counter() - start_time) * 1000  # Convert to milliseconds
@@ -603,7 +561,7 @@ def aggregate_frame_results_to_videos(frame_results: List[Any], max_results: int
     logger.info(
         "Aggregation complete: %d frames -> %d video segments in %.1fms (segmentation=%.2fms, scoring=%.2fms, filtering=%.2fms, formatting=%.2fms)",
         len(frame_results),
-        len(final_results),
+        len(formatted_results),
         processing_time,
         segmentation_time_ms,
         scoring_time_ms,
@@ -614,8 +572,8 @@ def aggregate_frame_results_to_videos(frame_results: List[Any], max_results: int
     return formatted_results, {
         "total_frame_matches": len(frame_results),
         "segments_created": len(segments),
-        "segments_after_filtering": len(filtered_segments),
-        "final_results": len(final_results),
+        "segments_after_filtering": len(ranking),
+        "final_results": len(formatted_results),
         "processing_time_ms": processing_time,
         "segmentation_time_ms": segmentation_time_ms,
         "scoring_time_ms": scoring_time_ms,
@@ -624,29 +582,145 @@ def aggregate_frame_results_to_videos(frame_results: List[Any], max_results: int
     }
 
 
+def get_embeddings() -> EmbeddingAPI:
+    """Return the embedding client shared by all search workers."""
+    global _embeddings
+    with _init_lock:
+        if _embeddings is None:
+            _embeddings = EmbeddingAPI(
+                api_url=settings.EMBEDDINGS_ENDPOINT,
+                model_name=settings.EMBEDDINGS_MODEL_NAME,
+            )
+    return _embeddings
+
+
+def get_search_executor() -> ThreadPoolExecutor:
+    """Return the worker pool that runs embedding requests and vector searches off the event loop."""
+    global _search_executor
+    with _init_lock:
+        if _search_executor is None:
+            _search_executor = ThreadPoolExecutor(
+                max_workers=max(1, settings.SEARCH_WORKERS), thread_name_prefix="vdms-search"
+            )
+    return _search_executor
+
+
 def get_vectordb() -> VDMS:
     """
     Initializes and returns a vector database based on the specified configuration.
-    Depending on the configuration, it uses either CLIP embeddings, a HuggingFace endpoint for embeddings,
-    or a default HuggingFace BGE embeddings model.
+    Every thread gets its own VDMS connection and vector store, created on first use,
+    so searches issued from the worker pool run concurrently.
     Returns:
         tuple: The vector database instance
     """
 
-    embeddings = EmbeddingAPI(
-        api_url=settings.EMBEDDINGS_ENDPOINT,
-        model_name=settings.EMBEDDINGS_MODEL_NAME,
-    )
+    vector_db = getattr(_thread_local, "vector_db", None)
+    if vector_db is not None:
+        return vector_db
 
+    embeddings = get_embeddings()
     vector_dimensions = embeddings.get_embedding_length()
 
     vector_db = VDMS(
-        client=client,
+        client=VDMS_Client(settings.VDMS_VDB_HOST, settings.VDMS_VDB_PORT),
         embedding=embeddings,
         collection_name=settings.INDEX_NAME,
         distance_strategy=settings.DISTANCE_STRATEGY,
         embedding_dimensions=vector_dimensions,
         engine=settings.SEARCH_ENGINE,
     )
+    _thread_local.vector_db = vector_db
 
     return vector_db
+
+
+def build_search_filters(
+    tags: Optional[List[str]] = None,
+    video_ids: Optional[List[str]] = None,
+    start_time: Optional[float] = None,
+    end_time: Optional[float] = None,
+) -> List[Optional[Dict[str, list]]]:
+    """
+    Translate query filters into VDMS constraints.
+
+    VDMS combines the constraints of one query with AND and supports a single equality
+    per property, so "any of these tags" and "any of these videos" are expressed as one
+    constraint set per (tag, video) combination whose results are merged.
+
+    Args:
+        tags: Match frames carrying any of these tags
+        video_ids: Match frames of any of these videos
+        start_time: Match frames at or after this timestamp (seconds into the video)
+        end_time: Match frames at or before this timestamp (seconds into the video)
+
+    Returns:
+        List of constraint dictionaries, ``[None]`` when nothing is filtered
+    """
+    base: Dict[str, list] = {}
+    if start_time is not None and end_time is not None:
+        base["timestamp"] = [">=", float(start_time), "<=", float(end_time)]
+    elif start_time is not None:
+        base["timestamp"] = [">=", float(start_time)]
+    elif end_time is not None:
+        base["timestamp"] = ["<=", float(end_time)]
+
+    tag_constraints: List[Dict[str, list]] = [{}]
+    if tags and settings.SEARCH_TAG_PUSHDOWN:
+        unique_tags = dict.fromkeys(tag.strip() for tag in tags if tag and tag.strip())
+        tag_constraints = [{f"{TAG_PROPERTY_PREFIX}{tag}": ["==", 1]} for tag in unique_tags] or [{}]
+
+    video_constraints: List[Dict[str, list]] = [{}]
+    if video_ids:
+        video_constraints = [{"video_id": ["==", video_id]} for video_id in dict.fromkeys(video_ids)]
+
+    filters = [
+        {**base, **tag_constraint, **video_constraint}
+        for tag_constraint, video_constraint in itertools.product(tag_constraints, video_constraints)
+    ]
+    return [constraints or None for constraints in filters]
+
+
+def search_frames(
+    embedding: List[float],
+    k: int,
+    filters: Optional[List[Optional[Dict[str, list]]]] = None,
+) -> List[Tuple[Any, float]]:
+    """
+    Run the vector search for one query embedding with the given constraint sets.
+
+    Meant to run on the search executor: the results of every constraint set are merged,
+    de-duplicated by descriptor id and cut to the k best matches.
+
+    Args:
+        embedding: Query embedding
+        k: Number of frame matches to return
+        filters: Constraint sets from ``build_search_filters``
+
+    Returns:
+        List of (document, score) tuples, best match first
+    """
+    db = get_vectordb()
+    filters = filters or [None]
+
+    docs_with_score: List[Tuple[Any, float]] = []
+    seen_ids = set()
+    for constraints in filters:
+        for doc, score in db.similarity_search_with_score_by_vector(
+            embedding,
+            k=k,
+            fetch_k=k + 1,  # ensure fetch_k > k for langchain_vdms
+            filter=constraints,
+        ):
+            doc_id = doc.id if doc.id is not None else id(doc)
+            if doc_id in seen_ids:
+                continue
+            seen_ids.add(doc_id)
+            docs_with_score.append((doc, score))
+
+    if len(filters) > 1:
+        # Inner product ranks higher scores first, distances rank lower scores first
+        higher_is_better = settings.DISTANCE_STRATEGY.upper() == "IP"
+        docs_with_score.sort(key=lambda item: item[1], reverse=higher_is_better)
+        docs_with_score = docs_with_score[:k]
+
+    return docs_with_score
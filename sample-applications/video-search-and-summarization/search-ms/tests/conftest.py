@@ -0,0 +1,8 @@
+# Copyright (C) 2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+import os
+import sys
+
+# Add the search-ms root to the path so the tests import the service as the `src` package
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
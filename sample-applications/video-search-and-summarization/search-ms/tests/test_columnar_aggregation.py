@@ -0,0 +1,63 @@
+# Copyright (C) 2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+import importlib.util
+import json
+from collections import defaultdict
+from pathlib import Path
+
+import pytest
+
+SEARCH_MS_ROOT = Path(__file__).resolve().parents[1]
+# Frame matches of three videos and the results the per-segment aggregation returned for them
+# before the columnar engine, recorded with the default aggregation settings
+FIXTURE = Path(__file__).parent / "fixtures" / "aggregation_results.json"
+
+
+def load_script():
+    spec = importlib.util.spec_from_file_location(
+        "recompute_aggregate_scores", SEARCH_MS_ROOT / "scripts" / "recompute_aggregate_scores.py"
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+script = load_script()
+
+
+@pytest.fixture(scope="module")
+def recorded():
+    return json.loads(FIXTURE.read_text())
+
+
+def test_columnar_aggregation_reproduces_recorded_results(recorded):
+    results, stats = script.aggregate_frame_results_to_videos(recorded["frames"], max_results=20)
+
+    assert stats["total_frame_matches"] == len(recorded["frames"])
+    assert [(r["video_id"], r["segment_start"], r["segment_end"]) for r in results] == [
+        (r["video_id"], r["segment_start"], r["segment_end"]) for r in recorded["results"]
+    ]
+    for result, expected in zip(results, recorded["results"]):
+        assert result["seek_timestamp"] == pytest.approx(expected["seek_timestamp"])
+        assert result["relevance_score"] == pytest.approx(expected["relevance_score"])
+        assert result["score_breakdown"] == pytest.approx(expected["score_breakdown"])
+
+
+def test_verify_columnar_matches_reference(recorded):
+    frames_by_video = defaultdict(list)
+    for frame in recorded["frames"]:
+        frames_by_video[frame["video_id"]].append(frame)
+    segments = [
+        {
+            "video_id": video_id,
+            "video_duration": frames[0].get("video_duration"),
+            "frames": [
+                {"timestamp": frame["timestamp"], "relevance_score": frame["relevance_score"]}
+                for frame in frames
+            ],
+        }
+        for video_id, frames in frames_by_video.items()
+    ]
+
+    assert script.verify_columnar(segments, script.get_aggregation_config()) == 0
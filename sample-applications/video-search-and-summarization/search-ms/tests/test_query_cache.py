@@ -0,0 +1,90 @@
+# Copyright (C) 2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+import pytest
+
+from src.utils import query_cache as query_cache_module
+from src.utils.query_cache import IndexVersion, LRUCache, QueryCache
+
+AGGREGATION_CONFIG = {"segment_duration_seconds": 8}
+
+
+@pytest.fixture
+def index_version(monkeypatch):
+    version = IndexVersion()
+    monkeypatch.setattr(query_cache_module, "index_version", version)
+    return version
+
+
+@pytest.fixture
+def cache(index_version):
+    return QueryCache(embedding_cache_size=2, result_cache_size=2)
+
+
+def result_key(version, embedding=(0.1, 0.2), filters=None, k=1000):
+    return QueryCache.result_key(version, list(embedding), filters, k, AGGREGATION_CONFIG)
+
+
+def test_lru_eviction():
+    cache = LRUCache(2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+
+    # "b" is now the least recently used entry
+    cache.put("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats() == {"size": 2, "max_size": 2, "hits": 3, "misses": 1, "hit_rate": 0.75}
+
+
+def test_disabled_cache_stores_nothing():
+    cache = LRUCache(0)
+    cache.put("a", 1)
+
+    assert cache.get("a") is None
+
+
+def test_embedding_cache(cache):
+    cache.put_embedding("red car", [0.1, 0.2])
+
+    assert cache.get_embedding("red car") == [0.1, 0.2]
+    assert cache.get_embedding("blue car") is None
+
+
+def test_result_key_covers_query_parameters():
+    key = result_key(0)
+
+    assert result_key(0) == key
+    assert result_key(1) != key
+    assert result_key(0, embedding=(0.1, 0.3)) != key
+    assert result_key(0, filters=[{"video_id": ["==", "v1"]}]) != key
+    assert result_key(0, k=500) != key
+
+
+def test_index_version_bump_invalidates_results(cache, index_version):
+    key = result_key(index_version.value)
+    cache.put_result(key, {"results": ["segment"]})
+    cache.put_embedding("red car", [0.1, 0.2])
+    assert cache.get_result(key) == {"results": ["segment"]}
+
+    assert index_version.bump("videos uploaded") == 1
+
+    assert cache.get_result(key) is None
+    assert cache.get_result(result_key(index_version.value)) is None
+    # Embeddings do not depend on the indexed videos
+    assert cache.get_embedding("red car") == [0.1, 0.2]
+
+
+def test_results_of_a_search_overlapping_a_bump_are_not_stored(cache, index_version):
+    # The key is taken before searching, the index changes while the search runs
+    key = result_key(index_version.value)
+    index_version.bump()
+
+    cache.put_result(key, {"results": ["stale segment"]})
+
+    assert cache.get_result(key) is None
+    assert cache.stats()["results"]["size"] == 0
+    assert cache.stats()["index_version"] == 1
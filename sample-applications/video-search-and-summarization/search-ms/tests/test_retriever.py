@@ -0,0 +1,104 @@
+# Copyright (C) 2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+import pytest
+from langchain_core.documents import Document
+
+from src.utils.common import settings
+from src.vdms_retriever import retriever
+from src.vdms_retriever.retriever import build_search_filters, search_frames
+
+
+@pytest.fixture
+def tag_pushdown(monkeypatch):
+    monkeypatch.setattr(settings, "SEARCH_TAG_PUSHDOWN", True)
+
+
+def test_no_filters():
+    assert build_search_filters() == [None]
+
+
+def test_timestamp_range():
+    assert build_search_filters(start_time=5, end_time=12.5) == [
+        {"timestamp": [">=", 5.0, "<=", 12.5]}
+    ]
+    assert build_search_filters(start_time=5) == [{"timestamp": [">=", 5.0]}]
+    assert build_search_filters(end_time=0) == [{"timestamp": ["<=", 0.0]}]
+
+
+def test_tags_ignored_without_pushdown(monkeypatch):
+    # Frames ingested before tag properties existed lack them, so pushdown is opt-in
+    assert type(settings).model_fields["SEARCH_TAG_PUSHDOWN"].default is False
+    monkeypatch.setattr(settings, "SEARCH_TAG_PUSHDOWN", False)
+
+    assert build_search_filters(tags=["car"]) == [None]
+    assert build_search_filters(tags=["car"], video_ids=["v1"]) == [{"video_id": ["==", "v1"]}]
+
+
+def test_tag_and_video_product(tag_pushdown):
+    filters = build_search_filters(
+        tags=["car", " person ", "car", ""], video_ids=["v1", "v2", "v1"], start_time=3
+    )
+
+    assert filters == [
+        {"timestamp": [">=", 3.0], "tag_car": ["==", 1], "video_id": ["==", "v1"]},
+        {"timestamp": [">=", 3.0], "tag_car": ["==", 1], "video_id": ["==", "v2"]},
+        {"timestamp": [">=", 3.0], "tag_person": ["==", 1], "video_id": ["==", "v1"]},
+        {"timestamp": [">=", 3.0], "tag_person": ["==", 1], "video_id": ["==", "v2"]},
+    ]
+
+
+def test_blank_tags_do_not_filter(tag_pushdown):
+    assert build_search_filters(tags=[" ", ""]) == [None]
+
+
+class FakeVectorDB:
+    """Returns the matches registered for every constraint set, in the order given."""
+
+    def __init__(self, results):
+        self.results = results
+        self.calls = []
+
+    def similarity_search_with_score_by_vector(self, embedding, k, fetch_k, filter):
+        self.calls.append((k, fetch_k, filter))
+        key = None if filter is None else filter.get("video_id", [None, None])[1]
+        return self.results[key][:k]
+
+
+def match(doc_id, score):
+    return Document(page_content="", id=doc_id, metadata={"video_id": doc_id.split(":")[0]}), score
+
+
+def test_search_frames_single_filter(monkeypatch):
+    db = FakeVectorDB({None: [match("v1:1", 0.9), match("v2:1", 0.2)]})
+    monkeypatch.setattr(retriever, "get_vectordb", lambda: db)
+
+    results = search_frames([0.1], k=2)
+
+    assert [(doc.id, score) for doc, score in results] == [("v1:1", 0.9), ("v2:1", 0.2)]
+    assert db.calls == [(2, 3, None)]
+
+
+@pytest.mark.parametrize(
+    "strategy, expected",
+    [
+        # Inner product: higher scores first
+        ("IP", [("v2:1", 0.95), ("v1:1", 0.9), ("shared", 0.7), ("v2:2", 0.5)]),
+        # Distances: lower scores first
+        ("L2", [("v1:2", 0.1), ("v2:3", 0.3), ("v2:2", 0.5), ("shared", 0.7)]),
+    ],
+)
+def test_search_frames_merges_filters(monkeypatch, strategy, expected):
+    db = FakeVectorDB({
+        "v1": [match("v1:1", 0.9), match("v1:2", 0.1), match("shared", 0.7)],
+        "v2": [match("v2:1", 0.95), match("shared", 0.7), match("v2:2", 0.5), match("v2:3", 0.3)],
+    })
+    monkeypatch.setattr(retriever, "get_vectordb", lambda: db)
+    monkeypatch.setattr(settings, "DISTANCE_STRATEGY", strategy)
+    filters = build_search_filters(video_ids=["v1", "v2"])
+
+    results = search_frames([0.1], k=4, filters=filters)
+
+    # Every constraint set is searched, a frame matched by several sets is returned once
+    assert [call[2] for call in db.calls] == filters
+    assert [(doc.id, score) for doc, score in results] == expected
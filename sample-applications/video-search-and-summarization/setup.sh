@@ -359,6 +359,11 @@ export AGGREGATION_MIN_GAP=${AGGREGATION_MIN_GAP:-0}
 export AGGREGATION_MAX_RESULTS=${AGGREGATION_MAX_RESULTS:-20}
 export AGGREGATION_INITIAL_K=${AGGREGATION_INITIAL_K:-1000}
 export AGGREGATION_CONTEXT_SEEK_OFFSET_SECONDS=${AGGREGATION_CONTEXT_SEEK_OFFSET_SECONDS:-0}
+export SEARCH_WORKERS=${SEARCH_WORKERS:-8}
+export SEARCH_TAG_PUSHDOWN=${SEARCH_TAG_PUSHDOWN:-false}
+export QUERY_CACHE_ENABLED=${QUERY_CACHE_ENABLED:-true}
+export QUERY_EMBEDDING_CACHE_SIZE=${QUERY_EMBEDDING_CACHE_SIZE:-1024}
+export QUERY_RESULT_CACHE_SIZE=${QUERY_RESULT_CACHE_SIZE:-256}
 
 # env for video-search
 export VS_HOST_PORT=7890